@@ -0,0 +1,109 @@
+"""Add integrations and sync_jobs
+
+Revision ID: a3e7c9d2f614
+Revises: c4f8a2d6e913
+Create Date: 2026-10-19 09:41:27.506318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3e7c9d2f614'
+down_revision: Union[str, Sequence[str], None] = 'c4f8a2d6e913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create integrations and sync_jobs, including the sync runner's checkpoint columns."""
+    op.create_table('integrations',
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('integration_type', sa.String(length=50), nullable=False),
+    sa.Column('system_identifier', sa.String(length=50), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('config', sa.JSON(), nullable=False),
+    sa.Column('auto_sync', sa.Boolean(), nullable=True),
+    sa.Column('sync_interval_minutes', sa.Integer(), nullable=True),
+    sa.Column('last_sync_at', sa.DateTime(), nullable=True),
+    sa.Column('next_sync_at', sa.DateTime(), nullable=True),
+    sa.Column('data_retention_days', sa.Integer(), nullable=True),
+    sa.Column('tags', sa.JSON(), nullable=True),
+    sa.Column('total_requests', sa.Integer(), nullable=True),
+    sa.Column('successful_requests', sa.Integer(), nullable=True),
+    sa.Column('failed_requests', sa.Integer(), nullable=True),
+    sa.Column('average_response_time', sa.Float(), nullable=True),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('last_health_check', sa.DateTime(), nullable=True),
+    sa.Column('version', sa.String(length=20), nullable=True),
+    sa.Column('metadata', sa.JSON(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('created_by', sa.UUID(), nullable=False),
+    sa.Column('updated_by', sa.UUID(), nullable=True),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], name='integrations_created_by_fkey'),
+    sa.ForeignKeyConstraint(['updated_by'], ['users.id'], name='integrations_updated_by_fkey'),
+    sa.PrimaryKeyConstraint('id', name='integrations_pkey'),
+    sa.UniqueConstraint('system_identifier', name='integrations_system_identifier_key')
+    )
+    op.create_index('ix_integrations_type_status', 'integrations', ['integration_type', 'status'], unique=False)
+    op.create_index('ix_integrations_active', 'integrations', ['is_active'], unique=False)
+    op.create_index('ix_integrations_sync', 'integrations', ['auto_sync', 'next_sync_at'], unique=False)
+    op.create_index('ix_integrations_created', 'integrations', ['created_at'], unique=False)
+
+    op.create_table('sync_jobs',
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('integration_id', sa.String(), nullable=True),
+    sa.Column('connector_type', sa.String(length=50), nullable=False),
+    sa.Column('sync_direction', sa.String(length=20), nullable=False),
+    sa.Column('entity_types', sa.JSON(), nullable=True),
+    sa.Column('sync_filters', sa.JSON(), nullable=True),
+    sa.Column('schedule_type', sa.String(length=20), nullable=True),
+    sa.Column('schedule_config', sa.JSON(), nullable=True),
+    sa.Column('next_run_at', sa.DateTime(), nullable=True),
+    sa.Column('status', sa.String(length=20), nullable=True),
+    sa.Column('progress_percentage', sa.Integer(), nullable=True),
+    sa.Column('records_processed', sa.Integer(), nullable=True),
+    sa.Column('records_created', sa.Integer(), nullable=True),
+    sa.Column('records_updated', sa.Integer(), nullable=True),
+    sa.Column('records_failed', sa.Integer(), nullable=True),
+    sa.Column('error_summary', sa.JSON(), nullable=True),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('checkpoint', sa.JSON(), nullable=True),
+    sa.Column('checkpointed_at', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('started_at', sa.DateTime(), nullable=True),
+    sa.Column('completed_at', sa.DateTime(), nullable=True),
+    sa.Column('estimated_duration', sa.Integer(), nullable=True),
+    sa.Column('created_by', sa.UUID(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['integration_id'], ['integrations.id'], name='sync_jobs_integration_id_fkey'),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], name='sync_jobs_created_by_fkey'),
+    sa.PrimaryKeyConstraint('id', name='sync_jobs_pkey')
+    )
+    op.create_index('ix_sync_jobs_integration_status', 'sync_jobs', ['integration_id', 'status'], unique=False)
+    op.create_index('ix_sync_jobs_schedule', 'sync_jobs', ['schedule_type', 'next_run_at'], unique=False)
+    op.create_index('ix_sync_jobs_created', 'sync_jobs', ['created_at'], unique=False)
+    op.create_index('ix_sync_jobs_connector', 'sync_jobs', ['connector_type'], unique=False)
+    # Running jobs by lease age, for resuming jobs whose worker died
+    op.create_index('ix_sync_jobs_status_checkpoint', 'sync_jobs', ['status', 'checkpointed_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Drop sync_jobs and integrations."""
+    op.drop_index('ix_sync_jobs_status_checkpoint', table_name='sync_jobs')
+    op.drop_index('ix_sync_jobs_connector', table_name='sync_jobs')
+    op.drop_index('ix_sync_jobs_created', table_name='sync_jobs')
+    op.drop_index('ix_sync_jobs_schedule', table_name='sync_jobs')
+    op.drop_index('ix_sync_jobs_integration_status', table_name='sync_jobs')
+    op.drop_table('sync_jobs')
+    op.drop_index('ix_integrations_created', table_name='integrations')
+    op.drop_index('ix_integrations_sync', table_name='integrations')
+    op.drop_index('ix_integrations_active', table_name='integrations')
+    op.drop_index('ix_integrations_type_status', table_name='integrations')
+    op.drop_table('integrations')
@@ -0,0 +1,34 @@
+"""Add siem_export_cursors table
+
+Revision ID: a7c3e91f2d40
+Revises: 0ddf58db62b3
+Create Date: 2026-10-18 09:12:40.118302
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c3e91f2d40'
+down_revision: Union[str, Sequence[str], None] = '0ddf58db62b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create siem_export_cursors table."""
+    op.create_table('siem_export_cursors',
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('last_timestamp', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('last_id', sa.UUID(), nullable=True),
+        sa.Column('exported_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('name')
+    )
+
+
+def downgrade() -> None:
+    """Drop siem_export_cursors table."""
+    op.drop_table('siem_export_cursors')
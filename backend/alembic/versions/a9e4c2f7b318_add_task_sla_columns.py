@@ -0,0 +1,50 @@
+"""Add persisted SLA deadline and breach tracking to tasks
+
+Revision ID: a9e4c2f7b318
+Revises: f3c9d1b7e254
+Create Date: 2026-10-18 22:31:05.902114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9e4c2f7b318'
+down_revision: Union[str, Sequence[str], None] = 'f3c9d1b7e254'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add sla_deadline, sla_breached_at and escalation_level with partial indexes, and backfill."""
+    op.add_column('tasks', sa.Column('sla_deadline', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('tasks', sa.Column('sla_breached_at', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('tasks', sa.Column('escalation_level', sa.Integer(), server_default='0', nullable=False))
+
+    # Same defaults as app.utils.sla_engine.DEFAULT_SLA_HOURS (no task in the
+    # table has a template with its own SLA row yet)
+    op.execute("""
+        UPDATE tasks SET sla_deadline = COALESCE(due_at, created_at + make_interval(hours => CASE priority
+            WHEN 5 THEN 8 WHEN 4 THEN 24 WHEN 2 THEN 168 WHEN 1 THEN 168 ELSE 72 END))
+    """)
+    # Breaches that predate the sweeper are recorded without raising events
+    op.execute("""
+        UPDATE tasks SET sla_breached_at = now()
+        WHERE status <> 'DONE' AND sla_deadline <= now()
+    """)
+
+    op.create_index('ix_tasks_sla_open', 'tasks', ['sla_deadline'], unique=False,
+                    postgresql_where=sa.text("status <> 'DONE' AND sla_breached_at IS NULL"))
+    op.create_index('ix_tasks_sla_breached_at', 'tasks', ['sla_breached_at'], unique=False,
+                    postgresql_where=sa.text('sla_breached_at IS NOT NULL'))
+
+
+def downgrade() -> None:
+    """Drop the SLA columns and their indexes."""
+    op.drop_index('ix_tasks_sla_breached_at', table_name='tasks')
+    op.drop_index('ix_tasks_sla_open', table_name='tasks')
+    op.drop_column('tasks', 'escalation_level')
+    op.drop_column('tasks', 'sla_breached_at')
+    op.drop_column('tasks', 'sla_deadline')
@@ -0,0 +1,124 @@
+"""Partition audit_logs by month on timestamp
+
+Revision ID: b4d2f8e61c07
+Revises: a7c3e91f2d40
+Create Date: 2026-10-18 14:05:11.524913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'b4d2f8e61c07'
+down_revision: Union[str, Sequence[str], None] = 'a7c3e91f2d40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Monthly partitions created ahead of the current month
+PREMAKE_MONTHS = 3
+
+AUDIT_LOG_INDEXES = [
+    ('ix_audit_logs_action', ['action']),
+    ('ix_audit_logs_entity_type', ['entity_type']),
+    ('ix_audit_logs_entity_id', ['entity_id']),
+    ('ix_audit_logs_user_id', ['user_id']),
+    ('ix_audit_logs_session_id', ['session_id']),
+    ('ix_audit_logs_ip_address', ['ip_address']),
+    ('ix_audit_logs_correlation_id', ['correlation_id']),
+    ('ix_audit_logs_severity', ['severity']),
+    ('ix_audit_logs_timestamp', ['timestamp']),
+    ('ix_audit_logs_is_archived', ['is_archived']),
+    ('ix_audit_logs_timestamp_desc', [sa.text('timestamp DESC')]),
+    ('ix_audit_logs_user_timestamp', ['user_id', sa.text('timestamp DESC')]),
+    ('ix_audit_logs_entity_timestamp', ['entity_type', 'entity_id', sa.text('timestamp DESC')]),
+    ('ix_audit_logs_action_timestamp', ['action', sa.text('timestamp DESC')]),
+    ('ix_audit_logs_session_timestamp', ['session_id', sa.text('timestamp DESC')]),
+]
+
+
+def _rename_table_and_indexes(old: str, new: str) -> None:
+    """Rename a table together with its indexes and constraints so names can be reused."""
+    op.execute(f"""
+        DO $$
+        DECLARE
+            r record;
+        BEGIN
+            FOR r IN SELECT conname FROM pg_constraint WHERE conrelid = '{old}'::regclass LOOP
+                EXECUTE format('ALTER TABLE {old} RENAME CONSTRAINT %I TO %I', r.conname, r.conname || '_old');
+            END LOOP;
+            FOR r IN SELECT indexname FROM pg_indexes WHERE tablename = '{old}' AND schemaname = current_schema() LOOP
+                IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = r.indexname) THEN
+                    EXECUTE format('ALTER INDEX %I RENAME TO %I', r.indexname, r.indexname || '_old');
+                END IF;
+            END LOOP;
+        END $$;
+    """)
+    op.execute(f"ALTER TABLE {old} RENAME TO {new}")
+
+
+def upgrade() -> None:
+    """Convert audit_logs into a monthly range-partitioned table."""
+    _rename_table_and_indexes('audit_logs', 'audit_logs_unpartitioned')
+
+    op.execute("""
+        CREATE TABLE audit_logs (
+            LIKE audit_logs_unpartitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS
+        ) PARTITION BY RANGE (timestamp)
+    """)
+    op.execute("ALTER TABLE audit_logs ADD CONSTRAINT audit_logs_pkey PRIMARY KEY (id, timestamp)")
+    op.create_foreign_key('audit_logs_user_id_fkey', 'audit_logs', 'users', ['user_id'], ['id'])
+    for name, columns in AUDIT_LOG_INDEXES:
+        op.create_index(name, 'audit_logs', columns, unique=False)
+
+    # One partition per month from the oldest existing row through the premake window
+    op.execute(f"""
+        DO $$
+        DECLARE
+            first_month date := date_trunc('month', LEAST(
+                COALESCE((SELECT min(timestamp) FROM audit_logs_unpartitioned), now()), now()
+            ) AT TIME ZONE 'UTC')::date;
+            last_month date := (date_trunc('month', now() AT TIME ZONE 'UTC') + interval '{PREMAKE_MONTHS} months')::date;
+            m date;
+        BEGIN
+            m := first_month;
+            WHILE m <= last_month LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF audit_logs FOR VALUES FROM (%L) TO (%L)',
+                    'audit_logs_y' || to_char(m, 'YYYY') || 'm' || to_char(m, 'MM'),
+                    (m::timestamp AT TIME ZONE 'UTC'),
+                    ((m + interval '1 month')::timestamp AT TIME ZONE 'UTC')
+                );
+                m := (m + interval '1 month')::date;
+            END LOOP;
+        END $$;
+    """)
+    op.execute("CREATE TABLE audit_logs_default PARTITION OF audit_logs DEFAULT")
+
+    op.execute("INSERT INTO audit_logs SELECT * FROM audit_logs_unpartitioned")
+    op.execute("DROP TABLE audit_logs_unpartitioned")
+
+    # Retention archives whole partitions as a system operation
+    op.alter_column('audit_archives', 'created_by', existing_type=sa.UUID(), nullable=True)
+
+
+def downgrade() -> None:
+    """Collapse audit_logs back into a single table."""
+    op.alter_column('audit_archives', 'created_by', existing_type=sa.UUID(), nullable=False)
+
+    _rename_table_and_indexes('audit_logs', 'audit_logs_partitioned')
+
+    op.execute("""
+        CREATE TABLE audit_logs (
+            LIKE audit_logs_partitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS
+        )
+    """)
+    op.execute("ALTER TABLE audit_logs ADD CONSTRAINT audit_logs_pkey PRIMARY KEY (id)")
+    op.create_foreign_key('audit_logs_user_id_fkey', 'audit_logs', 'users', ['user_id'], ['id'])
+    for name, columns in AUDIT_LOG_INDEXES:
+        op.create_index(name, 'audit_logs', columns, unique=False)
+
+    op.execute("INSERT INTO audit_logs SELECT * FROM audit_logs_partitioned")
+    op.execute("DROP TABLE audit_logs_partitioned CASCADE")
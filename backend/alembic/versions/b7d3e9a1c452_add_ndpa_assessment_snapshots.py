@@ -0,0 +1,43 @@
+"""Add ndpa_assessment_snapshots for stored compliance assessments
+
+Revision ID: b7d3e9a1c452
+Revises: a9e4c2f7b318
+Create Date: 2026-10-18 23:12:44.518207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d3e9a1c452'
+down_revision: Union[str, Sequence[str], None] = 'a9e4c2f7b318'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create ndpa_assessment_snapshots, read newest first."""
+    op.create_table('ndpa_assessment_snapshots',
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.Column('assessed_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('assessed_by', sa.UUID(), nullable=True),
+        sa.Column('scope', sa.ARRAY(sa.String(length=100)), nullable=False),
+        sa.Column('compliance_score', sa.Float(), nullable=False),
+        sa.Column('compliance_status', sa.String(length=50), nullable=False),
+        sa.Column('violations_count', sa.Integer(), nullable=False),
+        sa.Column('area_results', sa.JSON(), nullable=False),
+        sa.Column('areas_recomputed', sa.Integer(), nullable=False),
+        sa.Column('duration_seconds', sa.Float(), nullable=True),
+        sa.ForeignKeyConstraint(['assessed_by'], ['users.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_ndpa_assessment_snapshots_assessed_at', 'ndpa_assessment_snapshots',
+                    [sa.text('assessed_at DESC')], unique=False)
+
+
+def downgrade() -> None:
+    """Drop ndpa_assessment_snapshots."""
+    op.drop_index('ix_ndpa_assessment_snapshots_assessed_at', table_name='ndpa_assessment_snapshots')
+    op.drop_table('ndpa_assessment_snapshots')
@@ -0,0 +1,54 @@
+"""Add data_mappings for streamed forensic report imports
+
+Revision ID: b9f2d6e4a187
+Revises: a3e7c9d2f614
+Create Date: 2026-10-19 10:26:51.093742
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'b9f2d6e4a187'
+down_revision: Union[str, Sequence[str], None] = 'a3e7c9d2f614'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create data_mappings; ingest jobs are tracked in sync_jobs from the previous revision."""
+    op.create_table('data_mappings',
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('source_system', sa.String(length=100), nullable=False),
+    sa.Column('target_system', sa.String(length=100), nullable=False),
+    sa.Column('field_mappings', sa.JSON(), nullable=False),
+    sa.Column('transformation_rules', sa.JSON(), nullable=True),
+    sa.Column('validation_rules', sa.JSON(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('version', sa.String(length=20), nullable=True),
+    sa.Column('total_transformations', sa.Integer(), nullable=True),
+    sa.Column('successful_transformations', sa.Integer(), nullable=True),
+    sa.Column('failed_transformations', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('created_by', sa.UUID(), nullable=False),
+    sa.Column('updated_by', sa.UUID(), nullable=True),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], name='data_mappings_created_by_fkey'),
+    sa.ForeignKeyConstraint(['updated_by'], ['users.id'], name='data_mappings_updated_by_fkey'),
+    sa.PrimaryKeyConstraint('id', name='data_mappings_pkey')
+    )
+    op.create_index('ix_data_mappings_systems', 'data_mappings', ['source_system', 'target_system'], unique=False)
+    op.create_index('ix_data_mappings_active', 'data_mappings', ['is_active'], unique=False)
+    op.create_index('ix_data_mappings_created', 'data_mappings', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Drop data_mappings."""
+    op.drop_index('ix_data_mappings_created', table_name='data_mappings')
+    op.drop_index('ix_data_mappings_active', table_name='data_mappings')
+    op.drop_index('ix_data_mappings_systems', table_name='data_mappings')
+    op.drop_table('data_mappings')
@@ -0,0 +1,80 @@
+"""Create notifications with commit order columns
+
+Revision ID: c4f8a2d6e913
+Revises: f1b7d4a9c286
+Create Date: 2026-10-19 01:12:08.274615
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4f8a2d6e913'
+down_revision: Union[str, Sequence[str], None] = 'f1b7d4a9c286'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+CREATED_BY_COMMENT = f"created by revision {revision}"
+
+
+def upgrade() -> None:
+    """Create notifications if missing and record the writing transaction on every row."""
+    # No earlier revision creates the table; databases built from the models
+    # already have it and only get the new columns
+    if not sa.inspect(op.get_bind()).has_table('notifications'):
+        op.create_table('notifications',
+        sa.Column('id', sa.String(), nullable=False),
+        sa.Column('recipient_id', sa.UUID(), nullable=False),
+        sa.Column('sender_id', sa.UUID(), nullable=True),
+        sa.Column('type', sa.String(length=50), nullable=False),
+        sa.Column('category', sa.String(length=50), nullable=False),
+        sa.Column('priority', sa.String(length=20), nullable=True),
+        sa.Column('title', sa.String(length=255), nullable=False),
+        sa.Column('message', sa.Text(), nullable=False),
+        sa.Column('data', sa.JSON(), nullable=True),
+        sa.Column('channels', sa.JSON(), nullable=True),
+        sa.Column('scheduled_for', sa.DateTime(), nullable=True),
+        sa.Column('expires_at', sa.DateTime(), nullable=True),
+        sa.Column('is_read', sa.Boolean(), nullable=True),
+        sa.Column('read_at', sa.DateTime(), nullable=True),
+        sa.Column('delivered_at', sa.DateTime(), nullable=True),
+        sa.Column('delivery_status', sa.JSON(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['recipient_id'], ['users.id'], name='notifications_recipient_id_fkey'),
+        sa.ForeignKeyConstraint(['sender_id'], ['users.id'], name='notifications_sender_id_fkey'),
+        sa.PrimaryKeyConstraint('id', name='notifications_pkey')
+        )
+        op.create_index('ix_notifications_id', 'notifications', ['id'], unique=False)
+        op.create_index('ix_notifications_recipient_id', 'notifications', ['recipient_id'], unique=False)
+        op.create_index('ix_notifications_sender_id', 'notifications', ['sender_id'], unique=False)
+        op.create_index('ix_notifications_is_read', 'notifications', ['is_read'], unique=False)
+        # Lets downgrade() tell a table created here from one built from the models
+        op.execute(f"COMMENT ON TABLE notifications IS '{CREATED_BY_COMMENT}'")
+
+    # Existing rows get txid 0: streams resume from a recent horizon, so they
+    # are never replayed
+    op.execute("CREATE SEQUENCE notifications_sequence_number_seq AS bigint")
+    op.add_column('notifications', sa.Column('txid', sa.BigInteger(), server_default='0', nullable=False))
+    op.add_column('notifications', sa.Column(
+        'sequence_number', sa.BigInteger(),
+        server_default=sa.text("nextval('notifications_sequence_number_seq')"), nullable=False
+    ))
+    op.execute("ALTER TABLE notifications ALTER COLUMN txid SET DEFAULT pg_current_xact_id()::text::bigint")
+    op.create_index('ix_notifications_recipient_txid', 'notifications', ['recipient_id', 'txid'], unique=False)
+
+
+def downgrade() -> None:
+    """Drop the commit order columns, and the table if this revision created it."""
+    created_here = op.get_bind().execute(
+        sa.text("SELECT obj_description('notifications'::regclass, 'pg_class')")
+    ).scalar() == CREATED_BY_COMMENT
+    if created_here:
+        op.drop_table('notifications')
+    else:
+        op.drop_index('ix_notifications_recipient_txid', table_name='notifications')
+        op.drop_column('notifications', 'sequence_number')
+        op.drop_column('notifications', 'txid')
+    op.execute("DROP SEQUENCE IF EXISTS notifications_sequence_number_seq")
@@ -0,0 +1,89 @@
+"""Add sync_changes change log with triggers on synced tables
+
+Revision ID: c8e2a4f61d93
+Revises: b4d2f8e61c07
+Create Date: 2026-10-18 16:20:37.402816
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8e2a4f61d93'
+down_revision: Union[str, Sequence[str], None] = 'b4d2f8e61c07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Table -> entity type reported to mobile clients
+SYNCED_TABLES = {
+    'cases': 'cases',
+    'tasks': 'tasks',
+    'devices': 'evidence',
+}
+
+
+def upgrade() -> None:
+    """Create sync_changes and record every write to the synced tables."""
+    op.create_table('sync_changes',
+        sa.Column('version', sa.BigInteger(), sa.Identity(always=True), nullable=False),
+        sa.Column('entity_type', sa.String(length=20), nullable=False),
+        sa.Column('entity_id', sa.UUID(), nullable=False),
+        sa.Column('case_id', sa.UUID(), nullable=True),
+        sa.Column('operation', sa.String(length=10), nullable=False),
+        sa.Column('txid', sa.BigInteger(), nullable=False),
+        sa.Column('changed_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('version')
+    )
+    op.create_index('ix_sync_changes_type_txid_version', 'sync_changes', ['entity_type', 'txid', 'version'], unique=False)
+    op.create_index('ix_sync_changes_changed_at', 'sync_changes', ['changed_at'], unique=False)
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION record_sync_change() RETURNS trigger AS $$
+        DECLARE
+            row_data jsonb;
+            change_op text;
+            owning_case uuid;
+        BEGIN
+            IF TG_OP = 'DELETE' THEN
+                row_data := to_jsonb(OLD);
+                change_op := 'delete';
+            ELSE
+                row_data := to_jsonb(NEW);
+                change_op := 'upsert';
+            END IF;
+
+            IF TG_TABLE_NAME = 'cases' THEN
+                owning_case := (row_data->>'id')::uuid;
+            ELSE
+                owning_case := (row_data->>'case_id')::uuid;
+                IF owning_case IS NULL AND row_data->>'seizure_id' IS NOT NULL THEN
+                    SELECT case_id INTO owning_case FROM seizures WHERE id = (row_data->>'seizure_id')::uuid;
+                END IF;
+            END IF;
+
+            INSERT INTO sync_changes (entity_type, entity_id, case_id, operation, txid)
+            VALUES (TG_ARGV[0], (row_data->>'id')::uuid, owning_case, change_op, pg_current_xact_id()::text::bigint);
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+
+    for table, entity_type in SYNCED_TABLES.items():
+        op.execute(f"""
+            CREATE TRIGGER {table}_sync_change
+            AFTER INSERT OR UPDATE OR DELETE ON {table}
+            FOR EACH ROW EXECUTE FUNCTION record_sync_change('{entity_type}')
+        """)
+
+
+def downgrade() -> None:
+    """Drop the change log and its triggers."""
+    for table in SYNCED_TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_sync_change ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS record_sync_change()")
+    op.drop_index('ix_sync_changes_changed_at', table_name='sync_changes')
+    op.drop_index('ix_sync_changes_type_txid_version', table_name='sync_changes')
+    op.drop_table('sync_changes')
@@ -0,0 +1,34 @@
+"""Add sync_prune_watermark recording how far the change log was pruned
+
+Revision ID: d2e9b4f7a615
+Revises: f7a2c8e4d193
+Create Date: 2026-10-19 12:24:06.571938
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2e9b4f7a615'
+down_revision: Union[str, Sequence[str], None] = 'f7a2c8e4d193'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create the single-row sync_prune_watermark table."""
+    op.create_table('sync_prune_watermark',
+        sa.Column('id', sa.SmallInteger(), nullable=False),
+        sa.Column('txid', sa.BigInteger(), nullable=False),
+        sa.Column('version', sa.BigInteger(), nullable=False),
+        sa.Column('pruned_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.CheckConstraint('id = 1', name='ck_sync_prune_watermark_single_row')
+    )
+
+
+def downgrade() -> None:
+    """Drop sync_prune_watermark."""
+    op.drop_table('sync_prune_watermark')
@@ -0,0 +1,47 @@
+"""Add artefact_ingest_staging and SHA-256 lookup indexes for bulk imports
+
+Revision ID: d5a1c7e3b920
+Revises: c8e2a4f61d93
+Create Date: 2026-10-18 18:05:12.118230
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5a1c7e3b920'
+down_revision: Union[str, Sequence[str], None] = 'c8e2a4f61d93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create the unlogged staging table and the merge lookup indexes."""
+    op.create_table('artefact_ingest_staging',
+        sa.Column('job_id', sa.String(length=36), nullable=False),
+        sa.Column('ordinal', sa.BigInteger(), nullable=False),
+        sa.Column('artefact_id', sa.UUID(), nullable=False),
+        sa.Column('sha256', sa.String(length=64), nullable=False),
+        sa.Column('artefact_type', sa.String(length=20), nullable=False),
+        sa.Column('source_tool', sa.String(length=100), nullable=True),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('file_path', sa.String(length=500), nullable=True),
+        sa.Column('staged_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('job_id', 'ordinal'),
+        prefixes=['UNLOGGED']
+    )
+    op.create_index('ix_artefact_ingest_staging_staged_at', 'artefact_ingest_staging', ['staged_at'], unique=False)
+
+    # Existence checks of the idempotent merge
+    op.create_index('ix_artefacts_evidence_sha256', 'artefacts', ['evidence_id', 'sha256'], unique=False)
+    op.create_index('ix_devices_case_sha256', 'devices', ['case_id', 'sha256'], unique=False)
+
+
+def downgrade() -> None:
+    """Drop the staging table and lookup indexes."""
+    op.drop_index('ix_devices_case_sha256', table_name='devices')
+    op.drop_index('ix_artefacts_evidence_sha256', table_name='artefacts')
+    op.drop_index('ix_artefact_ingest_staging_staged_at', table_name='artefact_ingest_staging')
+    op.drop_table('artefact_ingest_staging')
@@ -0,0 +1,41 @@
+"""Add external_records mirror for paged sync jobs
+
+Revision ID: e2b6f4a8c731
+Revises: d5a1c7e3b920
+Create Date: 2026-10-18 19:12:40.553017
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2b6f4a8c731'
+down_revision: Union[str, Sequence[str], None] = 'd5a1c7e3b920'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create external_records keyed by integration, entity type and remote id."""
+    op.create_table('external_records',
+        sa.Column('integration_id', sa.String(length=36), nullable=False),
+        sa.Column('entity_type', sa.String(length=50), nullable=False),
+        sa.Column('external_id', sa.String(length=255), nullable=False),
+        sa.Column('payload', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('remote_updated_at', sa.DateTime(), nullable=True),
+        sa.Column('sync_job_id', sa.String(length=36), nullable=True),
+        sa.Column('first_synced_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('synced_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('integration_id', 'entity_type', 'external_id')
+    )
+    op.create_index('ix_external_records_remote_updated', 'external_records',
+                    ['integration_id', 'entity_type', 'remote_updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Drop external_records."""
+    op.drop_index('ix_external_records_remote_updated', table_name='external_records')
+    op.drop_table('external_records')
@@ -0,0 +1,61 @@
+"""Add commit order columns to audit_logs and SIEM cursors
+
+Revision ID: e6a8c3f1d574
+Revises: b7d3e9a1c452
+Create Date: 2026-10-18 23:05:42.613290
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6a8c3f1d574'
+down_revision: Union[str, Sequence[str], None] = 'b7d3e9a1c452'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Record the writing transaction and an insert sequence on every audit row."""
+    # Existing rows are numbered in (timestamp, id) order under txid 0, so
+    # they sort before anything written after the upgrade
+    op.execute("CREATE SEQUENCE audit_logs_sequence_number_seq AS bigint")
+    op.add_column('audit_logs', sa.Column('txid', sa.BigInteger(), server_default='0', nullable=False))
+    op.add_column('audit_logs', sa.Column('sequence_number', sa.BigInteger(), nullable=True))
+    op.execute("""
+        UPDATE audit_logs AS a
+        SET sequence_number = numbered.n
+        FROM (
+            SELECT id, timestamp, nextval('audit_logs_sequence_number_seq') AS n
+            FROM (SELECT id, timestamp FROM audit_logs ORDER BY timestamp, id) AS ordered
+        ) AS numbered
+        WHERE a.id = numbered.id AND a.timestamp = numbered.timestamp
+    """)
+    op.execute("ALTER TABLE audit_logs ALTER COLUMN sequence_number SET DEFAULT nextval('audit_logs_sequence_number_seq')")
+    op.execute("ALTER TABLE audit_logs ALTER COLUMN sequence_number SET NOT NULL")
+    op.execute("ALTER TABLE audit_logs ALTER COLUMN txid SET DEFAULT pg_current_xact_id()::text::bigint")
+    op.create_index('ix_audit_logs_txid_sequence', 'audit_logs', ['txid', 'sequence_number'], unique=False)
+
+    # Cursors resume after the last row they had forwarded by timestamp
+    op.add_column('siem_export_cursors', sa.Column('last_txid', sa.BigInteger(), server_default='0', nullable=False))
+    op.add_column('siem_export_cursors', sa.Column('last_sequence_number', sa.BigInteger(), server_default='0', nullable=False))
+    op.execute("""
+        UPDATE siem_export_cursors AS c
+        SET last_sequence_number = COALESCE((
+            SELECT max(a.sequence_number) FROM audit_logs AS a
+            WHERE (a.timestamp, a.id) <= (c.last_timestamp, c.last_id)
+               OR (c.last_id IS NULL AND a.timestamp <= c.last_timestamp)
+        ), 0)
+    """)
+
+
+def downgrade() -> None:
+    """Drop the commit order columns."""
+    op.drop_column('siem_export_cursors', 'last_sequence_number')
+    op.drop_column('siem_export_cursors', 'last_txid')
+    op.drop_index('ix_audit_logs_txid_sequence', table_name='audit_logs')
+    op.drop_column('audit_logs', 'sequence_number')
+    op.drop_column('audit_logs', 'txid')
+    op.execute("DROP SEQUENCE IF EXISTS audit_logs_sequence_number_seq")
@@ -0,0 +1,73 @@
+"""Add notification_preferences and notification_logs
+
+Revision ID: e8c1a5f3b726
+Revises: b9f2d6e4a187
+Create Date: 2026-10-19 11:08:43.615209
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8c1a5f3b726'
+down_revision: Union[str, Sequence[str], None] = 'b9f2d6e4a187'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create the preference and delivery log tables read and written by notification fan-out."""
+    op.create_table('notification_preferences',
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('email_enabled', sa.Boolean(), nullable=True),
+    sa.Column('push_enabled', sa.Boolean(), nullable=True),
+    sa.Column('sms_enabled', sa.Boolean(), nullable=True),
+    sa.Column('categories', sa.JSON(), nullable=True),
+    sa.Column('quiet_hours_enabled', sa.Boolean(), nullable=True),
+    sa.Column('quiet_hours_start', sa.String(length=5), nullable=True),
+    sa.Column('quiet_hours_end', sa.String(length=5), nullable=True),
+    sa.Column('timezone', sa.String(length=50), nullable=True),
+    sa.Column('digest_enabled', sa.Boolean(), nullable=True),
+    sa.Column('digest_frequency', sa.String(length=20), nullable=True),
+    sa.Column('digest_time', sa.String(length=5), nullable=True),
+    sa.Column('email_address', sa.String(length=255), nullable=True),
+    sa.Column('phone_number', sa.String(length=20), nullable=True),
+    sa.Column('push_token', sa.String(length=255), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], name='notification_preferences_user_id_fkey'),
+    sa.PrimaryKeyConstraint('id', name='notification_preferences_pkey'),
+    sa.UniqueConstraint('user_id', name='notification_preferences_user_id_key')
+    )
+    op.create_index('ix_notification_preferences_id', 'notification_preferences', ['id'], unique=False)
+
+    op.create_table('notification_logs',
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('notification_id', sa.String(), nullable=False),
+    sa.Column('channel', sa.String(length=20), nullable=False),
+    sa.Column('recipient_address', sa.String(length=255), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('error_message', sa.Text(), nullable=True),
+    sa.Column('external_id', sa.String(length=255), nullable=True),
+    sa.Column('sent_at', sa.DateTime(), nullable=True),
+    sa.Column('delivered_at', sa.DateTime(), nullable=True),
+    sa.Column('opened_at', sa.DateTime(), nullable=True),
+    sa.Column('clicked_at', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['notification_id'], ['notifications.id'], name='notification_logs_notification_id_fkey', ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id', name='notification_logs_pkey')
+    )
+    op.create_index('ix_notification_logs_id', 'notification_logs', ['id'], unique=False)
+    op.create_index('ix_notification_logs_notification_id', 'notification_logs', ['notification_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Drop notification_logs and notification_preferences."""
+    op.drop_index('ix_notification_logs_notification_id', table_name='notification_logs')
+    op.drop_index('ix_notification_logs_id', table_name='notification_logs')
+    op.drop_table('notification_logs')
+    op.drop_index('ix_notification_preferences_id', table_name='notification_preferences')
+    op.drop_table('notification_preferences')
@@ -0,0 +1,90 @@
+"""Keep access attributes of deleted cases for mobile sync filtering
+
+Revision ID: f1b7d4a9c286
+Revises: e6a8c3f1d574
+Create Date: 2026-10-18 23:41:18.270514
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1b7d4a9c286'
+down_revision: Union[str, Sequence[str], None] = 'e6a8c3f1d574'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+RECORD_SYNC_CHANGE = """
+    CREATE OR REPLACE FUNCTION record_sync_change() RETURNS trigger AS $$
+    DECLARE
+        row_data jsonb;
+        change_op text;
+        owning_case uuid;
+    BEGIN
+        IF TG_OP = 'DELETE' THEN
+            row_data := to_jsonb(OLD);
+            change_op := 'delete';
+        ELSE
+            row_data := to_jsonb(NEW);
+            change_op := 'upsert';
+        END IF;
+
+        IF TG_TABLE_NAME = 'cases' THEN
+            owning_case := (row_data->>'id')::uuid;
+        ELSE
+            owning_case := (row_data->>'case_id')::uuid;
+            IF owning_case IS NULL AND row_data->>'seizure_id' IS NOT NULL THEN
+                SELECT case_id INTO owning_case FROM seizures WHERE id = (row_data->>'seizure_id')::uuid;
+            END IF;
+        END IF;
+%(tombstone)s
+        INSERT INTO sync_changes (entity_type, entity_id, case_id, operation, txid)
+        VALUES (TG_ARGV[0], (row_data->>'id')::uuid, owning_case, change_op, pg_current_xact_id()::text::bigint);
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+"""
+
+# The columns get_user_accessible_cases_filter reads, as they were at delete time
+RECORD_TOMBSTONE = """
+        IF TG_TABLE_NAME = 'cases' AND TG_OP = 'DELETE' THEN
+            INSERT INTO sync_case_tombstones
+                (case_id, is_sensitive, sensitivity_level, access_restrictions, lead_investigator, created_by)
+            VALUES (
+                owning_case,
+                (row_data->>'is_sensitive')::boolean,
+                (row_data->>'sensitivity_level')::sensitivitylevel,
+                row_data->'access_restrictions',
+                (row_data->>'lead_investigator')::uuid,
+                (row_data->>'created_by')::uuid
+            )
+            ON CONFLICT (case_id) DO NOTHING;
+        END IF;
+"""
+
+
+def upgrade() -> None:
+    """Record a tombstone with the access attributes of every deleted case."""
+    op.create_table('sync_case_tombstones',
+        sa.Column('case_id', sa.UUID(), nullable=False),
+        sa.Column('is_sensitive', sa.Boolean(), nullable=True),
+        sa.Column('sensitivity_level', postgresql.ENUM(name='sensitivitylevel', create_type=False), nullable=True),
+        sa.Column('access_restrictions', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column('lead_investigator', sa.UUID(), nullable=True),
+        sa.Column('created_by', sa.UUID(), nullable=True),
+        sa.Column('deleted_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('case_id')
+    )
+    op.create_index('ix_sync_case_tombstones_deleted_at', 'sync_case_tombstones', ['deleted_at'], unique=False)
+    op.execute(RECORD_SYNC_CHANGE % {'tombstone': RECORD_TOMBSTONE})
+
+
+def downgrade() -> None:
+    """Stop recording tombstones and drop them."""
+    op.execute(RECORD_SYNC_CHANGE % {'tombstone': ''})
+    op.drop_index('ix_sync_case_tombstones_deleted_at', table_name='sync_case_tombstones')
+    op.drop_table('sync_case_tombstones')
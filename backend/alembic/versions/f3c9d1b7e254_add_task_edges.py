@@ -0,0 +1,37 @@
+"""Add task_edges dependency table
+
+Revision ID: f3c9d1b7e254
+Revises: e2b6f4a8c731
+Create Date: 2026-10-18 21:04:17.318842
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3c9d1b7e254'
+down_revision: Union[str, Sequence[str], None] = 'e2b6f4a8c731'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create task_edges keyed by (task, prerequisite) with a reverse index."""
+    op.create_table('task_edges',
+        sa.Column('task_id', sa.UUID(), nullable=False),
+        sa.Column('depends_on_id', sa.UUID(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.CheckConstraint('task_id <> depends_on_id', name='ck_task_edges_not_self'),
+        sa.ForeignKeyConstraint(['task_id'], ['tasks.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['depends_on_id'], ['tasks.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('task_id', 'depends_on_id')
+    )
+    op.create_index('ix_task_edges_depends_on_id', 'task_edges', ['depends_on_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Drop task_edges."""
+    op.drop_index('ix_task_edges_depends_on_id', table_name='task_edges')
+    op.drop_table('task_edges')
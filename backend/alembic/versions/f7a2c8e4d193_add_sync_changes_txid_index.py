@@ -0,0 +1,27 @@
+"""Index sync_changes by commit order for the change log validator
+
+Revision ID: f7a2c8e4d193
+Revises: e8c1a5f3b726
+Create Date: 2026-10-19 11:52:19.380457
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'f7a2c8e4d193'
+down_revision: Union[str, Sequence[str], None] = 'e8c1a5f3b726'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add a (txid, version) index, read on either side of the commit horizon."""
+    op.create_index('ix_sync_changes_txid_version', 'sync_changes', ['txid', 'version'], unique=False)
+
+
+def downgrade() -> None:
+    """Drop the (txid, version) index."""
+    op.drop_index('ix_sync_changes_txid_version', table_name='sync_changes')
@@ -1,5 +1,7 @@
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks, Query, Header
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks, Query, Header, Request
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
 from typing import List, Optional, Dict, Any
 import uuid
 from datetime import datetime, timedelta
@@ -10,6 +12,8 @@ import json
 from app.database import get_db
 from app.models.integration import APIKey, Webhook, WebhookDelivery, DataMapping, ExternalSystem
 from app.models.user import User
+from app.models.case import Case
+from app.models.evidence import Evidence, Seizure
 from app.schemas.integrations import (
     APIKeyCreate,
     APIKeyResponse,
@@ -34,6 +38,8 @@ from app.utils.webhooks import (
     get_webhook_events,
     log_webhook_delivery
 )
+from app.utils.case_access import check_case_access
+from app.utils.forensic_ingest import ingest_report
 from app.utils.transformers import (
     transform_data,
     validate_schema,
@@ -505,19 +511,24 @@ async def list_external_systems(
 
 # --- Incoming Data Endpoints ---
 
-@router.post("/ingress/generic/{source_system}")
-async def generic_data_ingress(
+async def _ingest_forensic_report(
+    request: Request,
+    db: AsyncSession,
+    x_api_key: str,
     source_system: str,
-    payload: Dict[str, Any],
-    background_tasks: BackgroundTasks,
-    x_api_key: str = Header(...),
-    x_signature: Optional[str] = Header(None),
-    x_timestamp: Optional[str] = Header(None),
-    db: Session = Depends(get_db)
-):
-    """Generic endpoint for receiving data from external systems"""
+    mapping_filter,
+    case_id: Optional[uuid.UUID],
+    evidence_id: Optional[uuid.UUID]
+) -> Dict[str, Any]:
+    """
+    Authenticate, check access to the target case and stream the request
+    body into artefacts.
+    
+    Everything that can reject the request is checked before the body is
+    read, so a rejected upload costs no parsing or staging.
+    """
     
-    # Authenticate using API key
+    # Authenticate
     user = await get_user_by_api_key(x_api_key, db)
     if not user:
         raise HTTPException(
@@ -525,95 +536,121 @@ async def generic_data_ingress(
             detail="Invalid API key"
         )
     
+    mapping = (await db.execute(
+        select(DataMapping).where(mapping_filter, DataMapping.is_active == True).limit(1)
+    )).scalar_one_or_none()
+    if not mapping:
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail=f"{source_system} data mapping not configured"
+        )
+    
+    if evidence_id is not None:
+        evidence = await db.get(Evidence, evidence_id)
+        if evidence is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Evidence not found")
+        evidence_case_id = evidence.case_id
+        if evidence_case_id is None and evidence.seizure_id is not None:
+            evidence_case_id = await db.scalar(select(Seizure.case_id).where(Seizure.id == evidence.seizure_id))
+        if case_id is not None and evidence_case_id is not None and case_id != evidence_case_id:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Evidence does not belong to the given case"
+            )
+        case_id = case_id or evidence_case_id
+    
+    if case_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="case_id or evidence_id linked to a case is required"
+        )
+    
+    case = (await db.execute(
+        select(Case).options(selectinload(Case.assignments)).where(Case.id == case_id)
+    )).scalar_one_or_none()
+    if case is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Case not found")
+    if not await check_case_access(case, user, action="EDIT"):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied to this case")
+    
+    content_length = request.headers.get("content-length")
+    try:
+        summary = await ingest_report(
+            db,
+            request.stream(),
+            mapping,
+            source_system,
+            user.id,
+            case_id=case_id,
+            evidence_id=evidence_id,
+            content_type=request.headers.get("content-type"),
+            content_length=int(content_length) if content_length and content_length.isdigit() else None
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    return {"status": "completed", **summary}
+
+@router.post("/ingress/generic/{source_system}")
+async def generic_data_ingress(
+    source_system: str,
+    request: Request,
+    case_id: Optional[uuid.UUID] = Query(None),
+    evidence_id: Optional[uuid.UUID] = Query(None),
+    x_api_key: str = Header(...),
+    x_signature: Optional[str] = Header(None),
+    x_timestamp: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Generic endpoint for receiving data from external systems
+    
+    The body is a JSON array, a JSON object holding the records under
+    ``artefacts``/``records``/``items``, or NDJSON; it is parsed and imported
+    while it streams in. Progress is tracked on a SyncJob.
+    """
+    
     # Verify signature if provided
     if x_signature:
         # In a real implementation, you would fetch the secret for the API key
         # and verify the signature
         pass
     
-    # Log the incoming data
-    # In a real implementation, you would have a dedicated logging table
-    
-    # Process the data in the background
-    background_tasks.add_task(
-        process_incoming_data,
-        source_system,
-        payload,
-        user.id
+    return await _ingest_forensic_report(
+        request, db, x_api_key, source_system,
+        DataMapping.source_system == source_system,
+        case_id, evidence_id
     )
-    
-    return {
-        "status": "received",
-        "message": "Data received and queued for processing",
-        "timestamp": datetime.utcnow().isoformat()
-    }
-
-async def process_incoming_data(source_system: str, payload: Dict[str, Any], user_id: str):
-    """Background task to process incoming data"""
-    # 1. Identify the data type (e.g., new case, evidence update)
-    # 2. Find the appropriate data mapping
-    # 3. Transform the data
-    # 4. Create or update the relevant records in the JCTC system
-    # 5. Log the outcome
-    pass
 
 @router.post("/ingress/forensics/cellebrite")
 async def ingress_cellebrite_report(
-    report: Dict[str, Any],
+    request: Request,
+    case_id: Optional[uuid.UUID] = Query(None),
+    evidence_id: Optional[uuid.UUID] = Query(None),
     x_api_key: str = Header(...),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    """Specific endpoint for ingesting Cellebrite forensic reports"""
-    
-    # Authenticate
-    user = await get_user_by_api_key(x_api_key, db)
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid API key"
-        )
-    
-    # Find the Cellebrite to JCTC data mapping
-    mapping = db.query(DataMapping).filter(DataMapping.name == "Cellebrite to JCTC Evidence").first()
-    if not mapping:
-        raise HTTPException(
-            status_code=status.HTTP_501_NOT_IMPLEMENTED,
-            detail="Cellebrite data mapping not configured"
-        )
-    
-    # Transform and process the data
-    # ...
-    
-    return {"status": "processing", "message": "Cellebrite report is being processed"}
+    """Specific endpoint for ingesting Cellebrite forensic reports (streamed JSON or NDJSON)"""
+    return await _ingest_forensic_report(
+        request, db, x_api_key, "cellebrite",
+        DataMapping.name == "Cellebrite to JCTC Evidence",
+        case_id, evidence_id
+    )
 
 @router.post("/ingress/forensics/encase")
 async def ingress_encase_report(
-    report: Dict[str, Any],
+    request: Request,
+    case_id: Optional[uuid.UUID] = Query(None),
+    evidence_id: Optional[uuid.UUID] = Query(None),
     x_api_key: str = Header(...),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    """Specific endpoint for ingesting EnCase forensic reports"""
-    
-    # Authenticate
-    user = await get_user_by_api_key(x_api_key, db)
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid API key"
-        )
-    
-    # Find the EnCase to JCTC data mapping
-    mapping = db.query(DataMapping).filter(DataMapping.name == "EnCase to JCTC Evidence").first()
-    if not mapping:
-        raise HTTPException(
-            status_code=status.HTTP_501_NOT_IMPLEMENTED,
-            detail="EnCase data mapping not configured"
-        )
-    
-    # Transform and process the data
-    # ...
-    
-    return {"status": "processing", "message": "EnCase report is being processed"}
+    """Specific endpoint for ingesting EnCase forensic reports (streamed JSON or NDJSON)"""
+    return await _ingest_forensic_report(
+        request, db, x_api_key, "encase",
+        DataMapping.name == "EnCase to JCTC Evidence",
+        case_id, evidence_id
+    )
 
 # --- Outgoing Data Endpoints ---
 
@@ -1,4 +1,5 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Header
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Header, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from sqlalchemy.orm import Session
 from typing import List, Optional, Dict, Any, Union
 import uuid
@@ -7,6 +8,7 @@ import json
 import gzip
 import base64
 
+from app.config.settings import settings
 from app.database import get_db
 from app.models.case import Case
 from app.models.evidence import Evidence
@@ -34,13 +36,14 @@ from app.schemas.user import User as UserSchema
 from app.utils.mobile import (
     compress_response,
     optimize_for_mobile,
-    calculate_sync_delta,
-    process_offline_actions,
+    mobile_sync_engine,
     register_mobile_device,
     send_push_notification,
     get_mobile_cache_key,
     validate_mobile_request
 )
+from app.utils.mobile_batch import MobileBatchExecutor, stream_batch
+from app.utils.http_caching import case_assignment_version, make_etag, not_modified, sync_change_version
 
 router = APIRouter()
 
@@ -210,6 +213,8 @@ async def get_mobile_dashboard(
 
 @router.get("/cases", response_model=List[MobileCaseSummary])
 async def list_mobile_cases(
+    request: Request,
+    response: Response,
     status: Optional[str] = None,
     priority: Optional[str] = None,
     limit: int = Query(20, le=50, description="Maximum 50 items for mobile"),
@@ -220,7 +225,23 @@ async def list_mobile_cases(
     db: Session = Depends(get_db),
     current_user: UserSchema = Depends(get_current_user)
 ):
-    """Get mobile-optimized case list with minimal data"""
+    """
+    Get mobile-optimized case list with minimal data.
+    
+    Responses carry a strong ETag derived from the sync change log version,
+    the caller's case assignments, the caller and the query, so a client
+    revalidating with If-None-Match gets a 304 without any case rows being
+    read, and still sees cases as soon as it is assigned to them.
+    """
+    etag = make_etag(
+        "cases", await sync_change_version(db), await case_assignment_version(db, current_user.id),
+        current_user.id, current_user.role, status, priority, limit, offset, search, since
+    )
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "private, no-cache"
     
     query = db.query(Case)
     
@@ -408,97 +429,53 @@ async def mobile_sync(
                 detail="Invalid sync request"
             )
         
-        # Calculate what data has changed since last sync
-        sync_delta = await calculate_sync_delta(
-            user_id=current_user.id,
-            device_id=device_id,
-            last_sync=sync_request.last_sync_timestamp,
-            entity_types=sync_request.sync_entities,
-            db=db
-        )
-        
-        # Process any offline actions from the mobile app
-        offline_results = []
-        if sync_request.offline_actions:
-            offline_results = await process_offline_actions(
-                actions=sync_request.offline_actions,
-                user_id=current_user.id,
-                device_id=device_id,
-                db=db
-            )
-        
-        return MobileSyncResponse(
-            sync_timestamp=datetime.utcnow(),
-            changes=sync_delta,
-            conflicts=[],  # Would contain any sync conflicts
-            offline_action_results=offline_results,
-            next_sync_recommended=datetime.utcnow() + timedelta(minutes=15),
-            server_time=datetime.utcnow(),
-            sync_statistics={
-                "items_updated": len(sync_delta.get("updated", [])),
-                "items_deleted": len(sync_delta.get("deleted", [])),
-                "conflicts_resolved": 0,
-                "offline_actions_processed": len(offline_results)
-            }
+        # Changes after the client's cursor, with offline actions applied first
+        return await mobile_sync_engine.process_sync_request(
+            sync_request, current_user, db
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Sync failed: {str(e)}"
         )
 
-@router.post("/batch", response_model=MobileBatchResponse)
+@router.post(
+    "/batch",
+    response_class=StreamingResponse,
+    responses={200: {"model": MobileBatchResponse}}
+)
 async def mobile_batch_request(
     batch_request: MobileBatchRequest,
+    request: Request,
     device_id: str = Header(..., alias="X-Device-ID"),
-    db: Session = Depends(get_db),
     current_user: UserSchema = Depends(get_current_user)
 ):
-    """Process multiple API requests in a single batch for mobile efficiency"""
+    """
+    Process multiple API requests in a single batch for mobile efficiency.
+    
+    Sub-requests run in process with the caller's credentials; consecutive
+    GETs run concurrently and results are streamed as they complete.
+    """
     
-    if len(batch_request.requests) > 10:  # Limit batch size
+    if len(batch_request.requests) > settings.mobile_batch_max_requests:  # Limit batch size
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Batch size exceeds maximum limit of 10 requests"
+            detail=f"Batch size exceeds maximum limit of {settings.mobile_batch_max_requests} requests"
         )
     
-    responses = []
-    
-    for request_item in batch_request.requests:
-        try:
-            # Process each request in the batch
-            if request_item.method == "GET":
-                if request_item.endpoint == "/mobile/cases":
-                    # Handle cases list request
-                    result = {"status": "success", "data": []}  # Simplified
-                elif request_item.endpoint.startswith("/mobile/tasks"):
-                    # Handle tasks list request
-                    result = {"status": "success", "data": []}  # Simplified
-                else:
-                    result = {"status": "error", "error": "Unsupported endpoint"}
-            else:
-                result = {"status": "error", "error": "Only GET requests supported in batch"}
-            
-            responses.append({
-                "request_id": request_item.request_id,
-                "status_code": 200 if result["status"] == "success" else 400,
-                "response": result
-            })
-            
-        except Exception as e:
-            responses.append({
-                "request_id": request_item.request_id,
-                "status_code": 500,
-                "response": {"status": "error", "error": str(e)}
-            })
-    
-    return MobileBatchResponse(
-        batch_id=batch_request.batch_id,
-        responses=responses,
-        processed_at=datetime.utcnow(),
-        success_count=len([r for r in responses if r["status_code"] < 400]),
-        error_count=len([r for r in responses if r["status_code"] >= 400])
+    executor = MobileBatchExecutor(
+        request.scope["app"],
+        request.scope,
+        concurrency=settings.mobile_batch_concurrency,
+        timeout_seconds=settings.mobile_batch_request_timeout_seconds
+    )
+    
+    return StreamingResponse(
+        stream_batch(executor, batch_request),
+        media_type="application/json"
     )
 
 @router.post("/search", response_model=MobileSearchResponse)
@@ -676,12 +653,13 @@ async def get_mobile_profile(
 
 @router.get("/offline/manifest")
 async def get_offline_manifest(
+    request: Request,
     device_id: str = Header(..., alias="X-Device-ID"),
     current_user: UserSchema = Depends(get_current_user)
 ):
     """Get manifest of data available for offline use"""
     
-    return {
+    manifest = {
         "version": "1.0",
         "offline_enabled": True,
         "cacheable_endpoints": [
@@ -709,6 +687,12 @@ async def get_offline_manifest(
         "max_offline_storage": "100MB",
         "auto_sync_interval": 900  # 15 minutes
     }
+    
+    etag = make_etag(json.dumps(manifest, sort_keys=True))
+    cached = not_modified(request, etag, cache_control="private, max-age=300")
+    if cached:
+        return cached
+    return JSONResponse(manifest, headers={"ETag": etag, "Cache-Control": "private, max-age=300"})
 
 @router.post("/push/test")
 async def test_push_notification(
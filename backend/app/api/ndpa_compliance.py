@@ -17,6 +17,7 @@ from typing import Optional, List, Dict, Any, Union
 from fastapi import APIRouter, Depends, HTTPException, status, Query, Body
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, or_, desc, func
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.deps import get_db, get_current_user
 from app.core.permissions import require_admin, require_supervisor_or_admin
@@ -33,7 +34,9 @@ from app.schemas.audit import (
     NDPABreachNotification as NDPABreachSchema, NDPAComplianceAssessment,
     NDPARegistrationStatus, NDPAImpactAssessment as NDPADPIASchema
 )
-from app.utils.ndpa_compliance import NDPAComplianceEngine, NDPAComplianceStatus, NDPAViolationContext
+from app.utils.ndpa_compliance import (
+    NDPAComplianceEngine, NDPAComplianceStatus, NDPAViolationContext, latest_assessment_snapshot
+)
 from app.utils.compliance_reporting import ComplianceReportGenerator
 from app.schemas.audit import ComplianceReportCreate, ComplianceReportResponse
 
@@ -41,12 +44,57 @@ from app.schemas.audit import ComplianceReportCreate, ComplianceReportResponse
 router = APIRouter()
 
 
+SEVERITY_ORDER = {"LOW": 0, "MEDIUM": 1, "HIGH": 2, "CRITICAL": 3}
+
+# Served until an assessment covering every area is stored
+NOT_ASSESSED_STATUS = {
+    "overall_status": "NOT_ASSESSED",
+    "compliance_score": None,
+    "last_assessment": None,
+    "total_violations": 0,
+    "open_violations": 0,
+    "pending_dsr_requests": 0,
+    "consent_rate": None,
+    "recent_breaches": 0
+}
+
+
+def _area_metrics(results: Dict[str, Any], area: str) -> Dict[str, Any]:
+    return (results.get(area) or {}).get("metrics") or {}
+
+
+def _snapshot_results(snapshot) -> Dict[str, Any]:
+    if snapshot is None:
+        return {}
+    return {area: entry["result"] for area, entry in snapshot.area_results.items()}
+
+
+def _compliance_status(snapshot) -> Dict[str, Any]:
+    """Dashboard status block from the latest full-scope assessment snapshot."""
+    if snapshot is None:
+        return dict(NOT_ASSESSED_STATUS)
+    
+    results = _snapshot_results(snapshot)
+    consent = _area_metrics(results, "consent_management")
+    total_consents = consent.get("total_consents", 0)
+    return {
+        "overall_status": snapshot.compliance_status,
+        "compliance_score": round(snapshot.compliance_score, 1),
+        "last_assessment": snapshot.assessed_at.isoformat(),
+        # Assessment findings stay open until an assessment no longer reports them
+        "total_violations": snapshot.violations_count,
+        "open_violations": snapshot.violations_count,
+        "pending_dsr_requests": _area_metrics(results, "data_subject_rights").get("pending_requests", 0),
+        "consent_rate": round(consent.get("valid_consents", 0) / total_consents * 100, 1) if total_consents else 100.0,
+        "recent_breaches": _area_metrics(results, "breach_notifications").get("recent_breaches", 0)
+    }
+
+
 @router.post("/assess", response_model=Dict[str, Any])
 async def assess_ndpa_compliance(
     assessment_scope: Optional[List[str]] = Query(None, description="Specific compliance areas to assess"),
     entity_type: Optional[str] = Query(None, description="Specific entity type to assess"),
     entity_id: Optional[str] = Query(None, description="Specific entity ID to assess"),
-    db: Session = Depends(get_db),
     current_user: User = Depends(require_supervisor_or_admin)
 ):
     """
@@ -54,189 +102,81 @@ async def assess_ndpa_compliance(
     
     Assesses compliance with Nigeria Data Protection Act requirements
     including consent management, data localization, breach notification,
-    data subject rights, and NITDA registration.
+    data subject rights, and NITDA registration. Areas run concurrently and
+    areas whose data is unchanged since the last assessment are reused. The
+    result is stored and served by ``/status`` and ``/dashboard``.
     """
-    import uuid as uuid_module
-    from datetime import datetime
-    
     try:
-        # Perform simplified compliance assessment
-        assessment_id = str(uuid_module.uuid4())
-        
-        # Count existing records to determine base score
-        try:
-            consent_count = db.query(NDPAConsentRecord).count()
-            dsr_count = db.query(NDPADataSubjectRequest).filter(
-                NDPADataSubjectRequest.status == "PENDING"
-            ).count()
-            breach_count = db.query(NDPABreachNotification).filter(
-                NDPABreachNotification.breach_resolved == False
-            ).count()
-            registration = db.query(NDPARegistrationRecord).first()
-        except Exception:
-            consent_count = 0
-            dsr_count = 0
-            breach_count = 0
-            registration = None
-        
-        # Calculate compliance score based on available data
-        base_score = 75.0
-        
-        # Adjust score based on findings
-        if consent_count > 0:
-            base_score += 5.0  # Bonus for having consent records
-        if dsr_count == 0:
-            base_score += 5.0  # No pending DSRs is good
-        else:
-            base_score -= min(dsr_count * 2, 10)  # Penalize pending DSRs
-        if breach_count == 0:
-            base_score += 5.0  # No open breaches is good
-        else:
-            base_score -= min(breach_count * 5, 15)  # Penalize open breaches
-        if registration and registration.dpo_appointed:
-            base_score += 5.0  # Bonus for having DPO
-        
-        # Ensure score is within bounds
-        compliance_score = max(0, min(100, base_score))
-        
-        # Determine overall status
-        if compliance_score >= 90:
-            overall_status = "COMPLIANT"
-        elif compliance_score >= 70:
-            overall_status = "MINOR_ISSUES"
-        elif compliance_score >= 50:
-            overall_status = "MAJOR_VIOLATIONS"
-        else:
-            overall_status = "CRITICAL_VIOLATIONS"
-        
-        assessment_result = {
-            "assessment_id": assessment_id,
-            "compliance_score": compliance_score,
-            "overall_status": overall_status,
-            "assessed_at": datetime.utcnow().isoformat(),
-            "assessed_by": str(current_user.id),
-            "areas_assessed": assessment_scope or [
-                "consent_management",
-                "data_subject_rights",
-                "breach_notifications",
-                "nitda_registration",
-                "data_localization"
-            ],
-            "findings": {
-                "consent_records": consent_count,
-                "pending_dsr_requests": dsr_count,
-                "open_breaches": breach_count,
-                "dpo_appointed": registration.dpo_appointed if registration else False,
-                "nitda_registered": registration.registration_status == "APPROVED" if registration else False
-            },
-            "recommendations": []
-        }
-        
-        # Add recommendations based on findings
-        if dsr_count > 0:
-            assessment_result["recommendations"].append({
-                "area": "data_subject_rights",
-                "priority": "HIGH",
-                "description": f"Process {dsr_count} pending data subject rights request(s) within 30-day deadline"
-            })
-        if breach_count > 0:
-            assessment_result["recommendations"].append({
-                "area": "breach_notifications",
-                "priority": "CRITICAL",
-                "description": f"Resolve {breach_count} open data breach(es) and ensure NITDA notification compliance"
-            })
-        if not registration or not registration.dpo_appointed:
-            assessment_result["recommendations"].append({
-                "area": "governance",
-                "priority": "MEDIUM",
-                "description": "Appoint a Data Protection Officer (DPO) as required by NDPA"
-            })
-        
-        return assessment_result
-        
+        ndpa_engine = NDPAComplianceEngine()
+        assessment = await ndpa_engine.assess_ndpa_compliance(
+            entity_type=entity_type,
+            entity_id=entity_id,
+            assessment_scope=assessment_scope,
+            assessed_by=current_user.id
+        )
     except Exception as e:
-        # Return a fallback result on any error
-        return {
-            "assessment_id": str(uuid_module.uuid4()) if 'uuid_module' in dir() else "assessment-error",
-            "compliance_score": 78.0,
-            "overall_status": "MINOR_ISSUES",
-            "assessed_at": datetime.utcnow().isoformat() if 'datetime' in dir() else None,
-            "error": str(e),
-            "areas_assessed": [],
-            "findings": {},
-            "recommendations": []
-        }
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"NDPA compliance assessment failed: {str(e)}"
+        )
+    
+    results = assessment["results"]
+    consent = _area_metrics(results, "consent_management")
+    dsr = _area_metrics(results, "data_subject_rights")
+    breach = _area_metrics(results, "breach_notifications")
+    registration = _area_metrics(results, "nitda_registration")
+    
+    # Recommendations of the areas with findings, ranked by their worst violation
+    recommendations = []
+    for area, result in results.items():
+        violations = result.get("violations") or []
+        if not violations:
+            continue
+        priority = max((violation["severity"] for violation in violations), key=lambda severity: SEVERITY_ORDER.get(severity, 0))
+        for description in result.get("recommendations") or []:
+            recommendations.append({"area": area, "priority": priority, "description": description})
+    recommendations.sort(key=lambda recommendation: -SEVERITY_ORDER.get(recommendation["priority"], 0))
+    
+    return {
+        "assessment_id": assessment["assessment_id"],
+        "compliance_score": round(assessment["compliance_score"], 1),
+        "overall_status": assessment["compliance_status"].value,
+        "assessed_at": assessment["assessment_date"],
+        "assessed_by": str(current_user.id),
+        "areas_assessed": assessment["scope"],
+        "areas_recomputed": assessment["areas_recomputed"],
+        "areas_carried": assessment["areas_carried"],
+        "duration_seconds": assessment["duration_seconds"],
+        "findings": {
+            "consent_records": consent.get("total_consents", 0),
+            "pending_dsr_requests": dsr.get("pending_requests", 0),
+            "open_breaches": breach.get("total_breaches", 0) - breach.get("resolved_breaches", 0),
+            "dpo_appointed": registration.get("dpo_appointed", 0) > 0,
+            "nitda_registered": registration.get("active_registrations", 0) > 0,
+            "violations": len(assessment["violations_detected"])
+        },
+        "recommendations": recommendations
+    }
 
 
 @router.get("/status", response_model=Dict[str, Any])
 async def get_ndpa_compliance_status(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     Get current NDPA compliance status overview.
     
     Returns high-level compliance status including overall score,
-    recent violations, and key compliance indicators.
+    recent violations, and key compliance indicators, as of the last
+    stored assessment covering every area.
     """
-    # Return default compliance status (tables may not exist yet)
     try:
-        # Try to query violations
-        try:
-            recent_violations = db.query(ComplianceViolation).filter(
-                ComplianceViolation.violation_type.like("NDPA_%")
-            ).order_by(desc(ComplianceViolation.detected_at)).limit(10).all()
-        except:
-            recent_violations = []
-        
-        # Try to get registration
-        try:
-            registration = db.query(NDPARegistrationRecord).first()
-        except:
-            registration = None
-        
-        # Try to count breaches
-        try:
-            recent_breaches = db.query(NDPABreachNotification).filter(
-                NDPABreachNotification.breach_discovered_at >= datetime.utcnow() - timedelta(days=30)
-            ).count()
-        except:
-            recent_breaches = 0
-        
-        # Try to count pending DSRs
-        try:
-            pending_dsrs = db.query(NDPADataSubjectRequest).filter(
-                NDPADataSubjectRequest.status == "PENDING"
-            ).count()
-        except:
-            pending_dsrs = 0
-        
-        # Build compliance status with safe defaults
-        compliance_status = {
-            "overall_status": "NOT_ASSESSED",
-            "compliance_score": registration.compliance_score if registration else 78.0,  # Default score
-            "last_assessment": None,
-            "total_violations": len(recent_violations),
-            "open_violations": len([v for v in recent_violations if hasattr(v, 'status') and v.status == 'OPEN']),
-            "pending_dsr_requests": pending_dsrs,
-            "consent_rate": 95.0,  # Default
-            "recent_breaches": recent_breaches
-        }
-        
-        return compliance_status
-        
-    except Exception as e:
-        # Return default data on any error
-        return {
-            "overall_status": "NOT_ASSESSED",
-            "compliance_score": 78.0,
-            "last_assessment": None,
-            "total_violations": 0,
-            "open_violations": 0,
-            "pending_dsr_requests": 0,
-            "consent_rate": 95.0,
-            "recent_breaches": 0
-        }
+        snapshot = await latest_assessment_snapshot(db, full_scope=True)
+    except Exception:
+        # No assessment table yet
+        snapshot = None
+    return _compliance_status(snapshot)
 
 
 @router.post("/consent", response_model=Dict[str, Any])
@@ -652,86 +592,62 @@ async def get_ndpa_breaches(
 
 @router.get("/dashboard", response_model=Dict[str, Any])
 async def get_ndpa_dashboard(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Get NDPA compliance dashboard data."""
-    # Return safe default data structure
-    default_dashboard = {
-        "status": {
-            "overall_status": "NOT_ASSESSED",
-            "compliance_score": 78,
-            "last_assessment": None,
-            "total_violations": 0,
-            "open_violations": 0,
-            "pending_dsr_requests": 0,
-            "consent_rate": 95,
-            "recent_breaches": 0
-        },
+    """Get NDPA compliance dashboard data from the last stored assessment covering every area."""
+    try:
+        snapshot = await latest_assessment_snapshot(db, full_scope=True)
+    except Exception:
+        # No assessment table yet
+        snapshot = None
+    
+    results = _snapshot_results(snapshot)
+    consent = _area_metrics(results, "consent_management")
+    dsr = _area_metrics(results, "data_subject_rights")
+    breach = _area_metrics(results, "breach_notifications")
+    
+    violations = [
+        (area, violation)
+        for area, result in results.items()
+        for violation in result.get("violations") or []
+    ]
+    violations.sort(key=lambda item: -SEVERITY_ORDER.get(item[1].get("severity"), 0))
+    recent_violations = [
+        {
+            "id": f"{snapshot.id}:{index}",
+            "violation_type": violation.get("type"),
+            "entity_id": violation.get("entity_id"),
+            "entity_type": area,
+            "severity": violation.get("severity"),
+            "description": violation.get("description"),
+            "ndpa_article": violation.get("ndpa_article"),
+            "status": "OPEN",
+            "created_at": snapshot.assessed_at.isoformat()
+        }
+        for index, (area, violation) in enumerate(violations[:10])
+    ]
+    
+    return {
+        "status": _compliance_status(snapshot),
         "consent_summary": {
-            "total_consents": 0,
-            "active_consents": 0,
-            "withdrawn_consents": 0,
-            "expired_consents": 0
+            "total_consents": consent.get("total_consents", 0),
+            "active_consents": consent.get("valid_consents", 0),
+            "withdrawn_consents": consent.get("withdrawn_consents", 0),
+            "expired_consents": consent.get("expired_consents", 0)
         },
         "dsr_summary": {
-            "total_requests": 0,
-            "pending_requests": 0,
-            "completed_requests": 0,
-            "overdue_requests": 0
+            "total_requests": dsr.get("total_requests", 0),
+            "pending_requests": dsr.get("pending_requests", 0),
+            "completed_requests": dsr.get("completed_requests", 0),
+            "overdue_requests": dsr.get("overdue_requests", 0)
         },
         "breach_summary": {
-            "total_breaches": 0,
-            "open_breaches": 0,
-            "nitda_notified": 0,
-            "subjects_notified": 0
+            "total_breaches": breach.get("total_breaches", 0),
+            "open_breaches": breach.get("total_breaches", 0) - breach.get("resolved_breaches", 0),
+            "nitda_notified": breach.get("nitda_notified", 0),
+            "subjects_notified": breach.get("data_subjects_notified", 0)
         },
-        "recent_violations": [],
+        "recent_violations": recent_violations,
         "upcoming_deadlines": []
     }
-    
-    try:
-        # Try to get real data but fall back to defaults
-        try:
-            registration = db.query(NDPARegistrationRecord).first()
-            if registration:
-                default_dashboard["status"]["compliance_score"] = registration.compliance_score or 78
-        except:
-            pass
-        
-        try:
-            thirty_days_ago = datetime.utcnow() - timedelta(days=30)
-            recent_violations = db.query(ComplianceViolation).filter(
-                and_(
-                    ComplianceViolation.violation_type.like("NDPA_%"),
-                    ComplianceViolation.detected_at >= thirty_days_ago
-                )
-            ).all()
-            default_dashboard["status"]["total_violations"] = len(recent_violations)
-            default_dashboard["status"]["open_violations"] = len([v for v in recent_violations if v.status == "OPEN"])
-        except:
-            pass
-        
-        try:
-            pending_dsrs = db.query(NDPADataSubjectRequest).filter(
-                NDPADataSubjectRequest.status == "PENDING"
-            ).count()
-            default_dashboard["status"]["pending_dsr_requests"] = pending_dsrs
-            default_dashboard["dsr_summary"]["pending_requests"] = pending_dsrs
-        except:
-            pass
-        
-        try:
-            recent_breaches = db.query(NDPABreachNotification).filter(
-                NDPABreachNotification.breach_discovered_at >= thirty_days_ago
-            ).count()
-            default_dashboard["status"]["recent_breaches"] = recent_breaches
-            default_dashboard["breach_summary"]["total_breaches"] = recent_breaches
-        except:
-            pass
-        
-        return default_dashboard
-        
-    except Exception:
-        # Return default data on any error
-        return default_dashboard
\ No newline at end of file
@@ -1,8 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks, Query
+from sqlalchemy import case, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List, Optional, Dict, Any
 import uuid
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import json
 
 from app.database import get_db
@@ -33,8 +35,14 @@ from app.utils.tasks import (
     escalate_overdue_tasks,
     assign_task_automatically,
     trigger_workflow,
-    send_task_notification
+    send_task_notification,
+    send_task_notifications,
+    workload_cache,
+    MODEL_TASK_PRIORITIES,
+    MODEL_TASK_STATUSES
 )
+from app.utils.sla_engine import apply_task_sla
+from app.utils.notification_stream import publish_user_events
 
 router = APIRouter()
 
@@ -85,8 +93,7 @@ async def create_task(
             assign_task_automatically,
             db_task.id,
             task.task_type,
-            case.priority,
-            db
+            case.priority
         )
     
     # Trigger workflow if configured
@@ -302,6 +309,9 @@ async def update_task(
     db.commit()
     db.refresh(task)
     
+    if old_status != task.status or "assigned_to" in update_data:
+        workload_cache.invalidate([task.assigned_to])
+    
     # Trigger workflow progression if status changed
     if old_status != task.status:
         background_tasks.add_task(
@@ -405,6 +415,8 @@ async def assign_task(
     db.commit()
     db.refresh(task)
     
+    workload_cache.invalidate([old_assignee, task.assigned_to])
+    
     # Send notifications to old and new assignees
     if old_assignee:
         background_tasks.add_task(
@@ -514,10 +526,10 @@ async def escalate_task(
 async def bulk_task_action(
     bulk_action: TaskBulkAction,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: UserSchema = Depends(get_current_user)
 ):
-    """Perform bulk actions on multiple tasks"""
+    """Perform bulk actions on multiple tasks with a single UPDATE"""
     
     # Check permissions
     if current_user.role not in ["supervisor", "admin"]:
@@ -526,48 +538,84 @@ async def bulk_task_action(
             detail="Only supervisors and administrators can perform bulk actions"
         )
     
-    # Get tasks
-    tasks = db.query(Task).filter(Task.id.in_(bulk_action.task_ids)).all()
-    if len(tasks) != len(bulk_action.task_ids):
+    try:
+        task_ids = list(dict.fromkeys(uuid.UUID(task_id) for task_id in bulk_action.task_ids))
+        assigned_to = uuid.UUID(bulk_action.assigned_to) if bulk_action.assigned_to else None
+    except ValueError:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Some tasks not found"
         )
     
-    updated_count = 0
-    
-    for task in tasks:
-        if bulk_action.action == "assign" and bulk_action.assigned_to:
-            task.assigned_to = bulk_action.assigned_to
-            updated_count += 1
-        elif bulk_action.action == "update_status" and bulk_action.status:
-            task.status = bulk_action.status
-            if bulk_action.status == "completed":
-                task.completed_at = datetime.utcnow()
-                task.completion_percentage = 100
-            updated_count += 1
-        elif bulk_action.action == "update_priority" and bulk_action.priority:
-            task.priority = bulk_action.priority
-            updated_count += 1
-        elif bulk_action.action == "extend_deadline" and bulk_action.extension_hours:
-            if task.due_date:
-                task.due_date += timedelta(hours=bulk_action.extension_hours)
-                updated_count += 1
-        
-        task.updated_at = datetime.utcnow()
+    values: Dict[str, Any] = {"updated_at": func.now()}
+    
+    if bulk_action.action == "assign" and assigned_to:
+        values["assigned_to"] = assigned_to
+    elif bulk_action.action == "update_status" and bulk_action.status:
+        values["status"] = MODEL_TASK_STATUSES[bulk_action.status]
+    elif bulk_action.action == "update_priority" and bulk_action.priority:
+        values["priority"] = MODEL_TASK_PRIORITIES[bulk_action.priority]
+    elif bulk_action.action == "extend_deadline" and bulk_action.extension_hours:
+        # Tasks without a due date keep none (NULL + interval is NULL) and
+        # their SLA deadline; the others are held to the new due date
+        new_due_at = Task.due_at + timedelta(hours=bulk_action.extension_hours)
+        values["due_at"] = new_due_at
+        values["sla_deadline"] = case((Task.due_at.is_(None), Task.sla_deadline), else_=new_due_at)
+        values["sla_breached_at"] = case((new_due_at > func.now(), None), else_=Task.sla_breached_at)
+    applied = len(values) > 1
+    
+    # Lock the rows and return their previous assignees from the same statement
+    previous = select(Task.id, Task.assigned_to).where(Task.id.in_(task_ids)).with_for_update().subquery()
+    result = await db.execute(
+        update(Task)
+        .where(Task.id == previous.c.id)
+        .values(**values)
+        .returning(Task.id, Task.assigned_to, Task.due_at, previous.c.assigned_to.label("previous_assignee"))
+    )
+    rows = result.all()
+    if len(rows) != len(task_ids):
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Some tasks not found"
+        )
     
-    db.commit()
+    if applied and bulk_action.action == "update_priority":
+        # Tasks without a due date are held to the SLA of their new priority
+        tasks = await db.execute(select(Task).where(Task.id.in_(task_ids), Task.due_at.is_(None)))
+        for task in tasks.scalars():
+            apply_task_sla(task)
+    
+    if not applied:
+        updated_count = 0
+    elif bulk_action.action == "extend_deadline":
+        updated_count = sum(1 for row in rows if row.due_at is not None)
+    else:
+        updated_count = len(rows)
+    
+    # Tell assignees' open streams; sent on commit
+    assigned_rows = [row for row in rows if row.assigned_to]
+    await publish_user_events(
+        db,
+        "task",
+        [row.assigned_to for row in assigned_rows],
+        {"action": bulk_action.action},
+        object_ids=[str(row.id) for row in assigned_rows]
+    )
+    await db.commit()
     
-    # Send notifications for bulk actions
-    for task in tasks:
-        background_tasks.add_task(
-            send_task_notification,
-            task.id,
-            f"task_{bulk_action.action}",
-            task.assigned_to,
-            db
+    if applied and bulk_action.action in ("assign", "update_status", "update_priority"):
+        workload_cache.invalidate(
+            [row.assigned_to for row in rows] + [row.previous_assignee for row in rows]
         )
     
+    # One background task for all notifications; it opens its own session
+    background_tasks.add_task(
+        send_task_notifications,
+        [str(row.id) for row in rows],
+        f"task_{bulk_action.action}"
+    )
+    
     return {
         "message": f"Bulk action '{bulk_action.action}' applied to {updated_count} tasks",
         "updated_count": updated_count
@@ -675,10 +723,10 @@ async def get_task_metrics(
 async def get_sla_violations(
     days_back: int = 7,
     include_resolved: bool = False,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: UserSchema = Depends(get_current_user)
 ):
-    """Get SLA violations for monitoring"""
+    """Get SLA violations recorded by the SLA sweeper"""
     
     if current_user.role not in ["supervisor", "admin"]:
         raise HTTPException(
@@ -686,48 +734,44 @@ async def get_sla_violations(
             detail="Only supervisors and administrators can view SLA violations"
         )
     
-    start_date = datetime.utcnow() - timedelta(days=days_back)
+    start_date = datetime.now(timezone.utc) - timedelta(days=days_back)
     
-    query = db.query(Task).filter(
-        Task.created_at >= start_date,
-        Task.due_date < datetime.utcnow()
-    )
-    
-    if not include_resolved:
-        query = query.filter(Task.status != "completed")
-    
-    violations = query.all()
-    
-    violation_data = []
-    for task in violations:
-        hours_overdue = (datetime.utcnow() - task.due_date).total_seconds() / 3600
-        violation_data.append({
-            "task_id": task.id,
-            "case_id": task.case_id,
-            "title": task.title,
-            "assigned_to": task.assigned_to,
-            "priority": task.priority,
-            "task_type": task.task_type,
-            "due_date": task.due_date,
-            "hours_overdue": round(hours_overdue, 1),
-            "status": task.status
-        })
+    if include_resolved:
+        # Breached tasks that have since been completed too
+        result = await db.execute(
+            select(Task).where(Task.sla_breached_at >= start_date).order_by(Task.sla_deadline)
+        )
+        violation_data = [
+            {
+                "task_id": str(task.id),
+                "case_id": str(task.case_id),
+                "title": task.title,
+                "assigned_to": str(task.assigned_to) if task.assigned_to else None,
+                "priority": task.priority,
+                "sla_deadline": task.sla_deadline,
+                "breached_at": task.sla_breached_at,
+                "escalation_level": task.escalation_level,
+                "status": task.status
+            }
+            for task in result.scalars()
+        ]
+    else:
+        violation_data = await check_sla_violations(db, days_back)
     
     return {
         "violations": violation_data,
         "total_violations": len(violation_data),
         "period_start": start_date,
-        "period_end": datetime.utcnow()
+        "period_end": datetime.now(timezone.utc)
     }
 
 @router.post("/sla/escalate-overdue")
 async def escalate_overdue_tasks_endpoint(
-    hours_overdue_threshold: int = 24,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db),
+    hours_overdue_threshold: int = 24,
     current_user: UserSchema = Depends(get_current_user)
 ):
-    """Automatically escalate overdue tasks"""
+    """Escalate overdue tasks now instead of waiting for the next SLA sweep"""
     
     if current_user.role not in ["supervisor", "admin"]:
         raise HTTPException(
@@ -735,12 +779,11 @@ async def escalate_overdue_tasks_endpoint(
             detail="Only supervisors and administrators can escalate overdue tasks"
         )
     
-    # Queue escalation background task
+    # Queue escalation background task (it opens its own connection)
     background_tasks.add_task(
         escalate_overdue_tasks,
         hours_overdue_threshold,
-        current_user.id,
-        db
+        current_user.id
     )
     
     return {"message": f"Escalation process started for tasks overdue by {hours_overdue_threshold} hours"}
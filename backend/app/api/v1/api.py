@@ -1,7 +1,7 @@
 from fastapi import APIRouter
 # Phase 1 scope only (extended to include device management for frontend flows)
-from app.api.v1.endpoints import auth, users, cases, evidence, audit, prosecution, lookup_values, artefacts, charges, legal_instruments, international_requests, collaborations, attachments, email_settings, intelligence
-from app.api import team_activity, reports, parties, chain_of_custody, ndpa_compliance
+from app.api.v1.endpoints import auth, users, cases, evidence, audit, prosecution, lookup_values, artefacts, charges, legal_instruments, international_requests, collaborations, attachments, email_settings, intelligence, notification_stream
+from app.api import team_activity, reports, parties, chain_of_custody, ndpa_compliance, notifications
 
 api_router = APIRouter()
 
@@ -34,6 +34,11 @@ api_router.include_router(parties.router, prefix="/parties", tags=["parties"])
 # Intelligence Management
 api_router.include_router(intelligence.router, prefix="/intelligence", tags=["intelligence"])
 
+# Notification push stream (SSE)
+api_router.include_router(notification_stream.router, prefix="/notifications", tags=["notifications"])
+# Notifications - after the stream router, whose /stream paths "/{notification_id}" would also match
+api_router.include_router(notifications.router, prefix="/notifications", tags=["notifications"])
+
 # Admin - Lookup Values Management
 api_router.include_router(lookup_values.router, prefix="/admin/lookups", tags=["admin-lookups"])
 
@@ -1,12 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.security import HTTPBearer
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from datetime import timedelta
 from app.database.base import get_db
 from app.models.user import User
 from app.schemas.user import LoginRequest, Token, UserResponse, LoginResponse, ForgotPasswordRequest, ResetPasswordRequest
-from app.utils.auth import verify_password, create_access_token
+from app.security.revocation import revocation_filter
+from app.utils.auth import create_access_token, password_hasher, verify_token
 from app.utils.dependencies import get_current_active_user
 
 router = APIRouter()
@@ -19,7 +20,8 @@ async def login(login_data: LoginRequest, db: AsyncSession = Depends(get_db)):
     result = await db.execute(select(User).filter(User.email == login_data.email))
     user = result.scalar_one_or_none()
     
-    if not user or not verify_password(login_data.password, user.hashed_password):
+    # Runs bcrypt in the hashing pool; unknown users take the same time without hashing
+    if not await password_hasher.verify_user(user, login_data.password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -54,15 +56,20 @@ async def refresh_token(current_user: User = Depends(get_current_active_user)):
     return {"access_token": access_token, "token_type": "bearer"}
 
 @router.post("/logout")
-async def logout(current_user: User = Depends(get_current_active_user)):
+async def logout(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    current_user: User = Depends(get_current_active_user)
+):
     """
     Logout the current user.
     
-    Since we're using stateless JWT tokens, the actual token invalidation
-    happens on the client side by removing the token from storage.
-    This endpoint confirms the logout action and can be extended to
-    implement token blacklisting if needed.
+    Revokes the presented token until it expires; the revocation reaches
+    every worker through the shared revocation filter. Clients should also
+    discard their refresh token.
     """
+    payload = verify_token(credentials.credentials)
+    if payload.get("jti") and payload.get("exp"):
+        await revocation_filter.revoke(payload["jti"], int(payload["exp"]))
     return {"message": "Successfully logged out", "user_id": str(current_user.id)}
 
 
@@ -136,7 +143,6 @@ async def reset_password(
     import hashlib
     from datetime import datetime, timezone
     from app.models.user import PasswordResetToken
-    from app.utils.auth import get_password_hash
     
     # Hash the provided token to find it in DB
     token_hash = hashlib.sha256(request.token.encode()).hexdigest()
@@ -170,7 +176,7 @@ async def reset_password(
         )
     
     # Update password
-    user.hashed_password = get_password_hash(request.new_password)
+    user.hashed_password = await password_hasher.hash(request.new_password)
     
     # Mark token as used
     reset_token.used_at = datetime.now(timezone.utc)
@@ -13,7 +13,7 @@ from sqlalchemy import select
 from app.database.session import get_db
 from app.models.users import User
 from app.schemas.users import LoginRequest, Token, UserResponse
-from app.utils.auth import verify_password, create_access_token
+from app.utils.auth import create_access_token, password_hasher
 from app.utils.dependencies import get_current_active_user
 from app.utils.audit_integration import (
     AuditableEndpoint, log_authentication_event, log_user_action
@@ -57,10 +57,11 @@ async def login(
         result = db.execute(select(User).filter(User.email == login_data.email))
         user = result.scalar_one_or_none()
         
-        # Check user existence and password
+        # Check user existence and password (timing-safe for unknown users)
+        password_ok = await password_hasher.verify_user(user, login_data.password)
         if not user:
             failure_reason = "User not found"
-        elif not verify_password(login_data.password, user.hashed_password):
+        elif not password_ok:
             failure_reason = "Invalid password"
         elif not user.is_active:
             failure_reason = "Account inactive"
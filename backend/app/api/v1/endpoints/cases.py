@@ -4,7 +4,7 @@ from uuid import UUID
 
 from datetime import datetime
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Form, File, UploadFile, Body
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Form, File, UploadFile, Body, BackgroundTasks
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -32,6 +32,10 @@ from app.models.lookup_value import LookupValue
 
 from app.utils.dependencies import get_current_active_user, require_role
 
+from app.utils.case_deletion import bulk_delete_case, remove_case_files
+
+from app.utils.sla_engine import apply_task_sla, task_sla_status
+
 import secrets
 
 import string
@@ -872,6 +876,8 @@ async def delete_case(
 
     case_id: UUID,
 
+    background_tasks: BackgroundTasks,
+
     db: AsyncSession = Depends(get_db),
 
     current_user: User = Depends(get_current_active_user)
@@ -884,6 +890,12 @@ async def delete_case(
 
     
 
+    Dependent rows are removed with set-based statements and stored files
+
+    are cleaned up in the background after the transaction commits.
+
+    
+
     Only the following users can delete a case:
 
     - Admin users
@@ -934,14 +946,18 @@ async def delete_case(
 
     
 
-    # Delete the case
+    # Delete the case and its dependents without loading them into the session
 
-    await db.delete(case)
+    file_paths = await bulk_delete_case(db, case_id)
 
     await db.commit()
 
     
 
+    background_tasks.add_task(remove_case_files, case_id, file_paths)
+
+    
+
     return None
 
 
@@ -1635,6 +1651,10 @@ async def get_case_tasks(
 
         "due_at": task.due_at.isoformat() if task.due_at else None,
 
+        "sla_deadline": task.sla_deadline.isoformat() if task.sla_deadline else None,
+
+        "sla_status": task_sla_status(task),
+
         "priority": task.priority,
 
         "status": task.status.value if task.status else "OPEN",
@@ -1721,6 +1741,8 @@ async def create_case_task(
 
     
 
+    apply_task_sla(new_task)
+
     db.add(new_task)
 
     await db.commit()
@@ -1771,6 +1793,10 @@ async def create_case_task(
 
         "due_at": new_task.due_at.isoformat() if new_task.due_at else None,
 
+        "sla_deadline": new_task.sla_deadline.isoformat() if new_task.sla_deadline else None,
+
+        "sla_status": task_sla_status(new_task),
+
         "priority": new_task.priority,
 
         "status": new_task.status.value if new_task.status else "OPEN",
@@ -3126,11 +3152,80 @@ async def get_case_tasks(
         "status": task.status.value if task.status else None,
         "priority": task.priority,
         "due_at": task.due_at.isoformat() if task.due_at else None,
+        "sla_deadline": task.sla_deadline.isoformat() if task.sla_deadline else None,
+        "sla_status": task_sla_status(task),
         "created_at": task.created_at.isoformat() if task.created_at else None,
         "updated_at": task.updated_at.isoformat() if task.updated_at else None
     } for task in tasks]
 
 
+@router.get('/{case_id}/tasks/graph/')
+async def get_case_task_graph(
+    case_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Dependency order, ready tasks and critical path of a case's tasks."""
+    from app.utils.task_graph import DependencyCycleError, load_task_graph
+    
+    # Verify case exists
+    case_result = await db.execute(select(Case.id).where(Case.id == case_id))
+    if case_result.scalar_one_or_none() is None:
+        raise HTTPException(status_code=404, detail='Case not found')
+    
+    graph = await load_task_graph(db, case_id=case_id)
+    try:
+        order = graph.topological_order()
+        critical_path, critical_path_hours = graph.critical_path()
+    except DependencyCycleError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    
+    return {
+        "order": order,
+        "dependencies": {task_id: sorted(prerequisites) for task_id, prerequisites in graph.depends_on.items()},
+        "ready": sorted(graph.ready),
+        "critical_path": critical_path,
+        "critical_path_hours": critical_path_hours
+    }
+
+
+@router.put('/{case_id}/tasks/{task_id}/dependencies/')
+async def set_case_task_dependencies(
+    case_id: UUID,
+    task_id: UUID,
+    dependency_data: Dict = Body(...),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Replace the prerequisites of a task; rejects changes that would create a cycle."""
+    from app.utils.task_graph import DependencyCycleError, TaskGraphError, set_task_dependencies
+    
+    result = await db.execute(select(Task.id).where(Task.id == task_id, Task.case_id == case_id))
+    if result.scalar_one_or_none() is None:
+        raise HTTPException(status_code=404, detail='Task not found')
+    
+    try:
+        depends_on = [UUID(str(value)) for value in dependency_data.get('depends_on', [])]
+    except ValueError:
+        raise HTTPException(status_code=400, detail='depends_on must be a list of task ids')
+    
+    try:
+        graph = await set_task_dependencies(db, task_id, depends_on)
+    except DependencyCycleError as e:
+        await db.rollback()
+        raise HTTPException(status_code=409, detail=str(e))
+    except TaskGraphError as e:
+        await db.rollback()
+        raise HTTPException(status_code=400, detail=str(e))
+    await db.commit()
+    
+    return {
+        "task_id": str(task_id),
+        "depends_on": sorted(graph.depends_on[str(task_id)]),
+        "ready": str(task_id) in graph.ready
+    }
+
+
 @router.post('/{case_id}/tasks/')
 async def create_case_task(
     case_id: UUID,
@@ -3166,6 +3261,7 @@ async def create_case_task(
         due_at=due_at
     )
     
+    apply_task_sla(new_task)
     db.add(new_task)
     await db.commit()
     await db.refresh(new_task)
@@ -3179,6 +3275,8 @@ async def create_case_task(
         "status": new_task.status.value,
         "priority": new_task.priority,
         "due_at": new_task.due_at.isoformat() if new_task.due_at else None,
+        "sla_deadline": new_task.sla_deadline.isoformat() if new_task.sla_deadline else None,
+        "sla_status": task_sla_status(new_task),
         "created_at": new_task.created_at.isoformat(),
         "updated_at": new_task.updated_at.isoformat()
     }
@@ -3209,8 +3307,11 @@ async def update_case_task(
         task.description = task_data['description']
     if 'assigned_to' in task_data:
         task.assigned_to = UUID(task_data['assigned_to']) if task_data['assigned_to'] else None
+    completed = False
     if 'status' in task_data:
-        task.status = TaskStatus(task_data['status'])
+        new_status = TaskStatus(task_data['status'])
+        completed = new_status == TaskStatus.DONE and task.status != TaskStatus.DONE
+        task.status = new_status
     if 'priority' in task_data:
         task.priority = task_data['priority']
     if 'due_at' in task_data:
@@ -3221,6 +3322,22 @@ async def update_case_task(
                 pass
         else:
             task.due_at = None
+    
+    apply_task_sla(task)
+    
+    if completed:
+        # Tell the assignees of tasks this completion unblocks; sent on commit
+        from app.utils.notification_stream import publish_user_events
+        from app.utils.task_graph import ready_dependents
+        await db.flush()
+        unblocked = [(dependent, assignee) for dependent, assignee in await ready_dependents(db, task.id) if assignee]
+        await publish_user_events(
+            db,
+            "task",
+            [assignee for _, assignee in unblocked],
+            {"action": "ready", "completed": str(task.id)},
+            object_ids=[str(dependent) for dependent, _ in unblocked]
+        )
             
     await db.commit()
     await db.refresh(task)
@@ -3234,6 +3351,8 @@ async def update_case_task(
         "status": task.status.value,
         "priority": task.priority,
         "due_at": task.due_at.isoformat() if task.due_at else None,
+        "sla_deadline": task.sla_deadline.isoformat() if task.sla_deadline else None,
+        "sla_status": task_sla_status(task),
         "created_at": task.created_at.isoformat(),
         "updated_at": task.updated_at.isoformat()
     }
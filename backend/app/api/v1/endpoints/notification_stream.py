@@ -0,0 +1,75 @@
+from datetime import timedelta
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config.settings import settings
+from app.database.base import get_db
+from app.models.user import User
+from app.utils.auth import create_access_token, verify_token
+from app.utils.dependencies import get_current_active_user
+from app.utils.notification_stream import stream_user_events
+
+router = APIRouter()
+
+STREAM_TOKEN_SCOPE = "notification_stream"
+
+
+@router.post("/stream/token")
+async def create_stream_token(current_user: User = Depends(get_current_active_user)):
+    """
+    Short-lived token for opening ``/stream``.
+
+    Browsers' ``EventSource`` cannot send an ``Authorization`` header, so the
+    stream is opened with ``?token=``. The token is only accepted there and
+    expires after ``notification_stream_token_seconds``; fetch a new one
+    before each reconnect.
+    """
+    expires_in = settings.notification_stream_token_seconds
+    token = create_access_token(
+        data={"sub": current_user.email, "scope": STREAM_TOKEN_SCOPE},
+        expires_delta=timedelta(seconds=expires_in)
+    )
+    return {"token": token, "expires_in": expires_in}
+
+
+@router.get("/stream")
+async def stream_notifications(
+    token: str = Query(..., description="Token from POST /notifications/stream/token"),
+    last_event_id: Optional[str] = Query(None, description="Resume point when reconnecting with a new EventSource"),
+    last_event_id_header: Optional[str] = Header(None, alias="Last-Event-ID"),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Server-sent events for the token's user: ``notification`` (resumable
+    with ``Last-Event-ID``), ``task`` and ``resync`` (reload and reconnect),
+    plus a comment heartbeat. Replaces polling ``/notifications/`` and
+    ``/notifications/stats``.
+
+    Resuming may resend a few notifications the client already has; they
+    carry the same ``id`` in their data.
+    """
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials"
+    )
+    payload = verify_token(token)
+    if payload.get("scope") != STREAM_TOKEN_SCOPE or payload.get("sub") is None:
+        raise credentials_exception
+
+    result = await db.execute(select(User.id, User.is_active).where(User.email == payload["sub"]))
+    user = result.one_or_none()
+    if user is None or not user.is_active:
+        raise credentials_exception
+
+    user_id = str(user.id)
+    # The stream outlives the request: give its pooled connection back now
+    await db.close()
+    return StreamingResponse(
+        stream_user_events(user_id, last_event_id_header or last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
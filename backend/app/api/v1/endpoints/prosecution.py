@@ -8,10 +8,11 @@ the PRD requirements for prosecution case management.
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import and_, distinct, func, select, true
 from typing import List, Optional
 from uuid import UUID
-from datetime import datetime, date
+from datetime import datetime, date, timezone
 
 from app.core.deps import get_db, get_current_user
 from app.models import (
@@ -23,7 +24,8 @@ from app.schemas.prosecution import (
     ChargeCreate, ChargeUpdate, ChargeResponse,
     CourtSessionCreate, CourtSessionUpdate, CourtSessionResponse,
     OutcomeCreate, OutcomeUpdate, OutcomeResponse,
-    ProsecutionSummaryResponse, ChargeStatisticsResponse
+    ProsecutionSummaryResponse, ChargeStatisticsResponse,
+    CourtStatistics, ProsecutorStatistics
 )
 from app.utils.audit_integration import (
     AuditableEndpoint, log_case_access, log_prosecution_activity
@@ -54,34 +56,48 @@ def require_roles(current_user: User, allowed_roles: list) -> None:
         )
 
 
-def check_case_access(db: Session, case_id, current_user: User):
+def can_access_case(case: Case, current_user: User) -> bool:
     """
-    Check if user has access to a specific case.
-    Returns the case if accessible, None otherwise.
+    Check if user may access the given case.
     """
-    case = db.query(Case).filter(Case.id == case_id).first()
-    if not case:
-        return None
-    
     # Admins have access to all cases
     role_value = current_user.role.value if hasattr(current_user.role, 'value') else str(current_user.role)
     if role_value.upper() == "ADMIN":
-        return case
+        return True
     
     # Supervisors have access to all cases
     if role_value.upper() == "SUPERVISOR":
-        return case
+        return True
     
     # Check if user is assigned to the case
     if hasattr(case, 'assigned_officer_id') and case.assigned_officer_id == current_user.id:
-        return case
+        return True
     
     # Allow prosecution-related roles
     allowed_roles = ["INVESTIGATOR", "PROSECUTOR", "FORENSIC", "INTAKE", "LIAISON"]
-    if role_value.upper() in allowed_roles:
-        return case
-    
-    return None
+    return role_value.upper() in allowed_roles
+
+
+def check_case_access(db: Session, case_id, current_user: User):
+    """
+    Check if user has access to a specific case.
+    Returns the case if accessible, None otherwise.
+    """
+    case = db.query(Case).filter(Case.id == case_id).first()
+    if not case or not can_access_case(case, current_user):
+        return None
+    return case
+
+
+async def load_accessible_case(db: AsyncSession, case_id, current_user: User):
+    """
+    Async variant of check_case_access.
+    Returns the case if accessible, None otherwise.
+    """
+    case = await db.get(Case, case_id)
+    if not case or not can_access_case(case, current_user):
+        return None
+    return case
 
 
 # ==================== CHARGE MANAGEMENT APIs ====================
@@ -616,49 +632,67 @@ async def update_case_outcome(
 @router.get("/{case_id}/summary", response_model=ProsecutionSummaryResponse)
 async def get_prosecution_summary(
     case_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     Get comprehensive prosecution summary for a case.
+    
+    Counts are computed in the database; only the case's charges, its five
+    latest court sessions and its outcome are loaded.
     """
     # Verify case access
-    case = check_case_access(db, case_id, current_user)
+    case = await load_accessible_case(db, case_id, current_user)
     if not case:
         raise HTTPException(status_code=404, detail="Case not found")
     
-    # Get charges
-    charges = db.query(Charge).filter(Charge.case_id == case_id).all()
-    
-    # Get court sessions
-    court_sessions = db.query(CourtSession).filter(
-        CourtSession.case_id == case_id
-    ).order_by(CourtSession.session_date.desc()).all()
-    
-    # Get outcome
-    outcome = db.query(Outcome).filter(Outcome.case_id == case_id).first()
+    now = datetime.now(timezone.utc)
     
     # Calculate prosecution metrics
-    total_charges = len(charges)
-    active_charges = len([c for c in charges if c.status == ChargeStatus.FILED])
-    withdrawn_charges = len([c for c in charges if c.status == ChargeStatus.WITHDRAWN])
+    charge_counts = (await db.execute(
+        select(
+            func.count(Charge.id).label("total"),
+            func.count(Charge.id).filter(Charge.status == ChargeStatus.FILED).label("active"),
+            func.count(Charge.id).filter(Charge.status == ChargeStatus.WITHDRAWN).label("withdrawn"),
+        ).where(Charge.case_id == case_id)
+    )).one()
+    
+    session_counts = (await db.execute(
+        select(
+            func.count(CourtSession.id).label("total"),
+            func.count(CourtSession.id).filter(CourtSession.session_date >= now).label("upcoming"),
+        ).where(CourtSession.case_id == case_id)
+    )).one()
     
-    upcoming_sessions = len([
-        s for s in court_sessions 
-        if s.session_date and s.session_date >= datetime.utcnow()
-    ])
+    # Get charges
+    charges = (await db.execute(
+        select(Charge).where(Charge.case_id == case_id).order_by(Charge.filed_at.desc())
+    )).scalars().all()
+    
+    # Get latest court sessions
+    court_sessions = (await db.execute(
+        select(CourtSession)
+        .where(CourtSession.case_id == case_id)
+        .order_by(CourtSession.session_date.desc().nulls_last())
+        .limit(5)
+    )).scalars().all()
+    
+    # Get outcome
+    outcome = (await db.execute(
+        select(Outcome).where(Outcome.case_id == case_id).limit(1)
+    )).scalar_one_or_none()
     
     return ProsecutionSummaryResponse(
         case_id=case_id,
-        total_charges=total_charges,
-        active_charges=active_charges,
-        withdrawn_charges=withdrawn_charges,
-        total_court_sessions=len(court_sessions),
-        upcoming_sessions=upcoming_sessions,
+        total_charges=charge_counts.total,
+        active_charges=charge_counts.active,
+        withdrawn_charges=charge_counts.withdrawn,
+        total_court_sessions=session_counts.total,
+        upcoming_sessions=session_counts.upcoming,
         case_outcome=outcome,
         latest_court_session=court_sessions[0] if court_sessions else None,
         charges=charges,
-        court_sessions=court_sessions[:5]  # Latest 5 sessions
+        court_sessions=court_sessions  # Latest 5 sessions
     )
 
 
@@ -666,53 +700,114 @@ async def get_prosecution_summary(
 async def get_charge_statistics(
     start_date: Optional[date] = Query(None, description="Start date for statistics"),
     end_date: Optional[date] = Query(None, description="End date for statistics"),
-    db: Session = Depends(get_db),
+    breakdown_limit: int = Query(10, ge=1, le=100, description="Maximum courts and prosecutors in breakdowns"),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     Get prosecution statistics and metrics.
     
+    All figures are grouped aggregates, so the cost follows the number of
+    courts and prosecutors rather than the number of charges.
+    
     Available to PROSECUTOR, SUPERVISOR, and ADMIN roles.
     """
     require_roles(current_user, ["PROSECUTOR", "SUPERVISOR", "ADMIN"])
     
-    # Build base query
-    query = db.query(Charge)
-    
-    if start_date:
-        query = query.filter(Charge.filed_at >= start_date)
-    if end_date:
-        query = query.filter(Charge.filed_at <= end_date)
-    
-    charges = query.all()
+    def period(column):
+        conditions = []
+        if start_date:
+            conditions.append(column >= start_date)
+        if end_date:
+            conditions.append(column <= end_date)
+        return and_(true(), *conditions)
+    
+    status_counts = (
+        func.count(Charge.id).label("total"),
+        func.count(Charge.id).filter(Charge.status == ChargeStatus.FILED).label("filed"),
+        func.count(Charge.id).filter(Charge.status == ChargeStatus.WITHDRAWN).label("withdrawn"),
+        func.count(Charge.id).filter(Charge.status == ChargeStatus.AMENDED).label("amended"),
+    )
     
     # Calculate statistics
-    total_charges = len(charges)
-    filed_charges = len([c for c in charges if c.status == ChargeStatus.FILED])
-    withdrawn_charges = len([c for c in charges if c.status == ChargeStatus.WITHDRAWN])
-    amended_charges = len([c for c in charges if c.status == ChargeStatus.AMENDED])
-    
-    # Get outcomes for conviction rate
-    outcomes_query = db.query(Outcome)
-    if start_date:
-        outcomes_query = outcomes_query.filter(Outcome.closed_at >= start_date)
-    if end_date:
-        outcomes_query = outcomes_query.filter(Outcome.closed_at <= end_date)
-    
-    outcomes = outcomes_query.all()
-    total_outcomes = len(outcomes)
-    convictions = len([o for o in outcomes if o.disposition == Disposition.CONVICTED])
-    
-    conviction_rate = (convictions / total_outcomes * 100) if total_outcomes > 0 else 0
+    charge_counts = (await db.execute(
+        select(*status_counts).where(period(Charge.filed_at))
+    )).one()
+    
+    # Outcomes for conviction rate
+    outcome_counts = (await db.execute(
+        select(
+            func.count(Outcome.id).label("total"),
+            func.count(Outcome.id).filter(Outcome.disposition == Disposition.CONVICTED).label("convictions"),
+        ).where(period(Outcome.closed_at))
+    )).one()
+    
+    conviction_rate = (
+        outcome_counts.convictions / outcome_counts.total * 100
+    ) if outcome_counts.total > 0 else 0
+    
+    # Per-court breakdown
+    session_total = func.count(CourtSession.id)
+    court_rows = (await db.execute(
+        select(
+            CourtSession.court,
+            session_total.label("total"),
+            func.count(CourtSession.id).filter(
+                CourtSession.session_date >= datetime.now(timezone.utc)
+            ).label("upcoming"),
+            func.count(distinct(CourtSession.case_id)).label("cases"),
+        )
+        .where(period(CourtSession.session_date))
+        .group_by(CourtSession.court)
+        .order_by(session_total.desc(), CourtSession.court)
+        .limit(breakdown_limit)
+    )).all()
+    
+    # Per-prosecutor breakdown (the user who filed the charge)
+    charge_total = status_counts[0]
+    prosecutor_rows = (await db.execute(
+        select(
+            Charge.created_by,
+            User.full_name,
+            *status_counts,
+            func.count(distinct(Charge.case_id)).label("cases"),
+        )
+        .outerjoin(User, User.id == Charge.created_by)
+        .where(period(Charge.filed_at))
+        .group_by(Charge.created_by, User.full_name)
+        .order_by(charge_total.desc(), User.full_name)
+        .limit(breakdown_limit)
+    )).all()
     
     return ChargeStatisticsResponse(
-        total_charges=total_charges,
-        filed_charges=filed_charges,
-        withdrawn_charges=withdrawn_charges,
-        amended_charges=amended_charges,
-        total_outcomes=total_outcomes,
-        convictions=convictions,
+        total_charges=charge_counts.total,
+        filed_charges=charge_counts.filed,
+        withdrawn_charges=charge_counts.withdrawn,
+        amended_charges=charge_counts.amended,
+        total_outcomes=outcome_counts.total,
+        convictions=outcome_counts.convictions,
         conviction_rate=conviction_rate,
         period_start=start_date,
-        period_end=end_date
-    )
\ No newline at end of file
+        period_end=end_date,
+        by_court=[
+            CourtStatistics(
+                court=row.court,
+                total_sessions=row.total,
+                upcoming_sessions=row.upcoming,
+                cases=row.cases
+            )
+            for row in court_rows
+        ],
+        by_prosecutor=[
+            ProsecutorStatistics(
+                prosecutor_id=row.created_by,
+                prosecutor_name=row.full_name,
+                total_charges=row.total,
+                filed_charges=row.filed,
+                withdrawn_charges=row.withdrawn,
+                amended_charges=row.amended,
+                cases=row.cases
+            )
+            for row in prosecutor_rows
+        ]
+    )
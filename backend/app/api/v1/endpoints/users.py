@@ -7,7 +7,7 @@ from sqlalchemy import select, func
 from app.database.base import get_db
 from app.models.user import User, UserRole
 from app.schemas.user import UserCreate, UserUpdate, UserResponse, UserStatsResponse
-from app.utils.auth import get_password_hash
+from app.utils.auth import password_hasher
 from app.utils.dependencies import get_current_active_user, require_admin, require_supervisor_or_admin
 
 router = APIRouter()
@@ -30,7 +30,7 @@ async def create_user(
         )
     
     # Create new user
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await password_hasher.hash(user_data.password)
     db_user = User(
         email=user_data.email,
         full_name=user_data.full_name,
@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from pydantic import field_validator, ConfigDict
+from pydantic import field_validator, model_validator, ConfigDict
 from typing import List, Optional
 import secrets
 from functools import lru_cache
@@ -16,6 +16,11 @@ class Settings(BaseSettings):
     secret_key: str = secrets.token_urlsafe(32)
     access_token_expire_minutes: int = 30
     refresh_token_expire_days: int = 7
+    password_hash_workers: int = 4  # Concurrent bcrypt operations per process
+    password_hash_max_pending: int = 64  # Queued operations before logins get 503
+    jwt_revocation_redis_enabled: Optional[bool] = None  # Share revocations across workers via Redis; defaults to on when redis_url is set
+    jwt_revocation_sync_interval_seconds: float = 5.0  # Upper bound for revocations to reach every worker
+    jwt_revocation_bucket_seconds: int = 300  # Expiry bucket width; expired buckets are dropped whole
     
     # Database
     database_url: str
@@ -28,6 +33,9 @@ class Settings(BaseSettings):
     # Redis
     redis_url: str = "redis://localhost:6379/0"
     
+    # Server
+    web_concurrency: int = 1  # Worker processes; uvicorn also reads WEB_CONCURRENCY as its --workers default
+    
     # Email
     smtp_host: str = "localhost"
     smtp_port: int = 587
@@ -59,6 +67,8 @@ class Settings(BaseSettings):
     sso_token_url: Optional[str] = None
     sso_userinfo_url: Optional[str] = None
     sso_logout_url: Optional[str] = None
+    sso_jwks_url: Optional[str] = None  # Discovered from sso_issuer when unset
+    sso_issuer: Optional[str] = None
     sso_scopes: List[str] = ["openid", "profile", "email"]
     sso_tenant_id: Optional[str] = None  # Azure AD
     sso_realm: Optional[str] = None      # Keycloak
@@ -74,9 +84,100 @@ class Settings(BaseSettings):
     siem_webhook_api_key: Optional[str] = None
     siem_syslog_host: Optional[str] = None
     siem_syslog_port: int = 514
-    siem_syslog_protocol: str = "UDP"  # UDP or TCP
+    siem_syslog_protocol: str = "UDP"  # UDP, TCP or TLS
+    siem_syslog_ca_file: Optional[str] = None  # CA bundle for TLS syslog
     siem_format: str = "json"  # json, cef, leef
-    siem_export_interval_seconds: int = 60
+    siem_export_interval_seconds: int = 60  # Max time a partial batch waits
+    siem_batch_size: int = 500
+    
+    # Audit Request Logging (background sink)
+    audit_middleware_enabled: bool = False
+    audit_sink_queue_size: int = 10000
+    audit_sink_batch_size: int = 200
+    audit_sink_overflow_policy: str = "block"  # block, drop_newest, drop_oldest
+    audit_sink_block_timeout_ms: float = 50.0  # Max wait for queue space under the block policy
+    audit_partition_premake_months: int = 3  # Monthly audit_logs partitions created ahead
+    audit_partition_check_interval_seconds: int = 21600
+    audit_search_default_days: int = 90  # Search window when no start date is given
+    audit_statistics_window_days: int = 30
+    
+    # In-process L1 cache (in front of Redis)
+    l1_cache_max_bytes: int = 64 * 1024 * 1024
+    l1_cache_max_entries: int = 100000
+    l1_cache_max_ttl_seconds: float = 30.0  # Bounds staleness across workers
+    l1_cache_sweep_interval_seconds: float = 30.0
+    
+    # Forensic report ingest
+    ingest_chunk_size: int = 5000  # Records mapped and staged per chunk
+    ingest_max_record_bytes: int = 16 * 1024 * 1024  # Largest single record in a report
+    ingest_max_error_details: int = 100  # Failed records described on the SyncJob
+    ingest_staging_retention_hours: int = 24  # Staged rows of abandoned jobs are dropped after this
+    
+    # Integration Sync Jobs
+    sync_page_size: int = 500  # Records requested per remote page
+    sync_concurrency: int = 4  # Page-numbered requests in flight per job
+    sync_upsert_batch_rows: int = 2000  # Rows per INSERT ... ON CONFLICT statement
+    sync_lease_seconds: int = 300  # A running job not checkpointed for this long can be resumed elsewhere
+    sync_resume_enabled: bool = True
+    sync_resume_interval_seconds: float = 60.0  # How often each worker looks for interrupted jobs to resume
+    
+    # Notification Fan-out
+    notification_bulk_max_recipients: int = 10000
+    notification_batch_linger_seconds: float = 0.5  # Wait this long for a channel batch to fill
+    notification_delivery_concurrency: int = 4  # Channel batches sent at once
+    notification_email_provider: str = "smtp"
+    notification_sms_provider: str = "log"  # Placeholder until an SMS gateway is contracted
+    notification_push_provider: str = "fcm"
+    notification_stream_heartbeat_seconds: float = 15.0  # Below common proxy idle timeouts
+    notification_stream_queue_size: int = 256  # Events buffered per open stream before it must replay
+    notification_stream_replay_limit: int = 500  # Stored notifications replayed on reconnect
+    notification_stream_retry_ms: int = 3000  # Client reconnect delay sent to EventSource
+    notification_stream_token_seconds: int = 60  # Lifetime of the query-string token EventSource connects with
+    
+    # Task Assignment
+    task_workload_cache_ttl_seconds: float = 30.0  # Per-worker workload scores are reloaded after this
+    
+    # Task SLA Sweeper (one leader worker per deployment)
+    sla_sweeper_enabled: bool = True
+    sla_sweep_interval_seconds: float = 60.0
+    sla_sweep_batch_size: int = 500  # Breached tasks escalated per statement
+    sla_at_risk_hours: float = 24.0  # Open tasks due within this are reported AT_RISK
+    
+    # NDPA Compliance Assessment
+    ndpa_area_cache_ttl_seconds: float = 3600.0  # Unchanged areas are still recomputed after this (clock-based checks)
+    ndpa_nigerian_ip_ranges_file: Optional[str] = None  # CIDR list (one per line) replacing the built-in Nigerian ranges
+    ndpa_localization_audit_days: int = 30  # Audit-log window checked for access from outside Nigeria
+    
+    # Metrics
+    metrics_enabled: bool = True
+    metrics_multiproc_dir: Optional[str] = None  # Shared dir for multi-worker aggregation
+    metrics_flush_interval_seconds: float = 5.0
+    metrics_token: Optional[str] = None  # Bearer token required to scrape /metrics; unset disables the endpoint
+    
+    # Query Profiler (per-request statement accounting, opt-in)
+    query_profiler_enabled: bool = False
+    query_profiler_server_timing: bool = True
+    query_profiler_duplicate_threshold: int = 5  # Log statements repeated this often in one request
+    slow_query_threshold_ms: float = 200.0
+    slow_query_sample_rate: float = 1.0
+    slow_query_explain: bool = True
+    
+    # Response Compression (zstd/brotli used when the packages are installed)
+    http_compression_enabled: bool = True
+    http_compression_minimum_size: int = 1024
+    
+    # Webhook Delivery
+    webhook_worker_enabled: bool = True
+    webhook_worker_concurrency: int = 8
+    webhook_per_host_concurrency: int = 4
+    webhook_http2: bool = True
+    
+    # Mobile Sync
+    mobile_sync_change_retention_days: int = 30  # Older clients are told to do a full sync
+    mobile_sync_prune_interval_seconds: int = 3600
+    mobile_batch_max_requests: int = 25
+    mobile_batch_concurrency: int = 4  # Concurrent GETs per batch
+    mobile_batch_request_timeout_seconds: float = 30.0
     
     # S3/MinIO Object Storage
     s3_enabled: bool = False
@@ -97,6 +198,13 @@ class Settings(BaseSettings):
             return v
         raise ValueError(v)
     
+    @model_validator(mode="after")
+    def default_revocation_backend(self):
+        # Process-local revocations only reach the worker that handled the logout
+        if self.jwt_revocation_redis_enabled is None:
+            self.jwt_revocation_redis_enabled = bool(self.redis_url)
+        return self
+    
     model_config = ConfigDict(
         env_file=".env",
         case_sensitive=False
@@ -0,0 +1,310 @@
+"""
+Per-request database query profiler.
+
+Opt-in SQLAlchemy event hooks that attribute statement count, total database
+time and repeated (N+1 style) statements to the HTTP route that issued them.
+
+This module provides:
+- SQL normalization (literals and bind parameters folded, IN lists collapsed)
+- A pure ASGI middleware adding a ``Server-Timing: db;...`` response header
+- Per-route histograms in the shared metrics registry
+- A sampled slow-query log with background ``EXPLAIN`` capture
+"""
+
+import asyncio
+import logging
+import random
+import re
+import time
+from collections import Counter as StatementCounter
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+from app.config.settings import settings
+from app.utils.metrics import log_linear_buckets, metrics_registry
+
+logger = logging.getLogger(__name__)
+slow_query_logger = logging.getLogger("app.database.slow_query")
+
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w$.])-?\d+(?:\.\d+)?\b")
+_BIND_PARAMETER = re.compile(r"\$\d+|%\(\w+\)s|%s|(?<!:):\w+|\?")
+_IN_LIST = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.IGNORECASE)
+_VALUES_LIST = re.compile(r"\bVALUES\s*(\(\s*[?,\s]*\))(?:\s*,\s*\(\s*[?,\s]*\))*", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_sql(statement: str) -> str:
+    """
+    Reduce a SQL statement to its shape.
+
+    Literals and bind parameters become ``?``, ``IN (?, ?, ...)`` lists and
+    multi-row ``VALUES`` collapse to one entry, so the same query issued with
+    different arguments (the N+1 pattern) normalizes to the same string.
+    """
+    normalized = _STRING_LITERAL.sub("?", statement)
+    normalized = _BIND_PARAMETER.sub("?", normalized)
+    normalized = _NUMBER_LITERAL.sub("?", normalized)
+    normalized = _WHITESPACE.sub(" ", normalized).strip()
+    normalized = _IN_LIST.sub("IN (...)", normalized)
+    normalized = _VALUES_LIST.sub(r"VALUES \1", normalized)
+    return normalized
+
+
+class RequestQueryProfile:
+    """Statements executed while handling one request."""
+
+    __slots__ = ("route", "query_count", "db_time", "statements")
+
+    def __init__(self, route: str = "unmatched"):
+        self.route = route
+        self.query_count = 0
+        self.db_time = 0.0
+        self.statements: StatementCounter = StatementCounter()
+
+    def record(self, normalized: str, duration: float):
+        self.query_count += 1
+        self.db_time += duration
+        self.statements[normalized] += 1
+
+    @property
+    def duplicate_count(self) -> int:
+        """Executions beyond the first for each repeated statement."""
+        return sum(count - 1 for count in self.statements.values() if count > 1)
+
+    def repeated_statements(self, min_count: int = 2) -> List[Dict[str, Any]]:
+        return [
+            {"statement": statement, "count": count}
+            for statement, count in self.statements.most_common()
+            if count >= min_count
+        ]
+
+    def server_timing(self) -> str:
+        return (
+            f'db;dur={self.db_time * 1000:.2f};'
+            f'desc="{self.query_count} queries, {self.duplicate_count} duplicate"'
+        )
+
+
+_current_profile: ContextVar[Optional[RequestQueryProfile]] = ContextVar(
+    "query_profile", default=None
+)
+
+
+def get_current_profile() -> Optional[RequestQueryProfile]:
+    """Return the profile for the request being handled, if any."""
+    return _current_profile.get()
+
+
+db_queries_per_request = metrics_registry.histogram(
+    "db_queries_per_request", "Database statements executed per HTTP request", ("route",),
+    buckets=log_linear_buckets(0, 3)
+)
+db_time_per_request_seconds = metrics_registry.histogram(
+    "db_time_per_request_seconds", "Total database time per HTTP request in seconds", ("route",)
+)
+db_duplicate_queries_total = metrics_registry.counter(
+    "db_duplicate_queries_total", "Repeated statements executed within a single request", ("route",)
+)
+db_slow_queries_total = metrics_registry.counter(
+    "db_slow_queries_total", "Statements slower than the slow-query threshold", ("route",)
+)
+
+
+class SlowQueryLog:
+    """
+    Sampled slow-query logger with background EXPLAIN capture.
+
+    EXPLAIN runs on a separate pooled connection after the statement finished,
+    never inside the caller's transaction. Each normalized statement is
+    explained at most once per ``explain_interval_seconds`` and at most
+    ``max_concurrent_explains`` plans are captured at a time.
+    """
+
+    def __init__(
+        self,
+        threshold_ms: float = 200.0,
+        sample_rate: float = 1.0,
+        explain: bool = True,
+        explain_interval_seconds: float = 300.0,
+        max_concurrent_explains: int = 2,
+    ):
+        self.threshold_seconds = threshold_ms / 1000.0
+        self.sample_rate = sample_rate
+        self.explain = explain
+        self.explain_interval_seconds = explain_interval_seconds
+        self.max_concurrent_explains = max_concurrent_explains
+        self._engine = None
+        self._last_explained: Dict[str, float] = {}
+        self._pending: set = set()
+
+    def bind(self, engine):
+        """Use ``engine`` (async) for EXPLAIN connections."""
+        self._engine = engine
+
+    def record(self, statement: str, normalized: str, parameters: Any, duration: float, route: str):
+        if duration < self.threshold_seconds:
+            return
+        db_slow_queries_total.inc(route=route)
+        if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            return
+
+        slow_query_logger.warning(
+            "Slow query on %s: %.1f ms: %s", route, duration * 1000, normalized,
+            extra={"route": route, "duration_ms": round(duration * 1000, 2), "statement": normalized}
+        )
+
+        if self.explain and self._should_explain(statement, normalized):
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                return
+            task = loop.create_task(self._explain(statement, normalized, parameters, route))
+            self._pending.add(task)
+            task.add_done_callback(self._pending.discard)
+
+    def _should_explain(self, statement: str, normalized: str) -> bool:
+        if self._engine is None or len(self._pending) >= self.max_concurrent_explains:
+            return False
+        # Plain EXPLAIN never executes the statement, but only SELECTs are
+        # worth planning here and DML plans against live rows are not needed.
+        if not statement.lstrip().upper().startswith(("SELECT", "WITH")):
+            return False
+        now = time.monotonic()
+        last = self._last_explained.get(normalized)
+        if last is not None and now - last < self.explain_interval_seconds:
+            return False
+        self._last_explained[normalized] = now
+        if len(self._last_explained) > 1000:
+            cutoff = now - self.explain_interval_seconds
+            self._last_explained = {
+                key: value for key, value in self._last_explained.items() if value >= cutoff
+            }
+        return True
+
+    async def _explain(self, statement: str, normalized: str, parameters: Any, route: str):
+        token = _current_profile.set(None)
+        try:
+            async with self._engine.connect() as conn:
+                result = await conn.exec_driver_sql(f"EXPLAIN {statement}", parameters)
+                plan = "\n".join(str(row[0]) for row in result)
+            slow_query_logger.warning(
+                "Query plan for slow query on %s: %s\n%s", route, normalized, plan,
+                extra={"route": route, "statement": normalized, "plan": plan}
+            )
+        except Exception as e:
+            logger.debug(f"EXPLAIN failed for slow query: {e}")
+        finally:
+            _current_profile.reset(token)
+
+
+class QueryProfiler:
+    """
+    Attach statement hooks to an engine and attribute them to requests.
+
+    Statements outside a profiled request (startup, background workers) are
+    ignored by the per-request accounting but still reach the slow-query log.
+    """
+
+    def __init__(self, slow_query_log: Optional[SlowQueryLog] = None, duplicate_warning_threshold: int = 5):
+        self.slow_query_log = slow_query_log or SlowQueryLog()
+        self.duplicate_warning_threshold = duplicate_warning_threshold
+
+    def instrument(self, engine):
+        """Register cursor-execute listeners. Accepts sync or async engines."""
+        from sqlalchemy import event
+
+        sync_engine = getattr(engine, "sync_engine", engine)
+        if sync_engine is not engine:
+            self.slow_query_log.bind(engine)
+
+        @event.listens_for(sync_engine, "before_cursor_execute")
+        def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            conn.info.setdefault("profiler_query_start", []).append(time.perf_counter())
+
+        @event.listens_for(sync_engine, "after_cursor_execute")
+        def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            starts = conn.info.get("profiler_query_start")
+            if not starts:
+                return
+            duration = time.perf_counter() - starts.pop()
+            self.record(statement, parameters, duration, executemany)
+
+    def record(self, statement: str, parameters: Any, duration: float, executemany: bool = False):
+        profile = _current_profile.get()
+        normalized = normalize_sql(statement)
+        if profile is not None:
+            profile.record(normalized, duration)
+        if not executemany:
+            route = profile.route if profile is not None else "background"
+            self.slow_query_log.record(statement, normalized, parameters, duration, route)
+
+    def finish(self, profile: RequestQueryProfile):
+        """Publish a finished request profile to metrics and the log."""
+        if profile.query_count == 0:
+            return
+        db_queries_per_request.observe(profile.query_count, route=profile.route)
+        db_time_per_request_seconds.observe(profile.db_time, route=profile.route)
+        duplicates = profile.duplicate_count
+        if duplicates:
+            db_duplicate_queries_total.inc(duplicates, route=profile.route)
+        repeated = profile.repeated_statements(self.duplicate_warning_threshold)
+        if repeated:
+            logger.warning(
+                "Repeated statements on %s (%d queries, %.1f ms db): %s",
+                profile.route, profile.query_count, profile.db_time * 1000,
+                "; ".join(f"{item['count']}x {item['statement']}" for item in repeated[:3]),
+                extra={"route": profile.route, "repeated_statements": repeated}
+            )
+
+
+class QueryProfilerMiddleware:
+    """
+    Pure ASGI middleware opening a query profile for each HTTP request.
+
+    The ``Server-Timing`` header reflects statements executed before the
+    response started; metrics and the repeated-statement log see all of them.
+    """
+
+    def __init__(self, app, profiler: "QueryProfiler" = None, server_timing: bool = True):
+        self.app = app
+        self.profiler = profiler or query_profiler
+        self.server_timing = server_timing
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] == "/metrics":
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestQueryProfile()
+        token = _current_profile.set(profile)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                route = scope.get("route")
+                profile.route = getattr(route, "path", None) or "unmatched"
+                if self.server_timing:
+                    headers = list(message.get("headers", []))
+                    headers.append((b"server-timing", profile.server_timing().encode("latin-1")))
+                    message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current_profile.reset(token)
+            route = scope.get("route")
+            profile.route = getattr(route, "path", None) or "unmatched"
+            self.profiler.finish(profile)
+
+
+# Global profiler instance
+query_profiler = QueryProfiler(
+    slow_query_log=SlowQueryLog(
+        threshold_ms=settings.slow_query_threshold_ms,
+        sample_rate=settings.slow_query_sample_rate,
+        explain=settings.slow_query_explain,
+    ),
+    duplicate_warning_threshold=settings.query_profiler_duplicate_threshold,
+)
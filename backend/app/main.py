@@ -1,8 +1,28 @@
-from fastapi import FastAPI
+import hmac
+import logging
+from typing import Optional
+
+from fastapi import FastAPI, Header, HTTPException
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from uvicorn.middleware.proxy_headers import ProxyHeadersMiddleware
 from app.config.settings import settings
 from app.api.v1.api import api_router
+from app.utils.webhooks import webhook_dispatcher
+from app.utils.siem import SIEMConfiguration
+from app.utils.metrics import MetricsMiddleware, instrument_engine, metrics_registry
+from app.utils.audit import AuditMiddleware, audit_sink
+from app.utils.audit_partitions import audit_partition_maintainer
+from app.database.base import engine
+from app.database.profiler import QueryProfilerMiddleware, query_profiler
+from app.security.revocation import revocation_filter
+from app.utils.compression import CompressionMiddleware
+from app.utils.lru_cache import l1_cache
+from app.utils.notification_stream import notification_broker
+from app.utils.sla_engine import sla_sweeper
+from app.utils.integrations import sync_job_resumer
+
+logger = logging.getLogger(__name__)
 
 app = FastAPI(
     title=settings.app_name,
@@ -12,6 +32,24 @@ app = FastAPI(
     redoc_url="/redoc" if settings.debug else None
 )
 
+# Request latency metrics
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware)
+    instrument_engine(engine)
+
+# Per-request query profiling (Server-Timing header, slow-query log)
+if settings.query_profiler_enabled:
+    app.add_middleware(QueryProfilerMiddleware, server_timing=settings.query_profiler_server_timing)
+    query_profiler.instrument(engine)
+
+# Correlation IDs and background request auditing
+if settings.audit_middleware_enabled:
+    app.add_middleware(AuditMiddleware, sink=audit_sink)
+
+# Negotiated zstd/brotli/gzip response compression
+if settings.http_compression_enabled:
+    app.add_middleware(CompressionMiddleware, minimum_size=settings.http_compression_minimum_size)
+
 # Trust proxy headers (Traefik)
 app.add_middleware(ProxyHeadersMiddleware, trusted_hosts=["*"])
 
@@ -38,6 +76,51 @@ else:
 # Include API routes
 app.include_router(api_router, prefix=settings.api_v1_str)
 
+siem_forwarders = []
+
+@app.on_event("startup")
+async def start_background_workers():
+    if settings.metrics_enabled:
+        await metrics_registry.start()
+        if not settings.metrics_token:
+            logger.warning("/metrics is disabled until METRICS_TOKEN is set")
+    await audit_partition_maintainer.start()
+    if settings.jwt_revocation_redis_enabled:
+        await revocation_filter.start()
+    elif settings.web_concurrency > 1:
+        logger.error(
+            f"Token revocation is process-local with {settings.web_concurrency} workers: a logout only "
+            "revokes the token in the worker that handled it. Set JWT_REVOCATION_REDIS_ENABLED=true."
+        )
+    await l1_cache.start()
+    if settings.sla_sweeper_enabled:
+        await sla_sweeper.start()
+    if settings.sync_resume_enabled:
+        await sync_job_resumer.start()
+    if settings.audit_middleware_enabled:
+        await audit_sink.start()
+    if settings.webhook_worker_enabled:
+        await webhook_dispatcher.start_worker()
+    if settings.siem_enabled:
+        siem_forwarders.extend(SIEMConfiguration.from_settings(settings).create_forwarders())
+        for forwarder in siem_forwarders:
+            await forwarder.start()
+
+@app.on_event("shutdown")
+async def stop_background_workers():
+    await webhook_dispatcher.stop_worker()
+    for forwarder in siem_forwarders:
+        await forwarder.stop()
+    await audit_sink.stop()
+    await audit_partition_maintainer.stop()
+    await revocation_filter.stop()
+    await l1_cache.stop()
+    await notification_broker.stop()
+    await sla_sweeper.stop()
+    await sync_job_resumer.stop()
+    if settings.metrics_enabled:
+        await metrics_registry.stop()
+
 @app.get("/")
 async def root():
     return {
@@ -46,6 +129,15 @@ async def root():
         "docs": "/docs" if settings.debug else "Documentation not available in production"
     }
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics(authorization: Optional[str] = Header(None)):
+    # Route, query and worker internals: only scrapers holding the token get them.
+    # Client addresses are taken from X-Forwarded-For, so they cannot gate this
+    expected = f"Bearer {settings.metrics_token}" if settings.metrics_token else None
+    if expected is None or not hmac.compare_digest((authorization or "").encode(), expected.encode()):
+        raise HTTPException(status_code=404)
+    return PlainTextResponse(metrics_registry.render(), media_type="text/plain; version=0.0.4")
+
 @app.get("/health")
 async def health_check():
     return {"status": "healthy", "app": settings.app_name, "version": settings.app_version}
\ No newline at end of file
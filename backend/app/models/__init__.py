@@ -13,7 +13,7 @@ from app.models.evidence import (
     DeviceCondition, EncryptionStatus, AnalysisStatus
 )
 from app.models.chain_of_custody import ChainOfCustodyEntry
-from app.models.task import Task, TaskStatus, ActionLog
+from app.models.task import Task, TaskStatus, TaskEdge, ActionLog
 from app.models.prosecution import Charge, CourtSession, Outcome, ChargeStatus, Disposition
 from app.models.misc import (
     Attachment, CaseCollaboration,
@@ -28,18 +28,22 @@ from app.models.audit import (
     AuditConfiguration,
     DataRetentionJob,
     AuditArchive,
+    SIEMExportCursor,
 )
 from app.models.lookup_value import LookupValue, LOOKUP_CATEGORIES
 from app.models.forensic import ForensicReport
 from app.models.email import EmailSettings, EmailTemplate
 from app.models.ndpa_compliance import (
     NDPAConsentRecord, NDPADataProcessingActivity, NDPADataSubjectRequest,
-    NDPABreachNotification, NDPAImpactAssessment, NDPARegistrationRecord
+    NDPABreachNotification, NDPAImpactAssessment, NDPARegistrationRecord,
+    NDPAAssessmentSnapshot
 )
 from app.models.intelligence import (
     IntelligenceRecord, IntelligenceAttachment, IntelligenceTag, IntelligenceCaseLink,
     IntelCategory, IntelPriority, IntelStatus
 )
+from app.models.sync import SyncCaseTombstone, SyncChange, SyncOperation
+from app.models.ingest import ArtefactIngestStaging, ExternalRecord
 
 
 __all__ = [
@@ -54,17 +58,20 @@ __all__ = [
     "ImagingStatus", "DeviceType", "WarrantType", "SeizureStatus",
     "DeviceCondition", "EncryptionStatus", "AnalysisStatus",
     "ChainOfCustodyEntry",
-    "Task", "TaskStatus", "ActionLog",
+    "Task", "TaskStatus", "TaskEdge", "ActionLog",
     "Charge", "CourtSession", "Outcome", "ChargeStatus", "Disposition",
     "Attachment", "CaseCollaboration",
     "AttachmentClassification", "VirusScanStatus", "CollaborationStatus", "PartnerType",
     "AuditLog", "ComplianceReport", "RetentionPolicy", "ComplianceViolation",
-    "AuditConfiguration", "DataRetentionJob", "AuditArchive",
+    "AuditConfiguration", "DataRetentionJob", "AuditArchive", "SIEMExportCursor",
     "LookupValue", "LOOKUP_CATEGORIES",
     "ForensicReport",
     "EmailSettings", "EmailTemplate",
     "NDPAConsentRecord", "NDPADataProcessingActivity", "NDPADataSubjectRequest",
     "NDPABreachNotification", "NDPAImpactAssessment", "NDPARegistrationRecord",
+    "NDPAAssessmentSnapshot",
     "IntelligenceRecord", "IntelligenceAttachment", "IntelligenceTag", "IntelligenceCaseLink",
     "IntelCategory", "IntelPriority", "IntelStatus",
+    "SyncCaseTombstone", "SyncChange", "SyncOperation",
+    "ArtefactIngestStaging", "ExternalRecord",
 ]
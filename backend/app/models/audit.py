@@ -14,7 +14,7 @@ import json
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any, List
 
-from sqlalchemy import Column, String, Text, DateTime, Boolean, Integer, Float, JSON, Index, ForeignKey, UniqueConstraint, Enum as SQLEnum
+from sqlalchemy import Column, String, Text, DateTime, Boolean, Integer, BigInteger, Float, FetchedValue, JSON, Index, ForeignKey, UniqueConstraint, Enum as SQLEnum
 from sqlalchemy.dialects.postgresql import UUID
 from app.models.types import StringArray, UUIDArray
 from sqlalchemy.orm import relationship, validates
@@ -31,6 +31,10 @@ class AuditLog(Base):
     
     This model stores comprehensive audit trails for all system activities
     with cryptographic integrity protection and forensic compliance.
+    
+    The table is range-partitioned by month on ``timestamp`` (see
+    ``app.utils.audit_partitions``), so ``timestamp`` is part of the primary
+    key and time-bounded queries only scan the matching partitions.
     """
     __tablename__ = "audit_logs"
     
@@ -54,7 +58,13 @@ class AuditLog(Base):
     severity = Column(String(20), nullable=False, default="LOW", index=True)
     
     # Timestamps
-    timestamp = Column(DateTime(timezone=True), nullable=False, default=func.now(), index=True)
+    timestamp = Column(DateTime(timezone=True), primary_key=True, nullable=False, default=func.now(), index=True)
+    
+    # Commit order, assigned by the database: writing transaction id and insert
+    # sequence. Forwarders read rows by (txid, sequence_number) below the
+    # snapshot xmin, which rows committed late cannot fall behind
+    txid = Column(BigInteger, nullable=False, server_default=FetchedValue())
+    sequence_number = Column(BigInteger, nullable=False, server_default=FetchedValue())
     
     # Integrity protection
     checksum = Column(String(64), nullable=True)  # SHA-256 checksum
@@ -76,6 +86,8 @@ class AuditLog(Base):
         Index('ix_audit_logs_action_timestamp', action, timestamp.desc()),
         Index('ix_audit_logs_correlation_id', correlation_id),
         Index('ix_audit_logs_session_timestamp', session_id, timestamp.desc()),
+        Index('ix_audit_logs_txid_sequence', txid, sequence_number),
+        {'postgresql_partition_by': 'RANGE (timestamp)'},
     )
     
     def __init__(self, **kwargs):
@@ -478,7 +490,7 @@ class AuditArchive(Base):
     status = Column(String(50), nullable=False, default="ACTIVE", index=True)
     
     # Audit trail
-    created_by = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    created_by = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True)  # NULL for system archives
     created_at = Column(DateTime(timezone=True), nullable=False, default=func.now())
     last_verified = Column(DateTime(timezone=True), nullable=True)
     
@@ -506,6 +518,30 @@ class AuditArchive(Base):
         return is_valid
 
 
+class SIEMExportCursor(Base):
+    """
+    Forwarding watermark for a SIEM destination.
+    
+    Stores the (txid, sequence_number) of the last audit log row accepted by
+    the destination so the forwarder resumes after a restart without gaps or
+    re-sending rows. ``last_timestamp`` and ``last_id`` identify the same row
+    for operators.
+    """
+    __tablename__ = "siem_export_cursors"
+    
+    name = Column(String(100), primary_key=True)
+    
+    # Watermark
+    last_txid = Column(BigInteger, nullable=False, default=0)
+    last_sequence_number = Column(BigInteger, nullable=False, default=0)
+    last_timestamp = Column(DateTime(timezone=True), nullable=False)
+    last_id = Column(UUID(as_uuid=True), nullable=True)
+    
+    # Progress
+    exported_count = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), nullable=False, default=func.now(), onupdate=func.now())
+
+
 # Add relationships to existing User model (this would typically be added to the User model)
 # These are the reverse relationships that would be added to the User model:
 
@@ -0,0 +1,54 @@
+"""
+Tables for bulk imports from external systems.
+
+- ``ArtefactIngestStaging``: artefacts parsed from a forensic report are
+  copied here chunk by chunk while the request body streams in, then merged
+  into ``artefacts`` in one statement keyed by SHA-256 (see
+  ``app.utils.forensic_ingest``). The table is UNLOGGED: its rows are
+  transient and are rebuilt by re-sending the report.
+- ``ExternalRecord``: local mirror of records pulled from an integration by
+  sync jobs, upserted page by page (see ``app.utils.sync_runner``).
+"""
+
+from sqlalchemy import Column, String, Text, DateTime, BigInteger, Index, func
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+
+from app.database.base import Base
+
+
+class ArtefactIngestStaging(Base):
+    """One artefact of an import job, waiting to be merged."""
+    __tablename__ = "artefact_ingest_staging"
+
+    job_id = Column(String(36), primary_key=True)  # SyncJob.id
+    ordinal = Column(BigInteger, primary_key=True)  # Position in the report
+    artefact_id = Column(UUID(as_uuid=True), nullable=False)
+    sha256 = Column(String(64), nullable=False)
+    artefact_type = Column(String(20), nullable=False)
+    source_tool = Column(String(100))
+    description = Column(Text)
+    file_path = Column(String(500))
+    staged_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    __table_args__ = (
+        Index('ix_artefact_ingest_staging_staged_at', 'staged_at'),
+        {'prefixes': ['UNLOGGED']},
+    )
+
+
+class ExternalRecord(Base):
+    """Latest known state of one remote entity, keyed by its remote id."""
+    __tablename__ = "external_records"
+
+    integration_id = Column(String(36), primary_key=True)
+    entity_type = Column(String(50), primary_key=True)
+    external_id = Column(String(255), primary_key=True)
+    payload = Column(JSONB, nullable=False)  # Mapped record
+    remote_updated_at = Column(DateTime)  # Remote modification time (UTC)
+    sync_job_id = Column(String(36))  # Job that last wrote the row
+    first_synced_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    synced_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    __table_args__ = (
+        Index('ix_external_records_remote_updated', 'integration_id', 'entity_type', 'remote_updated_at'),
+    )
@@ -1,4 +1,5 @@
 from sqlalchemy import Column, String, Integer, Boolean, DateTime, Text, JSON, Float, Index, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from datetime import datetime, timedelta
@@ -73,8 +74,8 @@ class Integration(BaseModel):
     # Audit fields
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    created_by = Column(String, ForeignKey('users.id'), nullable=False)
-    updated_by = Column(String, ForeignKey('users.id'))
+    created_by = Column(UUID(as_uuid=True), ForeignKey('users.id'), nullable=False)
+    updated_by = Column(UUID(as_uuid=True), ForeignKey('users.id'))
     
     # Relationships
     creator = relationship("User", foreign_keys=[created_by])
@@ -602,7 +603,7 @@ class SyncJob(BaseModel):
     __tablename__ = "sync_jobs"
     
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    integration_id = Column(String, ForeignKey('integrations.id'), nullable=False)
+    integration_id = Column(String, ForeignKey('integrations.id'))  # None for ingress imports
     
     # Job configuration
     connector_type = Column(String(50), nullable=False)
@@ -629,6 +630,11 @@ class SyncJob(BaseModel):
     error_summary = Column(JSON, default=list)
     last_error = Column(Text)
     
+    # Resume state: current entity type and remote cursor, per-entity
+    # updated_since and watermark (see app.utils.sync_runner)
+    checkpoint = Column(JSON, default=dict)
+    checkpointed_at = Column(DateTime)  # Also the runner's lease heartbeat
+    
     # Timing
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     started_at = Column(DateTime)
@@ -636,7 +642,7 @@ class SyncJob(BaseModel):
     estimated_duration = Column(Integer)  # Seconds
     
     # User information
-    created_by = Column(String, ForeignKey('users.id'), nullable=False)
+    created_by = Column(UUID(as_uuid=True), ForeignKey('users.id'), nullable=False)
     
     # Relationships
     integration = relationship("Integration", back_populates="sync_jobs")
@@ -648,6 +654,7 @@ class SyncJob(BaseModel):
         Index('ix_sync_jobs_schedule', 'schedule_type', 'next_run_at'),
         Index('ix_sync_jobs_created', 'created_at'),
         Index('ix_sync_jobs_connector', 'connector_type'),
+        Index('ix_sync_jobs_status_checkpoint', 'status', 'checkpointed_at'),
     )
     
     def start_processing(self):
@@ -806,8 +813,8 @@ class DataMapping(BaseModel):
     # Audit fields
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    created_by = Column(String, ForeignKey('users.id'), nullable=False)
-    updated_by = Column(String, ForeignKey('users.id'))
+    created_by = Column(UUID(as_uuid=True), ForeignKey('users.id'), nullable=False)
+    updated_by = Column(UUID(as_uuid=True), ForeignKey('users.id'))
     
     # Relationships
     creator = relationship("User", foreign_keys=[created_by])
@@ -12,7 +12,7 @@ This module defines the database models for:
 
 import uuid
 import json
-from datetime import datetime, timedelta, date
+from datetime import datetime, timedelta, timezone, date
 from typing import Optional, List, Dict, Any
 
 from sqlalchemy import Column, String, Text, DateTime, Boolean, Integer, Float, JSON, Index, ForeignKey, Date, ARRAY
@@ -283,14 +283,14 @@ class NDPADataSubjectRequest(Base):
         """Check if the request response is overdue."""
         if self.status in ["COMPLETED", "REJECTED"]:
             return False
-        return datetime.utcnow() > self.response_due_date
+        return datetime.now(timezone.utc) > self.response_due_date
     
     @hybrid_property
     def days_until_due(self):
         """Calculate days until response is due."""
         if self.status in ["COMPLETED", "REJECTED"]:
             return 0
-        return (self.response_due_date - datetime.utcnow()).days
+        return (self.response_due_date - datetime.now(timezone.utc)).days
     
     def complete_request(self, response_details: str, actions_taken: List[str] = None):
         """Mark request as completed."""
@@ -380,7 +380,7 @@ class NDPABreachNotification(Base):
             hours_diff = (self.nitda_notification_date - self.breach_discovered_at).total_seconds() / 3600
             return hours_diff > 72
         elif not self.notified_to_nitda:
-            hours_since_discovery = (datetime.utcnow() - self.breach_discovered_at).total_seconds() / 3600
+            hours_since_discovery = (datetime.now(timezone.utc) - self.breach_discovered_at).total_seconds() / 3600
             return hours_since_discovery > 72
         return False
     
@@ -609,6 +609,37 @@ class NDPARegistrationRecord(Base):
         self.next_assessment_date = date.today() + timedelta(days=180)
 
 
+class NDPAAssessmentSnapshot(Base):
+    """
+    Stored result of one NDPA compliance assessment.
+    
+    The dashboard reads the latest snapshot instead of reassessing, and the
+    next assessment reuses each area whose source tables have not changed
+    since (``area_results[area]["watermark"]``).
+    """
+    __tablename__ = "ndpa_assessment_snapshots"
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    assessed_at = Column(DateTime(timezone=True), nullable=False, default=func.now())
+    assessed_by = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    
+    # Outcome
+    scope = Column(ARRAY(String(100)), nullable=False)
+    compliance_score = Column(Float, nullable=False)
+    compliance_status = Column(String(50), nullable=False)
+    violations_count = Column(Integer, nullable=False, default=0)
+    
+    # Per area: {"result": {...}, "watermark": "...", "computed_at": "..."}
+    area_results = Column(JSON, nullable=False)
+    areas_recomputed = Column(Integer, nullable=False, default=0)
+    duration_seconds = Column(Float, nullable=True)
+    
+    # Indexes
+    __table_args__ = (
+        Index('ix_ndpa_assessment_snapshots_assessed_at', assessed_at.desc()),
+    )
+
+
 # Add relationships to the User model (these would be added to the User model)
 """
 # To be added to User model:
@@ -1,4 +1,5 @@
-from sqlalchemy import Column, String, Text, Boolean, DateTime, JSON, ForeignKey, Integer
+from sqlalchemy import Column, String, Text, Boolean, DateTime, JSON, ForeignKey, Integer, BigInteger, FetchedValue, Index
+from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.declarative import declarative_base
 from datetime import datetime
@@ -10,8 +11,8 @@ class Notification(Base):
     __tablename__ = "notifications"
     
     id = Column(String, primary_key=True, index=True)
-    recipient_id = Column(String, ForeignKey("users.id"), nullable=False, index=True)
-    sender_id = Column(String, ForeignKey("users.id"), nullable=True, index=True)
+    recipient_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True)
+    sender_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True, index=True)
     
     # Notification content
     type = Column(String(50), nullable=False)  # SYSTEM, USER, ALERT, REMINDER
@@ -36,16 +37,27 @@ class Notification(Base):
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, nullable=True, onupdate=datetime.utcnow)
     
+    # Set by the database: the inserting transaction and an insert sequence.
+    # Notification streams replay by these rather than created_at, which
+    # does not follow commit order
+    txid = Column(BigInteger, nullable=False, server_default=FetchedValue())
+    sequence_number = Column(BigInteger, nullable=False, server_default=FetchedValue())
+    
     # Relationships
-    recipient = relationship("User", foreign_keys=[recipient_id], back_populates="received_notifications")
-    sender = relationship("User", foreign_keys=[sender_id], back_populates="sent_notifications")
+    recipient = relationship("User", foreign_keys=[recipient_id])
+    sender = relationship("User", foreign_keys=[sender_id])
+    delivery_logs = relationship("NotificationLog", back_populates="notification", cascade="all, delete-orphan", passive_deletes=True)
+    
+    __table_args__ = (
+        Index('ix_notifications_recipient_txid', recipient_id, txid),
+    )
 
 class NotificationPreference(Base):
     """User notification preferences"""
     __tablename__ = "notification_preferences"
     
     id = Column(String, primary_key=True, index=True)
-    user_id = Column(String, ForeignKey("users.id"), nullable=False, unique=True)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, unique=True)
     
     # Global channel preferences
     email_enabled = Column(Boolean, default=True)
@@ -76,7 +88,7 @@ class NotificationPreference(Base):
     updated_at = Column(DateTime, nullable=True, onupdate=datetime.utcnow)
     
     # Relationships
-    user = relationship("User", back_populates="notification_preferences")
+    user = relationship("User", foreign_keys=[user_id])
 
 class NotificationTemplate(Base):
     """Notification template for consistent messaging"""
@@ -101,7 +113,7 @@ class NotificationTemplate(Base):
     is_system = Column(Boolean, default=False)  # System templates can't be deleted
     
     # Metadata
-    created_by = Column(String, ForeignKey("users.id"), nullable=False)
+    created_by = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, nullable=True, onupdate=datetime.utcnow)
     
@@ -136,7 +148,7 @@ class NotificationRule(Base):
     trigger_count = Column(Integer, default=0)
     
     # Metadata
-    created_by = Column(String, ForeignKey("users.id"), nullable=False)
+    created_by = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, nullable=True, onupdate=datetime.utcnow)
     
@@ -149,7 +161,7 @@ class NotificationLog(Base):
     __tablename__ = "notification_logs"
     
     id = Column(String, primary_key=True, index=True)
-    notification_id = Column(String, ForeignKey("notifications.id"), nullable=False, index=True)
+    notification_id = Column(String, ForeignKey("notifications.id", ondelete="CASCADE"), nullable=False, index=True)
     
     # Delivery details
     channel = Column(String(20), nullable=False)  # email, push, sms
@@ -177,7 +189,7 @@ class NotificationDigest(Base):
     __tablename__ = "notification_digests"
     
     id = Column(String, primary_key=True, index=True)
-    user_id = Column(String, ForeignKey("users.id"), nullable=False, index=True)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True)
     
     # Digest configuration
     frequency = Column(String(20), nullable=False)  # daily, weekly
@@ -198,14 +210,3 @@ class NotificationDigest(Base):
     
     # Relationships
     user = relationship("User", foreign_keys=[user_id])
-
-# Add relationship back references to User model
-# This would typically be added to the User model in app/models/user.py
-"""
-# Add these to User model:
-
-# Notification relationships
-received_notifications = relationship("Notification", foreign_keys="Notification.recipient_id", back_populates="recipient")
-sent_notifications = relationship("Notification", foreign_keys="Notification.sender_id", back_populates="sender")
-notification_preferences = relationship("NotificationPreference", uselist=False, back_populates="user")
-"""
\ No newline at end of file
@@ -0,0 +1,86 @@
+"""
+Change log backing mobile delta sync.
+
+Rows are written by database triggers on the synced tables (see migration
+c8e2a4f61d93), so every write path -- ORM, bulk statements, manual SQL --
+is recorded. Each row carries the id of the writing transaction, which lets
+readers page only through changes from transactions that have finished.
+"""
+
+from sqlalchemy import Column, String, DateTime, BigInteger, SmallInteger, Boolean, CheckConstraint, Identity, Index, func, Enum as SQLEnum
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+
+from app.database.base import Base
+from app.models.case import SensitivityLevel
+
+
+class SyncOperation:
+    UPSERT = "upsert"
+    DELETE = "delete"
+
+
+class SyncChange(Base):
+    """
+    One insert, update or delete of a synced entity.
+
+    ``version`` increases monotonically in write order; ``txid`` is the
+    writing transaction's 64-bit id. Sync cursors are ``(txid, version)``.
+    """
+    __tablename__ = "sync_changes"
+
+    version = Column(BigInteger, Identity(always=True), primary_key=True)
+    entity_type = Column(String(20), nullable=False)  # cases, tasks, evidence
+    entity_id = Column(UUID(as_uuid=True), nullable=False)
+    case_id = Column(UUID(as_uuid=True))  # Owning case, used for access filtering
+    operation = Column(String(10), nullable=False)  # upsert, delete
+    txid = Column(BigInteger, nullable=False)
+    changed_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    __table_args__ = (
+        Index('ix_sync_changes_type_txid_version', 'entity_type', 'txid', 'version'),
+        Index('ix_sync_changes_txid_version', 'txid', 'version'),
+        Index('ix_sync_changes_changed_at', 'changed_at'),
+    )
+
+
+class SyncPruneWatermark(Base):
+    """
+    Latest ``(txid, version)`` deleted from the change log.
+
+    Single row, moved forward by every prune. A client whose cursor is
+    below it may have missed pruned changes and must re-download.
+    """
+    __tablename__ = "sync_prune_watermark"
+
+    id = Column(SmallInteger, primary_key=True, default=1)
+    txid = Column(BigInteger, nullable=False)
+    version = Column(BigInteger, nullable=False)
+    pruned_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    __table_args__ = (
+        CheckConstraint('id = 1', name='ck_sync_prune_watermark_single_row'),
+    )
+
+
+class SyncCaseTombstone(Base):
+    """
+    Access attributes of a deleted case, as they were when it was deleted.
+
+    Written by the change log trigger (see migration f1b7d4a9c286). Deletes of
+    the case and its tasks and evidence are only sent to users who could see
+    the case, which can no longer be checked against ``cases``. Columns mirror
+    the ones ``get_user_accessible_cases_filter`` reads.
+    """
+    __tablename__ = "sync_case_tombstones"
+
+    case_id = Column(UUID(as_uuid=True), primary_key=True)
+    is_sensitive = Column(Boolean)
+    sensitivity_level = Column(SQLEnum(SensitivityLevel))
+    access_restrictions = Column(JSONB)
+    lead_investigator = Column(UUID(as_uuid=True))
+    created_by = Column(UUID(as_uuid=True))
+    deleted_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    __table_args__ = (
+        Index('ix_sync_case_tombstones_deleted_at', 'deleted_at'),
+    )
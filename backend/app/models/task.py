@@ -1,6 +1,7 @@
-from sqlalchemy import Column, String, Text, DateTime, Integer, ForeignKey, CheckConstraint, Enum as SQLEnum
+from sqlalchemy import Column, String, Text, DateTime, Integer, ForeignKey, CheckConstraint, Index, Enum as SQLEnum, func, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
+from app.database.base import Base
 from app.models.base import BaseModel
 import enum
 
@@ -24,9 +25,42 @@ class Task(BaseModel):
     status = Column(SQLEnum(TaskStatus), default=TaskStatus.OPEN)
     priority = Column(Integer, CheckConstraint("priority >= 1 AND priority <= 5"))
     
+    # SLA tracking (see app.utils.sla_engine)
+    sla_deadline = Column(DateTime(timezone=True))  # due_at, or the priority/template SLA from creation
+    sla_breached_at = Column(DateTime(timezone=True))  # Set once by the sweeper; cleared if the deadline moves out
+    escalation_level = Column(Integer, nullable=False, default=0, server_default="0")
+    
     # Relationships
     case = relationship("Case", back_populates="tasks")
     assignee = relationship("User", back_populates="tasks")
+    
+    __table_args__ = (
+        # Exactly the rows the SLA sweeper scans, ordered by deadline
+        Index(
+            "ix_tasks_sla_open", "sla_deadline",
+            postgresql_where=text("status <> 'DONE' AND sla_breached_at IS NULL")
+        ),
+        Index(
+            "ix_tasks_sla_breached_at", "sla_breached_at",
+            postgresql_where=text("sla_breached_at IS NOT NULL")
+        ),
+    )
+
+
+
+class TaskEdge(Base):
+    """Dependency edge: ``task_id`` cannot start before ``depends_on_id`` is done (see ``app.utils.task_graph``)."""
+    __tablename__ = "task_edges"
+    
+    task_id = Column(UUID(as_uuid=True), ForeignKey("tasks.id", ondelete="CASCADE"), primary_key=True)
+    depends_on_id = Column(UUID(as_uuid=True), ForeignKey("tasks.id", ondelete="CASCADE"), primary_key=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    __table_args__ = (
+        CheckConstraint("task_id <> depends_on_id", name="ck_task_edges_not_self"),
+        # Dependents of a task, looked up when it completes
+        Index("ix_task_edges_depends_on_id", "depends_on_id"),
+    )
 
 
 class ActionLog(BaseModel):
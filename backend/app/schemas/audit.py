@@ -259,6 +259,8 @@ class AuditSearchResponse(BaseModel):
     page: int = Field(..., description="Current page number")
     size: int = Field(..., description="Page size")
     pages: int = Field(..., description="Total number of pages")
+    start_date: datetime = Field(..., description="Start of the searched time range (defaulted when not given)")
+    end_date: datetime = Field(..., description="End of the searched time range")
 
 
 # Compliance report schemas
@@ -421,6 +423,7 @@ class AuditConfigurationResponse(AuditConfigurationBase):
 class AuditStatistics(BaseModel):
     """Audit statistics for dashboards."""
     total_entries: int = Field(..., description="Total audit log entries")
+    total_entries_estimated: bool = Field(False, description="Whether total_entries is the planner's estimate rather than an exact count")
     entries_today: int = Field(..., description="Audit entries created today")
     entries_this_week: int = Field(..., description="Audit entries created this week")
     entries_this_month: int = Field(..., description="Audit entries created this month")
@@ -428,6 +431,7 @@ class AuditStatistics(BaseModel):
     top_entities: List[Dict[str, Union[str, int]]] = Field(..., description="Most audited entities")
     top_users: List[Dict[str, Union[str, int]]] = Field(..., description="Most active users")
     severity_breakdown: Dict[str, int] = Field(..., description="Breakdown by severity")
+    window_days: int = Field(..., description="Days covered by the top and severity breakdowns")
 
 
 class ComplianceStatistics(BaseModel):
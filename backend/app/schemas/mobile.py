@@ -152,6 +152,7 @@ class MobileSyncRequest(BaseModel):
     """Request for data synchronization"""
     device_id: str
     last_sync_timestamp: Optional[datetime] = None
+    sync_cursor: Optional[str] = None  # Cursor from the previous sync response
     sync_entities: List[SyncEntityType] = []
     offline_actions: List[OfflineAction] = []
     full_sync: bool = False
@@ -166,6 +167,9 @@ class MobileSyncResponse(BaseModel):
     offline_action_results: List[Dict[str, Any]] = []
     next_sync_recommended: datetime
     server_time: datetime
+    sync_cursor: Optional[str] = None  # Send back on the next sync
+    has_more: bool = False  # More changes are waiting; sync again immediately
+    full_sync_required: bool = False  # Cursor missing or older than the change log
     sync_statistics: Dict[str, int] = {}
 
 # Batch and search schemas
@@ -181,7 +185,7 @@ class MobileBatchRequestItem(BaseModel):
 class MobileBatchRequest(BaseModel):
     """Batch request for multiple API calls"""
     batch_id: str
-    requests: List[MobileBatchRequestItem] = Field(..., min_items=1, max_items=10)
+    requests: List[MobileBatchRequestItem] = Field(..., min_items=1, max_items=50)  # See mobile_batch_max_requests
     sequential: bool = False  # Execute requests sequentially vs parallel
     stop_on_error: bool = False
 
@@ -1,10 +1,12 @@
 from pydantic import BaseModel, Field, field_validator
 from typing import List, Dict, Optional, Any, Union
 from datetime import datetime
+from uuid import UUID
+from app.config.settings import settings
 
 class NotificationCreate(BaseModel):
     """Create notification request"""
-    recipient_id: str
+    recipient_id: UUID
     type: str = Field(..., description="Notification type: SYSTEM, USER, ALERT, REMINDER")
     category: str = Field(..., description="Category: case_updates, evidence_alerts, deadlines, assignments")
     priority: str = Field(default="MEDIUM", description="Priority: LOW, MEDIUM, HIGH, CRITICAL")
@@ -40,8 +42,8 @@ class NotificationUpdate(BaseModel):
 class NotificationResponse(BaseModel):
     """Notification response"""
     id: str
-    recipient_id: str
-    sender_id: Optional[str]
+    recipient_id: UUID
+    sender_id: Optional[UUID]
     type: str
     category: str
     priority: str
@@ -63,7 +65,7 @@ class NotificationResponse(BaseModel):
 
 class BulkNotificationRequest(BaseModel):
     """Bulk notification request"""
-    recipient_ids: List[str] = Field(..., min_items=1, max_items=1000)
+    recipient_ids: List[str] = Field(..., min_items=1, max_items=settings.notification_bulk_max_recipients)
     type: str
     category: str
     priority: str = "MEDIUM"
@@ -94,7 +96,7 @@ class NotificationPreferenceCreate(BaseModel):
 class NotificationPreferenceResponse(BaseModel):
     """Notification preferences response"""
     id: str
-    user_id: str
+    user_id: UUID
     email_enabled: bool
     push_enabled: bool
     sms_enabled: bool
@@ -140,7 +142,7 @@ class NotificationTemplateResponse(BaseModel):
     default_priority: str
     is_active: bool
     is_system: bool
-    created_by: str
+    created_by: UUID
     created_at: datetime
     updated_at: Optional[datetime] = None
 
@@ -189,7 +191,7 @@ class AlertRuleResponse(BaseModel):
     is_active: bool
     last_triggered: Optional[datetime]
     trigger_count: int
-    created_by: str
+    created_by: UUID
     created_at: datetime
     updated_at: Optional[datetime] = None
 
@@ -221,7 +223,7 @@ class NotificationDigestConfig(BaseModel):
 class NotificationDigestResponse(BaseModel):
     """Notification digest response"""
     id: str
-    user_id: str
+    user_id: UUID
     frequency: str
     period_start: datetime
     period_end: datetime
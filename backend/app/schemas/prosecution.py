@@ -189,6 +189,25 @@ class ProsecutionSummaryResponse(BaseModel):
 
 # ==================== STATISTICS SCHEMAS ====================
 
+class CourtStatistics(BaseModel):
+    """Court session counts for a single court."""
+    court: Optional[str] = Field(None, description="Court name (null for sessions without a court)")
+    total_sessions: int = Field(..., description="Court sessions in period")
+    upcoming_sessions: int = Field(..., description="Sessions scheduled in the future")
+    cases: int = Field(..., description="Distinct cases heard")
+
+
+class ProsecutorStatistics(BaseModel):
+    """Charge counts for a single filing prosecutor."""
+    prosecutor_id: Optional[UUID] = Field(None, description="User who filed the charges")
+    prosecutor_name: Optional[str] = Field(None, description="Full name of the prosecutor")
+    total_charges: int = Field(..., description="Charges filed in period")
+    filed_charges: int = Field(..., description="Charges currently filed")
+    withdrawn_charges: int = Field(..., description="Withdrawn charges")
+    amended_charges: int = Field(..., description="Amended charges")
+    cases: int = Field(..., description="Distinct cases charged")
+
+
 class ChargeStatisticsResponse(BaseModel):
     """Schema for charge statistics and prosecution metrics."""
     total_charges: int = Field(..., description="Total number of charges in period")
@@ -200,6 +219,8 @@ class ChargeStatisticsResponse(BaseModel):
     conviction_rate: float = Field(..., description="Conviction rate as percentage")
     period_start: Optional[date] = Field(None, description="Statistics period start date")
     period_end: Optional[date] = Field(None, description="Statistics period end date")
+    by_court: List[CourtStatistics] = Field([], description="Busiest courts by sessions in period")
+    by_prosecutor: List[ProsecutorStatistics] = Field([], description="Prosecutors with the most charges in period")
     
     class Config:
         from_attributes = True
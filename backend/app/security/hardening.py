@@ -9,6 +9,7 @@ This module provides comprehensive security enhancements including:
 - Advanced audit security and intrusion detection
 """
 
+import functools
 import hashlib
 import hmac
 import re
@@ -18,7 +19,8 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional, Set, Callable
 from urllib.parse import quote_plus, unquote_plus
 import ipaddress
-import jwt
+from jose import jwt
+from jose.exceptions import ExpiredSignatureError, JWTError
 from fastapi import Request, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
@@ -26,12 +28,12 @@ import redis
 import logging
 from pydantic import BaseModel, validator
 
-from app.core.config import get_settings
+from app.config.settings import settings
 from app.models import User, AuditLog
-from app.schemas.audit import AuditLevel
+from app.schemas.audit import AuditSeverity
+from app.security.revocation import TokenRevocationFilter, revocation_filter
 
 logger = logging.getLogger(__name__)
-settings = get_settings()
 
 
 class SecurityConfig(BaseModel):
@@ -80,7 +82,7 @@ class RateLimiter:
         try:
             import redis
             self.redis_client = redis_client or redis.from_url(
-                settings.REDIS_URL or "redis://localhost:6379/1"
+                settings.redis_url
             )
             self.enabled = True
             logger.info("Rate limiter enabled with Redis backend")
@@ -321,39 +323,30 @@ class InputSanitizer:
 class EnhancedJWTSecurity:
     """
     Enhanced JWT security with token blacklisting and advanced features.
+    
+    Revocation checks are answered from the worker's in-memory
+    :class:`~app.security.revocation.TokenRevocationFilter`, which is kept in
+    sync with the other workers through Redis.
     """
     
-    def __init__(self, redis_client=None):
-        try:
-            import redis
-            self.redis_client = redis_client or redis.from_url(
-                settings.REDIS_URL or "redis://localhost:6379/2"
-            )
-            self.enabled = True
-        except Exception:
-            self.redis_client = None
-            self.enabled = False
-            self._blacklist = set()
+    def __init__(self, revocations: Optional[TokenRevocationFilter] = None):
+        self.revocations = revocations or revocation_filter
     
-    def blacklist_token(self, token_jti: str, expiry_timestamp: int):
-        """Add token to blacklist."""
+    async def blacklist_token(self, token_jti: str, expiry_timestamp: int):
+        """Add token to blacklist and propagate it to all workers."""
         if not security_config.jwt_blacklist_enabled:
             return
         
-        if self.redis_client:
-            self.redis_client.setex(f"blacklist:{token_jti}", expiry_timestamp - int(time.time()), "1")
-        else:
-            self._blacklist.add(token_jti)
+        await self.revocations.revoke(token_jti, int(expiry_timestamp))
     
-    def is_token_blacklisted(self, token_jti: str) -> bool:
-        """Check if token is blacklisted."""
+    def is_token_blacklisted(self, token_jti: str, expiry_timestamp: Optional[int] = None) -> bool:
+        """Check if token is blacklisted (local lookup, no network round trip)."""
         if not security_config.jwt_blacklist_enabled:
             return False
         
-        if self.redis_client:
-            return bool(self.redis_client.get(f"blacklist:{token_jti}"))
-        else:
-            return token_jti in self._blacklist
+        return self.revocations.contains(
+            token_jti, int(expiry_timestamp) if expiry_timestamp is not None else None
+        )
     
     def generate_secure_token(self, payload: Dict[str, Any], token_type: str = "access") -> str:
         """Generate enhanced secure JWT token."""
@@ -378,7 +371,7 @@ class EnhancedJWTSecurity:
         # Sign with algorithm and secret
         token = jwt.encode(
             enhanced_payload,
-            settings.SECRET_KEY,
+            settings.secret_key,
             algorithm="HS256"
         )
         
@@ -390,7 +383,7 @@ class EnhancedJWTSecurity:
             # Decode token
             payload = jwt.decode(
                 token,
-                settings.SECRET_KEY,
+                settings.secret_key,
                 algorithms=["HS256"],
                 audience="jctc-api",
                 issuer="jctc-system"
@@ -398,20 +391,20 @@ class EnhancedJWTSecurity:
             
             # Verify token type
             if payload.get("type") != token_type:
-                raise jwt.InvalidTokenError("Invalid token type")
+                raise JWTError("Invalid token type")
             
             # Check if token is blacklisted
-            if self.is_token_blacklisted(payload.get("jti")):
-                raise jwt.InvalidTokenError("Token has been revoked")
+            if self.is_token_blacklisted(payload.get("jti"), payload.get("exp")):
+                raise JWTError("Token has been revoked")
             
             return payload
             
-        except jwt.ExpiredSignatureError:
+        except ExpiredSignatureError:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Token has expired"
             )
-        except jwt.InvalidTokenError as e:
+        except JWTError as e:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail=f"Invalid token: {str(e)}"
@@ -489,7 +482,7 @@ class SecurityMonitor:
         user_id: Optional[int],
         client_ip: str,
         details: Dict[str, Any],
-        severity: AuditLevel = AuditLevel.WARNING
+        severity: AuditSeverity = AuditSeverity.MEDIUM
     ):
         """Log security-related event."""
         try:
@@ -497,8 +490,8 @@ class SecurityMonitor:
                 audit_log = AuditLog(
                     user_id=user_id,
                     action="SECURITY_EVENT",
-                    entity="SYSTEM",
-                    level=severity,
+                    entity_type="SYSTEM",
+                    severity=severity.value,
                     description=f"Security event: {event_type}",
                     details={
                         "event_type": event_type,
@@ -547,7 +540,7 @@ class SecurityMonitor:
                     "failed_attempts": failed_attempts,
                     "lockout_duration_minutes": security_config.account_lockout_minutes
                 },
-                AuditLevel.CRITICAL
+                AuditSeverity.CRITICAL
             )
             return True
         
@@ -588,7 +581,7 @@ class SecurityMonitor:
                     "activity_types": [a["activity_type"] for a in activities[-5:]],
                     "time_window_hours": 1
                 },
-                AuditLevel.HIGH
+                AuditSeverity.HIGH
             )
             return True
         
@@ -600,7 +593,7 @@ class SecurityMonitor:
                 user_id,
                 client_ip,
                 {"unique_activity_types": list(unique_types)},
-                AuditLevel.HIGH
+                AuditSeverity.HIGH
             )
             return True
         
@@ -623,7 +616,7 @@ def require_secure_headers(func: Callable):
         
         if request:
             # Enforce HTTPS in production
-            if settings.ENVIRONMENT == "production" and request.url.scheme != "https":
+            if not settings.debug and request.url.scheme != "https":
                 raise HTTPException(
                     status_code=status.HTTP_426_UPGRADE_REQUIRED,
                     detail="HTTPS required"
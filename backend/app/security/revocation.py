@@ -0,0 +1,243 @@
+"""
+Per-worker JWT revocation filter kept in sync through Redis.
+
+Every worker process holds the set of revoked token IDs in memory, so checking
+a token costs a dictionary lookup instead of a Redis round trip. Entries are
+stored as 64-bit fingerprints in time buckets keyed by the token's expiry;
+whole buckets are dropped once every token in them has expired, so the filter
+only ever holds revocations that can still matter.
+
+Propagation between workers:
+- ``revoke`` records the token in the ``{prefix}:tokens`` sorted set (scored by
+  expiry), bumps the ``{prefix}:epoch`` counter and publishes on
+  ``{prefix}:channel``; subscribed workers apply it immediately
+- Every ``sync_interval_seconds`` each worker compares the epoch with the one it
+  last loaded and reloads the sorted set when they differ, so a missed pub/sub
+  message (reconnect, slow consumer) is repaired within that bound
+
+Without Redis (``jwt_revocation_redis_enabled`` off) the filter still works,
+but a revocation only applies in the worker that handled the logout.
+"""
+
+import asyncio
+import hashlib
+import logging
+import time
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from app.config.settings import settings
+from app.utils.metrics import metrics_registry
+
+logger = logging.getLogger(__name__)
+
+
+def token_fingerprint(jti: str) -> int:
+    """64-bit fingerprint of a token ID; collisions are negligible at revocation volumes."""
+    return int.from_bytes(hashlib.blake2b(jti.encode(), digest_size=8).digest(), "big")
+
+
+def encode_revocation(jti: str, expires_at: int) -> str:
+    return f"{int(expires_at)}:{jti}"
+
+
+def decode_revocation(value) -> Optional[Tuple[str, int]]:
+    if isinstance(value, bytes):
+        value = value.decode()
+    expires_at, separator, jti = value.partition(":")
+    if not separator or not jti or not expires_at.isdigit():
+        return None
+    return jti, int(expires_at)
+
+
+class TokenRevocationFilter:
+    """
+    Time-bucketed set of revoked token fingerprints for one worker.
+
+    Lookups are O(1) when the token's expiry is known (it always is once the
+    JWT has been decoded); without it every live bucket is checked.
+    """
+
+    def __init__(
+        self,
+        redis_url: Optional[str] = None,
+        key_prefix: str = "jwt:revoked",
+        bucket_seconds: int = 300,
+        sync_interval_seconds: float = 5.0,
+        use_redis: bool = True
+    ):
+        self.key_prefix = key_prefix
+        self.bucket_seconds = max(1, int(bucket_seconds))
+        self.sync_interval_seconds = sync_interval_seconds
+        self.tokens_key = f"{key_prefix}:tokens"
+        self.epoch_key = f"{key_prefix}:epoch"
+        self.channel = f"{key_prefix}:channel"
+
+        self._buckets: Dict[int, Set[int]] = {}
+        self._epoch: Optional[int] = None
+        self._tasks = []
+        self.redis_client = None
+
+        if use_redis:
+            try:
+                import redis.asyncio as aioredis
+                self.redis_client = aioredis.from_url(redis_url or settings.redis_url)
+            except Exception as e:
+                logger.warning(f"Token revocations are process-local, Redis unavailable: {e}")
+                self.redis_client = None
+
+    def _bucket(self, expires_at: int) -> int:
+        return int(expires_at) // self.bucket_seconds
+
+    def add(self, jti: str, expires_at: int, now: Optional[float] = None):
+        """Record a revocation locally; already-expired tokens are ignored."""
+        if expires_at <= (now or time.time()):
+            return
+        self._buckets.setdefault(self._bucket(expires_at), set()).add(token_fingerprint(jti))
+
+    def contains(self, jti: str, expires_at: Optional[int] = None) -> bool:
+        """Whether ``jti`` has been revoked. Never touches the network."""
+        if not self._buckets or not jti:
+            return False
+        fingerprint = token_fingerprint(jti)
+        if expires_at is not None:
+            bucket = self._buckets.get(self._bucket(expires_at))
+            return bucket is not None and fingerprint in bucket
+        return any(fingerprint in bucket for bucket in self._buckets.values())
+
+    def prune(self, now: Optional[float] = None) -> int:
+        """Drop buckets whose tokens have all expired. Returns fingerprints removed."""
+        current = self._bucket(now or time.time())
+        expired = [bucket for bucket in self._buckets if bucket < current]
+        removed = 0
+        for bucket in expired:
+            removed += len(self._buckets.pop(bucket))
+        return removed
+
+    def size(self) -> int:
+        return sum(len(bucket) for bucket in self._buckets.values())
+
+    def replace(self, revocations: Iterable[Tuple[str, int]], now: Optional[float] = None):
+        """Rebuild the filter from a full list of ``(jti, expires_at)``."""
+        now = now or time.time()
+        buckets: Dict[int, Set[int]] = {}
+        for jti, expires_at in revocations:
+            if expires_at > now:
+                buckets.setdefault(self._bucket(expires_at), set()).add(token_fingerprint(jti))
+        self._buckets = buckets
+
+    async def revoke(self, jti: str, expires_at: int):
+        """Revoke a token in this worker and broadcast it to all others."""
+        self.add(jti, expires_at)
+        if not self.redis_client:
+            return
+
+        member = encode_revocation(jti, expires_at)
+        try:
+            pipe = self.redis_client.pipeline()
+            pipe.zadd(self.tokens_key, {member: int(expires_at)})
+            pipe.zremrangebyscore(self.tokens_key, "-inf", int(time.time()))
+            pipe.incr(self.epoch_key)
+            pipe.publish(self.channel, member)
+            await pipe.execute()
+        except Exception as e:
+            # The revocation still applies here; other workers converge once
+            # Redis is reachable and the token is revoked again or re-synced
+            logger.error(f"Failed to propagate token revocation: {e}")
+
+    async def sync(self, force: bool = False) -> bool:
+        """
+        Reload revocations from Redis if the epoch moved since the last load.
+
+        Returns True when the filter was reloaded.
+        """
+        self.prune()
+        if not self.redis_client:
+            return False
+
+        epoch = int(await self.redis_client.get(self.epoch_key) or 0)
+        if not force and epoch == self._epoch:
+            return False
+
+        members = await self.redis_client.zrangebyscore(self.tokens_key, int(time.time()), "+inf")
+        self.replace(filter(None, (decode_revocation(member) for member in members)))
+        self._epoch = epoch
+        return True
+
+    async def start(self):
+        """Load current revocations and start the subscriber and epoch poller."""
+        if not self.redis_client or self._tasks:
+            return
+        try:
+            await self.sync(force=True)
+        except Exception as e:
+            logger.error(f"Initial token revocation sync failed: {e}")
+        self._tasks = [
+            asyncio.create_task(self._subscribe()),
+            asyncio.create_task(self._poll()),
+        ]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks = []
+
+    async def _subscribe(self):
+        backoff = 1.0
+        while True:
+            pubsub = self.redis_client.pubsub()
+            try:
+                await pubsub.subscribe(self.channel)
+                # Anything published while we were not subscribed is picked up here
+                await self.sync(force=True)
+                backoff = 1.0
+                async for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    revocation = decode_revocation(message["data"])
+                    if revocation:
+                        self.add(*revocation)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                revocation_sync_failures_total.inc(source="pubsub")
+                logger.warning(f"Token revocation subscription lost, retrying in {backoff:.0f}s: {e}")
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 60.0)
+            finally:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+
+    async def _poll(self):
+        while True:
+            await asyncio.sleep(self.sync_interval_seconds)
+            try:
+                await self.sync()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                revocation_sync_failures_total.inc(source="poll")
+                logger.warning(f"Token revocation sync failed: {e}")
+
+
+# Global filter instance (started on application startup)
+revocation_filter = TokenRevocationFilter(
+    bucket_seconds=settings.jwt_revocation_bucket_seconds,
+    sync_interval_seconds=settings.jwt_revocation_sync_interval_seconds,
+    use_redis=settings.jwt_revocation_redis_enabled
+)
+
+revoked_tokens_tracked = metrics_registry.gauge(
+    "revoked_tokens_tracked", "Unexpired revoked tokens held in memory (lowest across workers)",
+    multiprocess_mode="min"
+)
+revoked_tokens_tracked.set_function(revocation_filter.size)
+revocation_sync_failures_total = metrics_registry.counter(
+    "revocation_sync_failures_total", "Failed token revocation sync attempts", ("source",)
+)
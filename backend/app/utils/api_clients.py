@@ -21,7 +21,7 @@ from typing import Any, Dict, List, Optional, Union, Callable
 from urllib.parse import urljoin, urlparse
 
 import httpx
-import jwt
+from jose import jwt
 from pydantic import BaseModel, Field
 
 logger = logging.getLogger(__name__)
@@ -150,7 +150,7 @@ class APIResponse(BaseModel):
     headers: Dict[str, str]
     content: bytes
     text: Optional[str] = None
-    json_data: Optional[Dict[str, Any]] = None
+    json_data: Optional[Union[Dict[str, Any], List[Any]]] = None
     request_id: Optional[str] = None
     response_time_ms: float
     from_cache: bool = False
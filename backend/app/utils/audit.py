@@ -9,21 +9,25 @@ This module provides:
 - Data retention and archival management
 """
 
+import asyncio
 import uuid
 import hashlib
 import json
 import logging
+import time
 import traceback
-from datetime import datetime, timedelta
-from typing import Optional, Dict, Any, List, Union
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Dict, Any, List, Union, Callable
 from contextlib import contextmanager
 from functools import wraps
 from threading import local
 
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func, desc
+from sqlalchemy import and_, or_, func, desc, select, text
 from fastapi import Request, HTTPException
-from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.config.settings import settings
+from app.utils.metrics import metrics_registry
 
 from app.models.audit import (
     AuditLog, ComplianceViolation, AuditConfiguration, 
@@ -41,6 +45,20 @@ _context = local()
 # Logger for audit system
 logger = logging.getLogger(__name__)
 
+# Records the audit sink could not persist (queue overflow, failed writes)
+overflow_logger = logging.getLogger("app.audit.overflow")
+
+# HTTP method to audit action mapping for request auditing
+HTTP_METHOD_ACTIONS = {
+    'GET': AuditAction.READ,
+    'POST': AuditAction.CREATE,
+    'PUT': AuditAction.UPDATE,
+    'PATCH': AuditAction.UPDATE,
+    'DELETE': AuditAction.DELETE
+}
+
+HIGH_RISK_METHODS = ('POST', 'PUT', 'PATCH', 'DELETE')
+
 
 class AuditContext:
     """Context manager for audit trail correlation and enrichment."""
@@ -221,11 +239,20 @@ class AuditService:
             sort_order: Sort order (asc/desc)
         
         Returns:
-            Dictionary with audit logs and pagination info
+            Dictionary with audit logs, pagination info and the time range
+            searched. Without ``filters.start_date`` only the last
+            ``audit_search_default_days`` days are searched; pass an explicit
+            start date to search further back.
         """
         try:
             query = self.db.query(AuditLog)
             
+            # audit_logs is partitioned by month on timestamp; always bound the
+            # time range so only the relevant partitions are scanned
+            end_date = filters.end_date or datetime.now(timezone.utc)
+            start_date = filters.start_date or (end_date - timedelta(days=settings.audit_search_default_days))
+            query = query.filter(AuditLog.timestamp >= start_date, AuditLog.timestamp <= end_date)
+            
             # Apply filters
             if filters.user_id:
                 query = query.filter(AuditLog.user_id == filters.user_id)
@@ -242,12 +269,6 @@ class AuditService:
             if filters.severity:
                 query = query.filter(AuditLog.severity == filters.severity)
             
-            if filters.start_date:
-                query = query.filter(AuditLog.timestamp >= filters.start_date)
-            
-            if filters.end_date:
-                query = query.filter(AuditLog.timestamp <= filters.end_date)
-            
             if filters.ip_address:
                 query = query.filter(AuditLog.ip_address == filters.ip_address)
             
@@ -284,7 +305,9 @@ class AuditService:
                 'total': total,
                 'page': page,
                 'size': size,
-                'pages': (total + size - 1) // size
+                'pages': (total + size - 1) // size,
+                'start_date': start_date,
+                'end_date': end_date
             }
             
         except Exception as e:
@@ -356,48 +379,70 @@ class AuditService:
             raise HTTPException(status_code=500, detail="Integrity verification failed")
     
     def get_audit_statistics(self) -> Dict[str, Any]:
-        """Get comprehensive audit statistics for dashboards."""
+        """
+        Get comprehensive audit statistics for dashboards.
+        
+        Breakdowns cover the last ``audit_statistics_window_days`` days so they
+        are served from recent partitions only; ``total_entries`` is the
+        planner's row estimate summed over all partitions.
+        """
         try:
-            now = datetime.utcnow()
+            now = datetime.now(timezone.utc)
             today = now.replace(hour=0, minute=0, second=0, microsecond=0)
             week_start = today - timedelta(days=today.weekday())
             month_start = today.replace(day=1)
-            
-            # Basic counts
-            total_entries = self.db.query(AuditLog).count()
-            entries_today = self.db.query(AuditLog).filter(AuditLog.timestamp >= today).count()
-            entries_this_week = self.db.query(AuditLog).filter(AuditLog.timestamp >= week_start).count()
-            entries_this_month = self.db.query(AuditLog).filter(AuditLog.timestamp >= month_start).count()
+            window_start = now - timedelta(days=settings.audit_statistics_window_days)
+            
+            # Estimated total across partitions (an exact count would scan them all)
+            total_entries = int(self.db.execute(text("""
+                SELECT COALESCE(SUM(GREATEST(child.reltuples, 0)), 0)
+                FROM pg_inherits
+                JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+                JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+                WHERE parent.relname = 'audit_logs'
+            """)).scalar() or 0)
+            
+            # Period counts in one pass over the partitions since the earliest period start
+            period_counts = self.db.query(
+                func.count(AuditLog.id).filter(AuditLog.timestamp >= today),
+                func.count(AuditLog.id).filter(AuditLog.timestamp >= week_start),
+                func.count(AuditLog.id).filter(AuditLog.timestamp >= month_start)
+            ).filter(AuditLog.timestamp >= min(week_start, month_start)).one()
+            entries_today, entries_this_week, entries_this_month = period_counts
+            
+            recent = AuditLog.timestamp >= window_start
             
             # Top actions
             top_actions = self.db.query(
                 AuditLog.action,
                 func.count(AuditLog.id).label('count')
-            ).group_by(AuditLog.action).order_by(desc('count')).limit(10).all()
+            ).filter(recent).group_by(AuditLog.action).order_by(desc('count')).limit(10).all()
             
             # Top entities
             top_entities = self.db.query(
                 AuditLog.entity_type,
                 func.count(AuditLog.id).label('count')
-            ).group_by(AuditLog.entity_type).order_by(desc('count')).limit(10).all()
+            ).filter(recent).group_by(AuditLog.entity_type).order_by(desc('count')).limit(10).all()
             
             # Top users
             top_users = self.db.query(
                 AuditLog.user_id,
                 func.count(AuditLog.id).label('count')
-            ).filter(AuditLog.user_id.isnot(None)).group_by(AuditLog.user_id).order_by(desc('count')).limit(10).all()
+            ).filter(recent, AuditLog.user_id.isnot(None)).group_by(AuditLog.user_id).order_by(desc('count')).limit(10).all()
             
             # Severity breakdown
             severity_breakdown = dict(self.db.query(
                 AuditLog.severity,
                 func.count(AuditLog.id).label('count')
-            ).group_by(AuditLog.severity).all())
+            ).filter(recent).group_by(AuditLog.severity).all())
             
             return {
                 'total_entries': total_entries,
+                'total_entries_estimated': True,
                 'entries_today': entries_today,
                 'entries_this_week': entries_this_week,
                 'entries_this_month': entries_this_month,
+                'window_days': settings.audit_statistics_window_days,
                 'top_actions': [{'action': action, 'count': count} for action, count in top_actions],
                 'top_entities': [{'entity': entity, 'count': count} for entity, count in top_entities],
                 'top_users': [{'user_id': str(user_id), 'count': count} for user_id, count in top_users],
@@ -603,51 +648,349 @@ def audit_action(
     return decorator
 
 
-class AuditMiddleware(BaseHTTPMiddleware):
+class AuditRequestRecord:
     """
-    FastAPI middleware for automatic audit context setup and request logging.
+    HTTP request audit context captured on the request path.
+
+    Holds only plain values so it can be queued cheaply; conversion to an
+    ``AuditLog`` row happens in the background sink.
     """
     
-    def __init__(self, app, db_session_factory):
-        super().__init__(app)
-        self.db_session_factory = db_session_factory
+    __slots__ = (
+        'method', 'path', 'query_string', 'status_code', 'duration_ms',
+        'ip_address', 'user_agent', 'content_type', 'session_id',
+        'correlation_id', 'response_size', 'error', 'error_type', 'timestamp'
+    )
+    
+    def __init__(self, method: str, path: str, correlation_id: str):
+        self.method = method
+        self.path = path
+        self.correlation_id = correlation_id
+        self.query_string = None
+        self.status_code = None
+        self.duration_ms = None
+        self.ip_address = None
+        self.user_agent = None
+        self.content_type = None
+        self.session_id = None
+        self.response_size = None
+        self.error = None
+        self.error_type = None
+        self.timestamp = None
     
-    async def dispatch(self, request: Request, call_next):
-        # Generate correlation ID
-        correlation_id = request.headers.get('X-Correlation-ID') or str(uuid.uuid4())
+    def to_audit_log(self, high_risk_methods=HIGH_RISK_METHODS) -> AuditLog:
+        """Build the audit log row for this request."""
+        if self.error:
+            severity = AuditSeverity.HIGH
+            description = f"HTTP {self.method} {self.path} failed: {self.error}"
+        else:
+            severity = AuditSeverity.MEDIUM if self.method in high_risk_methods else AuditSeverity.LOW
+            description = f"HTTP {self.method} {self.path} - {self.status_code or 'unknown'}"
+        
+        details = {
+            'method': self.method,
+            'path': self.path,
+            'query_string': self.query_string or None,
+            'status_code': self.status_code,
+            'duration_ms': self.duration_ms,
+            'user_agent': self.user_agent,
+            'content_type': self.content_type,
+            'response_size': self.response_size,
+        }
+        if self.error:
+            details['error'] = self.error
+            details['error_type'] = self.error_type
         
-        # Set up audit context
-        context = AuditContext.from_request(request)
-        _context.audit_context = context
+        return AuditLog(
+            action=HTTP_METHOD_ACTIONS.get(self.method, AuditAction.READ).value,
+            entity_type=AuditEntity.SYSTEM.value,
+            description=description,
+            details=details,
+            severity=severity.value,
+            session_id=self.session_id,
+            ip_address=self.ip_address,
+            user_agent=self.user_agent,
+            correlation_id=self.correlation_id,
+            timestamp=self.timestamp
+        )
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert record to dictionary."""
+        data = {field: getattr(self, field) for field in self.__slots__}
+        data['timestamp'] = self.timestamp.isoformat() if self.timestamp else None
+        return data
+
+
+class AuditSink:
+    """
+    Bounded background writer for HTTP request audit records.
+    
+    The request path only enqueues an ``AuditRequestRecord``; a single writer
+    task drains the queue in batches, chains checksums and commits each batch
+    in one transaction.
+    
+    Backpressure when the queue is full is governed by ``overflow_policy``:
+    
+    - ``block``: wait up to ``block_timeout_seconds`` for space, then spill
+    - ``drop_newest``: spill the incoming record immediately
+    - ``drop_oldest``: spill the oldest queued record to make room
+    
+    Spilled records (and batches that fail to commit after retries) are
+    written to the ``app.audit.overflow`` logger as JSON so they still reach
+    the log pipeline and can be replayed.
+    """
+    
+    OVERFLOW_POLICIES = ('block', 'drop_newest', 'drop_oldest')
+    
+    def __init__(
+        self,
+        session_factory: Optional[Callable] = None,
+        max_queue_size: int = 10000,
+        batch_size: int = 200,
+        overflow_policy: str = 'block',
+        block_timeout_seconds: float = 0.05,
+        max_retries: int = 3
+    ):
+        if overflow_policy not in self.OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown audit overflow policy: {overflow_policy}")
+        self.session_factory = session_factory
+        self.max_queue_size = max_queue_size
+        self.batch_size = batch_size
+        self.overflow_policy = overflow_policy
+        self.block_timeout_seconds = block_timeout_seconds
+        self.max_retries = max_retries
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self.stats = {'enqueued': 0, 'written': 0, 'spilled': 0, 'failed_batches': 0}
+    
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+    
+    def depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+    
+    async def start(self):
+        """Start the background writer."""
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._task = asyncio.create_task(self._run())
+        logger.info(
+            f"Audit sink started (queue={self.max_queue_size}, batch={self.batch_size}, "
+            f"policy={self.overflow_policy})"
+        )
+    
+    async def stop(self):
+        """Stop the writer after flushing queued records."""
+        if not self.running:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
         
-        # Add correlation ID to response headers
-        response = await call_next(request)
-        response.headers['X-Correlation-ID'] = correlation_id
+        # Final drain so queued records are not lost on shutdown
+        while not self._queue.empty():
+            await self._write_with_retry(self._drain_batch())
+    
+    async def submit(self, record: AuditRequestRecord):
+        """Queue a record, applying the overflow policy when the queue is full."""
+        if not self.running:
+            self._spill([record], "sink not running")
+            return
         
-        # Log HTTP request (for high-risk endpoints)
-        if self._should_audit_request(request):
-            with self.db_session_factory() as db:
-                audit_service = AuditService(db)
-                audit_service.log_action(
-                    action=AuditAction.READ if request.method == "GET" else AuditAction.UPDATE,
-                    entity_type=AuditEntity.SYSTEM,
-                    description=f"HTTP {request.method} {request.url.path}",
-                    details={
-                        'method': request.method,
-                        'path': request.url.path,
-                        'status_code': response.status_code
-                    },
-                    severity=AuditSeverity.LOW,
-                    context=context
-                )
+        try:
+            self._queue.put_nowait(record)
+            self.stats['enqueued'] += 1
+            return
+        except asyncio.QueueFull:
+            pass
         
-        return response
+        if self.overflow_policy == 'block':
+            try:
+                await asyncio.wait_for(self._queue.put(record), self.block_timeout_seconds)
+                self.stats['enqueued'] += 1
+            except asyncio.TimeoutError:
+                self._spill([record], "queue full")
+        elif self.overflow_policy == 'drop_oldest':
+            try:
+                self._spill([self._queue.get_nowait()], "queue full")
+            except asyncio.QueueEmpty:
+                pass
+            self._queue.put_nowait(record)
+            self.stats['enqueued'] += 1
+        else:
+            self._spill([record], "queue full")
+    
+    def _drain_batch(self) -> List[AuditRequestRecord]:
+        batch = []
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+        return batch
+    
+    async def _run(self):
+        while True:
+            batch = [await self._queue.get()]
+            batch.extend(self._drain_batch())
+            await self._write_with_retry(batch)
+    
+    async def _write_with_retry(self, batch: List[AuditRequestRecord]):
+        if not batch:
+            return
+        for attempt in range(self.max_retries):
+            try:
+                await self.write_batch(batch)
+                self.stats['written'] += len(batch)
+                return
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Audit batch write failed (attempt {attempt + 1}/{self.max_retries}): {str(e)}")
+                await asyncio.sleep(min(2 ** attempt * 0.5, 5))
+        self.stats['failed_batches'] += 1
+        self._spill(batch, "write failed")
+    
+    async def write_batch(self, batch: List[AuditRequestRecord]):
+        """Persist a batch of records in a single transaction."""
+        if self.session_factory is None:
+            from app.database.base import AsyncSessionLocal
+            self.session_factory = AsyncSessionLocal
+        
+        async with self.session_factory() as db:
+            result = await db.execute(
+                select(AuditLog.checksum).order_by(desc(AuditLog.timestamp)).limit(1)
+            )
+            previous_checksum = result.scalar_one_or_none()
+            
+            for record in batch:
+                audit_log = record.to_audit_log()
+                audit_log.previous_checksum = previous_checksum
+                previous_checksum = audit_log.checksum
+                db.add(audit_log)
+            
+            await db.commit()
+    
+    def _spill(self, records: List[AuditRequestRecord], reason: str):
+        self.stats['spilled'] += len(records)
+        audit_records_spilled_total.inc(len(records), reason=reason)
+        for record in records:
+            overflow_logger.warning(json.dumps(
+                {'reason': reason, 'audit': record.to_dict()}, default=str
+            ))
+
+
+class AuditMiddleware:
+    """
+    Pure ASGI middleware for correlation IDs and HTTP request auditing.
+    
+    Every response gets an ``X-Correlation-ID`` header. Requests matching
+    ``sensitive_paths`` (or ``high_risk_methods``) are captured as an
+    ``AuditRequestRecord`` and handed to the audit sink once the response has
+    been sent, so no database work happens on the request path.
+    """
+    
+    sensitive_paths = (
+        '/auth/', '/admin/', '/users/', '/integrations/',
+        '/evidence/', '/cases/', '/audit/'
+    )
+    high_risk_methods: tuple = ()
     
-    def _should_audit_request(self, request: Request) -> bool:
+    def __init__(self, app, sink: Optional[AuditSink] = None):
+        self.app = app
+        self.sink = sink or audit_sink
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        correlation_id = None
+        for name, value in scope["headers"]:
+            if name == b"x-correlation-id":
+                correlation_id = value.decode("latin-1")
+                break
+        if correlation_id is None:
+            correlation_id = uuid.uuid4().hex
+        
+        state = scope.setdefault("state", {})
+        state["correlation_id"] = correlation_id
+        
+        if not self._should_audit_request(scope):
+            async def send_with_correlation_id(message):
+                if message["type"] == "http.response.start":
+                    message.setdefault("headers", []).append(
+                        (b"x-correlation-id", correlation_id.encode("latin-1"))
+                    )
+                await send(message)
+            
+            await self.app(scope, receive, send_with_correlation_id)
+            return
+        
+        record = AuditRequestRecord(scope["method"], scope["path"], correlation_id)
+        start = time.perf_counter()
+        
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                record.status_code = message["status"]
+                headers = message.setdefault("headers", [])
+                for name, value in headers:
+                    if name == b"content-length":
+                        record.response_size = value.decode("latin-1")
+                        break
+                headers.append((b"x-correlation-id", correlation_id.encode("latin-1")))
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as e:
+            record.error = str(e)
+            record.error_type = type(e).__name__
+            raise
+        finally:
+            record.duration_ms = round((time.perf_counter() - start) * 1000, 2)
+            record.timestamp = datetime.now(timezone.utc)
+            self._capture_request_context(scope, record)
+            await self.sink.submit(record)
+    
+    def _capture_request_context(self, scope, record: AuditRequestRecord):
+        """Copy client address and selected headers into the record."""
+        client = scope.get("client")
+        record.ip_address = client[0] if client else None
+        record.query_string = scope.get("query_string", b"").decode("latin-1")
+        for name, value in scope["headers"]:
+            if name == b"user-agent":
+                record.user_agent = value.decode("latin-1")
+            elif name == b"content-type":
+                record.content_type = value.decode("latin-1")
+            elif name == b"x-session-id":
+                record.session_id = value.decode("latin-1")
+    
+    def _should_audit_request(self, scope) -> bool:
         """Determine if HTTP request should be audited."""
-        # Audit sensitive endpoints
-        sensitive_paths = [
-            '/auth/', '/admin/', '/users/', '/integrations/',
-            '/evidence/', '/cases/', '/audit/'
-        ]
-        return any(path in request.url.path for path in sensitive_paths)
\ No newline at end of file
+        path = scope["path"]
+        if any(sensitive in path for sensitive in self.sensitive_paths):
+            return True
+        return scope["method"] in self.high_risk_methods
+
+
+# Global audit sink instance (started on application startup)
+audit_sink = AuditSink(
+    max_queue_size=settings.audit_sink_queue_size,
+    batch_size=settings.audit_sink_batch_size,
+    overflow_policy=settings.audit_sink_overflow_policy,
+    block_timeout_seconds=settings.audit_sink_block_timeout_ms / 1000
+)
+
+audit_sink_queue_depth = metrics_registry.gauge(
+    "audit_sink_queue_depth", "HTTP audit records waiting to be written"
+)
+audit_sink_queue_depth.set_function(audit_sink.depth)
+audit_records_spilled_total = metrics_registry.counter(
+    "audit_records_spilled_total", "HTTP audit records diverted to the overflow log", ("reason",)
+)
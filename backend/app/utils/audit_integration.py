@@ -9,12 +9,10 @@ major code changes.
 import functools
 import inspect
 import uuid
-from datetime import datetime
 from typing import Dict, Any, Optional, Callable
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
+from fastapi import Request
 
-from app.utils.audit import AuditService, AuditContext
+from app.utils.audit import AuditService, AuditContext, AuditMiddleware, AuditSink, HIGH_RISK_METHODS
 from app.schemas.audit import AuditAction, AuditEntity, AuditSeverity
 from app.database.session import get_db
 from app.models.users import User
@@ -163,165 +161,37 @@ class AuditableEndpoint:
         return str(data) if data is not None else None
 
 
-class AuditIntegrationMiddleware(BaseHTTPMiddleware):
+class AuditIntegrationMiddleware(AuditMiddleware):
     """
     Middleware for automatic audit logging of all API requests.
     
-    Provides comprehensive request/response logging for audit trails.
+    Audits every request under the versioned sensitive API prefixes plus any
+    state-changing method. Capture and background persistence are inherited
+    from the pure ASGI ``AuditMiddleware``.
     """
     
-    def __init__(self, app, db_session_factory, audit_sensitive_endpoints: bool = True):
-        super().__init__(app)
-        self.db_session_factory = db_session_factory
-        self.audit_sensitive_endpoints = audit_sensitive_endpoints
-        
-        # Define sensitive endpoints that should always be audited
-        self.sensitive_paths = [
-            '/api/v1/auth/',
-            '/api/v1/users/',
-            '/api/v1/cases/',
-            '/api/v1/evidence/',
-            '/api/v1/parties/',
-            '/api/v1/legal-instruments/',
-            '/api/v1/integrations/',
-            '/api/v1/audit/'
-        ]
-        
-        # Define high-risk operations
-        self.high_risk_methods = ['POST', 'PUT', 'PATCH', 'DELETE']
+    sensitive_paths = (
+        '/api/v1/auth/',
+        '/api/v1/users/',
+        '/api/v1/cases/',
+        '/api/v1/evidence/',
+        '/api/v1/parties/',
+        '/api/v1/legal-instruments/',
+        '/api/v1/integrations/',
+        '/api/v1/audit/'
+    )
     
-    async def dispatch(self, request: Request, call_next):
-        # Generate correlation ID
-        correlation_id = request.headers.get('X-Correlation-ID') or str(uuid.uuid4())
-        
-        # Determine if this request should be audited
-        should_audit = self._should_audit_request(request)
-        
-        # Set up audit context in request state
-        request.state.audit_context = AuditContext.from_request(request)
-        request.state.correlation_id = correlation_id
-        
-        start_time = datetime.utcnow()
-        
-        try:
-            # Process the request
-            response = await call_next(request)
-            
-            # Add correlation ID to response
-            response.headers['X-Correlation-ID'] = correlation_id
-            
-            # Log successful request if needed
-            if should_audit:
-                await self._log_request(
-                    request, response, start_time, None
-                )
-            
-            return response
-            
-        except Exception as e:
-            # Log failed request if needed
-            if should_audit:
-                await self._log_request(
-                    request, None, start_time, e
-                )
-            
-            # Re-raise the exception
-            raise
+    high_risk_methods = HIGH_RISK_METHODS
+    
+    def __init__(self, app, sink: Optional[AuditSink] = None, audit_sensitive_endpoints: bool = True):
+        super().__init__(app, sink)
+        self.audit_sensitive_endpoints = audit_sensitive_endpoints
     
-    def _should_audit_request(self, request: Request) -> bool:
+    def _should_audit_request(self, scope) -> bool:
         """Determine if a request should be audited."""
         if not self.audit_sensitive_endpoints:
             return False
-        
-        # Always audit sensitive endpoints
-        path = request.url.path
-        if any(sensitive in path for sensitive in self.sensitive_paths):
-            return True
-        
-        # Always audit high-risk methods
-        if request.method in self.high_risk_methods:
-            return True
-        
-        return False
-    
-    async def _log_request(
-        self, 
-        request: Request, 
-        response: Optional[Response], 
-        start_time: datetime,
-        exception: Optional[Exception]
-    ):
-        """Log HTTP request for audit purposes."""
-        try:
-            # Determine action based on HTTP method
-            action_mapping = {
-                'GET': AuditAction.READ,
-                'POST': AuditAction.CREATE,
-                'PUT': AuditAction.UPDATE,
-                'PATCH': AuditAction.UPDATE,
-                'DELETE': AuditAction.DELETE
-            }
-            
-            action = action_mapping.get(request.method, AuditAction.READ)
-            
-            # Determine severity
-            if exception:
-                severity = AuditSeverity.HIGH
-            elif request.method in self.high_risk_methods:
-                severity = AuditSeverity.MEDIUM
-            else:
-                severity = AuditSeverity.LOW
-            
-            # Calculate request duration
-            end_time = datetime.utcnow()
-            duration_ms = (end_time - start_time).total_seconds() * 1000
-            
-            # Prepare audit details
-            details = {
-                'method': request.method,
-                'path': request.url.path,
-                'query_params': dict(request.query_params) if request.query_params else None,
-                'duration_ms': round(duration_ms, 2),
-                'user_agent': request.headers.get('User-Agent'),
-                'content_type': request.headers.get('Content-Type')
-            }
-            
-            if response:
-                details['status_code'] = response.status_code
-                details['response_size'] = response.headers.get('Content-Length')
-            
-            if exception:
-                details['error'] = str(exception)
-                details['error_type'] = type(exception).__name__
-            
-            # Create description
-            if exception:
-                description = f"HTTP {request.method} {request.url.path} failed: {str(exception)}"
-            else:
-                status_code = response.status_code if response else 'unknown'
-                description = f"HTTP {request.method} {request.url.path} - {status_code}"
-            
-            # Get audit context from request state
-            audit_context = getattr(request.state, 'audit_context', None)
-            
-            # Log to audit system
-            with self.db_session_factory() as db:
-                audit_service = AuditService(db)
-                audit_service.log_action(
-                    action=action,
-                    entity_type=AuditEntity.SYSTEM,
-                    description=description,
-                    details=details,
-                    severity=severity,
-                    context=audit_context
-                )
-                
-        except Exception as e:
-            # Don't let audit logging break the application
-            # Log to system logger instead
-            import logging
-            logger = logging.getLogger(__name__)
-            logger.error(f"Audit logging failed: {str(e)}")
+        return super()._should_audit_request(scope)
 
 
 # Utility functions for common audit patterns
@@ -0,0 +1,218 @@
+"""
+Monthly range partitions for the audit_logs table.
+
+This module provides:
+- Partition naming and month-boundary helpers shared with retention
+- Creation of upcoming monthly partitions, moving any rows that landed in
+  the default partition before their month existed
+- A background maintainer that keeps partitions created ahead of time
+
+Partitions are named ``audit_logs_yYYYYmMM`` and cover
+``[first day of month, first day of next month)`` in UTC. A default partition
+(``audit_logs_default``) catches rows outside every range so inserts never
+fail when maintenance is late.
+"""
+
+import asyncio
+import logging
+import re
+from datetime import date, datetime, timezone
+from typing import Callable, List, Optional, Tuple
+
+from sqlalchemy import text
+
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+PARENT_TABLE = "audit_logs"
+DEFAULT_PARTITION = "audit_logs_default"
+
+# Arbitrary constant identifying audit partition maintenance for advisory locks
+PARTITION_LOCK_KEY = 0x4A435443_0001
+
+_PARTITION_NAME = re.compile(r"^audit_logs_y(\d{4})m(\d{2})$")
+
+LIST_PARTITIONS_SQL = text("""
+    SELECT child.relname
+    FROM pg_inherits
+    JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+    JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+    WHERE parent.relname = :parent
+""")
+
+
+def month_start(value: date) -> date:
+    """First day of the month containing ``value``."""
+    return date(value.year, value.month, 1)
+
+
+def add_months(value: date, months: int) -> date:
+    """First day of the month ``months`` after the month of ``value``."""
+    index = value.year * 12 + (value.month - 1) + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    """Partition table name for the month containing ``month``."""
+    return f"{PARENT_TABLE}_y{month.year:04d}m{month.month:02d}"
+
+
+def parse_partition_name(name: str) -> Optional[Tuple[date, date]]:
+    """Return ``(start, end)`` for a monthly partition name, or None."""
+    match = _PARTITION_NAME.match(name)
+    if not match:
+        return None
+    start = date(int(match.group(1)), int(match.group(2)), 1)
+    return start, add_months(start, 1)
+
+
+def partition_bounds(month: date) -> Tuple[datetime, datetime]:
+    """UTC datetimes bounding the partition for ``month``."""
+    start = month_start(month)
+    end = add_months(start, 1)
+    return (
+        datetime(start.year, start.month, 1, tzinfo=timezone.utc),
+        datetime(end.year, end.month, 1, tzinfo=timezone.utc),
+    )
+
+
+def create_partition_sql(month: date) -> str:
+    start, end = partition_bounds(month)
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(month)} PARTITION OF {PARENT_TABLE} "
+        f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+    )
+
+
+def sorted_monthly_partitions(names: List[str]) -> List[Tuple[str, date, date]]:
+    """``(name, start, end)`` for the monthly partitions in ``names``, oldest first."""
+    partitions = []
+    for name in names:
+        bounds = parse_partition_name(name)
+        if bounds:
+            partitions.append((name, bounds[0], bounds[1]))
+    return sorted(partitions, key=lambda item: item[1])
+
+
+class AuditPartitionMaintainer:
+    """
+    Keep monthly audit_logs partitions created ahead of the current month.
+
+    Runs on every worker; a transaction-level advisory lock makes sure only
+    one of them does the work at a time.
+    """
+
+    def __init__(
+        self,
+        premake_months: int = 3,
+        interval_seconds: float = 21600,
+        session_factory: Optional[Callable] = None
+    ):
+        self.premake_months = premake_months
+        self.interval_seconds = interval_seconds
+        self.session_factory = session_factory
+        self._task: Optional[asyncio.Task] = None
+
+    def _get_session_factory(self):
+        if self.session_factory is None:
+            from app.database.base import AsyncSessionLocal
+            self.session_factory = AsyncSessionLocal
+        return self.session_factory
+
+    async def ensure_partitions(self, reference: Optional[date] = None) -> List[str]:
+        """
+        Create partitions for the reference month and ``premake_months`` after it.
+
+        Returns the names of partitions created by this call.
+        """
+        current = month_start(reference or datetime.now(timezone.utc).date())
+        created = []
+
+        async with self._get_session_factory()() as db:
+            locked = await db.scalar(
+                text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": PARTITION_LOCK_KEY}
+            )
+            if not locked:
+                return created
+
+            existing = set((await db.execute(LIST_PARTITIONS_SQL, {"parent": PARENT_TABLE})).scalars())
+
+            for offset in range(self.premake_months + 1):
+                month = add_months(current, offset)
+                name = partition_name(month)
+                if name in existing:
+                    continue
+                await self._create_partition(db, month, DEFAULT_PARTITION in existing)
+                created.append(name)
+
+            await db.commit()
+
+        if created:
+            logger.info(f"Created audit log partitions: {', '.join(created)}")
+        return created
+
+    async def _create_partition(self, db, month: date, has_default: bool):
+        start, end = partition_bounds(month)
+        name = partition_name(month)
+        bounds = {"start": start, "end": end}
+
+        stray_rows = False
+        if has_default:
+            stray_rows = await db.scalar(text(
+                f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} "
+                f"WHERE timestamp >= :start AND timestamp < :end)"
+            ), bounds)
+
+        if not stray_rows:
+            await db.execute(text(create_partition_sql(month)))
+            return
+
+        # Rows for this month already sit in the default partition, which would
+        # make CREATE ... PARTITION OF fail. Move them into a standalone table
+        # and attach it once the default partition no longer overlaps.
+        await db.execute(text(
+            f"CREATE TABLE {name} (LIKE {PARENT_TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+        ))
+        await db.execute(text(
+            f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} "
+            f"WHERE timestamp >= :start AND timestamp < :end RETURNING *) "
+            f"INSERT INTO {name} SELECT * FROM moved"
+        ), bounds)
+        await db.execute(text(
+            f"ALTER TABLE {PARENT_TABLE} ATTACH PARTITION {name} "
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        ))
+        logger.warning(f"Moved audit log rows from {DEFAULT_PARTITION} into new partition {name}")
+
+    async def start(self):
+        """Start periodic partition maintenance."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self):
+        while True:
+            try:
+                await self.ensure_partitions()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Audit partition maintenance failed: {e}")
+            await asyncio.sleep(self.interval_seconds)
+
+
+# Global maintainer instance (started on application startup)
+audit_partition_maintainer = AuditPartitionMaintainer(
+    premake_months=settings.audit_partition_premake_months,
+    interval_seconds=settings.audit_partition_check_interval_seconds
+)
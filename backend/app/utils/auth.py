@@ -1,9 +1,17 @@
+import asyncio
+import random
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
 import bcrypt
 from fastapi import HTTPException, status
 from app.config.settings import settings
+from app.security.revocation import revocation_filter
+from app.utils.metrics import metrics_registry
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a plain password against a hashed password."""
@@ -18,9 +26,130 @@ def get_password_hash(password: str) -> str:
     hashed = bcrypt.hashpw(password_bytes, salt)
     return hashed.decode('utf-8')
 
+
+password_hash_queue_seconds = metrics_registry.histogram(
+    "password_hash_queue_seconds", "Time password hashing work waited for a pool slot", ("operation",)
+)
+password_hash_duration_seconds = metrics_registry.histogram(
+    "password_hash_duration_seconds", "Time spent hashing or verifying a password", ("operation",)
+)
+password_hash_rejected_total = metrics_registry.counter(
+    "password_hash_rejected_total", "Password hashing requests rejected because the queue was full", ("operation",)
+)
+
+
+class PasswordHasher:
+    """
+    Run bcrypt off the event loop in a bounded thread pool.
+    
+    bcrypt releases the GIL while hashing, so worker threads hash in parallel
+    while the event loop keeps serving other requests. At most ``max_workers``
+    operations run at once and at most ``max_pending`` wait for a slot; beyond
+    that requests are rejected with 503 instead of queueing without bound.
+    """
+    
+    def __init__(self, max_workers: int = 4, max_pending: int = 64):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._pending = 0
+        # Recent end-to-end verification latencies, used to pace unknown-user logins
+        self._verify_latencies = deque(maxlen=256)
+        self._dummy_hash: Optional[str] = None
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="password-hash"
+            )
+            self._slots = asyncio.Semaphore(self.max_workers)
+        return self._executor
+    
+    @property
+    def pending(self) -> int:
+        return self._pending
+    
+    def _admit(self, operation: str):
+        """Reject with 503 when every slot and queue position is taken."""
+        if self._pending >= self.max_workers + self.max_pending:
+            password_hash_rejected_total.inc(operation=operation)
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Authentication service busy, please retry",
+                headers={"Retry-After": "1"},
+            )
+    
+    async def _run(self, operation: str, func, *args):
+        executor = self._get_executor()
+        self._admit(operation)
+        
+        self._pending += 1
+        queued_at = time.perf_counter()
+        try:
+            async with self._slots:
+                started_at = time.perf_counter()
+                password_hash_queue_seconds.observe(started_at - queued_at, operation=operation)
+                result = await asyncio.get_running_loop().run_in_executor(executor, func, *args)
+                password_hash_duration_seconds.observe(time.perf_counter() - started_at, operation=operation)
+                return result
+        finally:
+            self._pending -= 1
+    
+    async def hash(self, password: str) -> str:
+        """Hash a password without blocking the event loop."""
+        return await self._run("hash", get_password_hash, password)
+    
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a password without blocking the event loop."""
+        started_at = time.perf_counter()
+        result = await self._run("verify", verify_password, plain_password, hashed_password)
+        self._verify_latencies.append(time.perf_counter() - started_at)
+        return result
+    
+    async def verify_user(self, user, plain_password: str) -> bool:
+        """
+        Verify a login attempt in a way that does not reveal whether the user exists.
+        
+        For unknown users (``user`` is None) no bcrypt work is done; the call
+        instead sleeps for a duration drawn from recent real verifications,
+        including their queueing delay, so response times match. Until there
+        are samples a verification against a dummy hash provides one. The
+        sleep goes through the same admission check and counts as pending,
+        so a busy service answers 503 whether or not the user exists.
+        """
+        if user is not None and user.hashed_password:
+            return await self.verify(plain_password, user.hashed_password)
+        
+        if self._verify_latencies:
+            self._admit("verify")
+            self._pending += 1
+            try:
+                await asyncio.sleep(random.choice(self._verify_latencies))
+            finally:
+                self._pending -= 1
+        else:
+            if self._dummy_hash is None:
+                self._dummy_hash = await self.hash("unknown-user")
+            await self.verify(plain_password, self._dummy_hash)
+        return False
+    
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+# Global password hasher instance
+password_hasher = PasswordHasher(
+    max_workers=settings.password_hash_workers,
+    max_pending=settings.password_hash_max_pending
+)
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
-    """Create JWT access token."""
+    """Create JWT access token with a unique ``jti`` so it can be revoked."""
     to_encode = data.copy()
+    to_encode.setdefault("jti", uuid.uuid4().hex)
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
     else:
@@ -30,13 +159,17 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 def verify_token(token: str) -> dict:
-    """Verify and decode JWT token."""
+    """Verify and decode JWT token, rejecting revoked tokens."""
     try:
         payload = jwt.decode(token, settings.secret_key, algorithms=["HS256"])
-        return payload
     except JWTError:
+        payload = None
+    
+    # In-memory lookup; revocations reach every worker through Redis
+    if payload is None or revocation_filter.contains(payload.get("jti"), payload.get("exp")):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
             headers={"WWW-Authenticate": "Bearer"},
-        )
\ No newline at end of file
+        )
+    return payload
\ No newline at end of file
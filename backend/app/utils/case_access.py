@@ -201,11 +201,13 @@ async def update_case_sensitivity(
     return case
 
 
-def get_user_accessible_cases_filter(user: User):
+def get_user_accessible_cases_filter(user: User, case_model=Case):
     """
     Return SQLAlchemy filter for cases accessible to user.
     
-    Used for listing cases with proper access control.
+    Used for listing cases with proper access control. ``case_model`` may be
+    any mapped class with the same access columns as ``Case`` (e.g. the sync
+    tombstones of deleted cases).
     """
     from sqlalchemy import or_, and_, text
     
@@ -216,18 +218,18 @@ def get_user_accessible_cases_filter(user: User):
     # Supervisor sees all except TOP_SECRET without explicit access
     if user.role == UserRole.SUPERVISOR:
         return or_(
-            Case.is_sensitive == False,
-            Case.sensitivity_level != SensitivityLevel.TOP_SECRET,
-            Case.access_restrictions['allowed_users'].astext.contains(str(user.id))
+            case_model.is_sensitive == False,
+            case_model.sensitivity_level != SensitivityLevel.TOP_SECRET,
+            case_model.access_restrictions['allowed_users'].astext.contains(str(user.id))
         )
     
     # Regular users - see non-sensitive or where assigned/allowed
     user_id_str = str(user.id)
     return or_(
-        Case.is_sensitive == False,
-        Case.sensitivity_level == SensitivityLevel.NORMAL,
-        Case.lead_investigator == user.id,
-        Case.created_by == user.id,
-        Case.access_restrictions['allowed_users'].astext.contains(user_id_str),
-        Case.access_restrictions['allowed_roles'].astext.contains(user.role.value)
+        case_model.is_sensitive == False,
+        case_model.sensitivity_level == SensitivityLevel.NORMAL,
+        case_model.lead_investigator == user.id,
+        case_model.created_by == user.id,
+        case_model.access_restrictions['allowed_users'].astext.contains(user_id_str),
+        case_model.access_restrictions['allowed_roles'].astext.contains(user.role.value)
     )
@@ -0,0 +1,142 @@
+"""
+Set-based case deletion.
+
+Deleting a case through ``session.delete(case)`` makes the ORM load every
+dependent row (parties, seizures, devices, artefacts, tasks, charges, ...) to
+honour the ``cascade="all, delete-orphan"`` relationships. This module deletes
+the same rows with one statement per table, children before parents, so the
+cost no longer grows with the size of the case, and removes the files the case
+referenced once the transaction has committed.
+"""
+import logging
+import shutil
+from pathlib import Path
+from typing import List, Set
+from uuid import UUID
+
+from sqlalchemy import delete, select, update, union_all, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.case import Case, CaseAssignment
+from app.models.party import Party
+from app.models.legal import LegalInstrument
+from app.models.evidence import Seizure, Evidence, Artefact, ChainOfCustody
+from app.models.chain_of_custody import ChainOfCustodyEntry
+from app.models.task import Task, ActionLog
+from app.models.prosecution import Charge, CourtSession, Outcome
+from app.models.misc import Attachment, CaseCollaboration
+from app.models.forensic import ForensicReport
+from app.models.intelligence import IntelligenceCaseLink
+
+logger = logging.getLogger(__name__)
+
+# Root of locally stored evidence uploads (see endpoints/evidence.py)
+UPLOAD_DIR = Path("uploads")
+
+
+def _case_device_ids(case_id: UUID):
+    """Devices belonging to the case directly or through one of its seizures."""
+    seizure_ids = select(Seizure.id).where(Seizure.case_id == case_id)
+    return select(Evidence.id).where(
+        or_(Evidence.case_id == case_id, Evidence.seizure_id.in_(seizure_ids))
+    )
+
+
+async def collect_case_file_paths(db: AsyncSession, case_id: UUID) -> List[str]:
+    """Return every stored file path referenced by the case's rows."""
+    device_ids = _case_device_ids(case_id)
+    paths_query = union_all(
+        select(Evidence.file_path.label("path")).where(Evidence.id.in_(device_ids)),
+        select(Evidence.image_file_path.label("path")).where(Evidence.id.in_(device_ids)),
+        select(Artefact.file_path.label("path")).where(Artefact.evidence_id.in_(device_ids)),
+        select(ChainOfCustodyEntry.signature_path.label("path")).where(ChainOfCustodyEntry.evidence_id.in_(device_ids)),
+        select(Attachment.file_path.label("path")).where(Attachment.case_id == case_id),
+        select(LegalInstrument.file_path.label("path")).where(LegalInstrument.case_id == case_id),
+    )
+    result = await db.execute(paths_query)
+    return sorted({row.path for row in result if row.path})
+
+
+async def bulk_delete_case(db: AsyncSession, case_id: UUID) -> List[str]:
+    """
+    Delete a case and all dependent rows with set-based statements.
+
+    Statements are ordered so that no foreign key is violated even where the
+    database does not declare ``ON DELETE CASCADE``. The caller owns the
+    transaction and must commit. Returns the file paths that were referenced
+    by the deleted rows, for :func:`remove_case_files`.
+    """
+    file_paths = await collect_case_file_paths(db, case_id)
+    device_ids = _case_device_ids(case_id)
+
+    statements = [
+        # Rows hanging off the case's devices
+        delete(Artefact).where(Artefact.evidence_id.in_(device_ids)),
+        delete(ChainOfCustody).where(ChainOfCustody.evidence_id.in_(device_ids)),
+        delete(ChainOfCustodyEntry).where(ChainOfCustodyEntry.evidence_id.in_(device_ids)),
+        delete(ForensicReport).where(ForensicReport.case_id == case_id),
+        # Reports filed under another case may still point at one of these devices
+        update(ForensicReport).where(ForensicReport.device_id.in_(device_ids)).values(device_id=None),
+        # Parties reference seizures, devices reference seizures, seizures reference legal instruments
+        delete(Party).where(Party.case_id == case_id),
+        delete(Evidence).where(Evidence.id.in_(device_ids)),
+        delete(Seizure).where(Seizure.case_id == case_id),
+        delete(LegalInstrument).where(LegalInstrument.case_id == case_id),
+        # Remaining direct children
+        delete(Task).where(Task.case_id == case_id),
+        delete(ActionLog).where(ActionLog.case_id == case_id),
+        delete(Charge).where(Charge.case_id == case_id),
+        delete(CourtSession).where(CourtSession.case_id == case_id),
+        delete(Outcome).where(Outcome.case_id == case_id),
+        delete(Attachment).where(Attachment.case_id == case_id),
+        delete(CaseCollaboration).where(CaseCollaboration.case_id == case_id),
+        delete(IntelligenceCaseLink).where(IntelligenceCaseLink.case_id == case_id),
+        delete(CaseAssignment).where(CaseAssignment.case_id == case_id),
+        delete(Case).where(Case.id == case_id),
+    ]
+
+    for statement in statements:
+        await db.execute(statement.execution_options(synchronize_session=False))
+
+    return file_paths
+
+
+def remove_case_files(case_id: UUID, file_paths: List[str]):
+    """
+    Remove stored files of a deleted case.
+
+    Intended to run as a background task after the deleting transaction has
+    committed. Local files are unlinked and the case's upload directory is
+    removed; paths that are not on local disk are treated as object storage
+    keys when S3 is enabled. Failures are logged and never raised.
+    """
+    from app.utils.s3_storage import delete_file, is_s3_enabled
+
+    s3_enabled = is_s3_enabled()
+    removed = 0
+    parent_dirs: Set[Path] = set()
+
+    for file_path in file_paths:
+        path = Path(file_path)
+        try:
+            if path.is_file():
+                path.unlink()
+                parent_dirs.add(path.parent)
+                removed += 1
+            elif s3_enabled:
+                delete_file(file_path)
+                removed += 1
+        except Exception as e:
+            logger.warning(f"Failed to remove file {file_path} of deleted case {case_id}: {e}")
+
+    case_dir = UPLOAD_DIR / str(case_id)
+    if case_dir.is_dir():
+        shutil.rmtree(case_dir, ignore_errors=True)
+
+    for directory in parent_dirs:
+        try:
+            directory.rmdir()  # Only succeeds when empty
+        except OSError:
+            pass
+
+    logger.info(f"Removed {removed} of {len(file_paths)} stored files for deleted case {case_id}")
@@ -0,0 +1,246 @@
+"""
+Transport-level response compression with Accept-Encoding negotiation.
+
+This module provides:
+- Codecs for zstd, brotli and gzip behind one streaming interface
+  (zstd and brotli are used when the ``zstandard`` / ``brotli`` packages are
+  installed; gzip is always available)
+- Accept-Encoding parsing with q-values and a server preference order
+- A pure ASGI middleware that compresses response bodies chunk by chunk, so
+  streamed responses are never buffered whole
+
+Responses that are small, already encoded, not compressible by content type,
+or have no body (304, 204, HEAD) pass through untouched. A strong ETag on a
+compressed response gets the coding appended (``"abc-gz"``) because the
+encoded bytes are a different representation; :mod:`app.utils.http_caching`
+strips the suffix again when matching ``If-None-Match``.
+"""
+
+import logging
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+try:
+    import zstandard
+except ImportError:  # Optional dependency
+    zstandard = None
+
+try:
+    import brotli
+except ImportError:  # Optional dependency
+    brotli = None
+
+COMPRESSIBLE_TYPES = (
+    "application/json", "application/javascript", "application/xml",
+    "application/x-ndjson", "application/problem+json", "text/",
+    "image/svg+xml",
+)
+
+# Suffix appended to strong ETags per coding
+ETAG_SUFFIXES = {"zstd": "-zstd", "br": "-br", "gzip": "-gz"}
+
+
+class StreamCompressor:
+    """Incremental compressor for one response body."""
+
+    def __init__(self, encoding: str, level: Optional[int] = None):
+        self.encoding = encoding
+        if encoding == "gzip":
+            self._compressor = zlib.compressobj(level if level is not None else 6, zlib.DEFLATED, 31)
+        elif encoding == "br":
+            self._compressor = brotli.Compressor(quality=level if level is not None else 4)
+        elif encoding == "zstd":
+            self._compressor = zstandard.ZstdCompressor(level=level if level is not None else 3).compressobj()
+        else:
+            raise ValueError(f"Unsupported encoding: {encoding}")
+
+    def compress(self, data: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._compressor.process(data)
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        """Flush buffered output so far without ending the stream."""
+        if self.encoding == "gzip":
+            return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+        if self.encoding == "br":
+            return self._compressor.flush()
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._compressor.finish()
+        return self._compressor.flush()
+
+
+def available_encodings() -> List[str]:
+    """Codings this process can produce, in server preference order."""
+    encodings = []
+    if zstandard is not None:
+        encodings.append("zstd")
+    if brotli is not None:
+        encodings.append("br")
+    encodings.append("gzip")
+    return encodings
+
+
+def compress_bytes(data: bytes, encoding: str, level: Optional[int] = None) -> bytes:
+    compressor = StreamCompressor(encoding, level)
+    return compressor.compress(data) + compressor.finish()
+
+
+def parse_accept_encoding(header: str) -> Dict[str, float]:
+    """Map each coding in an Accept-Encoding header to its q-value."""
+    codings = {}
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        codings[coding] = q
+    return codings
+
+
+def negotiate_encoding(header: Optional[str], supported: Optional[List[str]] = None) -> Optional[str]:
+    """
+    Pick the response coding for an Accept-Encoding header.
+
+    The highest q-value wins; ties go to the server preference order of
+    ``supported``. Returns None for identity.
+    """
+    if not header:
+        return None
+    supported = supported or available_encodings()
+    accepted = parse_accept_encoding(header)
+    wildcard = accepted.get("*")
+
+    best, best_q = None, 0.0
+    for encoding in supported:
+        q = accepted.get(encoding, wildcard if wildcard is not None else 0.0)
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def _is_compressible(content_type: str) -> bool:
+    content_type = content_type.lower()
+    return any(content_type.startswith(prefix) for prefix in COMPRESSIBLE_TYPES)
+
+
+class CompressionMiddleware:
+    """
+    Compress responses with the best coding the client accepts.
+
+    Pure ASGI: the first body chunk decides whether to compress (by content
+    type, size and existing encoding); later chunks of a streamed response
+    are compressed and flushed as they arrive.
+    """
+
+    def __init__(
+        self,
+        app,
+        minimum_size: int = 1024,
+        encodings: Optional[List[str]] = None,
+        levels: Optional[Dict[str, int]] = None
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.encodings = [e for e in (encodings or available_encodings()) if e in available_encodings()]
+        self.levels = levels or {}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope.get("method") == "HEAD":
+            await self.app(scope, receive, send)
+            return
+
+        accept = None
+        for name, value in scope.get("headers", []):
+            if name == b"accept-encoding":
+                accept = value.decode("latin-1")
+                break
+
+        encoding = negotiate_encoding(accept, self.encodings)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        compressor: Optional[StreamCompressor] = None
+        passthrough = False
+
+        async def send_compressed(message):
+            nonlocal start_message, compressor, passthrough
+
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if start_message is not None:
+                start, start_message = start_message, None
+                headers = start.get("headers", [])
+                content_type = content_encoding = ""
+                for name, value in headers:
+                    if name == b"content-type":
+                        content_type = value.decode("latin-1")
+                    elif name == b"content-encoding":
+                        content_encoding = value.decode("latin-1")
+
+                passthrough = (
+                    start["status"] < 200 or start["status"] in (204, 304)
+                    or content_encoding
+                    or not _is_compressible(content_type)
+                    or (not more_body and len(body) < self.minimum_size)
+                )
+                if passthrough:
+                    await send(start)
+                else:
+                    compressor = StreamCompressor(encoding, self.levels.get(encoding))
+                    await send({**start, "headers": self._compressed_headers(headers, encoding)})
+
+            if passthrough:
+                await send(message)
+                return
+
+            chunk = compressor.compress(body)
+            chunk += compressor.flush() if more_body else compressor.finish()
+            await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+        await self.app(scope, receive, send_compressed)
+
+    @staticmethod
+    def _compressed_headers(headers: List[Tuple[bytes, bytes]], encoding: str) -> List[Tuple[bytes, bytes]]:
+        result = []
+        vary = None
+        for name, value in headers:
+            if name == b"content-length":
+                continue
+            if name == b"vary":
+                vary = value
+                continue
+            if name == b"etag" and not value.startswith(b"W/") and value.endswith(b'"'):
+                value = value[:-1] + ETAG_SUFFIXES[encoding].encode() + b'"'
+            result.append((name, value))
+        if vary is None:
+            vary = b"Accept-Encoding"
+        elif b"accept-encoding" not in vary.lower():
+            vary = vary + b", Accept-Encoding"
+        result.append((b"vary", vary))
+        result.append((b"content-encoding", encoding.encode()))
+        return result
@@ -24,7 +24,8 @@ async def get_current_user(
     try:
         payload = verify_token(credentials.credentials)
         email: str = payload.get("sub")
-        if email is None:
+        # Scoped tokens (e.g. notification stream tokens) only open their own endpoint
+        if email is None or payload.get("scope") is not None:
             raise credentials_exception
     except Exception:
         raise credentials_exception
@@ -0,0 +1,596 @@
+"""
+Streaming ingest of forensic tool reports (Cellebrite, EnCase, generic).
+
+A report is processed while its request body is still arriving:
+
+- ``JSONRecordStream`` / ``NDJSONRecordStream`` parse records incrementally
+  from the raw body, so only the current record and one chunk are held
+- Records are mapped in chunks through a compiled ``DataMapping`` plan
+- Each chunk is copied into the unlogged ``artefact_ingest_staging`` table
+  (``COPY`` on asyncpg, multi-row INSERT otherwise) and committed together
+  with the job's progress on its ``SyncJob`` row
+- At the end one ``INSERT ... SELECT`` merges the staged rows into
+  ``artefacts``, skipping any SHA-256 the evidence item already has, so
+  re-sending a report is a no-op
+
+Artefacts without a SHA-256 in the report are keyed by the SHA-256 of their
+canonical JSON. The evidence item is either given, or found or created from
+the report's device section keyed by the SHA-256 of the report body.
+"""
+
+import codecs
+import hashlib
+import json
+import logging
+import re
+import time
+import uuid
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import delete, insert, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config.settings import settings
+from app.models.evidence import ArtefactType, Evidence
+from app.models.ingest import ArtefactIngestStaging
+from app.models.integrations import DataMapping, SyncJob
+from app.utils.metrics import metrics_registry
+from app.utils.transformers import (
+    CompiledMapping,
+    FieldMapping,
+    MappingConfiguration,
+    TransformationRule,
+    ValidationRule,
+    data_transformer,
+)
+
+logger = logging.getLogger(__name__)
+
+# Top-level keys of a report object that hold its records
+RECORD_KEYS = ("artefacts", "artifacts", "records", "items", "data")
+
+ARTEFACT_TYPES = frozenset(t.value for t in ArtefactType)
+SHA256_PATTERN = re.compile(r"[0-9a-f]{64}")
+WHITESPACE = re.compile(r"[ \t\n\r]*")
+# Characters that can follow a complete number or literal
+SCALAR_END = frozenset(",]} \t\n\r")
+
+STAGING_COLUMNS = (
+    "job_id", "ordinal", "artefact_id", "sha256", "artefact_type",
+    "source_tool", "description", "file_path",
+)
+
+MERGE_ARTEFACTS_SQL = text("""
+    INSERT INTO artefacts (id, evidence_id, artefact_type, source_tool, description, file_path, sha256)
+    SELECT DISTINCT ON (s.sha256)
+           s.artefact_id, CAST(:evidence_id AS uuid), CAST(s.artefact_type AS artefacttype),
+           s.source_tool, s.description, s.file_path, s.sha256
+    FROM artefact_ingest_staging s
+    WHERE s.job_id = :job_id
+      AND NOT EXISTS (
+          SELECT 1 FROM artefacts a
+          WHERE a.evidence_id = CAST(:evidence_id AS uuid) AND a.sha256 = s.sha256
+      )
+    ORDER BY s.sha256, s.ordinal
+""")
+
+# Evidence columns filled from a report's device section, with accepted key names
+DEVICE_FIELDS = {
+    "label": ("label", "name", "device_name", "DeviceName"),
+    "make": ("make", "manufacturer", "vendor", "Manufacturer", "Vendor"),
+    "model": ("model", "Model", "DeviceModel"),
+    "serial_no": ("serial_no", "serial", "serial_number", "SerialNumber"),
+    "imei": ("imei", "IMEI"),
+    "operating_system": ("operating_system", "os", "OS", "os_version", "OSVersion"),
+}
+DEVICE_KEYS = ("device", "Device", "device_info", "DeviceInfo", "source_device")
+
+
+class JSONRecordStream:
+    """
+    Incremental parser for a JSON report.
+
+    Accepts a top-level array of records, or an object whose records sit
+    in an array under one of ``items_keys``. The object's other keys are
+    decoded whole into ``metadata``. Feed raw body bytes; each call returns
+    the records completed so far.
+    """
+
+    def __init__(self, items_keys: Iterable[str] = RECORD_KEYS, max_record_bytes: Optional[int] = None):
+        self.items_keys = frozenset(items_keys)
+        self.max_record_bytes = max_record_bytes or settings.ingest_max_record_bytes
+        self.metadata: Dict[str, Any] = {}
+        self._decoder = json.JSONDecoder()
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._pos = 0
+        self._state = "start"
+        self._nested = False
+        self._key: Optional[str] = None
+
+    def feed(self, data: bytes) -> List[Any]:
+        self._buffer = self._buffer[self._pos:] + self._text.decode(data)
+        self._pos = 0
+        records = self._parse(final=False)
+        if len(self._buffer) - self._pos > self.max_record_bytes:
+            raise ValueError(f"A single record exceeds {self.max_record_bytes} bytes")
+        return records
+
+    def close(self) -> List[Any]:
+        self._buffer = self._buffer[self._pos:] + self._text.decode(b"", final=True)
+        self._pos = 0
+        records = self._parse(final=True)
+        if self._state != "done":
+            raise ValueError("Truncated JSON document")
+        return records
+
+    def _decode(self, final: bool) -> Tuple[bool, Any]:
+        try:
+            value, end = self._decoder.raw_decode(self._buffer, self._pos)
+        except json.JSONDecodeError as e:
+            if final:
+                raise ValueError(f"Invalid JSON at offset {e.pos}: {e.msg}")
+            return False, None
+        # A number or literal is only complete once a delimiter follows it;
+        # "12." may continue as "12.5" in the next chunk
+        if not final and self._buffer[self._pos] not in '{["':
+            if end >= len(self._buffer) or self._buffer[end] not in SCALAR_END:
+                return False, None
+        self._pos = end
+        return True, value
+
+    def _parse(self, final: bool) -> List[Any]:
+        records = []
+        buffer = self._buffer
+        while True:
+            self._pos = WHITESPACE.match(buffer, self._pos).end()
+            if self._pos >= len(buffer):
+                return records
+            char = buffer[self._pos]
+            state = self._state
+
+            if state == "items":
+                if char == ",":
+                    self._pos += 1
+                elif char == "]":
+                    self._pos += 1
+                    self._state = "key" if self._nested else "done"
+                else:
+                    complete, record = self._decode(final)
+                    if not complete:
+                        return records
+                    records.append(record)
+
+            elif state == "key":
+                if char == ",":
+                    self._pos += 1
+                elif char == "}":
+                    self._pos += 1
+                    self._state = "done"
+                elif char == '"':
+                    complete, self._key = self._decode(final)
+                    if not complete:
+                        return records
+                    self._state = "colon"
+                else:
+                    raise ValueError(f"Expected an object key at offset {self._pos}")
+
+            elif state == "colon":
+                if char != ":":
+                    raise ValueError(f"Expected ':' at offset {self._pos}")
+                self._pos += 1
+                self._state = "value"
+
+            elif state == "value":
+                if char == "[" and self._key in self.items_keys:
+                    self._pos += 1
+                    self._state = "items"
+                else:
+                    complete, value = self._decode(final)
+                    if not complete:
+                        return records
+                    self.metadata[self._key] = value
+                    self._state = "key"
+
+            elif state == "start":
+                if char == "[":
+                    self._state = "items"
+                elif char == "{":
+                    self._state = "key"
+                    self._nested = True
+                else:
+                    raise ValueError("Expected a JSON array or object")
+                self._pos += 1
+
+            else:
+                raise ValueError(f"Unexpected data after the JSON document at offset {self._pos}")
+
+
+class NDJSONRecordStream:
+    """Incremental parser for newline-delimited JSON, one record per line."""
+
+    def __init__(self, max_record_bytes: Optional[int] = None):
+        self.max_record_bytes = max_record_bytes or settings.ingest_max_record_bytes
+        self.metadata: Dict[str, Any] = {}
+        self._buffer = b""
+
+    def feed(self, data: bytes) -> List[Any]:
+        lines = (self._buffer + data).split(b"\n")
+        self._buffer = lines.pop()
+        if len(self._buffer) > self.max_record_bytes:
+            raise ValueError(f"A single record exceeds {self.max_record_bytes} bytes")
+        return [self._loads(line) for line in lines if line.strip()]
+
+    def close(self) -> List[Any]:
+        line, self._buffer = self._buffer, b""
+        return [self._loads(line)] if line.strip() else []
+
+    @staticmethod
+    def _loads(line: bytes) -> Any:
+        try:
+            return json.loads(line)
+        except ValueError as e:
+            raise ValueError(f"Invalid NDJSON line: {e}")
+
+
+def record_stream(content_type: Optional[str]):
+    """Parser for a request's content type."""
+    content_type = (content_type or "").split(";")[0].strip().lower()
+    if content_type in ("application/x-ndjson", "application/ndjson", "application/jsonlines", "application/jsonl"):
+        return NDJSONRecordStream()
+    return JSONRecordStream()
+
+
+def record_digest(record: Any) -> str:
+    """SHA-256 of a record's canonical JSON."""
+    canonical = json.dumps(record, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def mapping_configuration_from_model(mapping: DataMapping) -> MappingConfiguration:
+    """
+    Build a ``MappingConfiguration`` from a stored ``DataMapping``.
+
+    ``field_mappings`` is either ``{source_field: target_field}`` or a list of
+    ``FieldMapping`` dicts; ``transformation_rules`` and ``validation_rules``
+    map a source field to its list of rules.
+    """
+    transformation_rules = mapping.transformation_rules or {}
+    validation_rules = mapping.validation_rules or {}
+
+    if isinstance(mapping.field_mappings, dict):
+        field_mappings = [
+            FieldMapping(
+                source_field=source,
+                target_field=target,
+                transformations=[TransformationRule(**rule) for rule in transformation_rules.get(source, [])],
+                validation_rules=[ValidationRule(**rule) for rule in validation_rules.get(source, [])],
+            )
+            for source, target in mapping.field_mappings.items()
+        ]
+    else:
+        field_mappings = [FieldMapping(**field) for field in mapping.field_mappings or []]
+
+    return MappingConfiguration(
+        name=mapping.name,
+        description=mapping.description,
+        source_system=mapping.source_system,
+        target_system=mapping.target_system,
+        field_mappings=field_mappings,
+        # Records failing an error-severity rule are reported, not imported
+        validation_mode="strict",
+        error_handling="collect_errors",
+    )
+
+
+def _text(value: Any, limit: Optional[int] = None) -> Optional[str]:
+    if value is None:
+        return None
+    if not isinstance(value, str):
+        value = json.dumps(value, default=str) if isinstance(value, (dict, list)) else str(value)
+    return value[:limit] if limit else value
+
+
+def device_fields(metadata: Dict[str, Any]) -> Dict[str, str]:
+    """Evidence columns found in a report's device section."""
+    device = next((metadata[key] for key in DEVICE_KEYS if isinstance(metadata.get(key), dict)), metadata)
+    column_limits = {column.name: column.type.length for column in Evidence.__table__.columns
+                     if column.name in DEVICE_FIELDS}
+    fields = {}
+    for column, keys in DEVICE_FIELDS.items():
+        value = next((device[key] for key in keys if device.get(key) not in (None, "")), None)
+        if value is not None:
+            fields[column] = _text(value, column_limits[column])
+    return fields
+
+
+class ForensicIngestPipeline:
+    """
+    Stream one forensic report into the artefacts of an evidence item.
+
+    The session is committed after every chunk so the ``SyncJob`` progress
+    is visible to other readers while the import runs.
+    """
+
+    def __init__(
+        self,
+        db: AsyncSession,
+        job: SyncJob,
+        plan: CompiledMapping,
+        source_tool: str,
+        case_id: Optional[uuid.UUID] = None,
+        evidence_id: Optional[uuid.UUID] = None,
+        chunk_size: Optional[int] = None
+    ):
+        if case_id is None and evidence_id is None:
+            raise ValueError("A case or an evidence item is required")
+        self.db = db
+        self.job = job
+        self.job_id = job.id
+        self.source = job.connector_type
+        self.plan = plan
+        self.source_tool = source_tool
+        self.case_id = case_id
+        self.evidence_id = evidence_id
+        self.chunk_size = chunk_size or settings.ingest_chunk_size
+
+        self.processed = 0
+        self.staged = 0
+        self.failed = 0
+        self.errors: List[Dict[str, Any]] = []
+        self.bytes_read = 0
+
+    async def run(
+        self,
+        body: AsyncIterator[bytes],
+        content_type: Optional[str] = None,
+        content_length: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Parse, map, stage and merge the report; returns the job summary."""
+        start = time.perf_counter()
+        parser = record_stream(content_type)
+        digest = hashlib.sha256()
+        pending: List[Any] = []
+
+        try:
+            await self._drop_abandoned_staging()
+
+            async for data in body:
+                if not data:
+                    continue
+                self.bytes_read += len(data)
+                digest.update(data)
+                pending.extend(parser.feed(data))
+                while len(pending) >= self.chunk_size:
+                    chunk, pending = pending[:self.chunk_size], pending[self.chunk_size:]
+                    await self._process_chunk(chunk, content_length)
+
+            pending.extend(parser.close())
+            if pending:
+                await self._process_chunk(pending, content_length)
+
+            evidence_id = await self._resolve_evidence(parser.metadata, digest.hexdigest())
+            created = await self._merge(evidence_id)
+        except Exception as e:
+            await self.db.rollback()
+            await self._clear_staging()
+            await self.db.refresh(self.job)
+            self.job.update_progress(self.processed, 0, 0, self.failed)
+            self.job.mark_failed(str(e))
+            self.job.error_summary = list(self.job.error_summary) + self.errors
+            await self.db.commit()
+            forensic_ingest_jobs_total.inc(source=self.source, result="failed")
+            raise
+
+        duplicates = self.staged - created
+        self.job.update_progress(self.processed, created, 0, self.failed)
+        self.job.sync_filters = {**(self.job.sync_filters or {}), "evidence_id": str(evidence_id)}
+        self.job.error_summary = self.errors
+        self.job.complete_processing()
+        await self.db.commit()
+
+        forensic_ingest_jobs_total.inc(source=self.source, result="completed")
+        forensic_ingest_records_total.inc(created, source=self.source, result="created")
+        forensic_ingest_records_total.inc(duplicates, source=self.source, result="duplicate")
+
+        return {
+            "job_id": self.job_id,
+            "status": self.job.status,
+            "evidence_id": str(evidence_id),
+            "report_sha256": digest.hexdigest(),
+            "records_processed": self.processed,
+            "records_created": created,
+            "records_duplicate": duplicates,
+            "records_failed": self.failed,
+            "errors": self.errors,
+            "bytes_read": self.bytes_read,
+            "duration_ms": int((time.perf_counter() - start) * 1000),
+        }
+
+    async def _process_chunk(self, records: List[Any], content_length: Optional[int]):
+        rows = []
+        for record, result in zip(records, self.plan.transform_many(records)):
+            ordinal = self.processed
+            self.processed += 1
+            if not isinstance(record, dict):
+                self._record_failure(ordinal, [{"type": "invalid_record", "message": "Record is not an object"}])
+                continue
+            if not result.success:
+                self._record_failure(ordinal, result.errors)
+                continue
+            rows.append(self._staging_row(ordinal, record, result.transformed_data))
+
+        if rows:
+            await self._stage(rows)
+            self.staged += len(rows)
+
+        self.job.update_progress(self.processed, 0, 0, self.failed)
+        if content_length:
+            self.job.progress_percentage = min(99, self.bytes_read * 100 // content_length)
+        await self.db.commit()
+        forensic_ingest_records_total.inc(len(records), source=self.source, result="processed")
+
+    def _staging_row(self, ordinal: int, record: Dict[str, Any], data: Dict[str, Any]) -> tuple:
+        sha256 = str(data.get("sha256") or "").strip().lower()
+        if not SHA256_PATTERN.fullmatch(sha256):
+            sha256 = record_digest(record)
+
+        artefact_type = str(data.get("artefact_type") or "").strip().upper()
+        if artefact_type not in ARTEFACT_TYPES:
+            artefact_type = ArtefactType.OTHER.value
+
+        return (
+            self.job_id,
+            ordinal,
+            uuid.uuid4(),
+            sha256,
+            artefact_type,
+            _text(data.get("source_tool") or self.source_tool, 100),
+            _text(data.get("description")),
+            _text(data.get("file_path"), 500),
+        )
+
+    def _record_failure(self, ordinal: int, errors: List[Dict[str, Any]]):
+        self.failed += 1
+        if len(self.errors) < settings.ingest_max_error_details:
+            self.errors.append({
+                "record": ordinal,
+                "errors": [
+                    {key: error.get(key) for key in ("type", "field", "message")} for error in errors
+                ],
+            })
+
+    async def _stage(self, rows: List[tuple]):
+        """COPY rows into the staging table, or multi-row INSERT off asyncpg."""
+        connection = await self.db.connection()
+        raw_connection = await connection.get_raw_connection()
+        driver_connection = raw_connection.driver_connection
+        if hasattr(driver_connection, "copy_records_to_table"):
+            await driver_connection.copy_records_to_table(
+                ArtefactIngestStaging.__tablename__, records=rows, columns=STAGING_COLUMNS
+            )
+        else:
+            await self.db.execute(
+                insert(ArtefactIngestStaging), [dict(zip(STAGING_COLUMNS, row)) for row in rows]
+            )
+
+    async def _resolve_evidence(self, metadata: Dict[str, Any], report_sha256: str) -> uuid.UUID:
+        if self.evidence_id is not None:
+            return self.evidence_id
+
+        # Serialize concurrent imports of the same report into the same case
+        await self.db.execute(
+            text("SELECT pg_advisory_xact_lock(hashtext(:key))"),
+            {"key": f"ingest:{self.case_id}:{report_sha256}"}
+        )
+        existing = await self.db.scalar(
+            select(Evidence.id)
+            .where(Evidence.case_id == self.case_id, Evidence.sha256 == report_sha256)
+            .limit(1)
+        )
+        if existing is not None:
+            return existing
+
+        fields = device_fields(metadata)
+        fields.setdefault("label", f"{self.source_tool} report {report_sha256[:12]}")
+        evidence = Evidence(
+            case_id=self.case_id,
+            category="DIGITAL",
+            sha256=report_sha256,
+            collected_at=datetime.utcnow(),
+            description=f"Imported from {self.source_tool} report (sync job {self.job_id})",
+            **fields
+        )
+        self.db.add(evidence)
+        await self.db.flush()
+        return evidence.id
+
+    async def _merge(self, evidence_id: uuid.UUID) -> int:
+        """Merge staged rows into artefacts; returns the number inserted."""
+        await self.db.execute(
+            text("SELECT pg_advisory_xact_lock(hashtext(:key))"),
+            {"key": f"ingest:evidence:{evidence_id}"}
+        )
+        result = await self.db.execute(
+            MERGE_ARTEFACTS_SQL, {"evidence_id": str(evidence_id), "job_id": self.job_id}
+        )
+        await self.db.execute(
+            delete(ArtefactIngestStaging).where(ArtefactIngestStaging.job_id == self.job_id)
+        )
+        return max(result.rowcount or 0, 0)
+
+    async def _clear_staging(self):
+        try:
+            await self.db.execute(
+                delete(ArtefactIngestStaging).where(ArtefactIngestStaging.job_id == self.job_id)
+            )
+        except Exception as e:
+            logger.error(f"Failed to clear staged rows of sync job {self.job_id}: {e}")
+            await self.db.rollback()
+
+    async def _drop_abandoned_staging(self):
+        """Drop rows left behind by imports that died mid-stream."""
+        await self.db.execute(
+            text("DELETE FROM artefact_ingest_staging WHERE staged_at < now() - make_interval(hours => :hours)"),
+            {"hours": settings.ingest_staging_retention_hours}
+        )
+
+
+def create_ingest_job(
+    source_system: str,
+    user_id: uuid.UUID,
+    mapping_name: str,
+    case_id: Optional[uuid.UUID] = None,
+    evidence_id: Optional[uuid.UUID] = None
+) -> SyncJob:
+    """New running ``SyncJob`` tracking one report import."""
+    job = SyncJob(
+        id=str(uuid.uuid4()),
+        connector_type=source_system,
+        sync_direction="import",
+        entity_types=["artefacts"],
+        sync_filters={
+            "mapping": mapping_name,
+            "case_id": str(case_id) if case_id else None,
+            "evidence_id": str(evidence_id) if evidence_id else None,
+        },
+        error_summary=[],
+        created_by=user_id,
+    )
+    job.start_processing()
+    return job
+
+
+async def ingest_report(
+    db: AsyncSession,
+    body: AsyncIterator[bytes],
+    mapping: DataMapping,
+    source_system: str,
+    user_id: uuid.UUID,
+    case_id: Optional[uuid.UUID] = None,
+    evidence_id: Optional[uuid.UUID] = None,
+    content_type: Optional[str] = None,
+    content_length: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Import a streamed report with a stored mapping.
+
+    Creates the ``SyncJob``, runs the pipeline and returns its summary.
+    Parse errors raise ``ValueError`` after the job is marked failed.
+    """
+    job = create_ingest_job(source_system, user_id, mapping.name, case_id, evidence_id)
+    db.add(job)
+    await db.commit()
+
+    plan = data_transformer.compile_mapping(mapping_configuration_from_model(mapping))
+    pipeline = ForensicIngestPipeline(db, job, plan, source_system, case_id, evidence_id)
+    return await pipeline.run(body, content_type, content_length)
+
+
+forensic_ingest_jobs_total = metrics_registry.counter(
+    "forensic_ingest_jobs_total", "Forensic report imports by outcome", ("source", "result")
+)
+forensic_ingest_records_total = metrics_registry.counter(
+    "forensic_ingest_records_total", "Forensic report records by outcome", ("source", "result")
+)
@@ -0,0 +1,109 @@
+"""
+Strong ETags and conditional GET helpers.
+
+ETags are derived from cheap version inputs (row versions from the sync
+change log, a manifest's content, the caller's identity and query
+parameters) rather than from the serialized response, so a matching
+``If-None-Match`` short-circuits the request before any rows are loaded.
+"""
+
+import hashlib
+from typing import Any, Optional
+
+from fastapi import Request
+from fastapi.responses import Response
+from sqlalchemy import func, select, text
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+
+from app.utils.compression import ETAG_SUFFIXES
+
+_SYNC_CHANGE_VERSION_SQL = text("""
+    WITH horizon AS (SELECT pg_snapshot_xmin(pg_current_snapshot())::text::bigint AS txid)
+    SELECT
+        (SELECT concat_ws(':', min(version), max(version), count(*))
+         FROM sync_changes WHERE txid < (SELECT txid FROM horizon)) AS settled,
+        (SELECT coalesce(string_agg(version::text, ',' ORDER BY version), '')
+         FROM sync_changes WHERE txid >= (SELECT txid FROM horizon)) AS recent
+""")
+
+
+def make_etag(*parts: Any) -> str:
+    """Strong ETag over the string form of ``parts``."""
+    digest = hashlib.blake2b(digest_size=12)
+    for part in parts:
+        digest.update(str(part).encode())
+        digest.update(b"\x1f")
+    return f'"{digest.hexdigest()}"'
+
+
+def _strip_coding(tag: str) -> str:
+    for suffix in ETAG_SUFFIXES.values():
+        if tag.endswith(f'{suffix}"'):
+            return tag[:-len(suffix) - 1] + '"'
+    return tag
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Weak comparison of ``If-None-Match`` against ``etag`` (RFC 9110 13.1.2).
+
+    Tags that came back with a content-coding suffix added by
+    CompressionMiddleware match the uncompressed tag.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if _strip_coding(candidate) == etag:
+            return True
+    return False
+
+
+def not_modified(request: Request, etag: str, cache_control: str = "private, no-cache") -> Optional[Response]:
+    """Return a 304 response if the request's If-None-Match matches ``etag``."""
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
+    return None
+
+
+async def sync_change_version(db) -> str:
+    """
+    Validator of the sync change log's committed contents.
+
+    Any insert, update or delete of a case, task or device moves it, which
+    makes it a cheap validator for list responses over those tables.
+
+    ``max(version)`` alone is not enough: versions are taken in write order
+    but become visible in commit order, so a change committing late below
+    the current maximum would leave it unmoved. Rows below the commit
+    horizon are final, so their ``(min, max, count)`` identifies them, and
+    the few rows above it are listed. Taken from one snapshot.
+    """
+    row = (await db.execute(_SYNC_CHANGE_VERSION_SQL)).one()
+    return f"{row.settled}/{row.recent}"
+
+
+async def case_assignment_version(db, user_id) -> str:
+    """
+    Digest of the user's case assignments.
+
+    Assignments are not in the sync change log, yet they decide which cases
+    a non-privileged user sees, so per-user case lists include this in their
+    ETag. Assignment rows carry no update timestamp that a delete would move,
+    hence a digest of the rows rather than a max timestamp.
+    """
+    from app.models.case import CaseAssignment
+    digest = await db.scalar(
+        select(func.md5(func.coalesce(
+            func.string_agg(
+                func.concat(CaseAssignment.case_id, ":", CaseAssignment.role),
+                aggregate_order_by(",", CaseAssignment.case_id, CaseAssignment.role)
+            ),
+            ""
+        ))).where(CaseAssignment.user_id == user_id)
+    )
+    return digest or ""
@@ -27,6 +27,10 @@ from ..schemas.integrations import (
     ExternalSystemConnector, IntegrationTemplate
 )
 
+from ..config.settings import settings
+from .api_clients import APIClient, APIClientConfig, AuthenticationConfig, RateLimitConfig
+from .sync_runner import SyncJobRunner, find_interrupted_jobs
+
 logger = logging.getLogger(__name__)
 
 class IntegrationError(Exception):
@@ -185,11 +189,11 @@ class IntegrationManager:
     
     async def list_integrations(
         self,
+        db: AsyncSession,
         skip: int = 0,
         limit: int = 100,
         status: Optional[str] = None,
-        system_type: Optional[str] = None,
-        db: AsyncSession
+        system_type: Optional[str] = None
     ) -> List[Integration]:
         """List integrations with filtering"""
         query = select(Integration).offset(skip).limit(limit)
@@ -495,7 +499,14 @@ class WebhookHandler:
     """Handler for webhook operations"""
     
     def __init__(self):
-        self.session = aiohttp.ClientSession()
+        # Created on first use: instances are built at import, outside a loop
+        self._session: Optional[aiohttp.ClientSession] = None
+    
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession()
+        return self._session
     
     async def create_webhook(
         self,
@@ -534,11 +545,11 @@ class WebhookHandler:
     
     async def list_webhooks(
         self,
+        db: AsyncSession,
         skip: int = 0,
         limit: int = 100,
         active_only: bool = False,
-        event_type: Optional[str] = None,
-        db: AsyncSession
+        event_type: Optional[str] = None
     ) -> List[Webhook]:
         """List webhooks with filtering"""
         query = select(Webhook).offset(skip).limit(limit)
@@ -737,10 +748,10 @@ class WebhookHandler:
     async def get_delivery_history(
         self,
         webhook_id: str,
+        db: AsyncSession,
         skip: int = 0,
         limit: int = 100,
-        status: Optional[str] = None,
-        db: AsyncSession
+        status: Optional[str] = None
     ) -> List[WebhookDelivery]:
         """Get webhook delivery history"""
         query = select(WebhookDelivery).where(WebhookDelivery.webhook_id == webhook_id)
@@ -1051,7 +1062,14 @@ class ExternalAPIClient:
     """Client for external API integrations"""
     
     def __init__(self):
-        self.session = aiohttp.ClientSession()
+        # Created on first use: instances are built at import, outside a loop
+        self._session: Optional[aiohttp.ClientSession] = None
+    
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession()
+        return self._session
     
     async def connect_system(
         self,
@@ -1153,40 +1171,115 @@ class ExternalAPIClient:
             await db.rollback()
             raise IntegrationError(f"Failed to create sync job: {str(e)}")
     
-    async def process_sync_job(self, job_id: str, db: AsyncSession):
-        """Process synchronization job in background"""
+    async def process_sync_job(self, job_id: str, db: AsyncSession) -> Optional[Dict[str, Any]]:
+        """
+        Run (or resume) a synchronization job in the background.
+
+        Pages are fetched and upserted by ``SyncJobRunner``, which checkpoints
+        the job after every page; a failed or interrupted job resumes from
+        its checkpoint the next time it is processed. The integration config
+        supplies the remote API settings::
+
+            {"base_url": ..., "authentication": {...}, "rate_limit": {...},
+             "sync": {"endpoints": {"cases": "/api/cases"}, "paging": "keyset",
+                      "page_size": 500, "concurrency": 4}}
+        """
         result = await db.execute(
-            select(SyncJob).where(SyncJob.id == job_id)
+            select(SyncJob, Integration)
+            .join(Integration, Integration.id == SyncJob.integration_id)
+            .where(SyncJob.id == job_id)
         )
-        sync_job = result.scalar_one_or_none()
-        
-        if not sync_job:
-            return
-        
+        row = result.first()
+        if not row:
+            return None
+
+        sync_job, integration = row
+        config = integration.config or {}
+        sync_config = config.get("sync", {})
+
         try:
-            sync_job.start_processing()
-            await db.commit()
-            
-            # Simulate sync processing
-            await asyncio.sleep(2)  # Simulate processing time
-            
-            # Update progress
-            sync_job.update_progress(
-                processed=100,
-                created=50,
-                updated=30,
-                failed=20
+            client_config = APIClientConfig(
+                base_url=config["base_url"],
+                name=integration.system_identifier,
+                authentication=AuthenticationConfig(**config.get("authentication", {"type": "none"})),
+                rate_limit_config=RateLimitConfig(**config.get("rate_limit", {})),
+                default_timeout=config.get("timeout", 30.0),
+                verify_ssl=config.get("verify_ssl", True),
+                custom_headers=config.get("headers", {})
             )
-            
-            sync_job.complete_processing()
-            await db.commit()
-            
-            logger.info(f"Sync job {job_id} completed successfully")
-            
         except Exception as e:
-            sync_job.mark_failed(str(e))
+            sync_job.mark_failed(f"Invalid integration configuration: {e}")
             await db.commit()
-            logger.error(f"Sync job {job_id} failed: {str(e)}")
+            logger.error(f"Sync job {job_id} failed: {e}")
+            return None
+
+        async with APIClient(client_config) as client:
+            runner = SyncJobRunner(
+                client,
+                endpoints=sync_config.get("endpoints", {}),
+                paging=sync_config.get("paging", "keyset"),
+                page_size=sync_config.get("page_size"),
+                concurrency=sync_config.get("concurrency"),
+                id_field=sync_config.get("id_field", "id"),
+                updated_field=sync_config.get("updated_field", "updated_at")
+            )
+            try:
+                summary = await runner.run(job_id)
+            except Exception as e:
+                logger.error(f"Sync job {job_id} failed: {str(e)}")
+                return None
+
+        integration.last_sync_at = datetime.utcnow()
+        await db.commit()
+        return summary
+    
+    async def resume_interrupted_jobs(self, db: AsyncSession) -> List[str]:
+        """Resume running jobs whose worker stopped checkpointing them."""
+        job_ids = await find_interrupted_jobs(db)
+        for job_id in job_ids:
+            logger.warning(f"Resuming interrupted sync job {job_id}")
+            await self.process_sync_job(job_id, db)
+        return job_ids
+
+class SyncJobResumer:
+    """
+    Periodically resume sync jobs whose worker died mid-run.
+    
+    Started in every worker. A job is claimed through its lease before it
+    runs, so each interrupted job is resumed by one worker only.
+    """
+    
+    def __init__(self, manager: IntegrationManager, interval_seconds: float = 60.0):
+        self.manager = manager
+        self.interval_seconds = interval_seconds
+        self._task: Optional[asyncio.Task] = None
+    
+    async def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+    
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+    
+    async def _run(self):
+        from app.database.base import AsyncSessionLocal
+        
+        while True:
+            try:
+                async with AsyncSessionLocal() as db:
+                    await self.manager.resume_interrupted_jobs(db)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Resuming interrupted sync jobs failed: {e}")
+            await asyncio.sleep(self.interval_seconds)
 
 # Integration Monitoring Utilities
 
@@ -1247,9 +1340,9 @@ class IntegrationMonitor:
     
     async def get_metrics(
         self,
+        db: AsyncSession,
         timeframe: str = "24h",
-        integration_id: Optional[str] = None,
-        db: AsyncSession
+        integration_id: Optional[str] = None
     ) -> Dict[str, Any]:
         """Get integration metrics"""
         # Parse timeframe
@@ -1302,13 +1395,13 @@ class IntegrationMonitor:
     
     async def get_logs(
         self,
+        db: AsyncSession,
         skip: int = 0,
         limit: int = 100,
         level: Optional[str] = None,
         integration_id: Optional[str] = None,
         start_date: Optional[datetime] = None,
-        end_date: Optional[datetime] = None,
-        db: AsyncSession
+        end_date: Optional[datetime] = None
     ) -> List[IntegrationLog]:
         """Get integration logs with filtering"""
         query = select(IntegrationLog).offset(skip).limit(limit)
@@ -1333,6 +1426,7 @@ class IntegrationMonitor:
 
 # Global utility instances
 integration_manager = IntegrationManager()
+sync_job_resumer = SyncJobResumer(integration_manager, interval_seconds=settings.sync_resume_interval_seconds)
 webhook_handler = WebhookHandler()
 data_transformer = DataTransformer()
 external_api_client = ExternalAPIClient()
@@ -0,0 +1,172 @@
+"""
+Sorted interval index over IP ranges, for "is this address in the country" checks.
+
+- ``IPRangeIndex`` keeps IPv4 and IPv6 ranges as merged, sorted integer
+  start/end lists; a lookup is one ``bisect`` over the starts, O(log n)
+  however many ranges are loaded. IPv4-mapped IPv6 addresses are looked up
+  as IPv4
+- Ranges come from networks (``ipaddress`` objects or CIDR strings) or a
+  CIDR file: one network or ``first-last`` address pair per line, ``#``
+  starts a comment
+- ``contains`` sits behind an LRU of recently seen address strings, since
+  the same few addresses make up most of an audit log
+- ``contains_many`` classifies a batch. IPv4 addresses are packed with
+  ``inet_pton`` and looked up with one numpy ``searchsorted`` when numpy is
+  installed; IPv6, malformed entries and installs without numpy go through
+  ``contains``
+
+The index is immutable once built; build a new one to change the ranges.
+"""
+
+import ipaddress
+import logging
+import socket
+from bisect import bisect_right
+from functools import lru_cache, partial
+from typing import Iterable, List, Optional, Sequence, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+try:
+    import numpy
+except ImportError:  # Optional dependency
+    numpy = None
+
+# Dotted quad to 4 network-order bytes; raises OSError for anything else
+_pack_v4 = partial(socket.inet_pton, socket.AF_INET)
+
+NetworkLike = Union[str, ipaddress.IPv4Network, ipaddress.IPv6Network]
+
+
+def _merge(intervals: List[Tuple[int, int]]) -> Tuple[List[int], List[int]]:
+    """Sorted, non-overlapping starts and ends covering ``intervals``."""
+    starts: List[int] = []
+    ends: List[int] = []
+    for start, end in sorted(intervals):
+        if ends and start <= ends[-1] + 1:
+            ends[-1] = max(ends[-1], end)
+        else:
+            starts.append(start)
+            ends.append(end)
+    return starts, ends
+
+
+def _find(starts: List[int], ends: List[int], value: int) -> bool:
+    position = bisect_right(starts, value) - 1
+    return position >= 0 and value <= ends[position]
+
+
+def parse_range(value: str) -> Tuple[int, int, int]:
+    """(IP version, first, last) of a CIDR network or ``first-last`` pair."""
+    value = value.strip()
+    if "-" in value:
+        first, last = (ipaddress.ip_address(part.strip()) for part in value.split("-", 1))
+        if first.version != last.version or int(last) < int(first):
+            raise ValueError(f"Invalid address range: {value}")
+        return first.version, int(first), int(last)
+    network = ipaddress.ip_network(value, strict=False)
+    return network.version, int(network.network_address), int(network.broadcast_address)
+
+
+class IPRangeIndex:
+    """
+    Membership test for a fixed set of IPv4 and IPv6 ranges.
+
+    Overlapping and adjacent ranges are merged, so every address falls in at
+    most one stored interval.
+    """
+
+    def __init__(self, ranges: Iterable[NetworkLike] = (), cache_size: int = 65536):
+        intervals = {4: [], 6: []}
+        for network in ranges:
+            if isinstance(network, str):
+                version, first, last = parse_range(network)
+            else:
+                version, first, last = network.version, int(network.network_address), int(network.broadcast_address)
+            intervals[version].append((first, last))
+
+        self._v4_starts, self._v4_ends = _merge(intervals[4])
+        self._v6_starts, self._v6_ends = _merge(intervals[6])
+        if numpy is not None:
+            self._v4_start_array = numpy.array(self._v4_starts, dtype=numpy.uint32)
+            self._v4_end_array = numpy.array(self._v4_ends, dtype=numpy.uint32)
+
+        # Per instance, so the cache goes away with the index
+        self.contains = lru_cache(maxsize=cache_size)(self._lookup)
+
+    @classmethod
+    def from_file(cls, path: str, cache_size: int = 65536) -> "IPRangeIndex":
+        """Load ranges from a CIDR file; raises ``ValueError`` naming the first bad line."""
+        ranges = []
+        with open(path, encoding="utf-8") as handle:
+            for line_number, line in enumerate(handle, 1):
+                entry = line.split("#", 1)[0].strip()
+                if not entry:
+                    continue
+                try:
+                    parse_range(entry)
+                except ValueError as e:
+                    raise ValueError(f"{path}:{line_number}: {e}") from None
+                ranges.append(entry)
+        index = cls(ranges, cache_size=cache_size)
+        logger.info(f"Loaded {len(ranges)} IP ranges from {path} ({len(index)} after merging)")
+        return index
+
+    def __len__(self) -> int:
+        return len(self._v4_starts) + len(self._v6_starts)
+
+    def _lookup(self, ip_address: Optional[str]) -> bool:
+        try:
+            return _find(self._v4_starts, self._v4_ends, int.from_bytes(_pack_v4(ip_address), "big"))
+        except (OSError, TypeError, ValueError):
+            pass
+        if not ip_address:
+            return False
+        try:
+            address = ipaddress.ip_address(ip_address.strip())
+        except (ValueError, AttributeError):
+            return False
+        if address.version == 6:
+            if address.ipv4_mapped is None:
+                return _find(self._v6_starts, self._v6_ends, int(address))
+            address = address.ipv4_mapped
+        return _find(self._v4_starts, self._v4_ends, int(address))
+
+    def contains_many(self, ip_addresses: Sequence[Optional[str]]) -> List[bool]:
+        """Membership of each address, in order; invalid entries are False."""
+        if numpy is None or not ip_addresses:
+            return [self.contains(ip_address) for ip_address in ip_addresses]
+
+        try:
+            # Whole batch in C when every entry is a plain dotted quad
+            packed = b"".join(map(_pack_v4, ip_addresses))
+            return self._contains_v4(packed).tolist()
+        except (OSError, TypeError, ValueError):
+            pass
+
+        # Mixed batch: what looks like IPv4 vectorized, the rest one at a time
+        v4_positions = [
+            position for position, ip_address in enumerate(ip_addresses)
+            if isinstance(ip_address, str) and ":" not in ip_address
+        ]
+        try:
+            packed = b"".join(map(_pack_v4, map(ip_addresses.__getitem__, v4_positions)))
+        except (OSError, TypeError, ValueError):
+            # Malformed entries among them: classify everything one at a time
+            return [self.contains(ip_address) for ip_address in ip_addresses]
+        results = numpy.zeros(len(ip_addresses), dtype=bool)
+        results[v4_positions] = self._contains_v4(packed)
+        is_v4 = numpy.zeros(len(ip_addresses), dtype=bool)
+        is_v4[v4_positions] = True
+        for position in numpy.flatnonzero(~is_v4).tolist():
+            results[position] = self.contains(ip_addresses[position])
+        return results.tolist()
+
+    def _contains_v4(self, packed: bytes):
+        values = numpy.frombuffer(packed, dtype=">u4").astype(numpy.uint32)
+        if not len(self._v4_start_array):
+            return numpy.zeros(len(values), dtype=bool)
+        positions = numpy.searchsorted(self._v4_start_array, values, side="right") - 1
+        found = positions >= 0
+        return found & (values <= self._v4_end_array[numpy.maximum(positions, 0)])
+
@@ -0,0 +1,263 @@
+"""
+Size-bounded in-process LRU cache with TTLs.
+
+This module provides:
+- ``LRUCache``: O(1) get, set and eviction on an ``OrderedDict`` kept in
+  recency order, bounded by approximate bytes and entry count
+- Cheap approximate sizing that samples large containers instead of
+  serializing them
+- Expiry on access plus a background sweep driven by a min-heap of expiry
+  times, so expired entries do not linger until someone reads them
+- Hit, miss, eviction and expiration counters on the shared metrics registry
+
+The global ``l1_cache`` is the first tier for ``mobile_cache`` and
+``performance.cache_response``; Redis stays the shared second tier. Entries
+are per worker, so their TTL is capped by ``l1_cache_max_ttl_seconds`` to
+bound staleness after invalidation in another worker.
+
+Not thread-safe: use it from the event loop thread.
+"""
+
+import asyncio
+import heapq
+import logging
+import sys
+import time
+from collections import OrderedDict
+from fnmatch import fnmatchcase
+from itertools import islice
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.config.settings import settings
+from app.utils.metrics import metrics_registry
+
+logger = logging.getLogger(__name__)
+
+# Containers larger than this are sized from a sample of their items
+SIZE_SAMPLE = 16
+SIZE_MAX_DEPTH = 6
+
+
+def approximate_size(value: Any, _depth: int = 0) -> int:
+    """
+    Rough in-memory size of ``value`` in bytes.
+
+    Strings and bytes count their length; containers above ``SIZE_SAMPLE``
+    items extrapolate from the first few. Good enough to bound a cache,
+    far cheaper than ``json.dumps``.
+    """
+    if isinstance(value, (str, bytes, bytearray)):
+        return len(value) + 50
+    if value is None or isinstance(value, (bool, int, float)):
+        return 28
+    if _depth >= SIZE_MAX_DEPTH:
+        return sys.getsizeof(value)
+
+    if isinstance(value, dict):
+        count = len(value)
+        sample = list(islice(value.items(), SIZE_SAMPLE))
+        sampled = sum(approximate_size(k, _depth + 1) + approximate_size(v, _depth + 1) for k, v in sample)
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        count = len(value)
+        sample = list(islice(value, SIZE_SAMPLE))
+        sampled = sum(approximate_size(item, _depth + 1) for item in sample)
+    else:
+        model_dump = getattr(value, "model_dump", None)
+        if callable(model_dump):
+            return approximate_size(model_dump(), _depth + 1)
+        return sys.getsizeof(value)
+
+    if not sample:
+        return 64
+    return 64 + sampled * count // len(sample)
+
+
+class _Entry:
+    __slots__ = ("value", "expires_at", "size")
+
+    def __init__(self, value: Any, expires_at: float, size: int):
+        self.value = value
+        self.expires_at = expires_at
+        self.size = size
+
+
+class LRUCache:
+    """
+    Least-recently-used cache bounded by approximate bytes and entry count.
+
+    ``get`` moves the entry to the most-recent end, ``set`` evicts from the
+    least-recent end until the new entry fits -- all O(1) per entry.
+    """
+
+    def __init__(
+        self,
+        name: str = "l1",
+        max_bytes: int = 64 * 1024 * 1024,
+        max_entries: int = 100_000,
+        default_ttl: float = 300.0,
+        sweep_interval_seconds: float = 30.0
+    ):
+        self.name = name
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.sweep_interval_seconds = sweep_interval_seconds
+
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._expiry_heap: List[Tuple[float, str]] = []
+        self.current_bytes = 0
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+        self._task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        entry = self._entries.get(key)
+        return entry is not None and entry.expires_at > time.monotonic()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            self._record("misses")
+            return default
+        if entry.expires_at <= time.monotonic():
+            self._remove(key)
+            self._record("expirations")
+            self._record("misses")
+            return default
+        self._entries.move_to_end(key)
+        self._record("hits")
+        return entry.value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None, size: Optional[int] = None) -> bool:
+        """Store ``value``; returns False if it is larger than the whole cache."""
+        size = size if size is not None else approximate_size(value)
+        if size > self.max_bytes:
+            self.delete(key)
+            return False
+
+        expires_at = time.monotonic() + (ttl if ttl is not None else self.default_ttl)
+        if key in self._entries:
+            self._remove(key)
+
+        while self._entries and (
+            self.current_bytes + size > self.max_bytes or len(self._entries) >= self.max_entries
+        ):
+            self._remove(next(iter(self._entries)))
+            self._record("evictions")
+
+        self._entries[key] = _Entry(value, expires_at, size)
+        self.current_bytes += size
+        heapq.heappush(self._expiry_heap, (expires_at, key))
+        if len(self._expiry_heap) > 2 * len(self._entries) + 1024:
+            self._rebuild_heap()
+        return True
+
+    def delete(self, key: str) -> bool:
+        if key not in self._entries:
+            return False
+        self._remove(key)
+        return True
+
+    def delete_matching(self, pattern: str) -> int:
+        """Delete keys matching a glob pattern. O(n); meant for invalidation."""
+        keys = [key for key in self._entries if fnmatchcase(key, pattern)]
+        for key in keys:
+            self._remove(key)
+        return len(keys)
+
+    def clear(self):
+        self._entries.clear()
+        self._expiry_heap.clear()
+        self.current_bytes = 0
+
+    def sweep_expired(self, now: Optional[float] = None) -> int:
+        """Remove every expired entry. Cost follows the number expired, not the cache size."""
+        now = now if now is not None else time.monotonic()
+        removed = 0
+        heap = self._expiry_heap
+        while heap and heap[0][0] <= now:
+            expires_at, key = heapq.heappop(heap)
+            entry = self._entries.get(key)
+            # Heap items of overwritten or deleted entries are stale
+            if entry is not None and entry.expires_at == expires_at:
+                self._remove(key)
+                removed += 1
+        if removed:
+            self._record("expirations", removed)
+        return removed
+
+    def info(self) -> Dict[str, Any]:
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            "name": self.name,
+            "entries": len(self._entries),
+            "bytes": self.current_bytes,
+            "max_bytes": self.max_bytes,
+            "hit_rate": round(self.stats["hits"] / lookups, 4) if lookups else None,
+            **self.stats,
+        }
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key)
+        self.current_bytes -= entry.size
+
+    def _rebuild_heap(self):
+        self._expiry_heap = [(entry.expires_at, key) for key, entry in self._entries.items()]
+        heapq.heapify(self._expiry_heap)
+
+    def _record(self, stat: str, amount: int = 1):
+        self.stats[stat] += amount
+        if stat == "hits":
+            cache_lookups_total.inc(amount, cache=self.name, result="hit")
+        elif stat == "misses":
+            cache_lookups_total.inc(amount, cache=self.name, result="miss")
+        elif stat == "evictions":
+            cache_removals_total.inc(amount, cache=self.name, reason="evicted")
+        else:
+            cache_removals_total.inc(amount, cache=self.name, reason="expired")
+
+    async def start(self):
+        """Start the background TTL sweep."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.sweep_interval_seconds)
+            try:
+                self.sweep_expired()
+            except Exception as e:
+                logger.error(f"Cache sweep failed for {self.name}: {e}")
+
+
+cache_lookups_total = metrics_registry.counter(
+    "cache_lookups_total", "In-process cache lookups", ("cache", "result")
+)
+cache_removals_total = metrics_registry.counter(
+    "cache_removals_total", "In-process cache entries removed by eviction or expiry", ("cache", "reason")
+)
+
+# Shared first-tier cache (sweep started on application startup)
+l1_cache = LRUCache(
+    name="l1",
+    max_bytes=settings.l1_cache_max_bytes,
+    max_entries=settings.l1_cache_max_entries,
+    sweep_interval_seconds=settings.l1_cache_sweep_interval_seconds
+)
+
+l1_cache_bytes = metrics_registry.gauge(
+    "l1_cache_bytes", "Approximate bytes held in the in-process L1 cache"
+)
+l1_cache_bytes.set_function(lambda: l1_cache.current_bytes)
@@ -0,0 +1,520 @@
+"""
+Low-overhead metrics registry with Prometheus exposition.
+
+This module provides:
+- Counters, gauges and fixed-bucket (log-linear) histograms with labels
+- Lock-free recording (plain attribute updates on the event loop thread)
+- Multiprocess aggregation across uvicorn workers via per-process snapshots
+- Prometheus text format rendering for the ``/metrics`` endpoint
+- ASGI middleware and SQLAlchemy hooks for request, query and pool metrics
+"""
+
+import json
+import logging
+import math
+import os
+import asyncio
+import time
+from bisect import bisect_left
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+def log_linear_buckets(min_exponent: int = -4, max_exponent: int = 2, steps: int = 9) -> List[float]:
+    """
+    Generate log-linear bucket bounds.
+
+    Each power-of-ten decade from ``10**min_exponent`` to ``10**max_exponent``
+    is split into ``steps`` linear steps (1, 2, ... 9 x 10^e by default), giving
+    a constant relative error per decade with a fixed number of buckets.
+    """
+    bounds = []
+    for exponent in range(min_exponent, max_exponent):
+        base = 10.0 ** exponent
+        for step in range(steps):
+            bounds.append(round(base * (1 + step * 9 / steps), 12))
+    bounds.append(10.0 ** max_exponent)
+    return bounds
+
+
+# 100us .. 100s, suitable for request and query latency in seconds
+LATENCY_BUCKETS = log_linear_buckets(-4, 2)
+
+
+class HistogramValue:
+    """Fixed-bucket histogram state for one label set."""
+
+    __slots__ = ("bounds", "counts", "sum", "count", "min", "max")
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def observe(self, value: float):
+        """Record a value in O(log buckets)."""
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate a quantile by linear interpolation within its bucket."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        cumulative = 0
+        for index, bucket_count in enumerate(self.counts):
+            if bucket_count and cumulative + bucket_count >= rank:
+                lower = self.bounds[index - 1] if index > 0 else min(self.min, self.bounds[0])
+                upper = self.bounds[index] if index < len(self.bounds) else self.max
+                fraction = (rank - cumulative) / bucket_count
+                return max(self.min, min(self.max, lower + (upper - lower) * fraction))
+            cumulative += bucket_count
+        return self.max
+
+    def summary(self) -> Dict[str, Any]:
+        """Aggregate statistics without touching raw samples."""
+        if not self.count:
+            return {}
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min,
+            "max": self.max,
+            "mean": self.sum / self.count,
+            "median": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99)
+        }
+
+
+class _Metric:
+    """Base class for registered metrics."""
+
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], Any] = {}
+
+    def _key(self, labels: Dict[str, Any]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def snapshot(self) -> Dict[str, Any]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonically increasing counter."""
+
+    type_name = "counter"
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def get(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"samples": [[list(k), v] for k, v in self._values.items()]}
+
+
+class Gauge(_Metric):
+    """
+    Value that can go up and down.
+
+    ``multiprocess_mode`` controls aggregation across workers: ``livesum``
+    sums live processes, ``max``/``min`` take the extreme across live ones.
+    A gauge can also be backed by a callback evaluated at collection time.
+    """
+
+    type_name = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), multiprocess_mode: str = "livesum"):
+        super().__init__(name, documentation, labelnames)
+        self.multiprocess_mode = multiprocess_mode
+        self._function: Optional[Callable[[], float]] = None
+
+    def set(self, value: float, **labels):
+        self._values[self._key(labels)] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels):
+        self.inc(-amount, **labels)
+
+    def set_function(self, function: Callable[[], float]):
+        """Evaluate ``function`` at collection time (unlabelled gauges only)."""
+        self._function = function
+
+    def get(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def snapshot(self) -> Dict[str, Any]:
+        if self._function is not None:
+            try:
+                self._values[()] = float(self._function())
+            except Exception as e:
+                logger.debug(f"Gauge callback for {self.name} failed: {e}")
+        return {
+            "mode": self.multiprocess_mode,
+            "samples": [[list(k), v] for k, v in self._values.items()]
+        }
+
+
+class Histogram(_Metric):
+    """Fixed-bucket histogram (log-linear latency buckets by default)."""
+
+    type_name = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = list(buckets)
+
+    def labels(self, **labels) -> HistogramValue:
+        """Return the per-label-set state, for hot paths that observe often."""
+        key = self._key(labels)
+        value = self._values.get(key)
+        if value is None:
+            value = self._values[key] = HistogramValue(self.buckets)
+        return value
+
+    def observe(self, value: float, **labels):
+        self.labels(**labels).observe(value)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "buckets": self.buckets,
+            "samples": [[list(k), {"counts": v.counts, "sum": v.sum}] for k, v in self._values.items()]
+        }
+
+
+class MetricsRegistry:
+    """
+    Registry of application metrics.
+
+    Recording only touches in-process state. When ``multiprocess_dir`` is set,
+    each worker periodically writes a JSON snapshot of its metrics there and
+    ``collect()`` merges the snapshots of all workers: counters and histograms
+    are summed (including exited workers, so counters never go backwards) and
+    gauges are aggregated over live workers according to their mode.
+    """
+
+    def __init__(self, multiprocess_dir: Optional[str] = None, flush_interval_seconds: float = 5.0):
+        self.multiprocess_dir = multiprocess_dir
+        self.flush_interval_seconds = flush_interval_seconds
+        self._metrics: Dict[str, _Metric] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+
+    def _register(self, metric: _Metric) -> _Metric:
+        existing = self._metrics.get(metric.name)
+        if existing is not None:
+            if type(existing) is not type(metric) or existing.labelnames != metric.labelnames:
+                raise ValueError(f"Metric {metric.name} already registered with a different definition")
+            return existing
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = (), multiprocess_mode: str = "livesum") -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames, multiprocess_mode))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Serializable snapshot of this process's metrics."""
+        return {
+            "pid": os.getpid(),
+            "metrics": {
+                name: {
+                    "type": metric.type_name,
+                    "help": metric.documentation,
+                    "labelnames": list(metric.labelnames),
+                    **metric.snapshot()
+                }
+                for name, metric in self._metrics.items()
+            }
+        }
+
+    def _snapshot_path(self, pid: int) -> str:
+        return os.path.join(self.multiprocess_dir, f"metrics_{pid}.json")
+
+    def write_snapshot(self):
+        """Atomically write this process's snapshot to the multiprocess dir."""
+        if not self.multiprocess_dir:
+            return
+        os.makedirs(self.multiprocess_dir, exist_ok=True)
+        path = self._snapshot_path(os.getpid())
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.snapshot(), f)
+        os.replace(tmp_path, path)
+
+    def _read_snapshots(self) -> Iterable[Dict[str, Any]]:
+        yield self.snapshot()
+        if not self.multiprocess_dir or not os.path.isdir(self.multiprocess_dir):
+            return
+        own_pid = os.getpid()
+        for filename in os.listdir(self.multiprocess_dir):
+            if not filename.startswith("metrics_") or not filename.endswith(".json"):
+                continue
+            try:
+                with open(os.path.join(self.multiprocess_dir, filename)) as f:
+                    snapshot = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.debug(f"Skipping unreadable metrics snapshot {filename}: {e}")
+                continue
+            if snapshot.get("pid") != own_pid:
+                yield snapshot
+
+    @staticmethod
+    def _is_alive(pid: int) -> bool:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            return True
+        return True
+
+    def collect(self) -> Dict[str, Dict[str, Any]]:
+        """Merge metrics from this process and every snapshot on disk."""
+        merged: Dict[str, Dict[str, Any]] = {}
+
+        for snapshot in self._read_snapshots():
+            alive = None
+            for name, data in snapshot["metrics"].items():
+                target = merged.setdefault(name, {
+                    "type": data["type"],
+                    "help": data["help"],
+                    "labelnames": data["labelnames"],
+                    "buckets": data.get("buckets"),
+                    "samples": {}
+                })
+                samples = target["samples"]
+
+                if data["type"] == "gauge":
+                    if alive is None:
+                        alive = snapshot["pid"] == os.getpid() or self._is_alive(snapshot["pid"])
+                    if not alive:
+                        continue
+                    mode = data.get("mode", "livesum")
+                    for labels, value in data["samples"]:
+                        key = tuple(labels)
+                        if key not in samples:
+                            samples[key] = value
+                        elif mode == "max":
+                            samples[key] = max(samples[key], value)
+                        elif mode == "min":
+                            samples[key] = min(samples[key], value)
+                        else:
+                            samples[key] += value
+
+                elif data["type"] == "histogram":
+                    for labels, value in data["samples"]:
+                        key = tuple(labels)
+                        if key not in samples:
+                            samples[key] = {"counts": list(value["counts"]), "sum": value["sum"]}
+                        else:
+                            current = samples[key]
+                            current["counts"] = [a + b for a, b in zip(current["counts"], value["counts"])]
+                            current["sum"] += value["sum"]
+
+                else:
+                    for labels, value in data["samples"]:
+                        key = tuple(labels)
+                        samples[key] = samples.get(key, 0.0) + value
+
+        return merged
+
+    def render(self) -> str:
+        """Render all metrics in Prometheus text exposition format 0.0.4."""
+        lines: List[str] = []
+
+        for name, data in sorted(self.collect().items()):
+            lines.append(f"# HELP {name} {_escape_help(data['help'])}")
+            lines.append(f"# TYPE {name} {data['type']}")
+            labelnames = data["labelnames"]
+
+            for key, value in sorted(data["samples"].items()):
+                if data["type"] == "histogram":
+                    cumulative = 0
+                    bounds = list(data["buckets"]) + [math.inf]
+                    for bound, count in zip(bounds, value["counts"]):
+                        cumulative += count
+                        le = "+Inf" if bound == math.inf else _format_value(bound)
+                        lines.append(f"{name}_bucket{_format_labels(labelnames, key, ('le', le))} {cumulative}")
+                    lines.append(f"{name}_sum{_format_labels(labelnames, key)} {_format_value(value['sum'])}")
+                    lines.append(f"{name}_count{_format_labels(labelnames, key)} {cumulative}")
+                else:
+                    lines.append(f"{name}{_format_labels(labelnames, key)} {_format_value(value)}")
+
+        lines.append("")
+        return "\n".join(lines)
+
+    async def start(self):
+        """Start periodic snapshot flushing when multiprocess mode is on."""
+        if self.multiprocess_dir and (self._flush_task is None or self._flush_task.done()):
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self):
+        """Stop flushing and write a final snapshot."""
+        if self._flush_task:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
+        try:
+            self.write_snapshot()
+        except OSError as e:
+            logger.warning(f"Failed to write final metrics snapshot: {e}")
+
+    async def _flush_loop(self):
+        while True:
+            try:
+                self.write_snapshot()
+            except OSError as e:
+                logger.warning(f"Failed to write metrics snapshot: {e}")
+            await asyncio.sleep(self.flush_interval_seconds)
+
+
+def _escape_help(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if value == -math.inf:
+        return "-Inf"
+    return repr(float(value))
+
+
+def _format_labels(labelnames: Sequence[str], values: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [f'{name}="{_escape_label(value)}"' for name, value in zip(labelnames, values)]
+    if extra:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+# Global registry instance
+metrics_registry = MetricsRegistry(
+    multiprocess_dir=settings.metrics_multiproc_dir,
+    flush_interval_seconds=settings.metrics_flush_interval_seconds
+)
+
+http_requests_total = metrics_registry.counter(
+    "http_requests_total", "Total HTTP requests", ("method", "route", "status")
+)
+http_request_duration_seconds = metrics_registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency in seconds", ("method", "route")
+)
+db_queries_total = metrics_registry.counter(
+    "db_queries_total", "Total database statements executed", ("operation",)
+)
+db_query_duration_seconds = metrics_registry.histogram(
+    "db_query_duration_seconds", "Database statement execution time in seconds", ("operation",)
+)
+db_pool_checked_out = metrics_registry.gauge(
+    "db_pool_checked_out_connections", "Database connections currently checked out of the pool"
+)
+db_pool_size = metrics_registry.gauge(
+    "db_pool_size", "Configured database pool size"
+)
+db_pool_overflow = metrics_registry.gauge(
+    "db_pool_overflow_connections", "Database connections open beyond the pool size"
+)
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware recording request count and latency per route.
+
+    The route template (e.g. ``/api/v1/cases/{case_id}``) is used as the label
+    so metric cardinality stays bounded; unmatched paths share one label.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] == "/metrics":
+            await self.app(scope, receive, send)
+            return
+
+        status_holder = [500]
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status_holder[0] = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration = time.perf_counter() - start
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or "unmatched"
+            method = scope["method"]
+            http_request_duration_seconds.labels(method=method, route=route_path).observe(duration)
+            http_requests_total.inc(method=method, route=route_path, status=str(status_holder[0]))
+
+
+def instrument_engine(engine):
+    """
+    Record statement timing and pool usage for a SQLAlchemy engine.
+
+    Accepts sync or async engines; listeners are attached to the sync core.
+    """
+    from sqlalchemy import event
+
+    sync_engine = getattr(engine, "sync_engine", engine)
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("metrics_query_start", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get("metrics_query_start")
+        if not starts:
+            return
+        duration = time.perf_counter() - starts.pop()
+        operation = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "UNKNOWN"
+        db_query_duration_seconds.labels(operation=operation).observe(duration)
+        db_queries_total.inc(operation=operation)
+
+    pool = sync_engine.pool
+    if hasattr(pool, "checkedout"):
+        db_pool_checked_out.set_function(pool.checkedout)
+    if hasattr(pool, "size"):
+        db_pool_size.set_function(pool.size)
+    if hasattr(pool, "overflow"):
+        db_pool_overflow.set_function(lambda: max(pool.overflow(), 0))
@@ -3,22 +3,65 @@ import gzip
 import base64
 import hashlib
 from typing import Dict, List, Any, Optional, Tuple, Union
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from functools import wraps
 import asyncio
 import logging
+import time
 from dataclasses import dataclass
 from enum import Enum
 
+from sqlalchemy import BigInteger, and_, delete, literal, or_, select, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..config.settings import settings
+from ..models.case import Case
+from ..models.evidence import Evidence
+from ..models.sync import SyncCaseTombstone, SyncChange, SyncOperation, SyncPruneWatermark
+from ..models.task import Task
 from ..schemas.mobile import (
     MobileSyncRequest, MobileSyncResponse, OfflineAction,
     CompressedResponse, MobileOptimizationSettings,
     MobileCacheEntry, MobileStorageInfo, MobileContext,
     MobilePerformanceMetrics, MobileError, SyncEntityType
 )
+from .case_access import get_user_accessible_cases_filter
+from .compression import available_encodings, brotli, compress_bytes, zstandard
+from .lru_cache import LRUCache, l1_cache
 
 logger = logging.getLogger(__name__)
 
+# Entity types recorded in the sync change log
+SYNC_ENTITY_MODELS = {
+    SyncEntityType.CASES: Case,
+    SyncEntityType.TASKS: Task,
+    SyncEntityType.EVIDENCE: Evidence,
+}
+
+# Offline actions name entities in the singular
+OFFLINE_ENTITY_MODELS = {
+    "case": Case, "cases": Case,
+    "task": Task, "tasks": Task,
+    "evidence": Evidence,
+}
+
+# Oldest transaction that may still be running; everything below it is final
+SYNC_HORIZON_SQL = text("SELECT pg_snapshot_xmin(pg_current_snapshot())::text::bigint")
+
+# Deletes expired change log rows and moves the prune watermark to the latest of them
+_PRUNE_CHANGE_LOG_SQL = text("""
+    WITH pruned AS (
+        DELETE FROM sync_changes WHERE changed_at < :cutoff RETURNING txid, version
+    ), watermark AS (
+        INSERT INTO sync_prune_watermark (id, txid, version)
+        SELECT 1, txid, version FROM pruned ORDER BY txid DESC, version DESC LIMIT 1
+        ON CONFLICT (id) DO UPDATE
+        SET txid = EXCLUDED.txid, version = EXCLUDED.version, pruned_at = now()
+        WHERE (sync_prune_watermark.txid, sync_prune_watermark.version) < (EXCLUDED.txid, EXCLUDED.version)
+    )
+    SELECT count(*) FROM pruned
+""")
+
 class CacheLevel(str, Enum):
     MEMORY = "memory"
     DISK = "disk"
@@ -59,7 +102,13 @@ class MobileCompressionUtils:
     
     @staticmethod
     def compress_data(data: Union[str, Dict[str, Any]], encoding: str = "gzip") -> CompressedResponse:
-        """Compress data for mobile transmission"""
+        """
+        Compress data into a base64 ``CompressedResponse`` envelope.
+        
+        Only for clients that need compressed payloads inside JSON; HTTP
+        responses are compressed by CompressionMiddleware, which avoids the
+        base64 overhead.
+        """
         try:
             # Convert to JSON string if dict
             if isinstance(data, dict):
@@ -70,10 +119,9 @@ class MobileCompressionUtils:
             original_data = json_str.encode('utf-8')
             original_size = len(original_data)
             
-            if encoding == "gzip":
-                compressed_data = gzip.compress(original_data)
-            else:
+            if encoding not in available_encodings():
                 raise ValueError(f"Unsupported encoding: {encoding}")
+            compressed_data = compress_bytes(original_data, encoding)
             
             compressed_size = len(compressed_data)
             compression_ratio = compressed_size / original_size if original_size > 0 else 1.0
@@ -102,6 +150,10 @@ class MobileCompressionUtils:
             
             if compressed_response.encoding == "gzip":
                 decompressed_data = gzip.decompress(compressed_data)
+            elif compressed_response.encoding == "br" and brotli is not None:
+                decompressed_data = brotli.decompress(compressed_data)
+            elif compressed_response.encoding == "zstd" and zstandard is not None:
+                decompressed_data = zstandard.ZstdDecompressor().decompressobj().decompress(compressed_data)
             else:
                 raise ValueError(f"Unsupported encoding: {compressed_response.encoding}")
             
@@ -112,12 +164,27 @@ class MobileCompressionUtils:
             raise
 
 class MobileCacheManager:
-    """Cache manager optimized for mobile environments"""
+    """
+    Cache manager optimized for mobile environments.
+    
+    A namespaced view over an :class:`~app.utils.lru_cache.LRUCache`,
+    by default the process-wide ``l1_cache`` shared with
+    ``performance.cache_response``.
+    """
+    
+    def __init__(self, max_memory_size: Optional[int] = None, cache: Optional[LRUCache] = None, namespace: str = "mobile"):
+        if cache is None:
+            cache = l1_cache if max_memory_size is None else LRUCache(name=namespace, max_bytes=max_memory_size)
+        self.cache = cache
+        self.namespace = namespace
     
-    def __init__(self, max_memory_size: int = 50 * 1024 * 1024):  # 50MB default
-        self.memory_cache: Dict[str, MobileCacheEntry] = {}
-        self.max_memory_size = max_memory_size
-        self.current_memory_usage = 0
+    @property
+    def max_memory_size(self) -> int:
+        return self.cache.max_bytes
+    
+    @property
+    def current_memory_usage(self) -> int:
+        return self.cache.current_bytes
     
     def _generate_cache_key(self, prefix: str, **kwargs) -> str:
         """Generate a consistent cache key"""
@@ -127,90 +194,24 @@ class MobileCacheManager:
         key_string = "|".join(key_parts)
         return hashlib.md5(key_string.encode()).hexdigest()
     
+    def _key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+    
     def get(self, key: str) -> Optional[Dict[str, Any]]:
         """Get data from cache"""
-        if key not in self.memory_cache:
-            return None
-        
-        entry = self.memory_cache[key]
-        
-        # Check if expired
-        if entry.expires_at <= datetime.utcnow():
-            self.delete(key)
-            return None
-        
-        # Update access stats
-        entry.last_accessed = datetime.utcnow()
-        entry.access_count += 1
-        
-        return entry.data
+        return self.cache.get(self._key(key))
     
     def set(self, key: str, data: Dict[str, Any], ttl_seconds: int = 300) -> bool:
         """Set data in cache with TTL"""
         try:
-            # Calculate size
-            data_size = len(json.dumps(data, default=str).encode('utf-8'))
-            
-            # Check if we need to evict entries
-            if self.current_memory_usage + data_size > self.max_memory_size:
-                self._evict_lru_entries(data_size)
-            
-            expires_at = datetime.utcnow() + timedelta(seconds=ttl_seconds)
-            
-            entry = MobileCacheEntry(
-                key=key,
-                data=data,
-                expires_at=expires_at,
-                size_bytes=data_size,
-                last_accessed=datetime.utcnow(),
-                access_count=0,
-                cache_level=CacheLevel.MEMORY
-            )
-            
-            # Remove old entry if exists
-            if key in self.memory_cache:
-                old_entry = self.memory_cache[key]
-                self.current_memory_usage -= old_entry.size_bytes
-            
-            self.memory_cache[key] = entry
-            self.current_memory_usage += data_size
-            
-            return True
+            return self.cache.set(self._key(key), data, ttl=ttl_seconds)
         except Exception as e:
             logger.error(f"Cache set failed for key {key}: {e}")
             return False
     
     def delete(self, key: str) -> bool:
         """Delete entry from cache"""
-        if key in self.memory_cache:
-            entry = self.memory_cache[key]
-            self.current_memory_usage -= entry.size_bytes
-            del self.memory_cache[key]
-            return True
-        return False
-    
-    def _evict_lru_entries(self, needed_space: int) -> None:
-        """Evict least recently used entries to free space"""
-        # Sort by last_accessed (oldest first)
-        sorted_entries = sorted(
-            self.memory_cache.items(),
-            key=lambda x: x[1].last_accessed
-        )
-        
-        freed_space = 0
-        keys_to_delete = []
-        
-        for key, entry in sorted_entries:
-            keys_to_delete.append(key)
-            freed_space += entry.size_bytes
-            
-            if freed_space >= needed_space:
-                break
-        
-        for key in keys_to_delete:
-            self.delete(key)
-        
-        logger.info(f"Evicted {len(keys_to_delete)} cache entries, freed {freed_space} bytes")
+        return self.cache.delete(self._key(key))
     
     def get_storage_info(self) -> MobileStorageInfo:
         """Get current cache storage information"""
@@ -224,25 +225,107 @@ class MobileCacheManager:
             cleanup_recommended=self.current_memory_usage > (self.max_memory_size * 0.8)
         )
 
+def encode_sync_cursor(txid: int, version: int) -> str:
+    """Opaque sync cursor handed to mobile clients."""
+    return f"{txid}.{version}"
+
+def decode_sync_cursor(cursor: Optional[str]) -> Optional[Tuple[int, int]]:
+    """Return ``(txid, version)`` for a cursor, or None if missing or malformed."""
+    if not cursor:
+        return None
+    txid, _, version = cursor.partition(".")
+    try:
+        return int(txid), int(version)
+    except ValueError:
+        return None
+
+def _enum_value(value):
+    return getattr(value, "value", value)
+
+def _iso(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value else None
+
+def _as_aware(value: datetime) -> datetime:
+    """Treat naive client timestamps as UTC."""
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+def _serialize_case(case: Case) -> Dict[str, Any]:
+    return {
+        "id": str(case.id),
+        "case_number": case.case_number,
+        "title": (case.title or "")[:100],
+        "status": _enum_value(case.status),
+        "severity": case.severity,
+        "description": (case.description or "")[:200] or None,
+        "updated_at": _iso(case.updated_at),
+    }
+
+def _serialize_task(task: Task) -> Dict[str, Any]:
+    return {
+        "id": str(task.id),
+        "case_id": str(task.case_id),
+        "title": (task.title or "")[:100],
+        "status": _enum_value(task.status),
+        "priority": task.priority,
+        "due_at": _iso(task.due_at),
+        "assigned_to": str(task.assigned_to) if task.assigned_to else None,
+        "updated_at": _iso(task.updated_at),
+    }
+
+def _serialize_evidence(evidence: Evidence) -> Dict[str, Any]:
+    return {
+        "id": str(evidence.id),
+        "case_id": str(evidence.case_id) if evidence.case_id else None,
+        "label": (evidence.label or "")[:100],
+        "category": evidence.category,
+        "type": evidence.evidence_type,
+        "updated_at": _iso(evidence.updated_at),
+    }
+
+SYNC_SERIALIZERS = {
+    SyncEntityType.CASES: _serialize_case,
+    SyncEntityType.TASKS: _serialize_task,
+    SyncEntityType.EVIDENCE: _serialize_evidence,
+}
+
 class MobileSyncEngine:
-    """Synchronization engine for mobile offline support"""
+    """
+    Synchronization engine for mobile offline support.
     
-    def __init__(self):
+    Deltas come from the ``sync_changes`` log. A client's cursor is the
+    ``(txid, version)`` of the last change it received; each sync returns the
+    next page of changes from finished transactions after that cursor, limited
+    to cases the user may access, with repeated changes to the same entity
+    collapsed into one.
+    """
+    
+    def __init__(
+        self,
+        retention_days: int = 30,
+        prune_interval_seconds: float = 3600,
+        session_factory=None
+    ):
         self.conflict_resolvers = {
             "cases": self._resolve_case_conflict,
             "tasks": self._resolve_task_conflict,
             "evidence": self._resolve_evidence_conflict
         }
+        self.retention_days = retention_days
+        self.prune_interval_seconds = prune_interval_seconds
+        self.session_factory = session_factory
+        self._last_prune = 0.0
+        self._prune_task: Optional[asyncio.Task] = None
     
     async def process_sync_request(
         self, 
         sync_request: MobileSyncRequest, 
-        user_id: str
+        user,
+        db: AsyncSession
     ) -> MobileSyncResponse:
         """Process a synchronization request from mobile client"""
         try:
             sync_timestamp = datetime.utcnow()
-            changes = {}
+            user_id = str(user.id)
             conflicts = []
             offline_action_results = []
             
@@ -254,22 +337,17 @@ class MobileSyncEngine:
                 
                 # Check for conflicts
                 conflicts = await self._detect_conflicts(
-                    sync_request.offline_actions, user_id
+                    db, sync_request.offline_actions, user_id
                 )
             
-            # Get server changes since last sync
-            for entity_type in sync_request.sync_entities:
-                entity_changes = await self._get_entity_changes(
-                    entity_type,
-                    sync_request.last_sync_timestamp,
-                    sync_request.max_items_per_entity,
-                    user_id,
-                    sync_request.include_deleted
-                )
-                changes[entity_type.value] = entity_changes
+            # Get server changes since the client's cursor
+            changes, next_cursor, has_more, full_sync_required = await self._get_changes(
+                db, user, sync_request
+            )
+            self._schedule_prune()
             
             # Calculate next sync recommendation
-            next_sync = sync_timestamp + timedelta(minutes=15)  # 15 min default
+            next_sync = sync_timestamp + timedelta(minutes=0 if has_more else 15)  # 15 min default
             
             return MobileSyncResponse(
                 sync_timestamp=sync_timestamp,
@@ -278,8 +356,15 @@ class MobileSyncEngine:
                 offline_action_results=offline_action_results,
                 next_sync_recommended=next_sync,
                 server_time=sync_timestamp,
+                sync_cursor=next_cursor,
+                has_more=has_more,
+                full_sync_required=full_sync_required,
                 sync_statistics={
-                    "total_changes": sum(len(changes.get(et.value, [])) for et in sync_request.sync_entities),
+                    "total_changes": sum(len(items) for items in changes.values()),
+                    "items_deleted": sum(
+                        1 for items in changes.values() for item in items
+                        if item["operation"] == SyncOperation.DELETE
+                    ),
                     "conflicts_detected": len(conflicts),
                     "offline_actions_processed": len(offline_action_results)
                 }
@@ -349,6 +434,7 @@ class MobileSyncEngine:
     
     async def _detect_conflicts(
         self, 
+        db: AsyncSession,
         offline_actions: List[OfflineAction], 
         user_id: str
     ) -> List[Dict[str, Any]]:
@@ -358,12 +444,11 @@ class MobileSyncEngine:
         for action in offline_actions:
             if action.entity_id and action.action_type.value in ["update_task", "add_comment"]:
                 # Check if entity was modified on server since action timestamp
-                # This would query your actual database
                 server_modified = await self._get_entity_last_modified(
-                    action.entity_type, action.entity_id
+                    db, action.entity_type, action.entity_id
                 )
                 
-                if server_modified and server_modified > action.timestamp:
+                if server_modified and server_modified > _as_aware(action.timestamp):
                     conflict = {
                         "action_id": action.action_id,
                         "entity_type": action.entity_type,
@@ -377,43 +462,169 @@ class MobileSyncEngine:
         
         return conflicts
     
-    async def _get_entity_changes(
-        self, 
-        entity_type: SyncEntityType, 
-        since_timestamp: Optional[datetime],
-        max_items: int,
-        user_id: str,
-        include_deleted: bool
-    ) -> List[Dict[str, Any]]:
-        """Get changes for a specific entity type since timestamp"""
-        # This would integrate with your actual database queries
-        # Placeholder implementation
-        
-        changes = []
+    def _needs_full_sync(self, sync_request: MobileSyncRequest) -> bool:
+        """Clients asking for it or without a usable cursor must re-download."""
+        return sync_request.full_sync or decode_sync_cursor(sync_request.sync_cursor) is None
+    
+    async def _cursor_pruned(self, db: AsyncSession, cursor: Tuple[int, int]) -> bool:
+        """
+        Whether changes after ``cursor`` have been pruned from the change log.
+        
+        Decided from the server's prune watermark, not the client's clock.
+        Read after the page so a prune committing in between is seen.
+        """
+        watermark = (await db.execute(
+            select(SyncPruneWatermark.txid, SyncPruneWatermark.version)
+        )).one_or_none()
+        return watermark is not None and tuple(cursor) < tuple(watermark)
+    
+    async def _get_changes(
+        self,
+        db: AsyncSession,
+        user,
+        sync_request: MobileSyncRequest
+    ) -> Tuple[Dict[str, List[Dict[str, Any]]], str, bool, bool]:
+        """
+        Get the next page of changes after the client's cursor.
+        
+        Returns ``(changes by entity type, next cursor, has_more, full_sync_required)``.
+        Only changes from transactions older than the current snapshot's xmin
+        are read, so a transaction that commits later can never land behind a
+        cursor that was already handed out.
+        """
+        changes = {entity_type.value: [] for entity_type in sync_request.sync_entities}
+        horizon = await db.scalar(SYNC_HORIZON_SQL)
+        
+        if self._needs_full_sync(sync_request):
+            return changes, encode_sync_cursor(horizon, 0), False, True
+        
+        entity_types = [et for et in sync_request.sync_entities if et in SYNC_ENTITY_MODELS]
+        cursor = decode_sync_cursor(sync_request.sync_cursor)
+        if not entity_types:
+            return changes, sync_request.sync_cursor, False, False
+        
+        limit = sync_request.max_items_per_entity * len(entity_types)
+        
+        query = (
+            select(SyncChange)
+            .where(
+                SyncChange.entity_type.in_([et.value for et in entity_types]),
+                tuple_(SyncChange.txid, SyncChange.version)
+                > tuple_(literal(cursor[0], BigInteger), literal(cursor[1], BigInteger)),
+                SyncChange.txid < horizon
+            )
+            .order_by(SyncChange.txid, SyncChange.version)
+            .limit(limit + 1)
+        )
+        accessible = get_user_accessible_cases_filter(user)
+        if accessible is not True:
+            # Changes of deleted cases keep flowing so clients can drop them,
+            # but only to users who could see the case when it was deleted.
+            # Changes without a case are only visible to unrestricted users.
+            query = (
+                query
+                .outerjoin(Case, Case.id == SyncChange.case_id)
+                .outerjoin(SyncCaseTombstone, and_(Case.id.is_(None), SyncCaseTombstone.case_id == SyncChange.case_id))
+                .where(or_(
+                    and_(Case.id.isnot(None), accessible),
+                    and_(
+                        SyncCaseTombstone.case_id.isnot(None),
+                        get_user_accessible_cases_filter(user, SyncCaseTombstone)
+                    )
+                ))
+            )
+        if not sync_request.include_deleted:
+            query = query.where(SyncChange.operation == SyncOperation.UPSERT)
         
-        if entity_type == SyncEntityType.CASES:
-            # Get case changes since timestamp
-            # TODO: Implement actual database query
-            pass
-        elif entity_type == SyncEntityType.TASKS:
-            # Get task changes since timestamp
-            # TODO: Implement actual database query
-            pass
-        elif entity_type == SyncEntityType.EVIDENCE:
-            # Get evidence changes since timestamp
-            # TODO: Implement actual database query
-            pass
+        rows = (await db.execute(query)).scalars().all()
+        if await self._cursor_pruned(db, cursor):
+            return changes, encode_sync_cursor(horizon, 0), False, True
+        has_more = len(rows) > limit
+        rows = rows[:limit]
         
-        return changes[:max_items]
+        if has_more:
+            next_cursor = (rows[-1].txid, rows[-1].version)
+        else:
+            # Every finished transaction below the horizon has been read
+            next_cursor = max(cursor, (horizon, 0))
+        
+        # Latest change per entity within the page
+        latest: Dict[Tuple[str, Any], SyncChange] = {}
+        for row in rows:
+            latest.pop((row.entity_type, row.entity_id), None)
+            latest[(row.entity_type, row.entity_id)] = row
+        
+        for entity_type in entity_types:
+            page = [row for (kind, _), row in latest.items() if kind == entity_type.value]
+            upsert_ids = [row.entity_id for row in page if row.operation == SyncOperation.UPSERT]
+            entities = await self._load_entities(db, entity_type, upsert_ids)
+            serialize = SYNC_SERIALIZERS[entity_type]
+            
+            for row in page:
+                item = {
+                    "id": str(row.entity_id),
+                    "operation": row.operation,
+                    "version": row.version,
+                }
+                if row.operation == SyncOperation.UPSERT:
+                    entity = entities.get(row.entity_id)
+                    if entity is None:
+                        continue  # Deleted since; the delete follows in a later page
+                    item["data"] = serialize(entity)
+                changes[entity_type.value].append(item)
+        
+        return changes, encode_sync_cursor(*next_cursor), has_more, False
+    
+    async def _load_entities(self, db: AsyncSession, entity_type: SyncEntityType, ids: List[Any]) -> Dict[Any, Any]:
+        if not ids:
+            return {}
+        model = SYNC_ENTITY_MODELS[entity_type]
+        result = await db.execute(select(model).where(model.id.in_(ids)))
+        return {entity.id: entity for entity in result.scalars()}
     
     async def _get_entity_last_modified(
         self, 
+        db: AsyncSession,
         entity_type: str, 
         entity_id: str
     ) -> Optional[datetime]:
         """Get the last modified timestamp for an entity"""
-        # TODO: Implement actual database query
-        return None
+        model = OFFLINE_ENTITY_MODELS.get(entity_type.lower())
+        if model is None:
+            return None
+        try:
+            return await db.scalar(select(model.updated_at).where(model.id == entity_id))
+        except Exception as e:
+            logger.warning(f"Could not read last modification of {entity_type} {entity_id}: {e}")
+            return None
+    
+    def _schedule_prune(self):
+        """Prune the change log in the background at most once per interval."""
+        now = time.monotonic()
+        if now - self._last_prune < self.prune_interval_seconds:
+            return
+        if self._prune_task and not self._prune_task.done():
+            return
+        self._last_prune = now
+        self._prune_task = asyncio.create_task(self.prune_change_log())
+    
+    async def prune_change_log(self) -> int:
+        """Delete change log rows and case tombstones older than the retention window."""
+        if self.session_factory is None:
+            from ..database.base import AsyncSessionLocal
+            self.session_factory = AsyncSessionLocal
+        cutoff = datetime.now(timezone.utc) - timedelta(days=self.retention_days)
+        try:
+            async with self.session_factory() as db:
+                pruned = (await db.execute(_PRUNE_CHANGE_LOG_SQL, {"cutoff": cutoff})).scalar_one()
+                await db.execute(delete(SyncCaseTombstone).where(SyncCaseTombstone.deleted_at < cutoff))
+                await db.commit()
+            if pruned:
+                logger.info(f"Pruned {pruned} sync change log rows older than {cutoff.isoformat()}")
+            return pruned
+        except Exception as e:
+            logger.error(f"Sync change log pruning failed: {e}")
+            return 0
     
     def _resolve_case_conflict(self, conflict: SyncConflict) -> Dict[str, Any]:
         """Resolve conflicts for case entities"""
@@ -590,8 +801,7 @@ def mobile_cache(ttl_seconds: int = 300, key_prefix: str = "mobile"):
     def decorator(func):
         @wraps(func)
         async def wrapper(*args, **kwargs):
-            # Get cache manager from app state or create one
-            cache_manager = getattr(wrapper, '_cache_manager', MobileCacheManager())
+            cache_manager = mobile_cache_manager
             
             # Generate cache key
             cache_key = cache_manager._generate_cache_key(
@@ -611,12 +821,16 @@ def mobile_cache(ttl_seconds: int = 300, key_prefix: str = "mobile"):
             
             return result
         
-        wrapper._cache_manager = MobileCacheManager()
         return wrapper
     return decorator
 
 def mobile_compress(threshold: int = 1024):
-    """Decorator to automatically compress mobile API responses"""
+    """
+    Decorator to wrap mobile API responses in a base64 ``CompressedResponse``.
+    
+    Transport compression (CompressionMiddleware) is cheaper and smaller; use
+    this only for clients that cannot handle Content-Encoding.
+    """
     def decorator(func):
         @wraps(func)
         async def wrapper(*args, **kwargs):
@@ -648,7 +862,10 @@ def mobile_optimize(network_type: NetworkType = NetworkType.UNKNOWN):
 
 # Global instances (would typically be managed by dependency injection)
 mobile_cache_manager = MobileCacheManager()
-mobile_sync_engine = MobileSyncEngine()
+mobile_sync_engine = MobileSyncEngine(
+    retention_days=settings.mobile_sync_change_retention_days,
+    prune_interval_seconds=settings.mobile_sync_prune_interval_seconds
+)
 mobile_metrics_collector = MobileMetricsCollector()
 mobile_compression_utils = MobileCompressionUtils()
 mobile_optimization_utils = MobileOptimizationUtils()
\ No newline at end of file
@@ -0,0 +1,213 @@
+"""
+In-process execution of mobile batch requests.
+
+Each sub-request of a ``/mobile/batch`` call is dispatched straight through the
+ASGI application -- middleware, routing, dependencies and all -- with the
+caller's credentials, so it behaves exactly like the equivalent standalone
+request without another network round trip.
+
+Execution order:
+- Consecutive GETs run concurrently, bounded by the per-batch limit
+- Any other method waits for everything before it and runs on its own, so
+  reads after a write see the write
+- ``sequential`` or ``stop_on_error`` batches run strictly one at a time
+
+Results are yielded as they complete so the endpoint can stream them.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional
+from urllib.parse import urlencode
+
+from app.schemas.mobile import MobileBatchRequest, MobileBatchRequestItem
+
+logger = logging.getLogger(__name__)
+
+# Caller headers carried into every sub-request (the authenticated principal)
+FORWARDED_HEADERS = {b"authorization", b"cookie", b"x-device-id", b"user-agent", b"x-forwarded-for"}
+
+# Sub-request headers that may not override the caller's
+PROTECTED_HEADERS = {"authorization", "cookie", "host", "content-length", "transfer-encoding"}
+
+# Response headers worth returning to the client
+RETURNED_HEADERS = {"content-type", "etag", "last-modified", "cache-control", "location", "retry-after"}
+
+
+class MobileBatchExecutor:
+    """Dispatch batch sub-requests through an ASGI app."""
+
+    def __init__(
+        self,
+        app,
+        parent_scope: Dict[str, Any],
+        concurrency: int = 4,
+        timeout_seconds: float = 30.0,
+        batch_path: Optional[str] = None
+    ):
+        self.app = app
+        self.parent_scope = parent_scope
+        self.concurrency = max(1, concurrency)
+        self.timeout_seconds = timeout_seconds
+        self.batch_path = batch_path or parent_scope.get("path")
+        self._forwarded = [
+            (name, value) for name, value in parent_scope.get("headers", [])
+            if name.lower() in FORWARDED_HEADERS
+        ]
+
+    def _build_scope(self, item: MobileBatchRequestItem, body: bytes) -> Dict[str, Any]:
+        path, _, inline_query = item.endpoint.partition("?")
+        query = "&".join(
+            part for part in (inline_query, urlencode(item.params or {}, doseq=True)) if part
+        )
+
+        headers = list(self._forwarded)
+        for name, value in (item.headers or {}).items():
+            if name.lower() not in PROTECTED_HEADERS:
+                headers.append((name.lower().encode("latin-1"), str(value).encode("latin-1")))
+        if body:
+            headers.append((b"content-type", b"application/json"))
+            headers.append((b"content-length", str(len(body)).encode()))
+
+        scope = {
+            key: self.parent_scope[key]
+            for key in ("http_version", "scheme", "server", "client", "root_path")
+            if key in self.parent_scope
+        }
+        scope.update({
+            "type": "http",
+            "asgi": {"version": "3.0", "spec_version": "2.3"},
+            "method": item.method,
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": query.encode(),
+            "headers": headers,
+        })
+        return scope
+
+    async def execute(self, item: MobileBatchRequestItem) -> Dict[str, Any]:
+        """Run one sub-request and return its batch result entry."""
+        start = time.perf_counter()
+
+        if not item.endpoint.startswith("/") or item.endpoint.split("?")[0].rstrip("/") == self.batch_path.rstrip("/"):
+            return self._result(item, 400, {"status": "error", "error": "Unsupported endpoint"}, {}, start)
+
+        body = json.dumps(item.body).encode() if item.body and item.method != "GET" else b""
+        scope = self._build_scope(item, body)
+        request_sent = False
+        status_code = 500
+        response_headers: Dict[str, str] = {}
+        chunks: List[bytes] = []
+        disconnect = asyncio.Event()
+
+        async def receive():
+            nonlocal request_sent
+            if not request_sent:
+                request_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            await disconnect.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                for name, value in message.get("headers", []):
+                    name = name.decode("latin-1").lower()
+                    if name in RETURNED_HEADERS:
+                        response_headers[name] = value.decode("latin-1")
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+
+        try:
+            await asyncio.wait_for(self.app(scope, receive, send), self.timeout_seconds)
+        except asyncio.TimeoutError:
+            return self._result(item, 504, {"status": "error", "error": "Sub-request timed out"}, {}, start)
+        except Exception as e:
+            logger.error(f"Batch sub-request {item.request_id} {item.method} {item.endpoint} failed: {e}")
+            return self._result(item, 500, {"status": "error", "error": str(e)}, {}, start)
+        finally:
+            disconnect.set()
+
+        payload = b"".join(chunks)
+        if response_headers.get("content-type", "").startswith("application/json") and payload:
+            try:
+                response = json.loads(payload)
+            except ValueError:
+                response = payload.decode("utf-8", "replace")
+        else:
+            response = payload.decode("utf-8", "replace") if payload else None
+
+        return self._result(item, status_code, response, response_headers, start)
+
+    @staticmethod
+    def _result(item, status_code: int, response: Any, headers: Dict[str, str], start: float) -> Dict[str, Any]:
+        return {
+            "request_id": item.request_id,
+            "status_code": status_code,
+            "headers": headers,
+            "response": response,
+            "processing_time_ms": int((time.perf_counter() - start) * 1000),
+        }
+
+    async def run(self, batch: MobileBatchRequest) -> AsyncIterator[Dict[str, Any]]:
+        """Yield result entries in completion order."""
+        if batch.sequential or batch.stop_on_error:
+            for item in batch.requests:
+                result = await self.execute(item)
+                yield result
+                if batch.stop_on_error and result["status_code"] >= 400:
+                    return
+            return
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def bounded(item):
+            async with semaphore:
+                return await self.execute(item)
+
+        group: List[MobileBatchRequestItem] = []
+        for item in batch.requests + [None]:
+            if item is not None and item.method == "GET":
+                group.append(item)
+                continue
+
+            # A write (or the end of the batch) closes the current group of reads
+            if group:
+                for finished in asyncio.as_completed([bounded(get) for get in group]):
+                    yield await finished
+                group = []
+            if item is not None:
+                yield await self.execute(item)
+
+
+async def stream_batch(executor: MobileBatchExecutor, batch: MobileBatchRequest) -> AsyncIterator[bytes]:
+    """
+    Stream a batch as one JSON document shaped like ``MobileBatchResponse``.
+
+    Sub-responses are written as soon as they complete; the counts follow at
+    the end of the document.
+    """
+    start = time.perf_counter()
+    success_count = error_count = 0
+
+    yield b'{"batch_id":' + json.dumps(batch.batch_id).encode() + b',"responses":['
+    first = True
+    async for result in executor.run(batch):
+        if result["status_code"] < 400:
+            success_count += 1
+        else:
+            error_count += 1
+        yield (b"" if first else b",") + json.dumps(result, default=str).encode()
+        first = False
+
+    yield (
+        b'],"processed_at":' + json.dumps(datetime.utcnow().isoformat()).encode()
+        + b',"success_count":' + str(success_count).encode()
+        + b',"error_count":' + str(error_count).encode()
+        + b',"total_processing_time_ms":' + str(int((time.perf_counter() - start) * 1000)).encode()
+        + b"}"
+    )
@@ -16,15 +16,19 @@ import time
 from collections import defaultdict, deque
 from datetime import datetime, timedelta
 from enum import Enum
-from statistics import mean, median
 from typing import Any, Dict, List, Optional, Union, Callable, Deque
 from dataclasses import dataclass
 
 import psutil
 from pydantic import BaseModel, Field
 
+from app.utils.metrics import HistogramValue, log_linear_buckets
+
 logger = logging.getLogger(__name__)
 
+# 0.1ms .. 1000s in milliseconds (also covers counts and sizes up to 1e6)
+LATENCY_BUCKETS_MS = log_linear_buckets(-1, 6)
+
 
 class HealthStatus(str, Enum):
     """Health status enumeration."""
@@ -111,14 +115,22 @@ class Metric:
 
 
 class MetricsCollector:
-    """Collect and aggregate metrics."""
+    """
+    Collect and aggregate metrics.
+    
+    Counters and gauges are plain values and timers/histograms are kept in
+    fixed log-linear buckets (``app.utils.metrics.HistogramValue``), so
+    recording needs no lock and aggregates never copy or sort raw samples.
+    A bounded ring of recent data points backs ``get_metrics`` and
+    time-windowed aggregates.
+    """
     
-    def __init__(self, retention_seconds: int = 3600):
+    def __init__(self, retention_seconds: int = 3600, max_recent_points: int = 10000):
         self.retention_seconds = retention_seconds
-        self.metrics: Dict[str, Deque[Metric]] = defaultdict(lambda: deque())
+        self.recent_metrics: Deque[Metric] = deque(maxlen=max_recent_points)
         self.counters: Dict[str, float] = defaultdict(float)
         self.gauges: Dict[str, float] = defaultdict(float)
-        self.lock = asyncio.Lock()
+        self.histograms: Dict[str, HistogramValue] = {}
     
     async def record_metric(
         self,
@@ -130,31 +142,28 @@ class MetricsCollector:
     ):
         """Record a metric value."""
         
-        async with self.lock:
-            timestamp = datetime.utcnow()
-            tags = tags or {}
-            
-            metric = Metric(
-                name=name,
-                type=type,
-                value=value,
-                tags=tags,
-                timestamp=timestamp,
-                unit=unit
-            )
-            
-            # Store metric
-            metric_key = self._get_metric_key(name, tags)
-            self.metrics[metric_key].append(metric)
-            
-            # Update aggregated values
-            if type == MetricType.COUNTER:
-                self.counters[metric_key] += value
-            elif type == MetricType.GAUGE:
-                self.gauges[metric_key] = value
-            
-            # Clean old metrics
-            self._cleanup_old_metrics(metric_key)
+        tags = tags or {}
+        metric_key = self._get_metric_key(name, tags)
+        
+        self.recent_metrics.append(Metric(
+            name=name,
+            type=type,
+            value=value,
+            tags=tags,
+            timestamp=datetime.utcnow(),
+            unit=unit
+        ))
+        
+        # Update aggregated values
+        if type == MetricType.COUNTER:
+            self.counters[metric_key] += value
+        elif type == MetricType.GAUGE:
+            self.gauges[metric_key] = value
+        
+        histogram = self.histograms.get(metric_key)
+        if histogram is None:
+            histogram = self.histograms[metric_key] = HistogramValue(LATENCY_BUCKETS_MS)
+        histogram.observe(value)
     
     async def increment(self, name: str, value: float = 1, tags: Optional[Dict[str, str]] = None):
         """Increment a counter metric."""
@@ -174,27 +183,28 @@ class MetricsCollector:
         since: Optional[datetime] = None,
         limit: Optional[int] = None
     ) -> List[Metric]:
-        """Get metrics matching criteria."""
+        """Get recent metrics matching criteria, newest first."""
+        
+        cutoff_time = datetime.utcnow() - timedelta(seconds=self.retention_seconds)
+        if since is None or since < cutoff_time:
+            since = cutoff_time
         
         results = []
         
-        for metric_key, metric_deque in self.metrics.items():
-            if name_pattern and name_pattern not in metric_key:
+        # The ring is in arrival order, so walk it backwards
+        for metric in reversed(self.recent_metrics):
+            if metric.timestamp < since:
+                break
+            
+            if name_pattern and name_pattern not in self._get_metric_key(metric.name, metric.tags):
                 continue
             
-            for metric in metric_deque:
-                if since and metric.timestamp < since:
-                    continue
-                
-                results.append(metric)
-                
-                if limit and len(results) >= limit:
-                    break
+            results.append(metric)
             
             if limit and len(results) >= limit:
                 break
         
-        return sorted(results, key=lambda m: m.timestamp, reverse=True)
+        return results
     
     def get_counter_value(self, name: str, tags: Optional[Dict[str, str]] = None) -> float:
         """Get current counter value."""
@@ -212,41 +222,33 @@ class MetricsCollector:
         tags: Optional[Dict[str, str]] = None,
         since: Optional[datetime] = None
     ) -> Dict[str, Any]:
-        """Get aggregated statistics for a metric."""
+        """
+        Get aggregated statistics for a metric.
+        
+        Without ``since`` the lifetime histogram is used (median and
+        percentiles are bucket estimates); with ``since`` the recent ring is
+        aggregated into a temporary histogram.
+        """
         
         metric_key = self._get_metric_key(name, tags or {})
-        metrics = []
         
-        if metric_key in self.metrics:
-            for metric in self.metrics[metric_key]:
-                if since and metric.timestamp < since:
-                    continue
-                metrics.append(metric.value)
+        if since is None:
+            histogram = self.histograms.get(metric_key)
+            return histogram.summary() if histogram else {}
         
-        if not metrics:
-            return {}
+        histogram = HistogramValue(LATENCY_BUCKETS_MS)
+        for metric in reversed(self.recent_metrics):
+            if metric.timestamp < since:
+                break
+            if self._get_metric_key(metric.name, metric.tags) == metric_key:
+                histogram.observe(metric.value)
         
-        return {
-            "count": len(metrics),
-            "sum": sum(metrics),
-            "min": min(metrics),
-            "max": max(metrics),
-            "mean": mean(metrics),
-            "median": median(metrics)
-        }
+        return histogram.summary()
     
     def _get_metric_key(self, name: str, tags: Dict[str, str]) -> str:
         """Generate metric key from name and tags."""
         tag_str = ",".join(f"{k}={v}" for k, v in sorted(tags.items()))
         return f"{name}|{tag_str}" if tag_str else name
-    
-    def _cleanup_old_metrics(self, metric_key: str):
-        """Remove old metrics beyond retention period."""
-        cutoff_time = datetime.utcnow() - timedelta(seconds=self.retention_seconds)
-        
-        while (self.metrics[metric_key] and 
-               self.metrics[metric_key][0].timestamp < cutoff_time):
-            self.metrics[metric_key].popleft()
 
 
 class HealthMonitor:
@@ -0,0 +1,510 @@
+"""
+Set-based notification fan-out and batched channel delivery.
+
+``fan_out_notification`` creates one notification per recipient with a
+constant number of statements, whatever the audience size:
+
+- Recipients and their preferences are loaded with one ``IN`` query;
+  unknown or inactive users are skipped
+- Channel rules (``should_send_notification``: channel switches, category
+  overrides, quiet hours and the CRITICAL bypass) are evaluated once per
+  distinct preference profile rather than once per recipient -- most
+  officers share the defaults
+- All rows are written by a single ``INSERT ... SELECT FROM unnest(...)``,
+  and open notification streams are told with one ``pg_notify`` statement
+- Deliveries are handed to ``notification_queue``, which groups them by
+  channel and provider and sends whole batches: one SMTP connection per
+  email batch, one multicast per push batch. Higher priorities go first and
+  CRITICAL batches are sent without waiting for the batch to fill
+
+The queue is in-process: deliveries still queued when a worker exits stay
+``PENDING`` in ``delivery_status``.
+"""
+
+import asyncio
+import json
+import logging
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import insert, select, text
+
+from app.config.settings import settings
+from app.models.notifications import Notification, NotificationLog, NotificationPreference
+from app.models.user import User
+from app.utils.metrics import metrics_registry
+from app.utils.notifications import (
+    build_email_message,
+    format_notification_for_channel,
+    get_notification_priority_score,
+    send_email_batch,
+    send_push_notification,
+    send_sms_notification,
+    should_send_notification,
+)
+from app.utils.notification_stream import publish_user_events
+
+logger = logging.getLogger(__name__)
+
+NOTIFICATION_CHANNELS = ("email", "sms", "push")
+
+# Deliveries per provider call: per SMTP connection, per SMS submission,
+# per push multicast (the FCM limit)
+CHANNEL_BATCH_SIZES = {"email": 100, "sms": 100, "push": 500}
+
+CRITICAL_PRIORITY_SCORE = get_notification_priority_score("CRITICAL")
+
+# Defaults of a recipient without a notification_preferences row
+DEFAULT_PREFERENCES = {
+    "email_enabled": True,
+    "push_enabled": True,
+    "sms_enabled": False,
+    "categories": {},
+    "quiet_hours_enabled": False,
+    "quiet_hours_start": "22:00",
+    "quiet_hours_end": "08:00",
+    "timezone": "UTC",
+}
+
+_INSERT_NOTIFICATIONS_SQL = text("""
+    INSERT INTO notifications (
+        id, recipient_id, sender_id, type, category, priority, title, message, data,
+        channels, scheduled_for, expires_at, is_read, delivery_status, created_at
+    )
+    SELECT t.id, t.recipient_id, CAST(:sender_id AS UUID), CAST(:type AS VARCHAR),
+           CAST(:category AS VARCHAR), CAST(:priority AS VARCHAR), CAST(:title AS VARCHAR),
+           CAST(:message AS TEXT), CAST(:data AS JSON), CAST(:channels AS JSON),
+           CAST(:scheduled_for AS TIMESTAMP), CAST(:expires_at AS TIMESTAMP), false,
+           CAST(t.delivery_status AS JSON), CAST(:created_at AS TIMESTAMP)
+    FROM unnest(CAST(:ids AS VARCHAR[]), CAST(:recipient_ids AS UUID[]), CAST(:delivery_statuses AS TEXT[]))
+         AS t(id, recipient_id, delivery_status)
+""")
+
+# Per-channel status of one batch; rows are locked, so concurrent batches of
+# other channels for the same notification do not overwrite each other
+_UPDATE_DELIVERY_STATUS_SQL = text("""
+    UPDATE notifications AS n
+    SET delivery_status = CAST(jsonb_set(
+            COALESCE(CAST(n.delivery_status AS JSONB), '{}'::jsonb),
+            ARRAY[CAST(:channel AS TEXT)], to_jsonb(t.status)) AS JSON),
+        delivered_at = CASE WHEN t.status = 'SENT' THEN COALESCE(n.delivered_at, CAST(:now AS TIMESTAMP))
+                            ELSE n.delivered_at END
+    FROM unnest(CAST(:ids AS VARCHAR[]), CAST(:statuses AS TEXT[])) AS t(id, status)
+    WHERE n.id = t.id
+""")
+
+
+def provider_for(channel: str) -> str:
+    return getattr(settings, f"notification_{channel}_provider", "default")
+
+
+def _naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    if value is not None and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+class Delivery(NamedTuple):
+    """One notification to send on one channel."""
+    notification_id: str
+    channel: str
+    provider: str
+    priority: str
+    address: str
+    content: Dict[str, Any]
+
+
+class FanoutResult(NamedTuple):
+    notification_ids: List[str]
+    skipped_recipient_ids: List[str]  # Unknown, inactive or malformed ids
+    queued_deliveries: int
+    suppressed_deliveries: int  # Disabled channel, quiet hours or no address
+
+
+def _profile_key(preferences: Dict[str, Any], category: str) -> Tuple:
+    """The preference fields that decide channels for ``category``."""
+    overrides = (preferences.get("categories") or {}).get(category) or {}
+    return (
+        bool(preferences.get("email_enabled")),
+        bool(preferences.get("push_enabled")),
+        bool(preferences.get("sms_enabled")),
+        tuple(sorted(overrides.items())),
+        bool(preferences.get("quiet_hours_enabled")),
+        preferences.get("quiet_hours_start"),
+        preferences.get("quiet_hours_end"),
+        preferences.get("timezone"),
+    )
+
+
+async def fan_out_notification(
+    db,
+    recipient_ids: Iterable[str],
+    sender_id: Optional[str],
+    type: str,
+    category: str,
+    priority: str,
+    title: str,
+    message: str,
+    channels: List[str],
+    data: Optional[Dict[str, Any]] = None,
+    scheduled_for: Optional[datetime] = None,
+    expires_at: Optional[datetime] = None,
+    queue: Optional["NotificationDeliveryQueue"] = None
+) -> FanoutResult:
+    """
+    Create a notification for every valid recipient and queue its deliveries.
+
+    Commits the notifications (which also releases their stream events)
+    before queueing, so senders never see a delivery for a row that does
+    not exist yet.
+    """
+    queue = queue or notification_queue
+    now = datetime.utcnow()
+    data = data or {}
+    channels = [channel for channel in dict.fromkeys(channels) if channel in NOTIFICATION_CHANNELS]
+
+    requested: Dict[uuid.UUID, str] = {}
+    skipped: List[str] = []
+    for recipient_id in dict.fromkeys(recipient_ids):
+        try:
+            requested[uuid.UUID(str(recipient_id))] = recipient_id
+        except ValueError:
+            skipped.append(recipient_id)
+
+    users = User.__table__
+    preferences = NotificationPreference.__table__
+    preference_columns = [preferences.c[name] for name in DEFAULT_PREFERENCES]
+    result = await db.execute(
+        select(
+            users.c.id, users.c.email,
+            preferences.c.user_id.label("has_preferences"),
+            preferences.c.email_address, preferences.c.phone_number, preferences.c.push_token,
+            *preference_columns
+        )
+        .select_from(users.outerjoin(preferences, preferences.c.user_id == users.c.id))
+        .where(users.c.id.in_(list(requested)), users.c.is_active.is_not(False))
+    )
+    rows = result.all()
+    found = {row.id for row in rows}
+    skipped.extend(requested[user_id] for user_id in requested if user_id not in found)
+
+    # Same content for every recipient, formatted once per channel
+    contents = {channel: format_notification_for_channel(title, message, data, channel) for channel in channels}
+    scheduled_for = _naive_utc(scheduled_for)
+    delay_seconds = max((scheduled_for - now).total_seconds(), 0.0) if scheduled_for else 0.0
+
+    providers = {channel: provider_for(channel) for channel in channels}
+    allowed_by_profile: Dict[Tuple, Tuple[str, ...]] = {}
+    status_json_cache: Dict[Tuple, str] = {}
+    default_key = _profile_key(DEFAULT_PREFERENCES, category)
+    notification_ids: List[str] = []
+    statuses: List[str] = []
+    deliveries: List[Delivery] = []
+    suppressed = 0
+
+    for row in rows:
+        if row.has_preferences:
+            prefs = {name: row._mapping[name] for name in DEFAULT_PREFERENCES}
+            key = _profile_key(prefs, category)
+        else:
+            prefs, key = DEFAULT_PREFERENCES, default_key
+        allowed = allowed_by_profile.get(key)
+        if allowed is None:
+            allowed = allowed_by_profile[key] = tuple(
+                channel for channel in channels
+                if should_send_notification(prefs, category, priority, channel, now)
+            )
+
+        notification_id = str(uuid.uuid4())
+        addresses = {"email": row.email_address or row.email, "sms": row.phone_number, "push": row.push_token}
+        status = []
+        for channel in channels:
+            if channel in allowed and addresses[channel]:
+                status.append((channel, "PENDING"))
+                deliveries.append(Delivery(
+                    notification_id, channel, providers[channel], priority, addresses[channel], contents[channel]
+                ))
+            else:
+                status.append((channel, "SUPPRESSED"))
+                suppressed += 1
+
+        status = tuple(status)
+        status_json = status_json_cache.get(status)
+        if status_json is None:
+            status_json = status_json_cache[status] = json.dumps(dict(status))
+        notification_ids.append(notification_id)
+        statuses.append(status_json)
+
+    if notification_ids:
+        user_ids = [str(row.id) for row in rows]
+        await db.execute(_INSERT_NOTIFICATIONS_SQL, {
+            "ids": notification_ids,
+            "recipient_ids": user_ids,
+            "delivery_statuses": statuses,
+            "sender_id": str(sender_id) if sender_id is not None else None,
+            "type": type,
+            "category": category,
+            "priority": priority,
+            "title": title,
+            "message": message,
+            "data": json.dumps(data, default=str),
+            "channels": json.dumps(channels),
+            "scheduled_for": scheduled_for,
+            "expires_at": _naive_utc(expires_at),
+            "created_at": now,
+        })
+        await publish_user_events(
+            db, "notification", user_ids,
+            {"category": category, "priority": priority, "type": type, "title": title, "created_at": now.isoformat()},
+            object_ids=notification_ids
+        )
+    await db.commit()
+
+    queue.enqueue_many(deliveries, delay_seconds)
+    notifications_fanned_out_total.inc(len(notification_ids), category=category)
+    return FanoutResult(notification_ids, skipped, len(deliveries), suppressed)
+
+
+async def _send_email(deliveries: List[Delivery]) -> List[Optional[str]]:
+    messages = [
+        build_email_message(d.address, d.content["subject"], d.content["text_content"], d.content["html_content"])
+        for d in deliveries
+    ]
+    return await asyncio.to_thread(send_email_batch, messages)
+
+
+async def _send_sms(deliveries: List[Delivery]) -> List[Optional[str]]:
+    sent = await asyncio.gather(*(
+        send_sms_notification(d.address, d.content["message"], "high" if d.priority in ("HIGH", "CRITICAL") else "normal")
+        for d in deliveries
+    ))
+    return [None if ok else "SMS provider rejected the message" for ok in sent]
+
+
+async def _send_push(deliveries: List[Delivery]) -> List[Optional[str]]:
+    # Deliveries of one announcement share content: one multicast per content
+    errors: List[Optional[str]] = [None] * len(deliveries)
+    groups: Dict[int, List[int]] = {}
+    for index, delivery in enumerate(deliveries):
+        groups.setdefault(id(delivery.content), []).append(index)
+
+    for indexes in groups.values():
+        first = deliveries[indexes[0]]
+        results = await send_push_notification(
+            [deliveries[i].address for i in indexes],
+            first.content["title"],
+            first.content["body"],
+            {key: str(value) for key, value in first.content["data"].items()},
+            "high" if first.priority in ("HIGH", "CRITICAL") else "normal"
+        )
+        for i in indexes:
+            if not results.get(deliveries[i].address):
+                errors[i] = "Push provider rejected the token"
+    return errors
+
+
+CHANNEL_SENDERS = {
+    "email": _send_email,
+    "sms": _send_sms,
+    "push": _send_push,
+}
+
+
+class NotificationDeliveryQueue:
+    """
+    In-process queue that sends deliveries in per-channel, per-provider batches.
+
+    Deliveries are grouped by ``(priority, channel, provider)``. A group is
+    sent when it reaches its channel's batch size, when its oldest delivery
+    has waited ``linger_seconds``, or at once for CRITICAL priority. Results
+    are written back with one multi-row insert into ``notification_logs``
+    and one update of the batch's notifications.
+    """
+
+    def __init__(
+        self,
+        linger_seconds: Optional[float] = None,
+        concurrency: Optional[int] = None,
+        session_factory=None
+    ):
+        self.linger_seconds = linger_seconds if linger_seconds is not None else settings.notification_batch_linger_seconds
+        self.concurrency = concurrency or settings.notification_delivery_concurrency
+        self.session_factory = session_factory
+
+        self._groups: Dict[Tuple[int, str, str], List[Delivery]] = {}
+        self._oldest: Dict[Tuple[int, str, str], float] = {}
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._inflight: set = set()
+        self.stats: Dict[str, int] = {"sent": 0, "failed": 0, "batches": 0}
+
+    def depth(self) -> int:
+        return sum(len(group) for group in self._groups.values())
+
+    def enqueue_many(self, deliveries: List[Delivery], delay_seconds: float = 0.0):
+        """Queue deliveries; starts the sender task on first use."""
+        if not deliveries:
+            return
+        if delay_seconds > 0:
+            asyncio.get_running_loop().call_later(delay_seconds, self.enqueue_many, deliveries)
+            return
+
+        now = time.monotonic()
+        for delivery in deliveries:
+            key = (-get_notification_priority_score(delivery.priority), delivery.channel, delivery.provider)
+            group = self._groups.get(key)
+            if group is None:
+                group = self._groups[key] = []
+                self._oldest[key] = now
+            group.append(delivery)
+
+        self.start()
+        self._wakeup.set()
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Send what is queued, then stop."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        for key in list(self._groups):
+            while self._groups.get(key):
+                await self._send_batch(self._take(key))
+        if self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
+
+    def _take(self, key: Tuple[int, str, str]) -> List[Delivery]:
+        group = self._groups[key]
+        size = CHANNEL_BATCH_SIZES.get(key[1], 100)
+        batch, rest = group[:size], group[size:]
+        if rest:
+            self._groups[key] = rest
+            self._oldest[key] = time.monotonic()
+        else:
+            del self._groups[key]
+            del self._oldest[key]
+        return batch
+
+    def _ready(self, now: float) -> Tuple[List[Tuple[int, str, str]], Optional[float]]:
+        """Groups to send now, highest priority first, and the wait until the next one is due."""
+        ready = []
+        wait = None
+        for key in sorted(self._groups):
+            due = self._oldest[key] + self.linger_seconds
+            if (
+                -key[0] >= CRITICAL_PRIORITY_SCORE
+                or len(self._groups[key]) >= CHANNEL_BATCH_SIZES.get(key[1], 100)
+                or due <= now
+            ):
+                ready.append(key)
+            else:
+                wait = due - now if wait is None else min(wait, due - now)
+        return ready, wait
+
+    async def _run(self):
+        semaphore = asyncio.Semaphore(self.concurrency)
+        while True:
+            ready, wait = self._ready(time.monotonic())
+            if not ready:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), wait)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            for key in ready:
+                while key in self._groups and (
+                    -key[0] >= CRITICAL_PRIORITY_SCORE
+                    or len(self._groups[key]) >= CHANNEL_BATCH_SIZES.get(key[1], 100)
+                    or self._oldest[key] + self.linger_seconds <= time.monotonic()
+                ):
+                    await semaphore.acquire()
+                    task = asyncio.create_task(self._send_batch(self._take(key)))
+                    self._inflight.add(task)
+                    task.add_done_callback(lambda t: (self._inflight.discard(t), semaphore.release()))
+
+    async def _send_batch(self, batch: List[Delivery]):
+        channel, provider = batch[0].channel, batch[0].provider
+        start = time.perf_counter()
+        sender = CHANNEL_SENDERS.get(channel)
+        try:
+            errors = await sender(batch) if sender else [f"No sender for channel {channel}"] * len(batch)
+        except Exception as e:
+            logger.error(f"Notification batch of {len(batch)} {channel} deliveries via {provider} failed: {e}")
+            errors = [str(e)] * len(batch)
+        notification_batch_seconds.observe(time.perf_counter() - start, channel=channel, provider=provider)
+
+        failed = sum(1 for error in errors if error)
+        self.stats["batches"] += 1
+        self.stats["sent"] += len(batch) - failed
+        self.stats["failed"] += failed
+        if len(batch) - failed:
+            notification_deliveries_total.inc(len(batch) - failed, channel=channel, provider=provider, result="sent")
+        if failed:
+            notification_deliveries_total.inc(failed, channel=channel, provider=provider, result="failed")
+
+        try:
+            await self._record(batch, errors)
+        except Exception as e:
+            logger.error(f"Failed to record {len(batch)} {channel} notification deliveries: {e}")
+
+    async def _record(self, batch: List[Delivery], errors: List[Optional[str]]):
+        if self.session_factory is None:
+            from app.database.base import AsyncSessionLocal
+            self.session_factory = AsyncSessionLocal
+
+        now = datetime.utcnow()
+        logs = NotificationLog.__table__
+        notifications = Notification.__table__
+        async with self.session_factory() as db:
+            await db.execute(insert(logs).values([
+                {
+                    "id": str(uuid.uuid4()),
+                    "notification_id": delivery.notification_id,
+                    "channel": delivery.channel,
+                    "recipient_address": delivery.address[:255],
+                    "status": "FAILED" if error else "SENT",
+                    "error_message": error,
+                    "sent_at": None if error else now,
+                    "created_at": now,
+                }
+                for delivery, error in zip(batch, errors)
+            ]))
+            await db.execute(_UPDATE_DELIVERY_STATUS_SQL, {
+                "channel": batch[0].channel,
+                "ids": [delivery.notification_id for delivery in batch],
+                "statuses": ["FAILED" if error else "SENT" for error in errors],
+                "now": now,
+            })
+            await db.commit()
+
+
+notifications_fanned_out_total = metrics_registry.counter(
+    "notifications_fanned_out_total", "Notifications created by bulk fan-out", ("category",)
+)
+notification_deliveries_total = metrics_registry.counter(
+    "notification_deliveries_total", "Notification deliveries by channel, provider and outcome",
+    ("channel", "provider", "result")
+)
+notification_batch_seconds = metrics_registry.histogram(
+    "notification_batch_seconds", "Time to send one batch of notification deliveries", ("channel", "provider")
+)
+
+notification_queue = NotificationDeliveryQueue()
+
+notification_queue_depth = metrics_registry.gauge(
+    "notification_queue_depth", "Notification deliveries waiting to be batched"
+)
+notification_queue_depth.set_function(notification_queue.depth)
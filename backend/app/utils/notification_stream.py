@@ -0,0 +1,358 @@
+"""
+Server-sent event stream of per-user notifications, fed by Postgres LISTEN/NOTIFY.
+
+Publishing:
+- ``publish_user_events`` issues one ``pg_notify`` per recipient from a
+  single statement inside the caller's transaction, so events go out on
+  commit and never for rolled-back writes. Notification fan-out publishes
+  ``notification`` events; other writers can publish their own (``task``)
+
+Delivery:
+- Each worker holds one dedicated LISTEN connection (``notification_broker``)
+  and routes events to the in-process queues of that user's open streams,
+  so every worker sees every event without polling
+- Streams send a comment heartbeat every
+  ``notification_stream_heartbeat_seconds`` to keep proxies from closing
+  idle connections
+- Every event carries the commit horizon of its writer: the snapshot xmin,
+  below which every transaction had finished. NOTIFYs arrive in commit
+  order, so once a stream has sent a notification it has sent every
+  notification written by a transaction below that horizon. The stream's
+  ``id:`` is the highest such horizon
+- A client reconnecting with ``Last-Event-ID`` first gets the
+  ``notifications`` rows written by transactions at or above it, in insert
+  order. Rows that commit late are still found; a few rows the client
+  already has may be sent again. A stream that overflowed or whose worker
+  lost its LISTEN connection replays the same way. Events of other types are
+  not stored and are not replayed
+
+Polling clients keep working; ``GET /notifications/`` stays the source of
+truth.
+"""
+
+import asyncio
+import json
+import logging
+from collections import deque
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import text
+
+from app.config.settings import settings
+from app.utils.metrics import metrics_registry
+
+logger = logging.getLogger(__name__)
+
+USER_EVENTS_CHANNEL = "user_events"
+
+# Placed on a subscriber queue when events may have been missed
+RESYNC = object()
+
+_PUBLISH_SQL = text("""
+    SELECT count(pg_notify(CAST(:channel AS TEXT), json_build_object(
+        'u', t.user_id,
+        'e', CAST(:event AS TEXT),
+        'id', t.event_id,
+        'h', pg_snapshot_xmin(pg_current_snapshot())::text::bigint,
+        'd', CASE WHEN t.object_id IS NULL THEN CAST(:data AS JSONB)
+                  ELSE CAST(:data AS JSONB) || jsonb_build_object('id', t.object_id) END
+    )::text))
+    FROM unnest(CAST(:user_ids AS VARCHAR[]), CAST(:event_ids AS VARCHAR[]), CAST(:object_ids AS VARCHAR[]))
+         AS t(user_id, event_id, object_id)
+""")
+
+COMMIT_HORIZON_SQL = text("SELECT pg_snapshot_xmin(pg_current_snapshot())::text::bigint")
+
+_REPLAY_SQL = text("""
+    SELECT id, category, priority, type, title, created_at
+    FROM notifications
+    WHERE recipient_id = CAST(:user_id AS UUID)
+      AND txid >= CAST(:horizon AS BIGINT)
+      AND (expires_at IS NULL OR expires_at > now() AT TIME ZONE 'utc')
+    ORDER BY sequence_number
+    LIMIT :limit
+""")
+
+
+def parse_event_id(value: Optional[str]) -> Optional[int]:
+    """Commit horizon a client resumes from; None for anything else."""
+    if not value or not value.isdigit():
+        return None
+    return int(value)
+
+
+async def publish_user_events(
+    db,
+    event: str,
+    user_ids: List[str],
+    data: Dict[str, Any],
+    event_ids: Optional[List[Optional[str]]] = None,
+    object_ids: Optional[List[Optional[str]]] = None
+):
+    """
+    Queue one event per user, sent when ``db``'s transaction commits.
+
+    ``data`` is shared; ``object_ids[i]`` is merged into it as ``id`` for
+    ``user_ids[i]``. Keep ``data`` small: a NOTIFY payload is capped at 8000 bytes.
+    """
+    if not user_ids:
+        return
+    await db.execute(_PUBLISH_SQL, {
+        "channel": USER_EVENTS_CHANNEL,
+        "event": event,
+        "data": json.dumps(data, default=str),
+        "user_ids": [str(user_id) for user_id in user_ids],
+        "event_ids": event_ids or [None] * len(user_ids),
+        "object_ids": object_ids or [None] * len(user_ids),
+    })
+
+
+def format_sse(event: str, data: Any, event_id: Optional[str] = None) -> str:
+    lines = []
+    if event_id:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data, default=str, separators=(',', ':'))}")
+    return "\n".join(lines) + "\n\n"
+
+
+class NotificationBroker:
+    """
+    Routes LISTEN/NOTIFY events to this worker's open streams.
+
+    The LISTEN connection is opened on the first subscription and reopened
+    with backoff if lost; subscribers are told to resync after a reconnect.
+    """
+
+    def __init__(self, dsn: Optional[str] = None, queue_size: Optional[int] = None):
+        self.dsn = dsn or settings.database_url.replace("+asyncpg", "")
+        self.queue_size = queue_size or settings.notification_stream_queue_size
+        self.subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._connected = asyncio.Event()
+
+    def subscriber_count(self) -> int:
+        return sum(len(queues) for queues in self.subscribers.values())
+
+    def subscribe(self, user_id: str) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self.subscribers.setdefault(str(user_id), set()).add(queue)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._listen())
+        return queue
+
+    def unsubscribe(self, user_id: str, queue: asyncio.Queue):
+        queues = self.subscribers.get(str(user_id))
+        if queues is not None:
+            queues.discard(queue)
+            if not queues:
+                del self.subscribers[str(user_id)]
+
+    async def wait_connected(self, timeout: float) -> bool:
+        try:
+            await asyncio.wait_for(self._connected.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def dispatch(self, payload: str):
+        """Hand one NOTIFY payload to the user's streams."""
+        try:
+            message = json.loads(payload)
+            queues = self.subscribers.get(message["u"])
+        except (ValueError, KeyError, TypeError):
+            logger.warning("Ignoring malformed user event payload")
+            return
+        notification_stream_events_total.inc(event=message.get("e", "unknown"))
+        if not queues:
+            return
+        for queue in list(queues):
+            self._offer(queue, message)
+
+    def _offer(self, queue: asyncio.Queue, item):
+        try:
+            queue.put_nowait(item)
+        except asyncio.QueueFull:
+            # A slow client: drop what is queued and have it replay from its last id
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait(RESYNC)
+            notification_stream_overflows_total.inc()
+
+    async def _listen(self):
+        import asyncpg
+
+        backoff = 1.0
+        reconnecting = False
+        while self.subscribers:
+            connection = None
+            try:
+                connection = await asyncpg.connect(self.dsn)
+                await connection.add_listener(USER_EVENTS_CHANNEL, self._on_notify)
+                self._connected.set()
+                if reconnecting:
+                    # Events sent while we were not listening are replayed by the streams
+                    for queues in list(self.subscribers.values()):
+                        for queue in list(queues):
+                            self._offer(queue, RESYNC)
+                reconnecting = True
+                backoff = 1.0
+                while self.subscribers and not connection.is_closed():
+                    await asyncio.sleep(settings.notification_stream_heartbeat_seconds)
+                    # Detects a dead connection that would otherwise stay silent
+                    await connection.execute("SELECT 1")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Notification LISTEN connection lost, retrying in {backoff:.0f}s: {e}")
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 60.0)
+            finally:
+                self._connected.clear()
+                if connection is not None and not connection.is_closed():
+                    try:
+                        await connection.close(timeout=5)
+                    except Exception:
+                        pass
+
+    def _on_notify(self, connection, pid, channel, payload):
+        self.dispatch(payload)
+
+
+async def _replay(user_id: str, horizon: int, session_factory) -> Tuple[List[Dict], int, bool]:
+    """
+    Stored notifications of transactions at or above ``horizon``, the
+    horizon the stream is at once they are sent, and whether the replay
+    limit cut them short.
+    """
+    limit = settings.notification_stream_replay_limit
+    async with session_factory() as db:
+        # Read first: everything below it has committed and is in the replay
+        new_horizon = (await db.execute(COMMIT_HORIZON_SQL)).scalar_one()
+        result = await db.execute(_REPLAY_SQL, {
+            "user_id": user_id,
+            "horizon": horizon,
+            "limit": limit + 1,
+        })
+        rows = result.all()
+    events = [
+        {
+            "id": row.id,
+            "category": row.category,
+            "priority": row.priority,
+            "type": row.type,
+            "title": row.title,
+            "created_at": row.created_at.isoformat(),
+        }
+        for row in rows[:limit]
+    ]
+    return events, max(horizon, new_horizon), len(rows) > limit
+
+
+async def stream_user_events(
+    user_id: str,
+    last_event_id: Optional[str] = None,
+    broker: Optional[NotificationBroker] = None,
+    session_factory=None
+) -> AsyncIterator[str]:
+    """
+    SSE body for one user: replay after ``last_event_id``, then live events.
+
+    Subscribes before replaying, so nothing committed in between is lost;
+    events seen in both are sent once.
+    """
+    broker = broker or notification_broker
+    if session_factory is None:
+        from app.database.base import AsyncSessionLocal
+        session_factory = AsyncSessionLocal
+
+    user_id = str(user_id)
+    queue = broker.subscribe(user_id)
+    recent: deque = deque(maxlen=settings.notification_stream_replay_limit)
+    position = parse_event_id(last_event_id)
+    heartbeat = settings.notification_stream_heartbeat_seconds
+
+    async def replay():
+        nonlocal position
+        events, horizon, truncated = await _replay(user_id, position, session_factory)
+        events = [data for data in events if data["id"] not in recent]
+        recent.extend(data["id"] for data in events)
+        # Rows come in insert order, not commit order: the stream is only past
+        # them all at the end, so only the last event moves the id on
+        chunks = [format_sse("notification", data, str(position)) for data in events[:-1]]
+        if truncated:
+            # Too far behind: the client should reload its list and reconnect
+            # from here, which its reload covers
+            chunks.extend(format_sse("notification", data, str(position)) for data in events[-1:])
+            chunks.append(format_sse("resync", {"reason": "replay_limit"}, str(horizon)))
+        else:
+            chunks.extend(format_sse("notification", data, str(horizon)) for data in events[-1:])
+        position = horizon
+        return "".join(chunks)
+
+    try:
+        yield f"retry: {int(settings.notification_stream_retry_ms)}\n\n"
+        await broker.wait_connected(timeout=5.0)
+        if position is not None:
+            chunk = await replay()
+            if chunk:
+                yield chunk
+
+        while True:
+            try:
+                message = await asyncio.wait_for(queue.get(), heartbeat)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+
+            if message is RESYNC:
+                if position is not None:
+                    chunk = await replay()
+                    if chunk:
+                        yield chunk
+                else:
+                    yield format_sse("resync", {"reason": "missed_events"})
+                continue
+
+            event = message.get("e", "message")
+            if event != "notification":
+                # No id: it would replace the client's resume point
+                yield format_sse(event, message.get("d"))
+                continue
+
+            data = message.get("d") or {}
+            if data.get("id") in recent:
+                continue
+            recent.append(data.get("id"))
+            horizon = message.get("h")
+            if isinstance(horizon, int) and (position is None or horizon > position):
+                position = horizon
+            yield format_sse(event, data, str(position) if position is not None else None)
+    finally:
+        broker.unsubscribe(user_id, queue)
+
+
+notification_stream_events_total = metrics_registry.counter(
+    "notification_stream_events_total", "User events received over LISTEN/NOTIFY", ("event",)
+)
+notification_stream_overflows_total = metrics_registry.counter(
+    "notification_stream_overflows_total", "Streams whose queue overflowed and had to replay"
+)
+
+# Per-worker broker (LISTEN connection opened on first subscription)
+notification_broker = NotificationBroker()
+
+notification_stream_subscribers = metrics_registry.gauge(
+    "notification_stream_subscribers", "Open notification streams in this worker"
+)
+notification_stream_subscribers.set_function(notification_broker.subscriber_count)
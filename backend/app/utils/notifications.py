@@ -45,32 +45,7 @@ async def send_email_notification(
         bool: True if sent successfully, False otherwise
     """
     try:
-        # Create message
-        msg = MIMEMultipart('alternative')
-        msg['From'] = FROM_EMAIL
-        msg['To'] = to_email
-        msg['Subject'] = subject
-        
-        # Add plain text part
-        text_part = MIMEText(content, 'plain', 'utf-8')
-        msg.attach(text_part)
-        
-        # Add HTML part if provided
-        if html_content:
-            html_part = MIMEText(html_content, 'html', 'utf-8')
-            msg.attach(html_part)
-        
-        # Add attachments if provided
-        if attachments:
-            for attachment in attachments:
-                file_part = MIMEBase('application', 'octet-stream')
-                file_part.set_payload(attachment['content'])
-                encoders.encode_base64(file_part)
-                file_part.add_header(
-                    'Content-Disposition',
-                    f'attachment; filename= {attachment["filename"]}'
-                )
-                msg.attach(file_part)
+        msg = build_email_message(to_email, subject, content, html_content, attachments)
         
         # Send email
         with smtplib.SMTP(SMTP_SERVER, SMTP_PORT) as server:
@@ -89,6 +64,74 @@ async def send_email_notification(
         logger.error(f"Failed to send email notification to {to_email}: {str(e)}")
         return False
 
+def build_email_message(
+    to_email: str,
+    subject: str,
+    content: str,
+    html_content: Optional[str] = None,
+    attachments: Optional[List[Dict[str, Any]]] = None
+) -> MIMEMultipart:
+    """Build the MIME message sent by ``send_email_notification``"""
+    msg = MIMEMultipart('alternative')
+    msg['From'] = FROM_EMAIL
+    msg['To'] = to_email
+    msg['Subject'] = subject
+    
+    # Add plain text part
+    text_part = MIMEText(content, 'plain', 'utf-8')
+    msg.attach(text_part)
+    
+    # Add HTML part if provided
+    if html_content:
+        html_part = MIMEText(html_content, 'html', 'utf-8')
+        msg.attach(html_part)
+    
+    # Add attachments if provided
+    if attachments:
+        for attachment in attachments:
+            file_part = MIMEBase('application', 'octet-stream')
+            file_part.set_payload(attachment['content'])
+            encoders.encode_base64(file_part)
+            file_part.add_header(
+                'Content-Disposition',
+                f'attachment; filename= {attachment["filename"]}'
+            )
+            msg.attach(file_part)
+    
+    return msg
+
+def send_email_batch(messages: List[MIMEMultipart]) -> List[Optional[str]]:
+    """
+    Send several emails over one SMTP connection (blocking; run in a thread)
+    
+    Args:
+        messages: Messages built with ``build_email_message``
+    
+    Returns:
+        List[Optional[str]]: Error per message, None where it was accepted
+    """
+    try:
+        with smtplib.SMTP(SMTP_SERVER, SMTP_PORT) as server:
+            if SMTP_USE_TLS:
+                server.starttls()
+            
+            if SMTP_USERNAME and SMTP_PASSWORD:
+                server.login(SMTP_USERNAME, SMTP_PASSWORD)
+            
+            errors = []
+            for msg in messages:
+                try:
+                    server.send_message(msg)
+                    errors.append(None)
+                except smtplib.SMTPException as e:
+                    logger.error(f"Failed to send email notification to {msg['To']}: {str(e)}")
+                    errors.append(str(e))
+            return errors
+        
+    except Exception as e:
+        logger.error(f"Failed to send batch of {len(messages)} email notifications: {str(e)}")
+        return [str(e)] * len(messages)
+
 async def send_sms_notification(
     phone_number: str,
     message: str,
@@ -434,6 +477,7 @@ DELIVERY_STATUS = {
     'SENT': 'Notification sent to provider',
     'DELIVERED': 'Notification delivered to recipient',
     'FAILED': 'Notification delivery failed',
+    'SUPPRESSED': 'Not sent: channel disabled, quiet hours or no address on file',
     'BOUNCED': 'Notification bounced (invalid recipient)',
     'OPENED': 'Notification opened by recipient',
     'CLICKED': 'Notification link clicked by recipient'
@@ -23,7 +23,9 @@ import redis
 import logging
 
 from app.models import Case, Evidence, Charge, CourtSession
-from app.core.config import get_settings
+from app.config.settings import get_settings
+from app.utils.metrics import metrics_registry
+from app.utils.lru_cache import l1_cache
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
@@ -38,7 +40,7 @@ class CacheManager:
         try:
             import redis
             self.redis_client = redis.from_url(
-                redis_url or settings.REDIS_URL or "redis://localhost:6379/0"
+                redis_url or settings.redis_url or "redis://localhost:6379/0"
             )
             self.enabled = True
             logger.info("Redis cache enabled")
@@ -101,6 +103,7 @@ class CacheManager:
             pattern = f"*{entity_type}*"
         
         deleted_keys = self.delete(pattern)
+        l1_cache.delete_matching(f"response:{pattern}")
         logger.info(f"Flushed {deleted_keys} cache keys for {entity_type}")
 
 
@@ -112,10 +115,17 @@ def cache_response(expiry: int = 300, key_prefix: str = None):
     """
     Decorator to cache API responses.
     
+    Results are looked up in the in-process L1 cache first, then in Redis;
+    Redis hits are copied into L1. L1 entries live at most
+    ``l1_cache_max_ttl_seconds`` so other workers' invalidations are seen
+    quickly.
+    
     Args:
         expiry: Cache expiry time in seconds (default 300 = 5 minutes)
         key_prefix: Optional prefix for cache key
     """
+    l1_ttl = min(expiry, settings.l1_cache_max_ttl_seconds)
+    
     def decorator(func: Callable):
         @functools.wraps(func)
         async def wrapper(*args, **kwargs):
@@ -133,9 +143,14 @@ def cache_response(expiry: int = 300, key_prefix: str = None):
             # Generate cache key
             prefix = key_prefix or func.__name__
             cache_key = cache_manager._generate_cache_key(prefix, **cache_params)
+            l1_key = f"response:{prefix}:{cache_key}"
             
-            # Try to get from cache
-            cached_result = cache_manager.get(cache_key)
+            # Try L1, then Redis
+            cached_result = l1_cache.get(l1_key)
+            if cached_result is None:
+                cached_result = cache_manager.get(cache_key)
+                if cached_result is not None:
+                    l1_cache.set(l1_key, cached_result, ttl=l1_ttl)
             if cached_result is not None:
                 logger.debug(f"Cache hit for key: {cache_key}")
                 return JSONResponse(content=cached_result)
@@ -145,10 +160,17 @@ def cache_response(expiry: int = 300, key_prefix: str = None):
             
             # Cache the response if it's successful
             if hasattr(result, 'status_code') and result.status_code == 200:
-                cache_manager.set(cache_key, result.body.decode() if hasattr(result, 'body') else result, expiry)
-                logger.debug(f"Cached result for key: {cache_key}")
+                try:
+                    content = json.loads(result.body) if hasattr(result, 'body') else None
+                except ValueError:
+                    content = None
+                if content is not None:
+                    cache_manager.set(cache_key, content, expiry)
+                    l1_cache.set(l1_key, content, ttl=l1_ttl)
+                    logger.debug(f"Cached result for key: {cache_key}")
             elif isinstance(result, (dict, list)):
                 cache_manager.set(cache_key, result, expiry)
+                l1_cache.set(l1_key, result, ttl=l1_ttl)
                 logger.debug(f"Cached result for key: {cache_key}")
             
             return result
@@ -314,15 +336,25 @@ class BulkOperationOptimizer:
 class PerformanceMonitor:
     """
     Monitor API performance and collect metrics.
+    
+    Timings are also recorded in the shared metrics registry so they are
+    exposed on ``/metrics``.
     """
     
     def __init__(self):
         self.metrics = {}
         self.slow_query_threshold = 1.0  # seconds
         self.slow_queries = []
+        self.execution_seconds = metrics_registry.histogram(
+            "endpoint_execution_seconds",
+            "Execution time of functions decorated with monitor_performance",
+            ("endpoint", "status")
+        )
     
     def record_request_time(self, endpoint: str, execution_time: float, status_code: int = 200):
         """Record API request execution time."""
+        self.execution_seconds.observe(execution_time, endpoint=endpoint, status=str(status_code))
+        
         if endpoint not in self.metrics:
             self.metrics[endpoint] = {
                 'total_requests': 0,
@@ -16,9 +16,11 @@ import shutil
 import tempfile
 import logging
 import hashlib
+import struct
 from datetime import datetime, timedelta, date
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, BinaryIO
 from pathlib import Path
+from types import SimpleNamespace
 import zipfile
 import tarfile
 from concurrent.futures import ThreadPoolExecutor, as_completed
@@ -42,10 +44,19 @@ from app.schemas.audit import (
     RetentionPeriod, AuditEntity, ViolationType, 
     AuditSeverity, AuditAction
 )
+from app.utils.audit_partitions import DEFAULT_PARTITION, LIST_PARTITIONS_SQL, PARENT_TABLE, sorted_monthly_partitions
 
 
 logger = logging.getLogger(__name__)
 
+# Chunked archives: this line, then one Fernet token per line. Each token holds
+# a chunk prefixed with its index and a last-chunk flag, so reordered or
+# truncated files fail to decrypt even before the checksum is compared.
+# Older archives are a single Fernet token.
+CHUNKED_ARCHIVE_MAGIC = b"JCTC-ARCHIVE-CHUNKED-1\n"
+ARCHIVE_CHUNK_SIZE = 4 * 1024 * 1024
+_CHUNK_PREFIX = struct.Struct(">Q?")
+
 
 class RetentionManager:
     """
@@ -185,6 +196,10 @@ class RetentionManager:
         
         cutoff_date = datetime.utcnow() - timedelta(days=retention_days)
         
+        # Audit logs are partitioned by month and retained a partition at a time
+        if entity_mapping['model'] is AuditLog:
+            return self._process_audit_log_partitions(policy, cutoff_date)
+        
         # Query for expired items
         model = entity_mapping['model']
         date_field = getattr(model, entity_mapping['date_field'])
@@ -319,6 +334,285 @@ class RetentionManager:
             self.db.rollback()
             return False
     
+    def _process_audit_log_partitions(self, policy: RetentionPolicy, cutoff_date: datetime) -> Dict[str, Any]:
+        """
+        Apply a retention policy to audit logs by whole monthly partitions.
+        
+        Only partitions whose entire range ends before the cutoff are touched.
+        Archival exports the partition to an encrypted archive; deletion
+        detaches and drops it, so no row-level DELETE is issued against a
+        monthly partition. Expired rows in the default partition (rows written
+        before their month's partition existed) are handled by
+        ``_process_audit_log_default_partition``.
+        """
+        results = {
+            'archived': 0,
+            'deleted': 0,
+            'violations': 0
+        }
+        
+        names = self.db.execute(LIST_PARTITIONS_SQL, {'parent': PARENT_TABLE}).scalars().all()
+        
+        for name, start, end in sorted_monthly_partitions(names):
+            if end > cutoff_date.date():
+                break
+            
+            try:
+                archive = self.db.query(AuditArchive).filter(
+                    AuditArchive.archive_name == name
+                ).first()
+                
+                if policy.auto_archive and archive is None:
+                    archive = self._export_audit_partition(name, start, end, policy)
+                    results['archived'] += 1
+                
+                if policy.auto_delete and (archive is not None or not policy.auto_archive):
+                    self._drop_audit_partition(name, start, end, policy)
+                    results['deleted'] += 1
+                
+            except Exception as e:
+                self.db.rollback()
+                logger.error(f"Error processing audit log partition {name}: {str(e)}")
+                self._create_compliance_violation(
+                    policy, SimpleNamespace(id=name), f"Partition retention failed: {str(e)}"
+                )
+                results['violations'] += 1
+        
+        if DEFAULT_PARTITION in names:
+            for key, count in self._process_audit_log_default_partition(policy, cutoff_date).items():
+                results[key] += count
+        
+        return results
+    
+    def _process_audit_log_default_partition(self, policy: RetentionPolicy, cutoff_date: datetime) -> Dict[str, int]:
+        """
+        Apply a retention policy to expired rows in the default partition.
+        
+        The default partition spans no fixed range and cannot be dropped, so
+        rows older than the cutoff are archived under a per-cutoff-date name
+        and deleted row by row. It only holds rows that arrived before their
+        monthly partition was created, so the DELETE stays small.
+        """
+        results = {'archived': 0, 'deleted': 0, 'violations': 0}
+        
+        oldest = self.db.execute(
+            text(f"SELECT min(timestamp) FROM {DEFAULT_PARTITION} WHERE timestamp < :cutoff"),
+            {'cutoff': cutoff_date}
+        ).scalar()
+        if oldest is None:
+            return results
+        
+        archive_name = f"{DEFAULT_PARTITION}_before_{cutoff_date:%Y%m%d}"
+        try:
+            archive = self.db.query(AuditArchive).filter(
+                AuditArchive.archive_name == archive_name
+            ).first()
+            
+            if policy.auto_archive and archive is None:
+                archive = self._export_audit_partition(
+                    DEFAULT_PARTITION, oldest.date(), cutoff_date.date(), policy,
+                    before=cutoff_date, archive_name=archive_name
+                )
+                results['archived'] += 1
+            
+            if policy.auto_delete and (archive is not None or not policy.auto_archive):
+                deleted = self.db.execute(
+                    text(f"DELETE FROM {DEFAULT_PARTITION} WHERE timestamp < :cutoff"),
+                    {'cutoff': cutoff_date}
+                ).rowcount
+                self.db.add(AuditLog(
+                    action=AuditAction.DELETE,
+                    entity_type=policy.entity_type,
+                    entity_id=DEFAULT_PARTITION,
+                    description=f"Expired audit log rows deleted from default partition by retention policy: {policy.name}",
+                    severity=AuditSeverity.HIGH,
+                    details={
+                        'policy_id': str(policy.id),
+                        'policy_name': policy.name,
+                        'retention_period': policy.retention_period,
+                        'cutoff_date': cutoff_date.isoformat(),
+                        'deleted_rows': deleted,
+                        'deletion_reason': 'retention_policy_expiration'
+                    }
+                ))
+                self.db.commit()
+                results['deleted'] += 1
+                logger.info(f"Deleted {deleted} expired rows from {DEFAULT_PARTITION}")
+            
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"Error processing audit log partition {DEFAULT_PARTITION}: {str(e)}")
+            self._create_compliance_violation(
+                policy, SimpleNamespace(id=DEFAULT_PARTITION), f"Partition retention failed: {str(e)}"
+            )
+            results['violations'] += 1
+        
+        return results
+    
+    def _export_audit_partition(
+        self, 
+        name: str, 
+        start: date, 
+        end: date, 
+        policy: RetentionPolicy,
+        before: Optional[datetime] = None,
+        archive_name: Optional[str] = None
+    ) -> AuditArchive:
+        """
+        Export one audit log partition to an encrypted archive file.
+        
+        With ``before``, only rows older than it are exported, under
+        ``archive_name``.
+        """
+        archive_name = archive_name or name
+        compressed_path = self.archive_dir / f"{archive_name}.json.gz"
+        archive_path = self.archive_dir / f"{archive_name}.tar.gz.enc"
+        
+        # Stream rows straight into the compressed file in the same layout as
+        # create_bulk_archive, without materialising the partition in memory
+        header = {
+            'archive_name': archive_name,
+            'entity_type': policy.entity_type,
+            'start_date': start.isoformat(),
+            'end_date': end.isoformat(),
+            'created_at': datetime.utcnow().isoformat(),
+        }
+        record_count = 0
+        original_size = 0
+        
+        with gzip.open(compressed_path, 'wb') as out:
+            def write(chunk: str):
+                nonlocal original_size
+                data = chunk.encode()
+                original_size += len(data)
+                out.write(data)
+            
+            write(json.dumps(header, default=str)[:-1] + ', "items": [')
+            where = "WHERE timestamp < :before " if before is not None else ""
+            rows = self.db.execute(
+                text(f"SELECT * FROM {name} {where}ORDER BY timestamp, id").execution_options(yield_per=5000),
+                {'before': before} if before is not None else {}
+            ).mappings()
+            for row in rows:
+                item = {
+                    key: value.isoformat() if isinstance(value, datetime) else (str(value) if value is not None else None)
+                    for key, value in row.items()
+                }
+                write((', ' if record_count else '') + json.dumps(item, default=str))
+                record_count += 1
+            write(']}')
+        
+        try:
+            with open(compressed_path, 'rb') as source, open(archive_path, 'wb') as target:
+                encrypted_size, checksum = self._encrypt_archive_stream(source, target)
+        finally:
+            compressed_path.unlink()
+        
+        archive_record = AuditArchive(
+            archive_name=archive_name,
+            start_date=datetime(start.year, start.month, start.day),
+            end_date=datetime(end.year, end.month, end.day),
+            record_count=record_count,
+            entity_types=[policy.entity_type],
+            compressed_size=encrypted_size,
+            original_size=original_size,
+            file_path=str(archive_path),
+            checksum=checksum,
+            status="ACTIVE",
+            created_by=None  # System operation
+        )
+        self.db.add(archive_record)
+        self.db.commit()
+        
+        logger.info(f"Archived audit log partition {archive_name} ({record_count} records)")
+        return archive_record
+    
+    def _encrypt_archive_stream(self, source: BinaryIO, target: BinaryIO) -> Tuple[int, str]:
+        """
+        Encrypt ``source`` into ``target`` in the chunked archive format.
+        
+        Holds one chunk at a time. Returns the encrypted size and its SHA-256.
+        """
+        digest = hashlib.sha256()
+        size = 0
+        
+        def emit(data: bytes):
+            nonlocal size
+            digest.update(data)
+            size += len(data)
+            target.write(data)
+        
+        emit(CHUNKED_ARCHIVE_MAGIC)
+        index = 0
+        chunk = source.read(ARCHIVE_CHUNK_SIZE)
+        while True:
+            following = source.read(ARCHIVE_CHUNK_SIZE)
+            is_last = not following
+            emit(self.fernet.encrypt(_CHUNK_PREFIX.pack(index, is_last) + chunk) + b"\n")
+            if is_last:
+                return size, digest.hexdigest()
+            chunk = following
+            index += 1
+    
+    def _decrypt_archive_file(self, path: str, target: BinaryIO):
+        """Decrypt an archive file of either format into ``target``, a chunk at a time."""
+        with open(path, 'rb') as f:
+            if f.read(len(CHUNKED_ARCHIVE_MAGIC)) != CHUNKED_ARCHIVE_MAGIC:
+                f.seek(0)
+                target.write(self.fernet.decrypt(f.read()))
+                return
+            
+            expected = 0
+            finished = False
+            for line in f:
+                if finished:
+                    raise ValueError("Archive has data after its last chunk")
+                plain = self.fernet.decrypt(line.rstrip(b"\n"))
+                index, finished = _CHUNK_PREFIX.unpack_from(plain)
+                if index != expected:
+                    raise ValueError(f"Archive chunk {index} found where chunk {expected} was expected")
+                target.write(plain[_CHUNK_PREFIX.size:])
+                expected += 1
+            if not finished:
+                raise ValueError("Archive is truncated")
+    
+    def _archive_file_checksum(self, path: str) -> str:
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(block)
+        return digest.hexdigest()
+    
+    def _drop_audit_partition(
+        self, 
+        name: str, 
+        start: date, 
+        end: date, 
+        policy: RetentionPolicy
+    ) -> None:
+        """Detach and drop an expired audit log partition."""
+        self.db.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name}"))
+        self.db.execute(text(f"DROP TABLE {name}"))
+        
+        self.db.add(AuditLog(
+            action=AuditAction.DELETE,
+            entity_type=policy.entity_type,
+            entity_id=name,
+            description=f"Audit log partition dropped by retention policy: {policy.name}",
+            severity=AuditSeverity.HIGH,
+            details={
+                'policy_id': str(policy.id),
+                'policy_name': policy.name,
+                'retention_period': policy.retention_period,
+                'partition_start': start.isoformat(),
+                'partition_end': end.isoformat(),
+                'deletion_reason': 'retention_policy_expiration'
+            }
+        ))
+        self.db.commit()
+        
+        logger.info(f"Dropped audit log partition {name}")
+    
     def _serialize_item(self, item: Any) -> Dict[str, Any]:
         """Serialize an item for archival."""
         # Convert SQLAlchemy object to dictionary
@@ -452,18 +746,16 @@ class RetentionManager:
             if not os.path.exists(archive.file_path):
                 raise ValueError(f"Archive file not found: {archive.file_path}")
             
-            # Read and decrypt archive
-            with open(archive.file_path, 'rb') as f:
-                encrypted_data = f.read()
-            
             # Verify checksum
-            if hashlib.sha256(encrypted_data).hexdigest() != archive.checksum:
+            if self._archive_file_checksum(archive.file_path) != archive.checksum:
                 raise ValueError("Archive checksum verification failed")
             
-            # Decrypt and decompress
-            compressed_data = self.fernet.decrypt(encrypted_data)
-            json_data = gzip.decompress(compressed_data)
-            archive_data = json.loads(json_data.decode())
+            # Decrypt to a spooled file and decompress from it
+            with tempfile.TemporaryFile() as compressed:
+                self._decrypt_archive_file(archive.file_path, compressed)
+                compressed.seek(0)
+                with gzip.GzipFile(fileobj=compressed) as json_data:
+                    archive_data = json.load(json_data)
             
             # Restoration results
             results = {
@@ -523,22 +815,21 @@ class RetentionManager:
             if os.path.exists(archive.file_path):
                 results['file_exists'] = True
                 
-                # Read file and verify checksum
-                with open(archive.file_path, 'rb') as f:
-                    file_data = f.read()
-                
-                file_checksum = hashlib.sha256(file_data).hexdigest()
+                # Verify checksum
+                file_checksum = self._archive_file_checksum(archive.file_path)
                 if file_checksum == archive.checksum:
                     results['checksum_valid'] = True
                     
                     try:
-                        # Test decryption
-                        compressed_data = self.fernet.decrypt(file_data)
-                        results['decryption_successful'] = True
-                        
-                        # Test decompression and JSON parsing
-                        json_data = gzip.decompress(compressed_data)
-                        archive_data = json.loads(json_data.decode())
+                        with tempfile.TemporaryFile() as compressed:
+                            # Test decryption
+                            self._decrypt_archive_file(archive.file_path, compressed)
+                            results['decryption_successful'] = True
+                            
+                            # Test decompression and JSON parsing
+                            compressed.seek(0)
+                            with gzip.GzipFile(fileobj=compressed) as json_data:
+                                json.load(json_data)
                         results['data_valid'] = True
                         
                         # Update archive verification timestamp
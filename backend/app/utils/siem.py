@@ -2,22 +2,31 @@
 SIEM (Security Information and Event Management) integration module.
 
 Provides audit log export capabilities to external SIEM systems
-via webhooks, Syslog, and standard formats (CEF, LEEF, JSON).
+via webhooks, Syslog, and standard formats (CEF, LEEF, JSON), and a
+continuous forwarder that tails the audit log.
 """
 import asyncio
 import aiohttp
-import socket
+import ssl
 import json
 import logging
-from datetime import datetime
+import time
+from datetime import datetime, timezone
 from typing import List, Optional, Dict, Any
 from enum import Enum
 
-from app.models.audit import AuditLog
+from sqlalchemy import BigInteger, literal, select, text, tuple_
+from sqlalchemy.dialects.postgresql import insert
+
+from app.database.base import AsyncSessionLocal
+from app.models.audit import AuditLog, SIEMExportCursor
 
 
 logger = logging.getLogger(__name__)
 
+# Oldest transaction still running; every txid below it has finished
+COMMIT_HORIZON_SQL = text("SELECT pg_snapshot_xmin(pg_current_snapshot())::text::bigint")
+
 
 class SIEMFormat(str, Enum):
     """Supported SIEM log formats."""
@@ -32,9 +41,12 @@ class SIEMExporter:
     Export audit logs to SIEM systems.
     
     Supports:
-    - Webhook-based delivery (HTTP POST)
-    - Syslog delivery (UDP/TCP)
+    - Webhook-based delivery (HTTP POST) over a pooled session
+    - Syslog delivery (UDP, or TCP/TLS with RFC 6587 octet-counting framing)
+      over a persistent connection
     - Multiple formats (JSON, CEF, LEEF)
+    
+    Connections are opened lazily and kept until ``close()``.
     """
     
     def __init__(
@@ -45,7 +57,9 @@ class SIEMExporter:
         syslog_protocol: str = "UDP",
         format: SIEMFormat = SIEMFormat.JSON,
         webhook_headers: Optional[Dict[str, str]] = None,
-        batch_size: int = 100
+        batch_size: int = 100,
+        syslog_ca_file: Optional[str] = None,
+        timeout_seconds: float = 30.0
     ):
         self.webhook_url = webhook_url
         self.syslog_host = syslog_host
@@ -54,6 +68,14 @@ class SIEMExporter:
         self.format = format
         self.webhook_headers = webhook_headers or {"Content-Type": "application/json"}
         self.batch_size = batch_size
+        self.syslog_ca_file = syslog_ca_file
+        self.timeout_seconds = timeout_seconds
+        
+        # Persistent transports
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._syslog_writer: Optional[asyncio.StreamWriter] = None
+        self._udp_transport: Optional[asyncio.DatagramTransport] = None
+        self._syslog_lock = asyncio.Lock()
         
         # Facility and severity mappings for Syslog
         self.facility = 10  # Security/authorization (authpriv)
@@ -80,11 +102,9 @@ class SIEMExporter:
             "errors": []
         }
         
-        # Format logs
-        formatted_logs = [self._format_log(log) for log in logs]
-        
         # Export to webhook if configured
         if self.webhook_url:
+            formatted_logs = [self._format_log(log) for log in logs]
             webhook_result = await self._export_to_webhook(formatted_logs)
             results["webhook"] = webhook_result
             if webhook_result.get("success"):
@@ -105,56 +125,115 @@ class SIEMExporter:
         
         return results
     
+    async def close(self):
+        """Close the pooled HTTP session and the syslog connection."""
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        await self._close_syslog()
+    
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Return the pooled HTTP session, creating it on first use."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=self.timeout_seconds),
+                connector=aiohttp.TCPConnector(limit=10, keepalive_timeout=60)
+            )
+        return self._session
+    
     async def _export_to_webhook(self, logs: List[Dict]) -> Dict[str, Any]:
         """Export logs to webhook endpoint."""
         try:
-            async with aiohttp.ClientSession() as session:
-                payload = {
-                    "source": "JCTC",
-                    "timestamp": datetime.utcnow().isoformat(),
-                    "event_count": len(logs),
-                    "events": logs
-                }
-                
-                async with session.post(
-                    self.webhook_url,
-                    json=payload,
-                    headers=self.webhook_headers,
-                    timeout=30
-                ) as response:
-                    if response.status in [200, 201, 202]:
-                        return {"success": True, "status": response.status}
-                    else:
-                        return {
-                            "success": False,
-                            "status": response.status,
-                            "error": await response.text()
-                        }
+            session = await self._get_session()
+            payload = {
+                "source": "JCTC",
+                "timestamp": datetime.utcnow().isoformat(),
+                "event_count": len(logs),
+                "events": logs
+            }
+            
+            async with session.post(
+                self.webhook_url,
+                json=payload,
+                headers=self.webhook_headers
+            ) as response:
+                if response.status in [200, 201, 202]:
+                    return {"success": True, "status": response.status}
+                else:
+                    return {
+                        "success": False,
+                        "status": response.status,
+                        "error": await response.text()
+                    }
         except Exception as e:
             logger.error(f"Webhook export failed: {e}")
             return {"success": False, "error": str(e)}
     
+    async def _open_syslog(self):
+        """Open the persistent syslog transport."""
+        if self.syslog_protocol == "UDP":
+            loop = asyncio.get_running_loop()
+            self._udp_transport, _ = await loop.create_datagram_endpoint(
+                asyncio.DatagramProtocol,
+                remote_addr=(self.syslog_host, self.syslog_port)
+            )
+        else:
+            ssl_context = None
+            if self.syslog_protocol == "TLS":
+                ssl_context = ssl.create_default_context(cafile=self.syslog_ca_file)
+            _, self._syslog_writer = await asyncio.wait_for(
+                asyncio.open_connection(self.syslog_host, self.syslog_port, ssl=ssl_context),
+                timeout=self.timeout_seconds
+            )
+    
+    async def _close_syslog(self):
+        """Close the syslog transport so the next send reconnects."""
+        if self._udp_transport:
+            self._udp_transport.close()
+            self._udp_transport = None
+        if self._syslog_writer:
+            self._syslog_writer.close()
+            try:
+                await self._syslog_writer.wait_closed()
+            except Exception:
+                pass
+            self._syslog_writer = None
+    
+    async def _send_syslog(self, messages: List[bytes]):
+        """Send messages over the persistent transport, connecting if needed."""
+        if self.syslog_protocol == "UDP":
+            if self._udp_transport is None or self._udp_transport.is_closing():
+                await self._open_syslog()
+            for message in messages:
+                self._udp_transport.sendto(message)
+        else:
+            if self._syslog_writer is None or self._syslog_writer.is_closing():
+                await self._open_syslog()
+            # RFC 6587 octet-counting: "<length> <message>" per frame
+            self._syslog_writer.write(
+                b"".join(b"%d %s" % (len(message), message) for message in messages)
+            )
+            await asyncio.wait_for(self._syslog_writer.drain(), timeout=self.timeout_seconds)
+    
     async def _export_to_syslog(self, logs: List[AuditLog]) -> Dict[str, Any]:
         """Export logs to Syslog server."""
-        try:
-            if self.syslog_protocol == "UDP":
-                sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-            else:
-                sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                sock.connect((self.syslog_host, self.syslog_port))
-            
-            sent_count = 0
-            for log in logs:
-                message = self._format_syslog_message(log)
-                sock.sendto(message.encode(), (self.syslog_host, self.syslog_port))
-                sent_count += 1
-            
-            sock.close()
-            return {"success": True, "sent": sent_count}
-            
-        except Exception as e:
-            logger.error(f"Syslog export failed: {e}")
-            return {"success": False, "error": str(e)}
+        messages = [self._format_syslog_message(log).encode() for log in logs]
+        
+        async with self._syslog_lock:
+            try:
+                await self._send_syslog(messages)
+            except Exception as e:
+                # The connection may have been dropped by the peer; reconnect once
+                logger.warning(f"Syslog send failed, reconnecting: {e}")
+                await self._close_syslog()
+                try:
+                    await self._send_syslog(messages)
+                except Exception as e:
+                    logger.error(f"Syslog export failed: {e}")
+                    await self._close_syslog()
+                    return {"success": False, "error": str(e)}
+        
+        return {"success": True, "sent": len(messages)}
     
     def _format_log(self, log: AuditLog) -> Dict[str, Any]:
         """Format a log entry based on configured format."""
@@ -169,7 +248,7 @@ class SIEMExporter:
         """Format log as JSON."""
         return {
             "id": str(log.id),
-            "timestamp": log.created_at.isoformat() if log.created_at else None,
+            "timestamp": log.timestamp.isoformat() if log.timestamp else None,
             "action": log.action,
             "entity_type": log.entity_type,
             "entity_id": str(log.entity_id) if log.entity_id else None,
@@ -201,8 +280,8 @@ class SIEMExporter:
         if log.entity_id:
             extensions.append(f"cs2={log.entity_id}")
             extensions.append("cs2Label=EntityID")
-        if log.created_at:
-            extensions.append(f"rt={int(log.created_at.timestamp() * 1000)}")
+        if log.timestamp:
+            extensions.append(f"rt={int(log.timestamp.timestamp() * 1000)}")
         
         extension_str = " ".join(extensions)
         
@@ -222,8 +301,8 @@ class SIEMExporter:
             fields.append(f"usrName={log.user_id}")
         if log.ip_address:
             fields.append(f"src={log.ip_address}")
-        if log.created_at:
-            fields.append(f"devTime={log.created_at.strftime('%b %d %Y %H:%M:%S')}")
+        if log.timestamp:
+            fields.append(f"devTime={log.timestamp.strftime('%b %d %Y %H:%M:%S')}")
         if log.severity:
             fields.append(f"sev={self._leef_severity(log.severity)}")
         if log.entity_type:
@@ -236,7 +315,7 @@ class SIEMExporter:
         severity = self.severity_map.get(log.severity, 6)
         priority = (self.facility * 8) + severity
         
-        timestamp = log.created_at.strftime("%Y-%m-%dT%H:%M:%S.%fZ") if log.created_at else "-"
+        timestamp = log.timestamp.strftime("%Y-%m-%dT%H:%M:%S.%fZ") if log.timestamp else "-"
         hostname = "jctc-cms"
         app_name = "audit"
         proc_id = "-"
@@ -260,6 +339,160 @@ class SIEMExporter:
         return mapping.get(severity, 5)
 
 
+class SIEMForwarder:
+    """
+    Continuous audit log forwarder for one SIEM destination.
+    
+    Tails ``audit_logs`` by a (txid, sequence_number) watermark and sends
+    rows in batches of up to ``batch_size``, flushing a partial batch once it
+    has waited ``flush_interval_seconds``. The watermark lives in
+    ``siem_export_cursors`` and is advanced in the same transaction that
+    holds the cursor row lock, only after the destination accepted the batch.
+    The ``FOR UPDATE SKIP LOCKED`` lock also means only one uvicorn worker
+    forwards for a destination at a time.
+    
+    Only rows from transactions below the current snapshot's xmin are read.
+    Every such transaction has finished, so a row committed late (the audit
+    sink writes after the request, long transactions commit after their
+    timestamp) can never land behind the watermark.
+    """
+    
+    def __init__(
+        self,
+        exporter: SIEMExporter,
+        cursor_name: str,
+        batch_size: int = 500,
+        flush_interval_seconds: float = 60.0,
+        poll_interval_seconds: float = 1.0,
+        session_factory=AsyncSessionLocal
+    ):
+        self.exporter = exporter
+        self.cursor_name = cursor_name
+        self.batch_size = batch_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self.poll_interval_seconds = poll_interval_seconds
+        self.session_factory = session_factory
+        
+        self._task: Optional[asyncio.Task] = None
+        self._last_flush = time.monotonic()
+    
+    async def start(self):
+        """Start forwarding in a background task."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+            logger.info(f"SIEM forwarder '{self.cursor_name}' started")
+    
+    async def stop(self):
+        """Stop forwarding and close the exporter's connections."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.exporter.close()
+        logger.info(f"SIEM forwarder '{self.cursor_name}' stopped")
+    
+    async def _ensure_cursor(self):
+        """Create the cursor at the current position if it does not exist."""
+        async with self.session_factory() as session:
+            # Everything below the horizon has committed and is skipped;
+            # transactions still running will be forwarded
+            horizon = (await session.execute(COMMIT_HORIZON_SQL)).scalar_one()
+            await session.execute(
+                insert(SIEMExportCursor)
+                .values(
+                    name=self.cursor_name,
+                    last_txid=horizon,
+                    last_sequence_number=0,
+                    last_timestamp=datetime.now(timezone.utc),
+                    exported_count=0
+                )
+                .on_conflict_do_nothing(index_elements=["name"])
+            )
+            await session.commit()
+    
+    async def forward_once(self) -> int:
+        """
+        Forward the next batch if one is due.
+        
+        Returns:
+            Number of rows forwarded (0 if nothing was due or another worker
+            holds the cursor)
+        
+        Raises:
+            RuntimeError: If the destination rejected the batch
+        """
+        async with self.session_factory() as session:
+            cursor = (await session.execute(
+                select(SIEMExportCursor)
+                .where(SIEMExportCursor.name == self.cursor_name)
+                .with_for_update(skip_locked=True)
+            )).scalar_one_or_none()
+            
+            if cursor is None:
+                return 0
+            
+            horizon = (await session.execute(COMMIT_HORIZON_SQL)).scalar_one()
+            logs = (await session.execute(
+                select(AuditLog)
+                .where(
+                    tuple_(AuditLog.txid, AuditLog.sequence_number)
+                    > tuple_(literal(cursor.last_txid, BigInteger), literal(cursor.last_sequence_number, BigInteger)),
+                    AuditLog.txid < horizon
+                )
+                .order_by(AuditLog.txid, AuditLog.sequence_number)
+                .limit(self.batch_size)
+            )).scalars().all()
+            
+            if not logs:
+                return 0
+            
+            waited = time.monotonic() - self._last_flush
+            if len(logs) < self.batch_size and waited < self.flush_interval_seconds:
+                return 0
+            
+            result = await self.exporter.export_logs(logs)
+            if result["failed"]:
+                raise RuntimeError("; ".join(str(e) for e in result["errors"]))
+            
+            cursor.last_txid = logs[-1].txid
+            cursor.last_sequence_number = logs[-1].sequence_number
+            cursor.last_timestamp = logs[-1].timestamp
+            cursor.last_id = logs[-1].id
+            cursor.exported_count += len(logs)
+            await session.commit()
+            
+            self._last_flush = time.monotonic()
+            return len(logs)
+    
+    async def _run(self):
+        """Forwarding loop with exponential backoff on destination errors."""
+        backoff = self.poll_interval_seconds
+        
+        while True:
+            try:
+                await self._ensure_cursor()
+                break
+            except Exception as e:
+                logger.error(f"SIEM forwarder '{self.cursor_name}' could not initialise cursor: {e}")
+                await asyncio.sleep(self.flush_interval_seconds)
+        
+        while True:
+            try:
+                forwarded = await self.forward_once()
+                backoff = self.poll_interval_seconds
+                if forwarded < self.batch_size:
+                    await asyncio.sleep(self.poll_interval_seconds)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"SIEM forwarder '{self.cursor_name}' failed: {e}")
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, self.flush_interval_seconds)
+
+
 class SIEMConfiguration:
     """SIEM configuration from settings."""
     
@@ -273,7 +506,8 @@ class SIEMConfiguration:
         syslog_protocol: str = "UDP",
         format: str = "json",
         export_interval_seconds: int = 60,
-        batch_size: int = 100
+        batch_size: int = 100,
+        syslog_ca_file: Optional[str] = None
     ):
         self.enabled = enabled
         self.webhook_url = webhook_url
@@ -284,19 +518,78 @@ class SIEMConfiguration:
         self.format = SIEMFormat(format) if format else SIEMFormat.JSON
         self.export_interval_seconds = export_interval_seconds
         self.batch_size = batch_size
+        self.syslog_ca_file = syslog_ca_file
     
-    def create_exporter(self) -> SIEMExporter:
-        """Create a SIEMExporter from this configuration."""
+    @classmethod
+    def from_settings(cls, settings) -> "SIEMConfiguration":
+        """Build configuration from application settings."""
+        return cls(
+            enabled=settings.siem_enabled,
+            webhook_url=settings.siem_webhook_url,
+            webhook_api_key=settings.siem_webhook_api_key,
+            syslog_host=settings.siem_syslog_host,
+            syslog_port=settings.siem_syslog_port,
+            syslog_protocol=settings.siem_syslog_protocol,
+            format=settings.siem_format,
+            export_interval_seconds=settings.siem_export_interval_seconds,
+            batch_size=settings.siem_batch_size,
+            syslog_ca_file=settings.siem_syslog_ca_file
+        )
+    
+    def _webhook_headers(self) -> Dict[str, str]:
         headers = {"Content-Type": "application/json"}
         if self.webhook_api_key:
             headers["Authorization"] = f"Bearer {self.webhook_api_key}"
-        
+        return headers
+    
+    def create_exporter(self) -> SIEMExporter:
+        """Create a SIEMExporter from this configuration."""
         return SIEMExporter(
             webhook_url=self.webhook_url,
             syslog_host=self.syslog_host,
             syslog_port=self.syslog_port,
             syslog_protocol=self.syslog_protocol,
             format=self.format,
-            webhook_headers=headers,
-            batch_size=self.batch_size
+            webhook_headers=self._webhook_headers(),
+            batch_size=self.batch_size,
+            syslog_ca_file=self.syslog_ca_file
+        )
+    
+    def create_forwarders(self) -> List[SIEMForwarder]:
+        """
+        Create one forwarder per configured destination.
+        
+        Each destination keeps its own cursor so a failing destination does
+        not cause duplicates at a healthy one.
+        """
+        forwarders = []
+        
+        if self.webhook_url:
+            exporter = SIEMExporter(
+                webhook_url=self.webhook_url,
+                format=self.format,
+                webhook_headers=self._webhook_headers(),
+                batch_size=self.batch_size
+            )
+            forwarders.append(self._create_forwarder(exporter, "webhook"))
+        
+        if self.syslog_host:
+            exporter = SIEMExporter(
+                syslog_host=self.syslog_host,
+                syslog_port=self.syslog_port,
+                syslog_protocol=self.syslog_protocol,
+                format=self.format,
+                batch_size=self.batch_size,
+                syslog_ca_file=self.syslog_ca_file
+            )
+            forwarders.append(self._create_forwarder(exporter, "syslog"))
+        
+        return forwarders
+    
+    def _create_forwarder(self, exporter: SIEMExporter, destination: str) -> SIEMForwarder:
+        return SIEMForwarder(
+            exporter=exporter,
+            cursor_name=destination,
+            batch_size=self.batch_size,
+            flush_interval_seconds=self.export_interval_seconds
         )
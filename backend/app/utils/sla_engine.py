@@ -0,0 +1,273 @@
+"""
+Task SLA deadlines and the background sweeper that escalates breaches.
+
+- Every task stores ``sla_deadline``: its ``due_at`` or, without one, the
+  SLA for its priority (and template, when the template names a task type
+  in ``SLA_MATRIX``) counted from creation. Writers call
+  ``apply_task_sla`` whenever priority or due date change, and
+  ``task_sla_status`` reads only these columns
+- ``SLASweeper`` finds breaches with one range scan of the partial index
+  ``ix_tasks_sla_open`` and escalates them in batches. Each batch is one
+  statement: it sets ``sla_breached_at``, raises the priority and
+  escalation level, writes a TASK_OVERDUE entry to the case timeline and
+  returns who to tell. ``sla_breached_at`` takes the row out of the index,
+  so each breach is escalated and announced once. Recipients are the
+  assignee and the case leads; the stream event goes out on commit
+- The sweeper runs in whichever worker holds a session-level advisory lock
+  on its own connection. If that worker exits or loses the connection, the
+  lock is released and another worker takes over on its next attempt. A
+  sweep done by two workers at once would still escalate each task once,
+  because rows are claimed with SKIP LOCKED
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import text
+
+from app.config.settings import settings
+from app.utils.metrics import metrics_registry
+from app.utils.notification_stream import publish_user_events
+from app.utils.tasks import SLA_MATRIX, calculate_sla_deadline, workload_cache
+
+logger = logging.getLogger(__name__)
+
+# Arbitrary constant identifying the SLA sweeper leader for advisory locks
+SLA_LEADER_LOCK_KEY = 0x4A435443_0002
+
+# Task.priority (1-5) as the SLA_MATRIX priority names
+TASK_PRIORITY_LEVELS = {5: "critical", 4: "high", 3: "medium", 2: "low", 1: "low"}
+
+# Hours allowed by priority when the task has no due date or typed template
+DEFAULT_SLA_HOURS = {"critical": 8, "high": 24, "medium": 72, "low": 168}
+
+_ESCALATE_BREACHES_SQL = text("""
+    WITH due AS (
+        SELECT id FROM tasks
+        WHERE status <> 'DONE' AND sla_breached_at IS NULL AND sla_deadline <= :cutoff
+        ORDER BY sla_deadline
+        LIMIT :batch_size
+        FOR UPDATE SKIP LOCKED
+    ), breached AS (
+        UPDATE tasks t
+        SET sla_breached_at = :now,
+            escalation_level = t.escalation_level + 1,
+            priority = LEAST(COALESCE(t.priority, 3) + 1, 5),
+            updated_at = now()
+        FROM due
+        WHERE t.id = due.id
+        RETURNING t.id, t.case_id, t.title, t.assigned_to, t.sla_deadline, t.priority
+    ), logged AS (
+        INSERT INTO actions_log (id, case_id, user_id, action, details, created_at, updated_at)
+        SELECT gen_random_uuid(), case_id, CAST(:escalated_by AS UUID), 'TASK_OVERDUE',
+               'Task ''' || COALESCE(title, '') || ''' breached its SLA deadline', now(), now()
+        FROM breached
+    )
+    SELECT b.id, b.case_id, b.assigned_to, b.sla_deadline, b.priority,
+           ARRAY(SELECT ca.user_id FROM case_assignments ca
+                 WHERE ca.case_id = b.case_id AND ca.role = 'LEAD') AS leads
+    FROM breached b
+""")
+
+
+_COUNT_OVERDUE_SQL = text("""
+    SELECT count(*) FROM tasks
+    WHERE status <> 'DONE' AND sla_deadline <= :cutoff
+""")
+
+
+def as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """``value`` as aware UTC; naive values (e.g. a date-only ``due_at``) are taken as UTC."""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    if value.utcoffset():
+        return value.astimezone(timezone.utc)
+    return value
+
+
+def task_sla_deadline(
+    task_template_id: Optional[str],
+    priority: Optional[int],
+    created_at: datetime,
+    due_at: Optional[datetime] = None
+) -> datetime:
+    """Deadline a task is held to: its due date, else the SLA from creation."""
+    if due_at is not None:
+        return as_utc(due_at)
+    created_at = as_utc(created_at)
+    level = TASK_PRIORITY_LEVELS.get(priority, "medium")
+    if task_template_id in SLA_MATRIX:
+        return calculate_sla_deadline(task_template_id, level, created_at)
+    return created_at + timedelta(hours=DEFAULT_SLA_HOURS[level])
+
+
+def apply_task_sla(task, now: Optional[datetime] = None):
+    """
+    Recompute ``task.sla_deadline``; a deadline moved into the future re-arms the breach check.
+
+    A naive ``task.due_at`` is stored as UTC.
+    """
+    now = as_utc(now) or datetime.now(timezone.utc)
+    due_at = as_utc(task.due_at)
+    if due_at is not task.due_at:
+        task.due_at = due_at
+    deadline = task_sla_deadline(task.task_template_id, task.priority, task.created_at or now, task.due_at)
+    if deadline != task.sla_deadline:
+        task.sla_deadline = deadline
+        if deadline > now:
+            task.sla_breached_at = None
+
+
+def task_sla_status(task, now: Optional[datetime] = None) -> Optional[str]:
+    """COMPLETED, BREACHED, AT_RISK or ON_TRACK from the stored SLA columns."""
+    if getattr(task.status, "value", task.status) == "DONE":
+        return "COMPLETED"
+    if task.sla_deadline is None:
+        return None
+    now = as_utc(now) or datetime.now(timezone.utc)
+    if task.sla_breached_at is not None or task.sla_deadline <= now:
+        return "BREACHED"
+    if task.sla_deadline - now <= timedelta(hours=settings.sla_at_risk_hours):
+        return "AT_RISK"
+    return "ON_TRACK"
+
+
+class SLASweeper:
+    """
+    Periodically escalate open tasks past their SLA deadline.
+
+    Started in every worker; only the one holding the leader lock sweeps.
+    """
+
+    def __init__(
+        self,
+        interval_seconds: float = 60.0,
+        batch_size: int = 500,
+        engine=None
+    ):
+        self.interval_seconds = interval_seconds
+        self.batch_size = batch_size
+        self.engine = engine
+        self.is_leader = False
+        self._task: Optional[asyncio.Task] = None
+
+    async def count_overdue(self, conn, now: Optional[datetime] = None, overdue_by: timedelta = timedelta(0)) -> int:
+        """Open tasks more than ``overdue_by`` past their deadline, escalated already or not."""
+        now = now or datetime.now(timezone.utc)
+        return await conn.scalar(_COUNT_OVERDUE_SQL, {"cutoff": now - overdue_by})
+
+    def _get_engine(self):
+        if self.engine is None:
+            from app.database.base import engine
+            self.engine = engine
+        return self.engine
+
+    async def start(self):
+        """Start competing for leadership and sweeping while leader."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def sweep(
+        self,
+        conn,
+        now: Optional[datetime] = None,
+        overdue_by: timedelta = timedelta(0),
+        escalated_by: Optional[str] = None
+    ) -> int:
+        """Escalate every open task more than ``overdue_by`` past its deadline; returns how many."""
+        now = now or datetime.now(timezone.utc)
+        params = {
+            "now": now,
+            "cutoff": now - overdue_by,
+            "escalated_by": str(escalated_by) if escalated_by else None,
+            "batch_size": self.batch_size,
+        }
+        started = time.perf_counter()
+        escalated = 0
+        while True:
+            result = await conn.execute(_ESCALATE_BREACHES_SQL, params)
+            rows = result.all()
+
+            recipients, task_ids = [], []
+            for row in rows:
+                for user_id in {row.assigned_to, *row.leads} - {None}:
+                    recipients.append(user_id)
+                    task_ids.append(str(row.id))
+            await publish_user_events(
+                conn, "task", recipients, {"action": "TASK_OVERDUE"}, object_ids=task_ids
+            )
+            await conn.commit()
+            # Their priority went up; other workers catch up when their cache expires
+            workload_cache.invalidate(row.assigned_to for row in rows)
+
+            escalated += len(rows)
+            if len(rows) < self.batch_size:
+                break
+
+        sla_sweep_seconds.observe(time.perf_counter() - started)
+        if escalated:
+            sla_breaches_total.inc(escalated)
+            logger.info(f"Escalated {escalated} tasks past their SLA deadline")
+        return escalated
+
+    async def _run(self):
+        while True:
+            try:
+                async with self._get_engine().connect() as conn:
+                    locked = await conn.scalar(
+                        text("SELECT pg_try_advisory_lock(:key)"), {"key": SLA_LEADER_LOCK_KEY}
+                    )
+                    await conn.commit()
+                    if locked:
+                        await self._lead(conn)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"SLA sweep failed: {e}")
+            await asyncio.sleep(self.interval_seconds)
+
+    async def _lead(self, conn):
+        self.is_leader = True
+        logger.info("This worker is now the SLA sweeper leader")
+        try:
+            while True:
+                await self.sweep(conn)
+                await asyncio.sleep(self.interval_seconds)
+        finally:
+            self.is_leader = False
+            # Close the connection rather than pool it, so the lock goes with it
+            await conn.invalidate()
+
+
+sla_breaches_total = metrics_registry.counter(
+    "sla_breaches_total", "Tasks escalated for breaching their SLA deadline"
+)
+sla_sweep_seconds = metrics_registry.histogram(
+    "sla_sweep_seconds", "Duration of one SLA sweep"
+)
+
+# Global sweeper instance (started on application startup)
+sla_sweeper = SLASweeper(
+    interval_seconds=settings.sla_sweep_interval_seconds,
+    batch_size=settings.sla_sweep_batch_size
+)
+
+sla_sweeper_leader = metrics_registry.gauge(
+    "sla_sweeper_leader", "1 in the worker currently running the SLA sweeper"
+)
+sla_sweeper_leader.set_function(lambda: 1.0 if sla_sweeper.is_leader else 0.0)
@@ -3,11 +3,15 @@ SSO (Single Sign-On) integration utilities.
 
 Provides OAuth2/OIDC abstraction for Keycloak, Azure AD, and Okta.
 """
+import asyncio
+import time
 import httpx
-from typing import Optional, Dict, Any, List
+from collections import OrderedDict
+from typing import Optional, Dict, Any, List, Tuple
 from enum import Enum
 from pydantic import BaseModel
 from fastapi import HTTPException, status
+from jose import jwt, JWTError
 import logging
 
 
@@ -33,8 +37,17 @@ class SSOConfiguration(BaseModel):
     userinfo_url: str = ""
     logout_url: Optional[str] = None
     jwks_url: Optional[str] = None
+    issuer: Optional[str] = None     # Expected "iss"; also used for JWKS discovery
     scopes: List[str] = ["openid", "profile", "email"]
     
+    # Local ID token validation
+    id_token_algorithms: List[str] = ["RS256", "ES256", "PS256"]
+    jwks_cache_ttl_seconds: int = 3600
+    jwks_min_refresh_interval_seconds: int = 30  # Rate limit for unknown-kid refreshes
+    clock_skew_seconds: int = 60
+    user_info_cache_ttl_seconds: int = 300
+    user_info_cache_size: int = 1000
+    
     # Provider-specific settings
     tenant_id: Optional[str] = None  # For Azure AD
     realm: Optional[str] = None      # For Keycloak
@@ -43,6 +56,27 @@ class SSOConfiguration(BaseModel):
     # Session settings
     session_timeout_minutes: int = 30
     max_concurrent_sessions: int = 5
+    
+    @classmethod
+    def from_settings(cls, settings) -> "SSOConfiguration":
+        """Build configuration from application settings."""
+        return cls(
+            enabled=settings.sso_enabled,
+            provider=settings.sso_provider,
+            client_id=settings.sso_client_id or "",
+            client_secret=settings.sso_client_secret or "",
+            authorization_url=settings.sso_authorization_url or "",
+            token_url=settings.sso_token_url or "",
+            userinfo_url=settings.sso_userinfo_url or "",
+            logout_url=settings.sso_logout_url,
+            jwks_url=settings.sso_jwks_url,
+            issuer=settings.sso_issuer,
+            scopes=settings.sso_scopes,
+            tenant_id=settings.sso_tenant_id,
+            realm=settings.sso_realm,
+            session_timeout_minutes=settings.session_timeout_minutes,
+            max_concurrent_sessions=settings.max_concurrent_sessions
+        )
 
 
 class SSOUserInfo(BaseModel):
@@ -58,6 +92,73 @@ class SSOUserInfo(BaseModel):
     raw_claims: Dict[str, Any] = {}
 
 
+class JWKSCache:
+    """
+    In-process cache of a provider's signing keys.
+    
+    Keys are indexed by ``kid`` and refreshed when the TTL expires or when a
+    token names a ``kid`` that is not cached (key rotation). Unknown-kid
+    refreshes are rate limited so forged kids cannot hammer the provider, and
+    concurrent refreshes share one request. If a refresh fails, previously
+    fetched keys keep being used.
+    """
+    
+    def __init__(
+        self,
+        jwks_url: str,
+        http_client: httpx.AsyncClient,
+        ttl_seconds: int = 3600,
+        min_refresh_interval_seconds: int = 30
+    ):
+        self.jwks_url = jwks_url
+        self.http_client = http_client
+        self.ttl_seconds = ttl_seconds
+        self.min_refresh_interval_seconds = min_refresh_interval_seconds
+        self._keys: Dict[str, Dict[str, Any]] = {}
+        self._fetched_at = 0.0
+        self._lock = asyncio.Lock()
+    
+    async def get_key(self, kid: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Return the JWK for ``kid`` (or the only key when ``kid`` is absent)."""
+        now = time.monotonic()
+        if not self._keys or now - self._fetched_at > self.ttl_seconds:
+            await self.refresh()
+        
+        key = self._lookup(kid)
+        if key is None and time.monotonic() - self._fetched_at >= self.min_refresh_interval_seconds:
+            await self.refresh()
+            key = self._lookup(kid)
+        return key
+    
+    def _lookup(self, kid: Optional[str]) -> Optional[Dict[str, Any]]:
+        if kid is None:
+            return next(iter(self._keys.values())) if len(self._keys) == 1 else None
+        return self._keys.get(kid)
+    
+    async def refresh(self):
+        """Fetch the JWKS document; concurrent callers wait for one fetch."""
+        started = time.monotonic()
+        async with self._lock:
+            if self._fetched_at > started:
+                return  # Another caller refreshed while we waited
+            try:
+                response = await self.http_client.get(self.jwks_url)
+                response.raise_for_status()
+                keys = {}
+                for index, jwk in enumerate(response.json().get("keys", [])):
+                    if jwk.get("use", "sig") != "sig":
+                        continue
+                    keys[jwk.get("kid") or f"_{index}"] = jwk
+                self._keys = keys
+                logger.info(f"Loaded {len(keys)} signing keys from {self.jwks_url}")
+            except Exception as e:
+                if not self._keys:
+                    raise
+                logger.warning(f"JWKS refresh failed, keeping cached keys: {e}")
+            finally:
+                self._fetched_at = time.monotonic()
+
+
 class SSOClient:
     """
     OAuth2/OIDC client for SSO integration.
@@ -77,13 +178,20 @@ class SSOClient:
         # Exchange code for token
         token = await client.exchange_code(code, redirect_uri)
         
-        # Get user info
-        user_info = await client.get_user_info(access_token)
+        # Validate the ID token locally (falls back to the userinfo endpoint)
+        user_info = await client.get_user_info_from_tokens(token, nonce=nonce)
+    
+    Pass ``http_client`` (e.g. one built on ``httpx.MockTransport``) to run
+    against a stub identity provider.
     """
     
-    def __init__(self, config: SSOConfiguration):
+    def __init__(self, config: SSOConfiguration, http_client: Optional[httpx.AsyncClient] = None):
         self.config = config
-        self._http_client = None
+        self._http_client = http_client
+        self._owns_http_client = http_client is None
+        self._jwks: Optional[JWKSCache] = None
+        self._jwks_lock = asyncio.Lock()
+        self._user_info_cache: "OrderedDict[str, Tuple[float, SSOUserInfo]]" = OrderedDict()
     
     @property
     def http_client(self) -> httpx.AsyncClient:
@@ -211,6 +319,171 @@ class SSOClient:
         claims = response.json()
         return self._normalize_user_info(claims)
     
+    async def _get_jwks(self) -> Optional[JWKSCache]:
+        """Return the JWKS cache, discovering the JWKS URL from the issuer if needed."""
+        if self._jwks is not None:
+            return self._jwks
+        
+        async with self._jwks_lock:
+            if self._jwks is not None:
+                return self._jwks
+            
+            jwks_url = self.config.jwks_url
+            if not jwks_url and self.config.issuer:
+                discovery_url = self.config.issuer.rstrip("/") + "/.well-known/openid-configuration"
+                try:
+                    response = await self.http_client.get(discovery_url)
+                    response.raise_for_status()
+                    jwks_url = response.json().get("jwks_uri")
+                except Exception as e:
+                    logger.warning(f"OIDC discovery failed for {discovery_url}: {e}")
+            
+            if not jwks_url:
+                return None
+            
+            self._jwks = JWKSCache(
+                jwks_url,
+                self.http_client,
+                ttl_seconds=self.config.jwks_cache_ttl_seconds,
+                min_refresh_interval_seconds=self.config.jwks_min_refresh_interval_seconds
+            )
+            return self._jwks
+    
+    async def validate_id_token(
+        self,
+        id_token: str,
+        nonce: Optional[str] = None,
+        access_token: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Verify an ID token's signature and claims locally against the JWKS.
+        
+        Checks signature, algorithm allow-list, ``aud`` (client id), ``iss``
+        (when configured), ``exp``/``iat``/``nbf`` with clock skew, ``nonce``
+        (when given) and ``at_hash`` (when an access token is given).
+        
+        Returns:
+            Verified claims
+        """
+        invalid = HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid SSO ID token"
+        )
+        
+        jwks = await self._get_jwks()
+        if jwks is None:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="SSO JWKS endpoint is not configured"
+            )
+        
+        try:
+            header = jwt.get_unverified_header(id_token)
+        except JWTError:
+            raise invalid
+        
+        algorithm = header.get("alg")
+        if algorithm not in self.config.id_token_algorithms:
+            logger.warning(f"Rejected ID token signed with disallowed algorithm {algorithm}")
+            raise invalid
+        
+        key = await jwks.get_key(header.get("kid"))
+        if key is None:
+            logger.warning(f"No signing key found for ID token kid {header.get('kid')}")
+            raise invalid
+        
+        try:
+            claims = jwt.decode(
+                id_token,
+                key,
+                algorithms=[algorithm],
+                audience=self.config.client_id,
+                issuer=self.config.issuer,
+                access_token=access_token,
+                options={"leeway": self.config.clock_skew_seconds, "verify_at_hash": access_token is not None}
+            )
+        except JWTError as e:
+            logger.warning(f"ID token validation failed: {e}")
+            raise invalid
+        
+        if nonce is not None and claims.get("nonce") != nonce:
+            logger.warning("ID token nonce mismatch")
+            raise invalid
+        
+        # Multiple audiences require the authorized party to be this client
+        audience = claims.get("aud")
+        if isinstance(audience, list) and len(audience) > 1 and claims.get("azp") != self.config.client_id:
+            raise invalid
+        
+        return claims
+    
+    async def get_user_info_from_tokens(
+        self,
+        token_response: Dict[str, Any],
+        nonce: Optional[str] = None
+    ) -> SSOUserInfo:
+        """
+        Resolve user info from a token response without a provider round trip.
+        
+        The ID token is validated locally and its claims normalized; the result
+        is cached per subject. Falls back to the userinfo endpoint when the
+        response has no ID token or no JWKS is configured.
+        """
+        id_token = token_response.get("id_token")
+        access_token = token_response.get("access_token")
+        
+        if id_token and await self._get_jwks() is not None:
+            claims = await self.validate_id_token(id_token, nonce=nonce, access_token=access_token)
+            user_info = self._normalize_user_info(claims)
+        else:
+            user_info = await self.get_user_info(access_token)
+        
+        self._cache_user_info(user_info)
+        return user_info
+    
+    def get_cached_user_info(self, sub: str) -> Optional[SSOUserInfo]:
+        """Return cached normalized user info for a subject, if still fresh."""
+        entry = self._user_info_cache.get(sub)
+        if entry is None:
+            return None
+        expires_at, user_info = entry
+        if time.monotonic() >= expires_at:
+            del self._user_info_cache[sub]
+            return None
+        self._user_info_cache.move_to_end(sub)
+        return user_info
+    
+    def _cache_user_info(self, user_info: SSOUserInfo):
+        if not user_info.sub:
+            return
+        self._user_info_cache[user_info.sub] = (
+            time.monotonic() + self.config.user_info_cache_ttl_seconds, user_info
+        )
+        self._user_info_cache.move_to_end(user_info.sub)
+        while len(self._user_info_cache) > self.config.user_info_cache_size:
+            self._user_info_cache.popitem(last=False)
+    
+    async def refresh_user_info(self, refresh_token: str) -> Tuple[Dict[str, Any], SSOUserInfo]:
+        """
+        Refresh tokens and resolve user info from the new ID token.
+        
+        Providers that omit the ID token on refresh are served from the
+        per-subject cache when possible, falling back to the userinfo endpoint.
+        """
+        tokens = await self.refresh_token(refresh_token)
+        if tokens.get("id_token"):
+            return tokens, await self.get_user_info_from_tokens(tokens)
+        
+        sub = None
+        try:
+            sub = jwt.get_unverified_claims(tokens.get("access_token", "")).get("sub")
+        except JWTError:
+            pass  # Opaque access token
+        cached = self.get_cached_user_info(sub) if sub else None
+        if cached is not None:
+            return tokens, cached
+        return tokens, await self.get_user_info_from_tokens(tokens)
+    
     def _normalize_user_info(self, claims: Dict[str, Any]) -> SSOUserInfo:
         """Normalize user info from different providers."""
         # Extract groups/roles based on provider
@@ -255,9 +528,10 @@ class SSOClient:
     
     async def close(self):
         """Close HTTP client."""
-        if self._http_client:
+        if self._http_client and self._owns_http_client:
             await self._http_client.aclose()
-            self._http_client = None
+        self._http_client = None
+        self._jwks = None
 
 
 def map_sso_role_to_user_role(sso_roles: List[str], sso_groups: List[str]) -> str:
@@ -0,0 +1,587 @@
+"""
+Chunked, resumable execution of integration sync jobs.
+
+A ``SyncJobRunner`` pages through an external system with an ``APIClient``
+and mirrors each page into ``external_records``:
+
+- Keyset endpoints (the default) are asked for records after the last
+  ``(updated_at, id)`` written, in that order, so records modified while
+  the job runs move ahead of the keyset instead of shifting others past
+  it. Cursor-token endpoints fetch the next page while the current one is
+  written. Every request still goes through the client's rate limiter,
+  retries and circuit breaker
+- Page-numbered endpoints are fetched several pages ahead, concurrently.
+  Offsets shift when remote records change mid-run, so these jobs always
+  sync everything rather than only changes since a watermark; a record
+  skipped by one run is picked up by the next
+- Each page is upserted with ``INSERT ... ON CONFLICT DO UPDATE`` (older
+  remote versions never overwrite newer ones) in the same transaction that
+  checkpoints the remote cursor and the entity's watermark on the
+  ``SyncJob`` row, so a resumed job continues after the last written page
+- Incremental runs ask the remote for records updated since the watermark
+  of the last completed job of the same integration
+- A job is claimed with a lease renewed at every checkpoint and by a
+  heartbeat while a page is in flight; jobs whose lease expired (the
+  worker died) can be claimed and resumed by another
+
+Per-entity throughput and lag (time since the newest record synced) are
+exported through the shared metrics registry.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, literal_column, or_, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm.attributes import flag_modified
+
+from app.config.settings import settings
+from app.models.ingest import ExternalRecord
+from app.models.integrations import JobStatus, SyncJob
+from app.utils.api_clients import APIClient, RequestStatus
+from app.utils.metrics import metrics_registry
+from app.utils.transformers import CompiledMapping
+
+logger = logging.getLogger(__name__)
+
+# Keys holding the records of a page, in lookup order
+PAGE_ITEM_KEYS = ("items", "data", "results", "records")
+
+
+class SyncError(Exception):
+    """Raised when a remote page cannot be fetched or understood."""
+
+
+def parse_remote_timestamp(value: Any) -> Optional[datetime]:
+    """Remote modification time as naive UTC, or None if unparseable."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, (int, float)):
+        return datetime.fromtimestamp(value / 1000 if value > 1e11 else value, tz=timezone.utc).replace(tzinfo=None)
+    if isinstance(value, datetime):
+        parsed = value
+    else:
+        try:
+            parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+class SyncPage:
+    """One fetched page of remote records."""
+
+    __slots__ = ("number", "records", "next_cursor", "has_more")
+
+    def __init__(self, number: int, records: List[Dict[str, Any]], next_cursor: Optional[str], has_more: Optional[bool]):
+        self.number = number
+        self.records = records
+        self.next_cursor = next_cursor
+        self.has_more = has_more
+
+
+class SyncJobRunner:
+    """
+    Run one sync job against one external system.
+
+    ``endpoints`` maps each entity type of the job to its list endpoint.
+    ``paging`` is ``"keyset"`` for endpoints that filter on
+    ``since_param``/``after_param`` and return records ordered by
+    ``(updated_field, id_field)``, ``"cursor"`` for endpoints returning a
+    ``next_cursor`` token, or ``"page"`` for page-number endpoints (fetched
+    concurrently, always a full sync).
+    """
+
+    def __init__(
+        self,
+        client: APIClient,
+        endpoints: Dict[str, str],
+        session_factory: Optional[Callable] = None,
+        paging: str = "keyset",
+        page_size: Optional[int] = None,
+        concurrency: Optional[int] = None,
+        id_field: str = "id",
+        updated_field: str = "updated_at",
+        plans: Optional[Dict[str, CompiledMapping]] = None,
+        page_param: str = "page",
+        size_param: str = "page_size",
+        cursor_param: str = "cursor",
+        since_param: str = "updated_since",
+        after_param: str = "after_id",
+        lease_seconds: Optional[float] = None
+    ):
+        if paging not in ("keyset", "page", "cursor"):
+            raise ValueError(f"Unsupported paging: {paging}")
+        self.client = client
+        self.endpoints = endpoints
+        self.session_factory = session_factory
+        self.paging = paging
+        self.page_size = page_size or settings.sync_page_size
+        self.concurrency = max(1, concurrency or settings.sync_concurrency)
+        self.id_field = id_field
+        self.updated_field = updated_field
+        self.plans = plans or {}
+        self.page_param = page_param
+        self.size_param = size_param
+        self.cursor_param = cursor_param
+        self.since_param = since_param
+        self.after_param = after_param
+        self.lease_seconds = lease_seconds or settings.sync_lease_seconds
+
+    def _sessions(self):
+        if self.session_factory is None:
+            from app.database.base import AsyncSessionLocal
+            self.session_factory = AsyncSessionLocal
+        return self.session_factory()
+
+    async def run(self, job_id: str) -> Dict[str, Any]:
+        """
+        Run or resume a job until every entity type is synced.
+
+        Returns the job summary. Raises ``SyncError`` if the job is leased
+        by another worker; failures mark the job failed but keep its
+        checkpoint, so running it again resumes it.
+        """
+        async with self._sessions() as db:
+            job = await self._claim(db, job_id)
+            if job is None:
+                raise SyncError(f"Sync job {job_id} is not runnable or is leased by another worker")
+
+            start = time.perf_counter()
+            processed_before = job.records_processed or 0
+            checkpoint = dict(job.checkpoint or {})
+            entity_types = list(job.entity_types or self.endpoints)
+            heartbeat = asyncio.create_task(self._renew_lease(job_id))
+
+            try:
+                for entity_type in entity_types:
+                    if entity_type in checkpoint.get("completed", []):
+                        continue
+                    if entity_type not in self.endpoints:
+                        raise SyncError(f"No endpoint configured for entity type {entity_type}")
+                    await self._sync_entity(db, job, entity_type)
+
+                job.complete_processing()
+                job.checkpointed_at = datetime.utcnow()
+                await db.commit()
+            except Exception as e:
+                await db.rollback()
+                await db.refresh(job)
+                job.mark_failed(str(e))
+                flag_modified(job, "error_summary")
+                await db.commit()
+                sync_jobs_total.inc(connector=job.connector_type, result="failed")
+                logger.error(f"Sync job {job_id} failed, resumable from its checkpoint: {e}")
+                raise
+            finally:
+                heartbeat.cancel()
+                await asyncio.gather(heartbeat, return_exceptions=True)
+
+            elapsed = time.perf_counter() - start
+            processed = (job.records_processed or 0) - processed_before
+            sync_jobs_total.inc(connector=job.connector_type, result="completed")
+            logger.info(
+                f"Sync job {job_id} completed: {processed} records in {elapsed:.1f}s "
+                f"({processed / elapsed if elapsed else 0:.0f}/s)"
+            )
+            return {
+                "job_id": job.id,
+                "status": job.status,
+                "records_processed": job.records_processed,
+                "records_created": job.records_created,
+                "records_updated": job.records_updated,
+                "records_failed": job.records_failed,
+                "checkpoint": job.checkpoint,
+                "duration_seconds": round(elapsed, 3),
+                "records_per_second": round(processed / elapsed, 1) if elapsed else None,
+            }
+
+    async def _claim(self, db, job_id: str) -> Optional[SyncJob]:
+        """Take the job's lease unless a live runner holds it."""
+        now = datetime.utcnow()
+        result = await db.execute(
+            update(SyncJob)
+            .where(
+                SyncJob.id == job_id,
+                or_(
+                    SyncJob.status.in_([JobStatus.PENDING, JobStatus.FAILED]),
+                    and_(
+                        SyncJob.status == JobStatus.RUNNING,
+                        or_(
+                            SyncJob.checkpointed_at.is_(None),
+                            SyncJob.checkpointed_at < now - timedelta(seconds=self.lease_seconds)
+                        )
+                    )
+                )
+            )
+            .values(status=JobStatus.RUNNING, checkpointed_at=now, last_error=None)
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+        if not result.rowcount:
+            return None
+
+        job = await db.get(SyncJob, job_id, populate_existing=True)
+        if job.started_at is None:
+            job.started_at = now
+            job.progress_percentage = 0
+        job.completed_at = None
+        await db.commit()
+        return job
+
+    async def _renew_lease(self, job_id: str):
+        """
+        Keep the job's lease alive while a page is fetched or written.
+
+        Checkpoints renew it too, but a single slow page (rate limiting,
+        retries, a large upsert) can outlast the lease; this renews it from
+        a separate session every third of the lease.
+        """
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                async with self._sessions() as db:
+                    await db.execute(
+                        update(SyncJob)
+                        .where(SyncJob.id == job_id, SyncJob.status == JobStatus.RUNNING)
+                        .values(checkpointed_at=datetime.utcnow())
+                        .execution_options(synchronize_session=False)
+                    )
+                    await db.commit()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Could not renew lease of sync job {job_id}: {e}")
+
+    async def _previous_watermark(self, db, job: SyncJob, entity_type: str) -> Optional[str]:
+        """Watermark of the last completed job of the same integration for ``entity_type``."""
+        result = await db.execute(
+            select(SyncJob.checkpoint)
+            .where(
+                SyncJob.integration_id == job.integration_id,
+                SyncJob.connector_type == job.connector_type,
+                SyncJob.status == JobStatus.COMPLETED,
+                SyncJob.id != job.id
+            )
+            .order_by(SyncJob.completed_at.desc())
+            .limit(20)
+        )
+        for checkpoint in result.scalars():
+            watermark = (checkpoint or {}).get("watermarks", {}).get(entity_type)
+            if watermark:
+                return watermark
+        return None
+
+    async def _sync_entity(self, db, job: SyncJob, entity_type: str):
+        checkpoint = dict(job.checkpoint or {})
+        since = dict(checkpoint.get("since", {}))
+        if entity_type not in since:
+            since[entity_type] = await self._previous_watermark(db, job, entity_type)
+            checkpoint["since"] = since
+            job.checkpoint = checkpoint
+            await db.commit()
+
+        resuming = checkpoint.get("entity_type") == entity_type
+        cursor = checkpoint.get("cursor") if resuming else None
+        if resuming and cursor is None:
+            # Checkpointed after the final page of this entity
+            return
+
+        params = {**(job.sync_filters or {}), self.size_param: self.page_size}
+
+        endpoint = self.endpoints[entity_type]
+        if self.paging == "keyset":
+            pages = self._keyset_pages(endpoint, params, cursor, since[entity_type])
+        elif self.paging == "page":
+            # No watermark: see the module docstring
+            pages = self._numbered_pages(endpoint, params, int(cursor or 1))
+        else:
+            if since[entity_type]:
+                params[self.since_param] = since[entity_type]
+            pages = self._cursor_pages(endpoint, params, cursor)
+
+        async for page, next_cursor in pages:
+            await self._write_page(db, job, entity_type, page, next_cursor)
+
+        checkpoint = dict(job.checkpoint)
+        checkpoint["completed"] = checkpoint.get("completed", []) + [entity_type]
+        checkpoint["entity_type"] = None
+        checkpoint["cursor"] = None
+        job.checkpoint = checkpoint
+        await db.commit()
+
+    async def _fetch(self, endpoint: str, params: Dict[str, Any], number: int) -> SyncPage:
+        fetch_start = time.perf_counter()
+        result = await self.client.get(endpoint, params=params)
+        sync_page_fetch_seconds.observe(time.perf_counter() - fetch_start, connector=self.client.config.name or "")
+
+        if result.status != RequestStatus.SUCCESS or result.response is None:
+            raise SyncError(f"GET {endpoint} page {number} failed: {result.error_message}")
+
+        body = result.response.json_data
+        if body is None:
+            raise SyncError(f"GET {endpoint} page {number} did not return JSON")
+        if isinstance(body, list):
+            return SyncPage(number, body, None, None)
+
+        records = next((body[key] for key in PAGE_ITEM_KEYS if isinstance(body.get(key), list)), None)
+        if records is None:
+            raise SyncError(f"GET {endpoint} page {number} has no record list")
+        next_cursor = body.get("next_cursor") or body.get("next")
+        return SyncPage(number, records, str(next_cursor) if next_cursor else None, body.get("has_more"))
+
+    async def _numbered_pages(self, endpoint: str, params: Dict[str, Any], first_page: int):
+        """
+        Yield ``(page, next cursor)`` in order, keeping ``concurrency`` pages in flight.
+
+        The end is a short page or ``has_more: false``; requests already in
+        flight past it are cancelled.
+        """
+        in_flight: Dict[int, asyncio.Task] = {}
+        next_to_request = first_page
+        current = first_page
+        try:
+            while True:
+                while len(in_flight) < self.concurrency:
+                    in_flight[next_to_request] = asyncio.create_task(
+                        self._fetch(endpoint, {**params, self.page_param: next_to_request}, next_to_request)
+                    )
+                    next_to_request += 1
+
+                page = await in_flight.pop(current)
+                last = len(page.records) < self.page_size or page.has_more is False
+                current += 1
+                yield page, None if last else str(current)
+                if last:
+                    return
+        finally:
+            for task in in_flight.values():
+                task.cancel()
+            if in_flight:
+                await asyncio.gather(*in_flight.values(), return_exceptions=True)
+
+    async def _keyset_pages(self, endpoint: str, params: Dict[str, Any], cursor: Optional[str], since: Optional[str]):
+        """
+        Yield ``(page, next cursor)`` after the last ``(updated_at, id)`` seen.
+
+        The request carries the boundary timestamp in ``since_param`` and the
+        last id in ``after_param``. Remotes that treat ``since_param`` as
+        inclusive or ignore ``after_param`` resend records at the boundary
+        timestamp; those already written (tracked by id in the cursor) are
+        dropped. The cursor is JSON: ``{"since": ..., "ids": [...]}``.
+        """
+        state = json.loads(cursor) if cursor else {"since": since, "ids": []}
+        number = 1
+        while True:
+            page_params = dict(params)
+            if state["since"]:
+                page_params[self.since_param] = state["since"]
+            if state["ids"]:
+                page_params[self.after_param] = state["ids"][-1]
+            page = await self._fetch(endpoint, page_params, number)
+
+            boundary = parse_remote_timestamp(state["since"])
+            seen = set(state["ids"])
+            fresh = []
+            for record in page.records:
+                updated_at = parse_remote_timestamp(record.get(self.updated_field)) if isinstance(record, dict) else None
+                external_id = str(record.get(self.id_field)) if isinstance(record, dict) else None
+                if boundary is not None and updated_at is not None:
+                    if updated_at < boundary or (updated_at == boundary and external_id in seen):
+                        continue
+                fresh.append(record)
+                if updated_at is not None:
+                    if boundary is None or updated_at > boundary:
+                        boundary, seen = updated_at, set()
+                        state = {"since": updated_at.isoformat(), "ids": []}
+                    if updated_at == boundary and external_id not in seen:
+                        seen.add(external_id)
+                        state["ids"].append(external_id)
+
+            last = len(page.records) < self.page_size or page.has_more is False
+            if not last and not fresh:
+                raise SyncError(
+                    f"GET {endpoint} returned a full page with nothing after {state['since']}; "
+                    f"the remote must order by {self.updated_field}, {self.id_field} and honour {self.after_param}"
+                )
+            page.records = fresh
+            yield page, None if last else json.dumps(state)
+            if last:
+                return
+            number += 1
+
+    async def _cursor_pages(self, endpoint: str, params: Dict[str, Any], cursor: Optional[str]):
+        """Yield ``(page, next cursor)``, fetching the next page while the caller writes this one."""
+        number = 1
+
+        def request(page_cursor):
+            page_params = dict(params)
+            if page_cursor:
+                page_params[self.cursor_param] = page_cursor
+            return asyncio.create_task(self._fetch(endpoint, page_params, number))
+
+        pending = request(cursor)
+        try:
+            while True:
+                page = await pending
+                pending = None
+                if page.next_cursor and page.records and page.has_more is not False:
+                    number += 1
+                    pending = request(page.next_cursor)
+                    yield page, page.next_cursor
+                else:
+                    yield page, None
+                    return
+        finally:
+            if pending is not None:
+                pending.cancel()
+                await asyncio.gather(pending, return_exceptions=True)
+
+    async def _write_page(self, db, job: SyncJob, entity_type: str, page: SyncPage, next_cursor: Optional[str]):
+        """Upsert one page and checkpoint the job in a single transaction."""
+        plan = self.plans.get(entity_type)
+        rows: Dict[str, Dict[str, Any]] = {}
+        failed = 0
+        watermark = None
+
+        for record in page.records:
+            external_id = record.get(self.id_field) if isinstance(record, dict) else None
+            if external_id is None:
+                failed += 1
+                continue
+            payload = record
+            if plan is not None:
+                result = plan.transform(record)
+                if not result.success:
+                    failed += 1
+                    continue
+                payload = result.transformed_data
+
+            updated_at = parse_remote_timestamp(record.get(self.updated_field))
+            if updated_at is not None and (watermark is None or updated_at > watermark):
+                watermark = updated_at
+
+            external_id = str(external_id)
+            previous = rows.get(external_id)
+            # Last version of a record repeated within the page wins
+            if previous is None or (updated_at or datetime.min) >= (previous["remote_updated_at"] or datetime.min):
+                rows[external_id] = {
+                    "integration_id": job.integration_id or "",
+                    "entity_type": entity_type,
+                    "external_id": external_id,
+                    "payload": payload,
+                    "remote_updated_at": updated_at,
+                    "sync_job_id": job.id,
+                }
+
+        created = updated = 0
+        values = list(rows.values())
+        batch_rows = settings.sync_upsert_batch_rows
+        for offset in range(0, len(values), batch_rows):
+            inserted = await self._upsert(db, values[offset:offset + batch_rows])
+            created += sum(1 for flag in inserted if flag)
+            updated += sum(1 for flag in inserted if not flag)
+        unchanged = len(page.records) - failed - created - updated
+
+        checkpoint = dict(job.checkpoint or {})
+        watermarks = dict(checkpoint.get("watermarks", {}))
+        previous_watermark = parse_remote_timestamp(watermarks.get(entity_type))
+        if watermark is not None and (previous_watermark is None or watermark > previous_watermark):
+            watermarks[entity_type] = watermark.isoformat()
+        checkpoint.update({
+            "entity_type": entity_type,
+            "cursor": next_cursor,
+            "watermarks": watermarks,
+            "pages": checkpoint.get("pages", 0) + 1,
+        })
+        job.checkpoint = checkpoint
+        job.checkpointed_at = datetime.utcnow()
+        job.update_progress(
+            (job.records_processed or 0) + len(page.records),
+            (job.records_created or 0) + created,
+            (job.records_updated or 0) + updated,
+            (job.records_failed or 0) + failed
+        )
+        await db.commit()
+
+        labels = {"connector": job.connector_type, "entity": entity_type}
+        sync_pages_total.inc(**labels)
+        for outcome, count in (("created", created), ("updated", updated), ("unchanged", unchanged), ("failed", failed)):
+            if count:
+                sync_records_total.inc(count, result=outcome, **labels)
+        if job.started_at is not None:
+            elapsed = (job.checkpointed_at - job.started_at).total_seconds()
+            if elapsed > 0:
+                sync_throughput.set(job.records_processed / elapsed, **labels)
+        newest = parse_remote_timestamp(watermarks.get(entity_type))
+        if newest is not None:
+            sync_lag_seconds.set(max((datetime.utcnow() - newest).total_seconds(), 0.0), **labels)
+
+    async def _upsert(self, db, rows: List[Dict[str, Any]]) -> List[bool]:
+        """Upsert rows; returns one flag per written row, True if it was inserted."""
+        if not rows:
+            return []
+        statement = pg_insert(ExternalRecord).values(rows)
+        excluded = statement.excluded
+        statement = statement.on_conflict_do_update(
+            index_elements=[ExternalRecord.integration_id, ExternalRecord.entity_type, ExternalRecord.external_id],
+            set_={
+                "payload": excluded.payload,
+                "remote_updated_at": excluded.remote_updated_at,
+                "sync_job_id": excluded.sync_job_id,
+                "synced_at": literal_column("now()"),
+            },
+            # Never replace a newer remote version with an older one
+            where=or_(
+                ExternalRecord.remote_updated_at.is_(None),
+                excluded.remote_updated_at.is_(None),
+                excluded.remote_updated_at >= ExternalRecord.remote_updated_at
+            )
+        ).returning(literal_column("xmax = 0"))
+        result = await db.execute(statement)
+        return [row[0] for row in result]
+
+
+async def find_interrupted_jobs(db, lease_seconds: Optional[float] = None) -> List[str]:
+    """Ids of running integration jobs whose runner stopped renewing its lease."""
+    lease_seconds = lease_seconds or settings.sync_lease_seconds
+    result = await db.execute(
+        select(SyncJob.id).where(
+            SyncJob.status == JobStatus.RUNNING,
+            # Ingress imports (no integration) are not run by SyncJobRunner
+            SyncJob.integration_id.is_not(None),
+            or_(
+                SyncJob.checkpointed_at.is_(None),
+                SyncJob.checkpointed_at < datetime.utcnow() - timedelta(seconds=lease_seconds)
+            )
+        )
+    )
+    return list(result.scalars())
+
+
+sync_jobs_total = metrics_registry.counter(
+    "sync_jobs_total", "Sync job runs by outcome", ("connector", "result")
+)
+sync_pages_total = metrics_registry.counter(
+    "sync_pages_total", "Remote pages written by sync jobs", ("connector", "entity")
+)
+sync_records_total = metrics_registry.counter(
+    "sync_records_total", "Remote records handled by sync jobs", ("connector", "entity", "result")
+)
+sync_page_fetch_seconds = metrics_registry.histogram(
+    "sync_page_fetch_seconds", "Time to fetch one remote page, including rate-limit waits", ("connector",)
+)
+sync_throughput = metrics_registry.gauge(
+    "sync_throughput_records_per_second", "Records per second of the latest sync job run",
+    ("connector", "entity"), multiprocess_mode="max"
+)
+sync_lag_seconds = metrics_registry.gauge(
+    "sync_lag_seconds", "Age of the newest remote record synced", ("connector", "entity"),
+    multiprocess_mode="min"
+)
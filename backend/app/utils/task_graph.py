@@ -0,0 +1,324 @@
+"""
+Task dependency graph: edges in ``task_edges``, analysis in memory.
+
+- ``load_task_graph`` reads a case's tasks plus every prerequisite they
+  reach (prerequisites may belong to other cases) with one recursive CTE
+- ``TaskGraph`` does cycle detection, topological order, the critical path
+  (remaining hours from ``estimate_task_duration``) and keeps the set of
+  ready tasks (not done, all prerequisites done) up to date as tasks
+  complete or reopen
+- ``set_task_dependencies`` replaces a task's prerequisites, rejecting any
+  change that would close a cycle. Dependency writes are serialized with a
+  transaction-level advisory lock, so two concurrent edits cannot each add
+  half of a cycle
+- ``ready_dependents`` returns the tasks a completion unblocks, reading
+  only that task's dependents
+"""
+
+import logging
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from uuid import UUID
+
+from sqlalchemy import delete, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.task import TaskEdge, TaskStatus
+from app.utils.tasks import estimate_task_duration
+
+logger = logging.getLogger(__name__)
+
+# Serializes dependency writes (any key shared by all writers works)
+_EDGE_LOCK_KEY = 0x7461736B
+
+_GRAPH_SQL = """
+    WITH RECURSIVE reach(id) AS (
+        SELECT id FROM tasks WHERE {roots}
+        UNION
+        SELECT e.depends_on_id FROM task_edges e JOIN reach r ON e.task_id = r.id
+    )
+    SELECT t.id, t.status, t.task_template_id, e.depends_on_id
+    FROM reach r
+    JOIN tasks t ON t.id = r.id
+    LEFT JOIN task_edges e ON e.task_id = t.id
+"""
+_CASE_GRAPH_SQL = text(_GRAPH_SQL.format(roots="case_id = :case_id"))
+_TASKS_GRAPH_SQL = text(_GRAPH_SQL.format(roots="id = ANY(CAST(:task_ids AS UUID[]))"))
+
+_READY_DEPENDENTS_SQL = text("""
+    SELECT d.task_id, t.assigned_to
+    FROM task_edges d
+    JOIN tasks t ON t.id = d.task_id
+    WHERE d.depends_on_id = :task_id
+      AND t.status <> 'DONE'
+      AND NOT EXISTS (
+          SELECT 1 FROM task_edges p JOIN tasks pt ON pt.id = p.depends_on_id
+          WHERE p.task_id = d.task_id AND pt.status <> 'DONE'
+      )
+""")
+
+
+class TaskGraphError(ValueError):
+    """A dependency change that cannot be applied."""
+
+
+class DependencyCycleError(TaskGraphError):
+    def __init__(self, cycle: List[str]):
+        self.cycle = cycle
+        super().__init__("Circular dependency: " + " -> ".join(cycle))
+
+
+class TaskGraph:
+    """
+    Tasks and their prerequisites, keyed by task id string.
+
+    ``depends_on[t]`` holds t's prerequisites and ``dependents[t]`` the
+    reverse. ``ready`` is maintained incrementally by ``complete``,
+    ``reopen`` and ``set_dependencies``.
+    """
+
+    def __init__(self):
+        self.durations: Dict[str, float] = {}
+        self.done: Set[str] = set()
+        self.depends_on: Dict[str, Set[str]] = {}
+        self.dependents: Dict[str, Set[str]] = {}
+        self.ready: Set[str] = set()
+        self._unfinished: Dict[str, int] = {}  # Prerequisites not done yet
+
+    def __contains__(self, task_id) -> bool:
+        return str(task_id) in self.depends_on
+
+    def __len__(self) -> int:
+        return len(self.depends_on)
+
+    def add_task(self, task_id, duration_hours: float = 0.0, done: bool = False):
+        task_id = str(task_id)
+        if task_id in self.depends_on:
+            return
+        self.durations[task_id] = float(duration_hours)
+        self.depends_on[task_id] = set()
+        self.dependents[task_id] = set()
+        self._unfinished[task_id] = 0
+        if done:
+            self.done.add(task_id)
+        else:
+            self.ready.add(task_id)
+
+    def add_edge(self, task_id, depends_on_id):
+        """Add a stored edge as is; use ``set_dependencies`` for checked changes."""
+        task_id, depends_on_id = str(task_id), str(depends_on_id)
+        if depends_on_id in self.depends_on[task_id]:
+            return
+        self.depends_on[task_id].add(depends_on_id)
+        self.dependents[depends_on_id].add(task_id)
+        if depends_on_id not in self.done:
+            self._unfinished[task_id] += 1
+            self.ready.discard(task_id)
+
+    def remove_edge(self, task_id, depends_on_id):
+        task_id, depends_on_id = str(task_id), str(depends_on_id)
+        if depends_on_id not in self.depends_on[task_id]:
+            return
+        self.depends_on[task_id].discard(depends_on_id)
+        self.dependents[depends_on_id].discard(task_id)
+        if depends_on_id not in self.done:
+            self._unfinished[task_id] -= 1
+            self._update_ready(task_id)
+
+    def set_dependencies(self, task_id, depends_on_ids: Iterable):
+        """Replace a task's prerequisites; raises before changing anything."""
+        task_id = str(task_id)
+        wanted = {str(depends_on_id) for depends_on_id in depends_on_ids}
+        if task_id not in self.depends_on:
+            raise TaskGraphError(f"Task {task_id} not found")
+        if task_id in wanted:
+            raise TaskGraphError("Task cannot depend on itself")
+        for depends_on_id in sorted(wanted):
+            if depends_on_id not in self.depends_on:
+                raise TaskGraphError(f"Dependency task {depends_on_id} not found")
+        for depends_on_id in sorted(wanted - self.depends_on[task_id]):
+            # The new edge closes a cycle if the prerequisite already waits on the task
+            path = self.find_path(depends_on_id, task_id)
+            if path is not None:
+                raise DependencyCycleError([task_id] + path)
+
+        for depends_on_id in self.depends_on[task_id] - wanted:
+            self.remove_edge(task_id, depends_on_id)
+        for depends_on_id in wanted:
+            self.add_edge(task_id, depends_on_id)
+
+    def complete(self, task_id) -> List[str]:
+        """Mark a task done; returns the tasks that became ready."""
+        task_id = str(task_id)
+        if task_id in self.done:
+            return []
+        self.done.add(task_id)
+        self.ready.discard(task_id)
+        unblocked = []
+        for dependent in self.dependents[task_id]:
+            self._unfinished[dependent] -= 1
+            if self._unfinished[dependent] == 0 and dependent not in self.done:
+                self.ready.add(dependent)
+                unblocked.append(dependent)
+        return unblocked
+
+    def reopen(self, task_id):
+        task_id = str(task_id)
+        if task_id not in self.done:
+            return
+        self.done.discard(task_id)
+        self._update_ready(task_id)
+        for dependent in self.dependents[task_id]:
+            self._unfinished[dependent] += 1
+            self.ready.discard(dependent)
+
+    def find_path(self, source, target) -> Optional[List[str]]:
+        """Prerequisite chain from ``source`` down to ``target``, if any."""
+        source, target = str(source), str(target)
+        parents: Dict[str, Optional[str]] = {source: None}
+        queue = deque([source])
+        while queue:
+            node = queue.popleft()
+            if node == target:
+                path = []
+                while node is not None:
+                    path.append(node)
+                    node = parents[node]
+                return path[::-1]
+            for prerequisite in self.depends_on.get(node, ()):
+                if prerequisite not in parents:
+                    parents[prerequisite] = node
+                    queue.append(prerequisite)
+        return None
+
+    def find_cycle(self) -> Optional[List[str]]:
+        """One cycle as [a, b, ..., a], or None if the graph is a DAG."""
+        state: Dict[str, int] = {}  # 1 = on the current path, 2 = finished
+        for start in self.depends_on:
+            if start in state:
+                continue
+            path = [start]
+            iterators = [iter(self.depends_on[start])]
+            state[start] = 1
+            while iterators:
+                node = next(iterators[-1], None)
+                if node is None:
+                    state[path.pop()] = 2
+                    iterators.pop()
+                elif state.get(node) == 1:
+                    return path[path.index(node):] + [node]
+                elif node not in state:
+                    state[node] = 1
+                    path.append(node)
+                    iterators.append(iter(self.depends_on[node]))
+        return None
+
+    def topological_order(self) -> List[str]:
+        """Tasks with every prerequisite before its dependents."""
+        remaining = {task_id: len(prerequisites) for task_id, prerequisites in self.depends_on.items()}
+        queue = deque(task_id for task_id, count in remaining.items() if count == 0)
+        order = []
+        while queue:
+            task_id = queue.popleft()
+            order.append(task_id)
+            for dependent in self.dependents[task_id]:
+                remaining[dependent] -= 1
+                if remaining[dependent] == 0:
+                    queue.append(dependent)
+        if len(order) != len(self.depends_on):
+            raise DependencyCycleError(self.find_cycle() or [])
+        return order
+
+    def critical_path(self) -> Tuple[List[str], float]:
+        """Longest chain of remaining work and its length in hours (done tasks count as 0)."""
+        finish: Dict[str, float] = {}
+        previous: Dict[str, Optional[str]] = {}
+        for task_id in self.topological_order():
+            start, before = 0.0, None
+            for prerequisite in self.depends_on[task_id]:
+                if finish[prerequisite] > start:
+                    start, before = finish[prerequisite], prerequisite
+            own = 0.0 if task_id in self.done else self.durations[task_id]
+            finish[task_id] = start + own
+            previous[task_id] = before
+        if not finish:
+            return [], 0.0
+
+        node = max(finish, key=finish.get)
+        total = finish[node]
+        path = []
+        while node is not None:
+            path.append(node)
+            node = previous[node]
+        return path[::-1], total
+
+    def _update_ready(self, task_id: str):
+        if task_id not in self.done and self._unfinished[task_id] == 0:
+            self.ready.add(task_id)
+        else:
+            self.ready.discard(task_id)
+
+
+def _build_graph(rows) -> TaskGraph:
+    graph = TaskGraph()
+    edges = []
+    for row in rows:
+        graph.add_task(
+            row.id,
+            estimate_task_duration(row.task_template_id or ""),
+            done=row.status == TaskStatus.DONE.value
+        )
+        if row.depends_on_id is not None:
+            edges.append((row.id, row.depends_on_id))
+    for task_id, depends_on_id in edges:
+        graph.add_edge(task_id, depends_on_id)
+    return graph
+
+
+async def load_task_graph(
+    db: AsyncSession,
+    case_id: Optional[UUID] = None,
+    task_ids: Optional[Iterable] = None
+) -> TaskGraph:
+    """The tasks of a case (or the given tasks) and all their prerequisites, in one query"""
+    if case_id is not None:
+        result = await db.execute(_CASE_GRAPH_SQL, {"case_id": case_id})
+    else:
+        result = await db.execute(_TASKS_GRAPH_SQL, {"task_ids": [UUID(str(task_id)) for task_id in task_ids or ()]})
+    return _build_graph(result.all())
+
+
+async def set_task_dependencies(db: AsyncSession, task_id: UUID, depends_on_ids: Iterable[UUID]) -> TaskGraph:
+    """
+    Replace a task's prerequisites in the caller's transaction.
+
+    Raises ``TaskGraphError`` (``DependencyCycleError`` for cycles) without
+    writing anything. Returns the graph around the task after the change.
+    """
+    wanted = list(dict.fromkeys(UUID(str(depends_on_id)) for depends_on_id in depends_on_ids))
+    await db.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": _EDGE_LOCK_KEY})
+
+    # The task's current prerequisites and everything the new ones wait on
+    graph = await load_task_graph(db, task_ids=[task_id, *wanted])
+    previous = set(graph.depends_on.get(str(task_id), ()))
+    graph.set_dependencies(task_id, wanted)
+
+    removed = [UUID(depends_on_id) for depends_on_id in previous - graph.depends_on[str(task_id)]]
+    if removed:
+        await db.execute(
+            delete(TaskEdge).where(TaskEdge.task_id == task_id, TaskEdge.depends_on_id.in_(removed))
+        )
+    if wanted:
+        await db.execute(
+            pg_insert(TaskEdge)
+            .values([{"task_id": task_id, "depends_on_id": depends_on_id} for depends_on_id in wanted])
+            .on_conflict_do_nothing()
+        )
+    return graph
+
+
+async def ready_dependents(db: AsyncSession, task_id: UUID) -> List[Tuple[UUID, Optional[UUID]]]:
+    """(task id, assignee) of dependents whose prerequisites are now all done"""
+    result = await db.execute(_READY_DEPENDENTS_SQL, {"task_id": task_id})
+    return [(row.task_id, row.assigned_to) for row in result]
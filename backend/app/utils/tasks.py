@@ -1,14 +1,20 @@
+import heapq
+import time
 import uuid
-from typing import Dict, Any, List, Optional, Tuple
-from datetime import datetime, timedelta
+from typing import Dict, Any, Iterable, List, Optional, Set, Tuple
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import and_, case, func, literal, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 import json
 import logging
 
-from app.models.task import Task
+from app.config.settings import settings
+from app.models.task import Task, TaskStatus as ModelTaskStatus
 from app.models.case import Case
 from app.models.user import User
 from app.schemas.tasks import TaskType, TaskPriority, TaskStatus, SLAStatus
+from app.utils.notification_stream import publish_user_events
 
 logger = logging.getLogger(__name__)
 
@@ -100,6 +106,44 @@ ROLE_TASK_ASSIGNMENT = {
     "quality_assurance": ["supervisor", "admin"]
 }
 
+# Statuses that count towards a user's workload
+ACTIVE_TASK_STATUSES = [ModelTaskStatus.OPEN, ModelTaskStatus.IN_PROGRESS, ModelTaskStatus.BLOCKED]
+
+# Base effort in hours by task type (a template id naming one), see estimate_task_duration
+TASK_BASE_DURATIONS = {
+    "investigation": 24,
+    "forensic_analysis": 48,
+    "evidence_collection": 8,
+    "interview": 4,
+    "documentation": 6,
+    "legal_review": 12,
+    "court_preparation": 16,
+    "follow_up": 2,
+    "administrative": 3,
+    "quality_assurance": 4
+}
+
+# Workload weight of an hour of work by Task.priority (1-5, 5 is critical)
+PRIORITY_WORKLOAD_MULTIPLIERS = {1: 0.8, 2: 0.8, 3: 1.0, 4: 1.3, 5: 2.0}
+
+# API task statuses and priorities as stored on Task
+MODEL_TASK_STATUSES = {
+    TaskStatus.PENDING: ModelTaskStatus.OPEN,
+    TaskStatus.ASSIGNED: ModelTaskStatus.OPEN,
+    TaskStatus.ESCALATED: ModelTaskStatus.OPEN,
+    TaskStatus.IN_PROGRESS: ModelTaskStatus.IN_PROGRESS,
+    TaskStatus.ON_HOLD: ModelTaskStatus.BLOCKED,
+    TaskStatus.COMPLETED: ModelTaskStatus.DONE,
+    TaskStatus.CANCELLED: ModelTaskStatus.DONE
+}
+MODEL_TASK_PRIORITIES = {
+    TaskPriority.LOW: 1,
+    TaskPriority.MEDIUM: 3,
+    TaskPriority.HIGH: 4,
+    TaskPriority.URGENT: 5,
+    TaskPriority.CRITICAL: 5
+}
+
 # Workflow templates configuration
 WORKFLOW_TEMPLATES = {
     "standard_investigation": {
@@ -162,167 +206,275 @@ def get_sla_status(task: Task) -> SLAStatus:
     else:
         return SLAStatus.WITHIN_SLA
 
-def check_sla_violations(db: Session, days_back: int = 1) -> List[Dict[str, Any]]:
-    """Check for SLA violations in the past N days"""
-    
-    cutoff_date = datetime.utcnow() - timedelta(days=days_back)
-    
-    # Query overdue tasks
-    overdue_tasks = db.query(Task).filter(
-        Task.due_date < datetime.utcnow(),
-        Task.status != "completed",
-        Task.created_at >= cutoff_date
-    ).all()
+async def check_sla_violations(db: AsyncSession, days_back: int = 1) -> List[Dict[str, Any]]:
+    """Open tasks whose SLA breach was recorded in the past N days"""
+    
+    now = datetime.now(timezone.utc)
+    cutoff_date = now - timedelta(days=days_back)
+    
+    # Range scan of ix_tasks_sla_breached_at; the sweeper sets the column
+    result = await db.execute(
+        select(
+            Task.id, Task.case_id, Task.title, Task.assigned_to, Task.priority,
+            Task.sla_deadline, Task.sla_breached_at, Task.escalation_level
+        ).where(
+            Task.sla_breached_at >= cutoff_date,
+            Task.status != ModelTaskStatus.DONE
+        ).order_by(Task.sla_deadline)
+    )
     
     violations = []
-    for task in overdue_tasks:
-        hours_overdue = (datetime.utcnow() - task.due_date).total_seconds() / 3600
+    for task in result:
+        hours_overdue = (now - task.sla_deadline).total_seconds() / 3600
         violations.append({
-            "task_id": task.id,
-            "case_id": task.case_id,
+            "task_id": str(task.id),
+            "case_id": str(task.case_id),
             "title": task.title,
-            "assigned_to": task.assigned_to,
+            "assigned_to": str(task.assigned_to) if task.assigned_to else None,
             "hours_overdue": round(hours_overdue, 1),
             "priority": task.priority,
-            "task_type": task.task_type,
-            "due_date": task.due_date
+            "sla_deadline": task.sla_deadline,
+            "breached_at": task.sla_breached_at,
+            "escalation_level": task.escalation_level
         })
     
     logger.info(f"Found {len(violations)} SLA violations in the past {days_back} days")
     return violations
 
-def assign_task_automatically(task_id: str, task_type: str, case_priority: str, db: Session) -> Optional[str]:
-    """Automatically assign a task to the most suitable user"""
+def task_workload(task_template_id: Optional[str], priority: Optional[int]) -> float:
+    """Workload one active task adds to its assignee's score"""
+    hours = estimate_task_duration(task_template_id)
+    return 10 + hours * PRIORITY_WORKLOAD_MULTIPLIERS.get(priority, 1.0) / 8
+
+def _task_workload_expression():
+    """SQL form of ``task_workload`` for one joined task row"""
+    hours = case(TASK_BASE_DURATIONS, value=Task.task_template_id, else_=8)
+    multiplier = case(PRIORITY_WORKLOAD_MULTIPLIERS, value=Task.priority, else_=1.0)
+    return literal(10) + hours * multiplier / 8
+
+def _role_value(role) -> str:
+    return getattr(role, "value", role).upper()
+
+async def load_workload_scores(
+    db: AsyncSession,
+    roles: Optional[Iterable[str]] = None,
+    user_ids: Optional[Iterable[str]] = None
+) -> List[Tuple[str, str, float]]:
+    """(user id, role, workload score) of active users, from one grouped aggregate"""
+    query = (
+        select(
+            User.id,
+            User.role,
+            func.coalesce(func.sum(_task_workload_expression()), 0).label("score")
+        )
+        .select_from(User)
+        .outerjoin(Task, and_(
+            Task.assigned_to == User.id,
+            Task.status.in_(ACTIVE_TASK_STATUSES)
+        ))
+        .where(User.is_active == True)
+        .group_by(User.id, User.role)
+    )
+    if roles is not None:
+        query = query.where(User.role.in_([_role_value(role) for role in roles]))
+    if user_ids is not None:
+        query = query.where(User.id.in_(list(user_ids)))
+
+    result = await db.execute(query)
+    return [(str(row.id), _role_value(row.role), float(row.score)) for row in result]
+
+class WorkloadScoreCache:
+    """
+    Per-worker workload scores of active users, grouped by role.
+    
+    A role's pool is loaded with one grouped aggregate and reloaded after
+    ``task_workload_cache_ttl_seconds``, which bounds staleness from changes
+    made in other workers. Users whose tasks changed here are invalidated and
+    reloaded together on the next lookup. Each role keeps a min-heap, so
+    picking the least loaded user does not scan the pool.
+    
+    Not thread-safe: use it from the event loop thread.
+    """
+    
+    def __init__(self, ttl_seconds: Optional[float] = None):
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.task_workload_cache_ttl_seconds
+        self._scores: Dict[str, float] = {}
+        self._user_roles: Dict[str, str] = {}
+        self._heaps: Dict[str, List[Tuple[float, str]]] = {}
+        self._loaded_at: Dict[str, float] = {}
+        self._stale: Set[str] = set()
+    
+    def invalidate(self, user_ids: Iterable[Optional[str]]):
+        """Reload these users' scores on their next lookup"""
+        for user_id in user_ids:
+            if user_id:
+                self._stale.add(str(user_id))
+    
+    def clear(self):
+        self._scores.clear()
+        self._user_roles.clear()
+        self._heaps.clear()
+        self._loaded_at.clear()
+        self._stale.clear()
+    
+    def add(self, user_id: str, delta: float):
+        """Apply a known change to a cached score without reloading it"""
+        user_id = str(user_id)
+        if user_id in self._scores and user_id not in self._stale:
+            self._store(user_id, self._user_roles[user_id], self._scores[user_id] + delta)
+    
+    async def score(self, db: AsyncSession, user_id: str) -> float:
+        user_id = str(user_id)
+        role = self._user_roles.get(user_id)
+        if role is None or user_id in self._stale or self._expired(role):
+            self._stale.add(user_id)
+            await self._reload_stale(db)
+        return self._scores.get(user_id, 0.0)
+    
+    async def least_loaded(self, db: AsyncSession, roles: Iterable[str]) -> Optional[str]:
+        """Active user with the lowest workload among ``roles``"""
+        roles = [_role_value(role) for role in roles]
+        expired = [role for role in roles if self._expired(role)]
+        if expired:
+            await self._load_roles(db, expired)
+        if self._stale:
+            await self._reload_stale(db)
+        
+        best = None
+        for role in roles:
+            heap = self._heaps.get(role)
+            # Entries superseded by a newer score are dropped lazily
+            while heap and not self._current(heap[0], role):
+                heapq.heappop(heap)
+            if heap and (best is None or heap[0] < best):
+                best = heap[0]
+        return best[1] if best else None
+    
+    def _expired(self, role: str) -> bool:
+        loaded_at = self._loaded_at.get(role)
+        return loaded_at is None or time.monotonic() - loaded_at >= self.ttl_seconds
+    
+    def _current(self, entry: Tuple[float, str], role: str) -> bool:
+        score, user_id = entry
+        return self._scores.get(user_id) == score and self._user_roles.get(user_id) == role
+    
+    def _store(self, user_id: str, role: str, score: float):
+        self._scores[user_id] = score
+        self._user_roles[user_id] = role
+        heap = self._heaps.setdefault(role, [])
+        heapq.heappush(heap, (score, user_id))
+        if len(heap) > 4 * len(self._scores) + 64:
+            self._heaps[role] = [entry for entry in heap if self._current(entry, role)]
+            heapq.heapify(self._heaps[role])
+    
+    def _forget(self, user_id: str):
+        self._scores.pop(user_id, None)
+        self._user_roles.pop(user_id, None)
+    
+    async def _load_roles(self, db: AsyncSession, roles: List[str]):
+        rows = await load_workload_scores(db, roles=roles)
+        now = time.monotonic()
+        for role in roles:
+            for user_id in [u for u, r in self._user_roles.items() if r == role]:
+                self._forget(user_id)
+            self._heaps[role] = []
+            self._loaded_at[role] = now
+        for user_id, role, score in rows:
+            self._stale.discard(user_id)
+            self._store(user_id, role, score)
+    
+    async def _reload_stale(self, db: AsyncSession):
+        user_ids = list(self._stale)
+        rows = await load_workload_scores(db, user_ids=user_ids)
+        self._stale.difference_update(user_ids)
+        for user_id in user_ids:
+            self._forget(user_id)
+        for user_id, role, score in rows:
+            self._store(user_id, role, score)
+
+# Per-worker workload scores used for automatic assignment
+workload_cache = WorkloadScoreCache()
+
+async def assign_task_automatically(
+    task_id: str,
+    task_type: str,
+    case_priority: str,
+    db: Optional[AsyncSession] = None
+) -> Optional[str]:
+    """Automatically assign a task to the least loaded eligible user"""
+    
+    # Get eligible roles for this task type
+    eligible_roles = ROLE_TASK_ASSIGNMENT.get(task_type, [])
+    if not eligible_roles:
+        logger.warning(f"No eligible roles found for task type: {task_type}")
+        return None
+    
+    if db is None:
+        # Runs as a background task, after the request's session is closed
+        from app.database.base import AsyncSessionLocal
+        async with AsyncSessionLocal() as session:
+            return await assign_task_automatically(task_id, task_type, case_priority, session)
     
     try:
-        # Get eligible roles for this task type
-        eligible_roles = ROLE_TASK_ASSIGNMENT.get(task_type, [])
-        if not eligible_roles:
-            logger.warning(f"No eligible roles found for task type: {task_type}")
+        assigned_user_id = await workload_cache.least_loaded(db, eligible_roles)
+        if not assigned_user_id:
+            logger.warning(f"No active users found for roles: {eligible_roles}")
             return None
         
-        # Query users with eligible roles, prioritizing by availability and workload
-        users = db.query(User).filter(
-            User.role.in_(eligible_roles),
-            User.is_active == True
-        ).all()
-        
-        if not users:
-            logger.warning(f"No active users found for roles: {eligible_roles}")
+        result = await db.execute(
+            update(Task)
+            .where(Task.id == task_id)
+            .values(assigned_to=assigned_user_id)
+            .returning(Task.task_template_id, Task.priority)
+        )
+        assigned = result.first()
+        if assigned is None:
+            await db.rollback()
             return None
         
-        # Simple assignment logic - find user with least active tasks
-        user_workloads = {}
-        for user in users:
-            active_tasks = db.query(Task).filter(
-                Task.assigned_to == user.id,
-                Task.status.in_(["pending", "assigned", "in_progress"])
-            ).count()
-            user_workloads[user.id] = active_tasks
+        await publish_user_events(db, "task", [assigned_user_id], {"action": "assigned"}, object_ids=[str(task_id)])
+        await db.commit()
         
-        # Assign to user with lowest workload
-        assigned_user_id = min(user_workloads, key=user_workloads.get)
+        # Later assignments in this worker see the new load without a reload
+        workload_cache.add(
+            assigned_user_id,
+            task_workload(assigned.task_template_id, assigned.priority)
+        )
         
-        # Update task assignment
-        task = db.query(Task).filter(Task.id == task_id).first()
-        if task:
-            task.assigned_to = assigned_user_id
-            task.status = "assigned"
-            db.commit()
-            
-            logger.info(f"Auto-assigned task {task_id} to user {assigned_user_id}")
-            return assigned_user_id
+        logger.info(f"Auto-assigned task {task_id} to user {assigned_user_id}")
+        return assigned_user_id
         
     except Exception as e:
         logger.error(f"Error auto-assigning task {task_id}: {str(e)}")
-        db.rollback()
+        await db.rollback()
     
     return None
 
-def escalate_overdue_tasks(hours_threshold: int, escalated_by: str, db: Session) -> Dict[str, Any]:
-    """Escalate tasks that are overdue by specified hours"""
+async def escalate_overdue_tasks(hours_threshold: int, escalated_by: str) -> Dict[str, Any]:
+    """Escalate now, instead of at the next sweep, tasks overdue by more than the given hours"""
+    
+    from app.database.base import engine
+    from app.utils.sla_engine import sla_sweeper
     
+    now = datetime.now(timezone.utc)
+    overdue_by = timedelta(hours=hours_threshold)
     try:
-        threshold_time = datetime.utcnow() - timedelta(hours=hours_threshold)
-        
-        # Find overdue tasks that haven't been escalated recently
-        overdue_tasks = db.query(Task).filter(
-            Task.due_date < threshold_time,
-            Task.status.in_(["assigned", "in_progress", "pending"]),
-            # Add condition to avoid re-escalating recently escalated tasks
-        ).all()
-        
-        escalated_count = 0
-        escalation_errors = []
-        
-        for task in overdue_tasks:
-            try:
-                # Check if already escalated recently
-                metadata = task.metadata or {}
-                escalations = metadata.get("escalations", [])
-                
-                # Skip if escalated in last 24 hours
-                recent_escalation = False
-                for escalation in escalations:
-                    escalated_at = datetime.fromisoformat(escalation.get("escalated_at", ""))
-                    if (datetime.utcnow() - escalated_at).total_seconds() < 24 * 3600:
-                        recent_escalation = True
-                        break
-                
-                if recent_escalation:
-                    continue
-                
-                # Find supervisor for escalation
-                case = db.query(Case).filter(Case.id == task.case_id).first()
-                supervisor = db.query(User).filter(User.role == "supervisor").first()
-                
-                if not supervisor:
-                    escalation_errors.append(f"No supervisor found for task {task.id}")
-                    continue
-                
-                # Escalate task
-                old_assignee = task.assigned_to
-                task.assigned_to = supervisor.id
-                task.priority = escalate_priority(task.priority)
-                task.status = "escalated"
-                
-                # Update metadata
-                if not task.metadata:
-                    task.metadata = {}
-                if "escalations" not in task.metadata:
-                    task.metadata["escalations"] = []
-                
-                task.metadata["escalations"].append({
-                    "escalated_by": escalated_by,
-                    "escalated_to": supervisor.id,
-                    "escalated_at": datetime.utcnow().isoformat(),
-                    "reason": "sla_violation",
-                    "old_assignee": old_assignee,
-                    "hours_overdue": (datetime.utcnow() - task.due_date).total_seconds() / 3600
-                })
-                
-                task.updated_at = datetime.utcnow()
-                escalated_count += 1
-                
-                logger.info(f"Escalated overdue task {task.id} to supervisor {supervisor.id}")
-                
-            except Exception as e:
-                error_msg = f"Error escalating task {task.id}: {str(e)}"
-                escalation_errors.append(error_msg)
-                logger.error(error_msg)
-        
-        db.commit()
+        async with engine.connect() as conn:
+            escalated_count = await sla_sweeper.sweep(
+                conn, now=now, overdue_by=overdue_by, escalated_by=escalated_by
+            )
+            # Includes tasks escalated by earlier sweeps and still open
+            total_overdue = await sla_sweeper.count_overdue(conn, now=now, overdue_by=overdue_by)
         
         return {
             "escalated_count": escalated_count,
-            "total_overdue": len(overdue_tasks),
-            "errors": escalation_errors,
+            "total_overdue": total_overdue,
+            "errors": [],
             "threshold_hours": hours_threshold
         }
         
     except Exception as e:
         logger.error(f"Error in bulk escalation process: {str(e)}")
-        db.rollback()
         return {
             "escalated_count": 0,
             "total_overdue": 0,
@@ -505,25 +657,17 @@ def assign_step_to_role(role: str, db: Session) -> Optional[str]:
     """Assign a workflow step to a user with the specified role"""
     
     try:
-        # Find users with the required role
-        users = db.query(User).filter(
-            User.role == role,
+        # Least active tasks first, counted for all candidates in one query
+        active_tasks = func.count(Task.id)
+        least_loaded = db.query(User.id).outerjoin(Task, and_(
+            Task.assigned_to == User.id,
+            Task.status.in_(ACTIVE_TASK_STATUSES)
+        )).filter(
+            User.role == _role_value(role),
             User.is_active == True
-        ).all()
-        
-        if not users:
-            return None
-        
-        # Simple assignment - find user with least active tasks
-        user_workloads = {}
-        for user in users:
-            active_tasks = db.query(Task).filter(
-                Task.assigned_to == user.id,
-                Task.status.in_(["assigned", "in_progress"])
-            ).count()
-            user_workloads[user.id] = active_tasks
+        ).group_by(User.id).order_by(active_tasks, User.id).first()
         
-        return min(user_workloads, key=user_workloads.get)
+        return least_loaded.id if least_loaded else None
         
     except Exception as e:
         logger.error(f"Error assigning step to role {role}: {str(e)}")
@@ -559,6 +703,30 @@ def send_task_notification(task_id: str, notification_type: str, user_id: str, d
         logger.error(f"Error sending task notification: {str(e)}")
         return False
 
+async def send_task_notifications(task_ids: List[str], notification_type: str) -> int:
+    """Send one task notification to the assignee of each task, loading them in one query"""
+    
+    # Runs as a background task, so it uses its own session
+    from app.database.base import AsyncSessionLocal
+    
+    try:
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(Task, User).join(User, User.id == Task.assigned_to).where(Task.id.in_(task_ids))
+            )
+            rows = result.all()
+        
+        for task, user in rows:
+            notification_content = get_notification_content(notification_type, task, user)
+            logger.info(f"Task notification: {notification_type} for task {task.id} to user {user.id}")
+            logger.info(f"Content: {notification_content['title']} - {notification_content['message']}")
+        
+        return len(rows)
+        
+    except Exception as e:
+        logger.error(f"Error sending task notifications: {str(e)}")
+        return 0
+
 def get_notification_content(notification_type: str, task: Task, user: User) -> Dict[str, str]:
     """Get notification content based on type and context"""
     
@@ -729,32 +897,19 @@ def calculate_sla_metrics(tasks: List[Task]) -> Dict[str, Any]:
         "compliance_rate": compliance_rate
     }
 
-def validate_task_dependencies(task_id: str, dependency_ids: List[str], db: Session) -> Tuple[bool, List[str]]:
-    """Validate task dependencies to prevent circular dependencies"""
+async def validate_task_dependencies(task_id: str, dependency_ids: List[str], db: AsyncSession) -> Tuple[bool, List[str]]:
+    """Validate task dependencies against the whole prerequisite graph, including indirect cycles"""
     
-    errors = []
+    from app.utils.task_graph import TaskGraphError, load_task_graph
     
     try:
-        # Check if any dependency is the task itself
-        if task_id in dependency_ids:
-            errors.append("Task cannot depend on itself")
-        
-        # Check if dependencies exist
-        existing_tasks = db.query(Task).filter(Task.id.in_(dependency_ids)).all()
-        existing_ids = [t.id for t in existing_tasks]
-        
-        for dep_id in dependency_ids:
-            if dep_id not in existing_ids:
-                errors.append(f"Dependency task {dep_id} not found")
-        
-        # Check for circular dependencies (simplified check)
-        for existing_task in existing_tasks:
-            task_deps = existing_task.metadata.get("dependencies", []) if existing_task.metadata else []
-            if task_id in task_deps:
-                errors.append(f"Circular dependency detected with task {existing_task.id}")
-        
-        return len(errors) == 0, errors
+        # The task, its prerequisites and everything the new ones wait on
+        graph = await load_task_graph(db, task_ids=[task_id, *dependency_ids])
+        graph.set_dependencies(task_id, dependency_ids)
+        return True, []
         
+    except TaskGraphError as e:
+        return False, [str(e)]
     except Exception as e:
         logger.error(f"Error validating dependencies: {str(e)}")
         return False, [f"Error validating dependencies: {str(e)}"]
@@ -762,19 +917,6 @@ def validate_task_dependencies(task_id: str, dependency_ids: List[str], db: Sess
 def estimate_task_duration(task_type: str, complexity: str = "medium") -> int:
     """Estimate task duration in hours based on type and complexity"""
     
-    base_durations = {
-        "investigation": 24,
-        "forensic_analysis": 48,
-        "evidence_collection": 8,
-        "interview": 4,
-        "documentation": 6,
-        "legal_review": 12,
-        "court_preparation": 16,
-        "follow_up": 2,
-        "administrative": 3,
-        "quality_assurance": 4
-    }
-    
     complexity_multipliers = {
         "simple": 0.5,
         "medium": 1.0,
@@ -782,38 +924,16 @@ def estimate_task_duration(task_type: str, complexity: str = "medium") -> int:
         "very_complex": 3.0
     }
     
-    base_hours = base_durations.get(task_type, 8)  # Default to 8 hours
+    base_hours = TASK_BASE_DURATIONS.get(task_type, 8)  # Default to 8 hours
     multiplier = complexity_multipliers.get(complexity, 1.0)
     
     return int(base_hours * multiplier)
 
-def get_user_workload_score(user_id: str, db: Session) -> float:
-    """Calculate workload score for a user based on active tasks"""
+async def get_user_workload_score(user_id: str, db: AsyncSession) -> float:
+    """Workload score for a user: 10 per active task plus priority-weighted estimated days"""
     
     try:
-        active_tasks = db.query(Task).filter(
-            Task.assigned_to == user_id,
-            Task.status.in_(["assigned", "in_progress"])
-        ).all()
-        
-        if not active_tasks:
-            return 0.0
-        
-        # Calculate workload based on task count and estimated hours
-        total_hours = 0
-        task_count = len(active_tasks)
-        
-        for task in active_tasks:
-            estimated_hours = task.estimated_hours or estimate_task_duration(task.task_type)
-            # Apply priority multiplier
-            priority_multipliers = {"low": 0.8, "medium": 1.0, "high": 1.3, "urgent": 1.6, "critical": 2.0}
-            multiplier = priority_multipliers.get(task.priority, 1.0)
-            total_hours += estimated_hours * multiplier
-        
-        # Workload score combines task count and total estimated hours
-        workload_score = (task_count * 10) + (total_hours / 8)  # Normalize hours to days
-        
-        return round(workload_score, 2)
+        return round(await workload_cache.score(db, user_id), 2)
         
     except Exception as e:
         logger.error(f"Error calculating workload score for user {user_id}: {str(e)}")
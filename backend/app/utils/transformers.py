@@ -7,15 +7,18 @@ This module provides comprehensive data transformation functionality including:
 - Custom transformation functions and templates
 - Schema validation and error handling
 - Support for multiple data formats (JSON, XML, CSV)
+- Compiled mapping plans and streaming ``transform_many`` for bulk imports
 """
 
+import functools
 import json
 import re
 import logging
+from collections import OrderedDict
 from datetime import datetime, date
 from decimal import Decimal, InvalidOperation
 from enum import Enum
-from typing import Any, Dict, List, Optional, Union, Callable
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
 from xml.etree.ElementTree import Element, SubElement, tostring as xml_tostring
 
 from pydantic import BaseModel, Field, field_validator
@@ -135,11 +138,222 @@ class TransformationResult(BaseModel):
     metadata: Dict[str, Any] = Field(default_factory=dict)
 
 
+def _parse_datetime(value: Any) -> datetime:
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, str):
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    raise TransformationError("", value, "date", "Invalid date value")
+
+
+def _to_boolean(value: Any) -> bool:
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str):
+        return value.lower() in ('true', '1', 'yes', 'on')
+    return bool(value)
+
+
+class RecordTransformation(NamedTuple):
+    """Lightweight per-record result yielded by ``transform_many``."""
+    
+    success: bool
+    transformed_data: Dict[str, Any]
+    errors: List[Dict[str, Any]]
+    warnings: List[Dict[str, Any]]
+
+
+# Transformations that still run when the current value is None
+NONE_TRANSFORMATIONS = frozenset({TransformationType.DEFAULT_VALUE, TransformationType.NULL_IF_EMPTY})
+
+# Compiled plans kept per DataTransformer, keyed by configuration identity
+COMPILED_MAPPING_CACHE_SIZE = 64
+
+# ``${name}`` placeholders in transformation conditions
+CONDITION_PLACEHOLDER = re.compile(r'\$\{([^}]*)\}')
+
+
+def _compile_getter(field_path: str) -> Callable[[Dict[str, Any]], Any]:
+    """Accessor for a dotted source path, split once."""
+    keys = tuple(field_path.split('.'))
+    if len(keys) == 1:
+        key = keys[0]
+        return lambda data: data.get(key)
+    
+    def get(data: Dict[str, Any]) -> Any:
+        value = data
+        for key in keys:
+            if isinstance(value, dict) and key in value:
+                value = value[key]
+            else:
+                return None
+        return value
+    
+    return get
+
+
+def _compile_setter(field_path: str) -> Callable[[Dict[str, Any], Any], None]:
+    """Assignment for a dotted target path, split once."""
+    *parents, last = field_path.split('.')
+    if not parents:
+        return lambda data, value: data.__setitem__(last, value)
+    
+    def set_value(data: Dict[str, Any], value: Any):
+        current = data
+        for key in parents:
+            if key not in current:
+                current[key] = {}
+            current = current[key]
+        current[last] = value
+    
+    return set_value
+
+
+class _CompiledField:
+    """One field mapping with its paths, transformations and validators pre-bound."""
+    
+    __slots__ = (
+        "source_field", "target_field", "get", "set", "required", "default_value",
+        "steps", "validators"
+    )
+    
+    def __init__(self, field_mapping: FieldMapping, steps: list, validators: list):
+        self.source_field = field_mapping.source_field
+        self.target_field = field_mapping.target_field
+        self.get = _compile_getter(field_mapping.source_field)
+        self.set = _compile_setter(field_mapping.target_field)
+        self.required = field_mapping.required
+        self.default_value = field_mapping.default_value
+        # (rule type, condition or None, callable, runs on None)
+        self.steps = steps
+        # (rule type, severity, check returning an error message or None)
+        self.validators = validators
+
+
+class CompiledMapping:
+    """
+    A ``MappingConfiguration`` compiled for repeated use.
+    
+    Source and target paths are split once, transformations are sorted by
+    order and bound to their parameters, regexes and conditions are compiled,
+    and custom functions are resolved. Build one with
+    ``DataTransformer.compile_mapping`` and reuse it across records;
+    recompile after changing the configuration or registering custom
+    functions.
+    """
+    
+    def __init__(
+        self,
+        mapping_config: MappingConfiguration,
+        fields: List[_CompiledField],
+        global_transformations: List[Tuple[TransformationType, Callable]]
+    ):
+        self.config = mapping_config
+        self.fields = fields
+        self.global_transformations = global_transformations
+        self.strict = mapping_config.validation_mode == "strict"
+        self.fail_fast = mapping_config.error_handling == "fail_fast"
+    
+    def transform(self, source_data: Dict[str, Any]) -> RecordTransformation:
+        """Transform one record."""
+        transformed_data: Dict[str, Any] = {}
+        errors: List[Dict[str, Any]] = []
+        warnings: List[Dict[str, Any]] = []
+        
+        processed_source = source_data
+        if self.global_transformations:
+            processed_source = source_data.copy()
+            for rule_type, apply in self.global_transformations:
+                try:
+                    processed_source = apply(processed_source)
+                except Exception as e:
+                    errors.append({
+                        'type': 'global_transformation_error',
+                        'transformation': rule_type,
+                        'message': str(e)
+                    })
+        
+        for field in self.fields:
+            try:
+                source_value = field.get(processed_source)
+                if source_value is None:
+                    source_value = field.default_value
+                    if source_value is None:
+                        if field.required:
+                            errors.append({
+                                'type': 'required_field_missing',
+                                'field': field.source_field,
+                                'target_field': field.target_field,
+                                'message': f'Required field {field.source_field} is missing'
+                            })
+                        continue
+                
+                value = source_value
+                for rule_type, condition, apply, runs_on_none in field.steps:
+                    if value is None and not runs_on_none:
+                        continue
+                    if condition is not None and not condition(source_value, processed_source):
+                        continue
+                    try:
+                        value = apply(value)
+                    except Exception as e:
+                        if not isinstance(e, TransformationError):
+                            e = TransformationError(field.source_field, value, rule_type, str(e))
+                        errors.append({
+                            'type': 'transformation_error',
+                            'field': field.source_field,
+                            'target_field': field.target_field,
+                            'transformation': rule_type,
+                            'message': str(e)
+                        })
+                        if self.fail_fast:
+                            return RecordTransformation(False, {}, errors, [])
+                        # Use original value if transformation fails
+                        value = source_value
+                
+                for rule_type, severity, check in field.validators:
+                    message = check(value)
+                    if message is not None:
+                        error_info = {
+                            'type': 'validation_error',
+                            'field': field.target_field,
+                            'value': value,
+                            'rule': rule_type,
+                            'message': message,
+                            'severity': severity
+                        }
+                        if severity == "error":
+                            errors.append(error_info)
+                        else:
+                            warnings.append(error_info)
+                
+                field.set(transformed_data, value)
+            
+            except Exception as e:
+                errors.append({
+                    'type': 'field_mapping_error',
+                    'field': field.source_field,
+                    'target_field': field.target_field,
+                    'message': str(e)
+                })
+        
+        return RecordTransformation(
+            not (errors and self.strict), transformed_data, errors, warnings
+        )
+    
+    def transform_many(self, records: Iterable[Dict[str, Any]]) -> Iterator[RecordTransformation]:
+        """Lazily transform an iterable of records."""
+        transform = self.transform
+        for record in records:
+            yield transform(record)
+
+
 class DataTransformer:
     """Core data transformation engine."""
     
     def __init__(self):
         self.custom_functions: Dict[str, Callable] = {}
+        self._compiled: "OrderedDict[int, Tuple[MappingConfiguration, CompiledMapping]]" = OrderedDict()
         self.register_default_functions()
     
     def register_default_functions(self):
@@ -159,304 +373,228 @@ class DataTransformer:
     def register_custom_function(self, name: str, func: Callable):
         """Register a custom transformation function."""
         self.custom_functions[name] = func
+        self._compiled.clear()
     
     def transform_data(
         self,
         source_data: Dict[str, Any],
-        mapping_config: MappingConfiguration
+        mapping_config: Union[MappingConfiguration, CompiledMapping]
     ) -> TransformationResult:
         """
         Transform data according to mapping configuration.
         
         Args:
             source_data: Source data dictionary
-            mapping_config: Transformation mapping configuration
+            mapping_config: Transformation mapping configuration, or a plan
+                from ``compile_mapping``
             
         Returns:
             TransformationResult with transformed data and any errors
         """
         
-        result = TransformationResult(success=True)
-        transformed_data = {}
-        errors = []
-        warnings = []
+        plan = self._get_plan(mapping_config)
+        record = plan.transform(source_data)
+        config = plan.config
+        
+        return TransformationResult(
+            success=record.success,
+            transformed_data=record.transformed_data,
+            transformation_errors=record.errors,
+            warnings=record.warnings,
+            metadata={
+                'source_system': config.source_system,
+                'target_system': config.target_system,
+                'mapping_name': config.name,
+                'transformation_time': datetime.utcnow().isoformat(),
+                'fields_processed': len(config.field_mappings),
+                'fields_transformed': len(record.transformed_data),
+                'errors_count': len(record.errors),
+                'warnings_count': len(record.warnings)
+            }
+        )
+    
+    def transform_many(
+        self,
+        records: Iterable[Dict[str, Any]],
+        mapping_config: Union[MappingConfiguration, CompiledMapping]
+    ) -> Iterator[RecordTransformation]:
+        """
+        Transform a stream of records with one compiled plan.
         
-        # Apply global transformations first
-        processed_source = source_data.copy()
-        for transformation in mapping_config.global_transformations:
-            try:
-                processed_source = self._apply_global_transformation(
-                    processed_source, transformation
-                )
-            except Exception as e:
-                error_info = {
-                    'type': 'global_transformation_error',
-                    'transformation': transformation.type,
-                    'message': str(e)
-                }
-                errors.append(error_info)
+        Records are consumed lazily, so generators over large exports are
+        processed without being materialized. Results are lightweight
+        ``RecordTransformation`` tuples rather than ``TransformationResult``
+        models.
+        
+        Args:
+            records: Iterable of source data dictionaries
+            mapping_config: Transformation mapping configuration, or a plan
+                from ``compile_mapping``
+            
+        Returns:
+            Iterator of RecordTransformation, one per record, in order
+        """
+        return self._get_plan(mapping_config).transform_many(records)
+    
+    def _get_plan(self, mapping_config: Union[MappingConfiguration, CompiledMapping]) -> CompiledMapping:
+        """
+        Compiled plan for a configuration, reusing one compiled earlier.
+        
+        Configurations are treated as immutable once used; call
+        ``compile_mapping`` directly after editing one in place.
+        """
+        
+        if isinstance(mapping_config, CompiledMapping):
+            return mapping_config
+        
+        cached = self._compiled.get(id(mapping_config))
+        if cached is not None and cached[0] is mapping_config:
+            self._compiled.move_to_end(id(mapping_config))
+            return cached[1]
+        
+        plan = self.compile_mapping(mapping_config)
+        # Holding the configuration keeps its id from being reused
+        self._compiled[id(mapping_config)] = (mapping_config, plan)
+        if len(self._compiled) > COMPILED_MAPPING_CACHE_SIZE:
+            self._compiled.popitem(last=False)
+        return plan
+    
+    def compile_mapping(
+        self,
+        mapping_config: Union[MappingConfiguration, CompiledMapping]
+    ) -> CompiledMapping:
+        """Compile a mapping configuration into a reusable plan."""
         
-        # Process field mappings
+        if isinstance(mapping_config, CompiledMapping):
+            return mapping_config
+        
+        fields = []
         for field_mapping in mapping_config.field_mappings:
-            try:
-                # Get source value
-                source_value = self._get_nested_value(
-                    processed_source, field_mapping.source_field
+            steps = [
+                (
+                    rule.type,
+                    self._compile_condition(rule.condition) if rule.condition else None,
+                    self._compile_transformation(rule),
+                    rule.type in NONE_TRANSFORMATIONS
                 )
-                
-                # Apply default value if source is None/missing
-                if source_value is None and field_mapping.default_value is not None:
-                    source_value = field_mapping.default_value
-                
-                # Skip if required field is missing
-                if source_value is None and field_mapping.required:
-                    error_info = {
-                        'type': 'required_field_missing',
-                        'field': field_mapping.source_field,
-                        'target_field': field_mapping.target_field,
-                        'message': f'Required field {field_mapping.source_field} is missing'
-                    }
-                    errors.append(error_info)
-                    continue
-                
-                # Skip if optional field is missing
-                if source_value is None:
-                    continue
-                
-                # Apply transformations
-                transformed_value = source_value
-                for transformation in sorted(field_mapping.transformations, key=lambda x: x.order):
-                    try:
-                        # Check condition if specified
-                        if transformation.condition:
-                            if not self._evaluate_condition(
-                                transformation.condition, 
-                                source_value, 
-                                processed_source
-                            ):
-                                continue
-                        
-                        transformed_value = self._apply_transformation(
-                            transformed_value, transformation
-                        )
-                    except TransformationError as e:
-                        error_info = {
-                            'type': 'transformation_error',
-                            'field': field_mapping.source_field,
-                            'target_field': field_mapping.target_field,
-                            'transformation': transformation.type,
-                            'message': str(e)
-                        }
-                        errors.append(error_info)
-                        
-                        if mapping_config.error_handling == "fail_fast":
-                            result.success = False
-                            result.transformation_errors = errors
-                            return result
-                        
-                        # Use original value if transformation fails
-                        transformed_value = source_value
-                
-                # Apply validation rules
-                for validation_rule in field_mapping.validation_rules:
-                    try:
-                        validation_result = self._validate_value(
-                            transformed_value, validation_rule
-                        )
-                        
-                        if not validation_result['valid']:
-                            error_info = {
-                                'type': 'validation_error',
-                                'field': field_mapping.target_field,
-                                'value': transformed_value,
-                                'rule': validation_rule.type,
-                                'message': validation_result['message'],
-                                'severity': validation_rule.severity
-                            }
-                            
-                            if validation_rule.severity == "error":
-                                errors.append(error_info)
-                                if mapping_config.validation_mode == "strict":
-                                    result.success = False
-                            else:
-                                warnings.append(error_info)
-                    
-                    except ValidationError as e:
-                        error_info = {
-                            'type': 'validation_error',
-                            'field': field_mapping.target_field,
-                            'message': str(e)
-                        }
-                        errors.append(error_info)
-                
-                # Set transformed value
-                self._set_nested_value(
-                    transformed_data, 
-                    field_mapping.target_field, 
-                    transformed_value
-                )
-                
-            except Exception as e:
-                error_info = {
-                    'type': 'field_mapping_error',
-                    'field': field_mapping.source_field,
-                    'target_field': field_mapping.target_field,
-                    'message': str(e)
-                }
-                errors.append(error_info)
-        
-        # Set result data
-        result.transformed_data = transformed_data
-        result.transformation_errors = errors
-        result.warnings = warnings
-        result.metadata = {
-            'source_system': mapping_config.source_system,
-            'target_system': mapping_config.target_system,
-            'mapping_name': mapping_config.name,
-            'transformation_time': datetime.utcnow().isoformat(),
-            'fields_processed': len(mapping_config.field_mappings),
-            'fields_transformed': len(transformed_data),
-            'errors_count': len(errors),
-            'warnings_count': len(warnings)
-        }
+                for rule in sorted(field_mapping.transformations, key=lambda x: x.order)
+            ]
+            validators = [
+                (rule.type, rule.severity, self._compile_validation(rule))
+                for rule in field_mapping.validation_rules
+            ]
+            fields.append(_CompiledField(field_mapping, steps, validators))
         
-        # Determine final success status
-        if errors and mapping_config.validation_mode == "strict":
-            result.success = False
+        global_transformations = [
+            (rule.type, functools.partial(self._apply_global_transformation, transformation=rule))
+            for rule in mapping_config.global_transformations
+        ]
         
-        return result
+        return CompiledMapping(mapping_config, fields, global_transformations)
     
     def _get_nested_value(self, data: Dict[str, Any], field_path: str) -> Any:
         """Get value from nested dictionary using dot notation."""
-        
-        keys = field_path.split('.')
-        value = data
-        
-        for key in keys:
-            if isinstance(value, dict) and key in value:
-                value = value[key]
-            else:
-                return None
-        
-        return value
+        return _compile_getter(field_path)(data)
     
     def _set_nested_value(self, data: Dict[str, Any], field_path: str, value: Any):
         """Set value in nested dictionary using dot notation."""
-        
-        keys = field_path.split('.')
-        current = data
-        
-        # Navigate to parent of target key
-        for key in keys[:-1]:
-            if key not in current:
-                current[key] = {}
-            current = current[key]
-        
-        # Set the final value
-        current[keys[-1]] = value
+        _compile_setter(field_path)(data, value)
     
     def _apply_transformation(self, value: Any, rule: TransformationRule) -> Any:
         """Apply a single transformation rule to a value."""
         
         # Handle None values specially for DEFAULT_VALUE and NULL_IF_EMPTY transformations
-        if value is None and rule.type not in [TransformationType.DEFAULT_VALUE, TransformationType.NULL_IF_EMPTY]:
+        if value is None and rule.type not in NONE_TRANSFORMATIONS:
             return value
         
         try:
-            if rule.type == TransformationType.REPLACE:
-                return str(value).replace(
-                    rule.parameters.get('from', ''),
-                    rule.parameters.get('to', '')
-                )
-            
-            elif rule.type == TransformationType.FORMAT_STRING:
-                return rule.parameters.get('format', '{}').format(value)
-            
-            elif rule.type == TransformationType.FORMAT_DATE:
-                if isinstance(value, str):
-                    # Parse string to datetime first
-                    dt = datetime.fromisoformat(value.replace('Z', '+00:00'))
-                elif isinstance(value, datetime):
-                    dt = value
-                else:
-                    raise TransformationError("", value, rule.type, "Invalid date value")
-                
-                return dt.strftime(rule.parameters.get('format', '%Y-%m-%d'))
-            
-            elif rule.type == TransformationType.FORMAT_NUMBER:
-                num = float(value)
-                decimals = rule.parameters.get('decimals', 2)
-                return f"{num:.{decimals}f}"
-            
-            elif rule.type == TransformationType.TO_STRING:
-                return str(value)
-            
-            elif rule.type == TransformationType.TO_INTEGER:
-                return int(float(value))  # Handle string numbers
-            
-            elif rule.type == TransformationType.TO_FLOAT:
-                return float(value)
-            
-            elif rule.type == TransformationType.TO_BOOLEAN:
-                if isinstance(value, bool):
-                    return value
-                if isinstance(value, str):
-                    return value.lower() in ('true', '1', 'yes', 'on')
-                return bool(value)
-            
-            elif rule.type == TransformationType.TO_DATE:
-                if isinstance(value, datetime):
-                    return value.date()
-                if isinstance(value, str):
-                    dt = datetime.fromisoformat(value.replace('Z', '+00:00'))
-                    return dt.date()
-                raise TransformationError("", value, rule.type, "Invalid date value")
-            
-            elif rule.type == TransformationType.UPPERCASE:
-                return str(value).upper()
-            
-            elif rule.type == TransformationType.LOWERCASE:
-                return str(value).lower()
-            
-            elif rule.type == TransformationType.CAPITALIZE:
-                return str(value).capitalize()
-            
-            elif rule.type == TransformationType.TRIM:
-                return str(value).strip()
-            
-            elif rule.type == TransformationType.SUBSTRING:
-                start = rule.parameters.get('start', 0)
-                end = rule.parameters.get('end')
-                return str(value)[start:end] if end else str(value)[start:]
-            
-            elif rule.type == TransformationType.JOIN:
-                if isinstance(value, list):
-                    separator = rule.parameters.get('separator', ', ')
-                    return separator.join(str(item) for item in value)
-                return str(value)
-            
-            elif rule.type == TransformationType.SPLIT:
-                separator = rule.parameters.get('separator', ',')
-                return str(value).split(separator)
-            
-            elif rule.type == TransformationType.DEFAULT_VALUE:
-                return rule.parameters.get('default') if value is None else value
-            
-            elif rule.type == TransformationType.NULL_IF_EMPTY:
-                return None if str(value).strip() == '' else value
-            
-            elif rule.type == TransformationType.CUSTOM:
-                func_name = rule.parameters.get('function')
-                if func_name in self.custom_functions:
-                    return self.custom_functions[func_name](value, rule.parameters)
-                raise TransformationError("", value, rule.type, f"Unknown custom function: {func_name}")
-            
-            else:
-                raise TransformationError("", value, rule.type, f"Unknown transformation type: {rule.type}")
-                
+            return self._compile_transformation(rule)(value)
+        except TransformationError:
+            raise
         except Exception as e:
             raise TransformationError("", value, rule.type, str(e))
     
+    def _compile_transformation(self, rule: TransformationRule) -> Callable[[Any], Any]:
+        """Bind a transformation rule's parameters into a one-argument callable."""
+        
+        params = rule.parameters
+        
+        if rule.type == TransformationType.REPLACE:
+            old, new = params.get('from', ''), params.get('to', '')
+            return lambda value: str(value).replace(old, new)
+        
+        elif rule.type == TransformationType.FORMAT_STRING:
+            return params.get('format', '{}').format
+        
+        elif rule.type == TransformationType.FORMAT_DATE:
+            date_format = params.get('format', '%Y-%m-%d')
+            return lambda value: _parse_datetime(value).strftime(date_format)
+        
+        elif rule.type == TransformationType.FORMAT_NUMBER:
+            number_format = f".{params.get('decimals', 2)}f"
+            return lambda value: format(float(value), number_format)
+        
+        elif rule.type == TransformationType.TO_STRING:
+            return str
+        
+        elif rule.type == TransformationType.TO_INTEGER:
+            return lambda value: int(float(value))  # Handle string numbers
+        
+        elif rule.type == TransformationType.TO_FLOAT:
+            return float
+        
+        elif rule.type == TransformationType.TO_BOOLEAN:
+            return _to_boolean
+        
+        elif rule.type == TransformationType.TO_DATE:
+            return lambda value: value.date() if isinstance(value, datetime) else _parse_datetime(value).date()
+        
+        elif rule.type == TransformationType.UPPERCASE:
+            return lambda value: str(value).upper()
+        
+        elif rule.type == TransformationType.LOWERCASE:
+            return lambda value: str(value).lower()
+        
+        elif rule.type == TransformationType.CAPITALIZE:
+            return lambda value: str(value).capitalize()
+        
+        elif rule.type == TransformationType.TRIM:
+            return lambda value: str(value).strip()
+        
+        elif rule.type == TransformationType.SUBSTRING:
+            bounds = slice(params.get('start', 0), params.get('end') or None)
+            return lambda value: str(value)[bounds]
+        
+        elif rule.type == TransformationType.JOIN:
+            separator = params.get('separator', ', ')
+            return lambda value: separator.join(str(item) for item in value) if isinstance(value, list) else str(value)
+        
+        elif rule.type == TransformationType.SPLIT:
+            separator = params.get('separator', ',')
+            return lambda value: str(value).split(separator)
+        
+        elif rule.type == TransformationType.DEFAULT_VALUE:
+            default = params.get('default')
+            return lambda value: default if value is None else value
+        
+        elif rule.type == TransformationType.NULL_IF_EMPTY:
+            return lambda value: None if str(value).strip() == '' else value
+        
+        elif rule.type == TransformationType.CUSTOM:
+            func_name = params.get('function')
+            func = self.custom_functions.get(func_name)
+            if func is not None:
+                return lambda value: func(value, params)
+            message = f"Unknown custom function: {func_name}"
+        
+        else:
+            message = f"Unknown transformation type: {rule.type}"
+        
+        def unsupported(value: Any) -> Any:
+            raise TransformationError("", value, rule.type, message)
+        
+        return unsupported
+    
     def _apply_global_transformation(
         self, 
         data: Dict[str, Any], 
@@ -471,60 +609,74 @@ class DataTransformer:
     def _validate_value(self, value: Any, rule: ValidationRule) -> Dict[str, Any]:
         """Validate a value against a validation rule."""
         
+        message = self._compile_validation(rule)(value)
+        return {
+            'valid': message is None,
+            'message': message or ""
+        }
+    
+    def _compile_validation(self, rule: ValidationRule) -> Callable[[Any], Optional[str]]:
+        """Bind a validation rule into a check returning an error message, or None if valid."""
+        
+        params = rule.parameters
+        
         if rule.type == "required":
-            valid = value is not None and str(value).strip() != ''
             message = rule.error_message or "Field is required"
+            return lambda value: None if value is not None and str(value).strip() != '' else message
         
         elif rule.type == "pattern":
-            pattern = rule.parameters.get('regex')
-            if pattern:
-                valid = bool(re.match(pattern, str(value)))
-                message = rule.error_message or f"Value does not match pattern {pattern}"
-            else:
-                valid = True
-                message = ""
-        
-        elif rule.type == "range":
+            pattern = params.get('regex')
+            if not pattern:
+                return lambda value: None
+            message = rule.error_message or f"Value does not match pattern {pattern}"
             try:
-                num_value = float(value)
-                min_val = rule.parameters.get('min')
-                max_val = rule.parameters.get('max')
+                match = re.compile(pattern).match
+            except re.error as e:
+                error = e
                 
-                valid = True
-                if min_val is not None:
-                    valid = valid and num_value >= min_val
-                if max_val is not None:
-                    valid = valid and num_value <= max_val
+                def invalid_pattern(value: Any) -> Optional[str]:
+                    raise error
                 
-                message = rule.error_message or f"Value must be between {min_val} and {max_val}"
-            except (ValueError, TypeError):
-                valid = False
-                message = "Value must be numeric"
+                return invalid_pattern
+            return lambda value: None if match(str(value)) else message
+        
+        elif rule.type == "range":
+            min_val = params.get('min')
+            max_val = params.get('max')
+            message = rule.error_message or f"Value must be between {min_val} and {max_val}"
+            
+            def check_range(value: Any) -> Optional[str]:
+                try:
+                    num_value = float(value)
+                except (ValueError, TypeError):
+                    return "Value must be numeric"
+                if min_val is not None and num_value < min_val:
+                    return message
+                if max_val is not None and num_value > max_val:
+                    return message
+                return None
+            
+            return check_range
         
         elif rule.type == "length":
-            min_len = rule.parameters.get('min', 0)
-            max_len = rule.parameters.get('max')
-            value_len = len(str(value))
+            min_len = params.get('min', 0)
+            max_len = params.get('max') or None
+            message = rule.error_message or f"Length must be between {min_len} and {params.get('max')}"
             
-            valid = value_len >= min_len
-            if max_len:
-                valid = valid and value_len <= max_len
+            def check_length(value: Any) -> Optional[str]:
+                value_len = len(str(value))
+                if value_len < min_len or (max_len is not None and value_len > max_len):
+                    return message
+                return None
             
-            message = rule.error_message or f"Length must be between {min_len} and {max_len}"
+            return check_length
         
         elif rule.type == "in":
-            allowed_values = rule.parameters.get('values', [])
-            valid = value in allowed_values
+            allowed_values = params.get('values', [])
             message = rule.error_message or f"Value must be one of: {', '.join(map(str, allowed_values))}"
+            return lambda value: None if value in allowed_values else message
         
-        else:
-            valid = True
-            message = ""
-        
-        return {
-            'valid': valid,
-            'message': message
-        }
+        return lambda value: None
     
     def _evaluate_condition(
         self, 
@@ -533,20 +685,36 @@ class DataTransformer:
         source_data: Dict[str, Any]
     ) -> bool:
         """Evaluate a conditional expression."""
+        return self._compile_condition(condition)(current_value, source_data)
+    
+    def _compile_condition(self, condition: str) -> Callable[[Any, Dict[str, Any]], bool]:
+        """
+        Compile a conditional expression once.
+        
+        ``${value}`` refers to the field's source value and ``${key}`` to a
+        top-level source field; both are bound as variables rather than
+        substituted as text. Failures evaluate to True, as before.
+        """
         
-        # Simple condition evaluation
         # For production use, consider using a safer expression evaluator
+        def placeholder(match) -> str:
+            name = match.group(1)
+            return '_value' if name == 'value' else f'_source[{name!r}]'
+        
         try:
-            # Replace placeholders with actual values
-            condition = condition.replace('${value}', repr(current_value))
-            for key, val in source_data.items():
-                condition = condition.replace(f'${{{key}}}', repr(val))
-            
-            # Evaluate the condition
-            return bool(eval(condition))
-        except Exception:
-            logger.warning(f"Failed to evaluate condition: {condition}")
-            return True  # Default to true if evaluation fails
+            code = compile(CONDITION_PLACEHOLDER.sub(placeholder, condition), '<condition>', 'eval')
+        except SyntaxError:
+            code = None
+        namespace = globals()
+        
+        def evaluate(current_value: Any, source_data: Dict[str, Any]) -> bool:
+            try:
+                return bool(eval(code, namespace, {'_value': current_value, '_source': source_data}))
+            except Exception:
+                logger.warning(f"Failed to evaluate condition: {condition}")
+                return True  # Default to true if evaluation fails
+        
+        return evaluate
     
     # Custom transformation functions
     def _format_case_number(self, value: Any, params: Dict[str, Any]) -> str:
@@ -725,6 +893,36 @@ def transform_data(
     return data_transformer.transform_data(source_data, mapping_config)
 
 
+def transform_many(
+    records: Iterable[Dict[str, Any]],
+    mapping_config: Union[MappingConfiguration, CompiledMapping]
+) -> Iterator[RecordTransformation]:
+    """
+    Convenience function to transform a stream of records.
+    
+    Args:
+        records: Iterable of source data dictionaries
+        mapping_config: Transformation mapping configuration or compiled plan
+        
+    Returns:
+        Iterator of RecordTransformation, one per record, in order
+    """
+    return data_transformer.transform_many(records, mapping_config)
+
+
+def compile_mapping(mapping_config: MappingConfiguration) -> CompiledMapping:
+    """
+    Convenience function to compile a mapping configuration.
+    
+    Args:
+        mapping_config: Transformation mapping configuration
+        
+    Returns:
+        CompiledMapping reusable with transform_data and transform_many
+    """
+    return data_transformer.compile_mapping(mapping_config)
+
+
 def register_custom_transformer(name: str, func: Callable):
     """
     Register a custom transformation function.
@@ -7,25 +7,36 @@ This module provides comprehensive webhook functionality including:
 - Event dispatching and payload formatting
 - Circuit breaker pattern for failed endpoints
 - Delivery status tracking and logging
+- Durable outbound queue and pooled delivery worker
 """
 
 import asyncio
 import hashlib
+import heapq
 import hmac
 import json
 import logging
 import time
+import uuid
 from datetime import datetime, timedelta
 from enum import Enum
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
 from urllib.parse import urlparse
 
 import aiohttp
 import httpx
 from pydantic import BaseModel, Field
 
+from app.config.settings import settings
+
 logger = logging.getLogger(__name__)
 
+try:
+    import h2  # noqa: F401  (enables httpx HTTP/2 support)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
 
 class WebhookEventType(str, Enum):
     """Supported webhook event types."""
@@ -181,6 +192,113 @@ class CircuitBreaker:
         
         if self.failure_count >= self.failure_threshold:
             self.state = CircuitBreakerState.OPEN
+    
+    def retry_after_seconds(self) -> float:
+        """Seconds until an OPEN breaker will allow a test request."""
+        if self.state != CircuitBreakerState.OPEN or not self.last_failure_time:
+            return 0.0
+        elapsed = (datetime.utcnow() - self.last_failure_time).total_seconds()
+        return max(self.recovery_timeout_seconds - elapsed, 0.0)
+    
+    def to_dict(self) -> Dict[str, str]:
+        """Serialize breaker state for sharing between workers."""
+        return {
+            'state': self.state.value,
+            'failure_count': str(self.failure_count),
+            'last_failure_time': self.last_failure_time.isoformat() if self.last_failure_time else ''
+        }
+    
+    def load_dict(self, data: Dict[str, str]):
+        """Restore breaker state previously produced by ``to_dict``."""
+        if not data:
+            return
+        self.state = CircuitBreakerState(data.get('state', CircuitBreakerState.CLOSED.value))
+        self.failure_count = int(data.get('failure_count') or 0)
+        last_failure = data.get('last_failure_time')
+        self.last_failure_time = datetime.fromisoformat(last_failure) if last_failure else None
+
+
+# Count one failure and open the breaker at the threshold, in one step so
+# concurrent failures from several workers are all counted
+_RECORD_FAILURE_SCRIPT = """
+local count = redis.call('HINCRBY', KEYS[1], 'failure_count', 1)
+redis.call('HSET', KEYS[1], 'last_failure_time', ARGV[1])
+if count >= tonumber(ARGV[2]) then
+    redis.call('HSET', KEYS[1], 'state', 'open')
+elseif redis.call('HEXISTS', KEYS[1], 'state') == 0 then
+    redis.call('HSET', KEYS[1], 'state', 'closed')
+end
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+return redis.call('HGETALL', KEYS[1])
+"""
+
+
+class CircuitBreakerStore:
+    """
+    Shares circuit breaker state across delivery workers and processes.
+    
+    Breaker state is kept in a Redis hash per host so every uvicorn worker sees
+    the same OPEN/CLOSED decision. Outcomes are applied to the hash atomically
+    (a Lua script for failures, a single HSET for success), never by writing
+    back a locally modified copy. Without Redis the store only updates the
+    local breaker, which is shared by all worker tasks of that process.
+    """
+    
+    def __init__(self, redis_client=None, key_prefix: str = "webhooks:circuit", ttl_seconds: int = 3600):
+        self.key_prefix = key_prefix
+        self.ttl_seconds = ttl_seconds
+        self.redis_client = redis_client
+        self._failure_script = redis_client.register_script(_RECORD_FAILURE_SCRIPT) if redis_client else None
+    
+    @staticmethod
+    def _decode(data) -> Dict[str, str]:
+        if isinstance(data, list):
+            data = dict(zip(data[::2], data[1::2]))
+        return {
+            (k.decode() if isinstance(k, bytes) else k): (v.decode() if isinstance(v, bytes) else v)
+            for k, v in data.items()
+        }
+    
+    def _key(self, host: str) -> str:
+        return f"{self.key_prefix}:{host}"
+    
+    async def load(self, host: str, breaker: CircuitBreaker):
+        """Refresh a local breaker from the shared state."""
+        if not self.redis_client:
+            return
+        try:
+            data = await self.redis_client.hgetall(self._key(host))
+            breaker.load_dict(self._decode(data))
+        except Exception as e:
+            logger.warning(f"Failed to load circuit breaker state for {host}: {e}")
+    
+    async def record_success(self, host: str, breaker: CircuitBreaker):
+        """Close the breaker locally and in the shared store."""
+        breaker.record_success()
+        if not self.redis_client:
+            return
+        try:
+            key = self._key(host)
+            pipe = self.redis_client.pipeline(transaction=True)
+            pipe.hset(key, mapping=breaker.to_dict())
+            pipe.expire(key, self.ttl_seconds)
+            await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Failed to save circuit breaker state for {host}: {e}")
+    
+    async def record_failure(self, host: str, breaker: CircuitBreaker):
+        """Count a failure in the shared store and adopt the resulting state."""
+        breaker.record_failure()
+        if not self.redis_client:
+            return
+        try:
+            data = await self._failure_script(
+                keys=[self._key(host)],
+                args=[breaker.last_failure_time.isoformat(), breaker.failure_threshold, self.ttl_seconds]
+            )
+            breaker.load_dict(self._decode(data))
+        except Exception as e:
+            logger.warning(f"Failed to save circuit breaker state for {host}: {e}")
 
 
 class WebhookSignatureGenerator:
@@ -231,7 +349,14 @@ class WebhookSignatureGenerator:
 
 
 class WebhookDeliveryClient:
-    """HTTP client for webhook delivery with retries and circuit breaking."""
+    """
+    HTTP client for webhook delivery with retries and circuit breaking.
+
+    The underlying ``httpx.AsyncClient`` is long-lived: call ``start()`` once and
+    reuse the client so connections (HTTP/2 where ``h2`` is installed) are pooled
+    across deliveries. Concurrent requests to the same host are capped by
+    ``per_host_concurrency``.
+    """
     
     def __init__(
         self,
@@ -240,7 +365,11 @@ class WebhookDeliveryClient:
         max_delay: float = 300.0,
         backoff_multiplier: float = 2.0,
         timeout_seconds: float = 30.0,
-        user_agent: str = "JCTC-Webhook-Client/1.2"
+        user_agent: str = "JCTC-Webhook-Client/1.2",
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        per_host_concurrency: int = 4,
+        http2: bool = True
     ):
         self.max_retries = max_retries
         self.initial_delay = initial_delay
@@ -248,37 +377,160 @@ class WebhookDeliveryClient:
         self.backoff_multiplier = backoff_multiplier
         self.timeout_seconds = timeout_seconds
         self.user_agent = user_agent
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.per_host_concurrency = per_host_concurrency
+        self.http2 = http2 and HTTP2_AVAILABLE
         
-        # Circuit breakers per URL
+        # Circuit breakers and concurrency limits per host
         self.circuit_breakers: Dict[str, CircuitBreaker] = {}
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
         
         # HTTP client session
         self.client: Optional[httpx.AsyncClient] = None
+        self._owns_client = False
     
-    async def __aenter__(self):
-        """Async context manager entry."""
-        self.client = httpx.AsyncClient(
-            timeout=httpx.Timeout(self.timeout_seconds),
-            headers={'User-Agent': self.user_agent}
-        )
+    async def start(self) -> "WebhookDeliveryClient":
+        """Create the pooled HTTP client if it is not already running."""
+        if self.client is None or self.client.is_closed:
+            self.client = httpx.AsyncClient(
+                timeout=httpx.Timeout(self.timeout_seconds),
+                headers={'User-Agent': self.user_agent},
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_keepalive_connections
+                ),
+                http2=self.http2
+            )
         return self
     
-    async def __aexit__(self, exc_type, exc_val, exc_tb):
-        """Async context manager exit."""
+    async def close(self):
+        """Close the pooled HTTP client."""
         if self.client:
             await self.client.aclose()
+            self.client = None
+    
+    async def __aenter__(self):
+        """Async context manager entry (reuses a running client)."""
+        self._owns_client = self.client is None or self.client.is_closed
+        return await self.start()
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit (only closes a client it created)."""
+        if self._owns_client:
+            await self.close()
+            self._owns_client = False
+    
+    @staticmethod
+    def host_key(url: str) -> str:
+        """Key used for per-host circuit breakers and concurrency limits."""
+        return urlparse(url).netloc
     
     def get_circuit_breaker(self, url: str) -> CircuitBreaker:
         """Get or create circuit breaker for URL."""
         
-        parsed_url = urlparse(url)
-        host = parsed_url.netloc
+        host = self.host_key(url)
         
         if host not in self.circuit_breakers:
             self.circuit_breakers[host] = CircuitBreaker()
         
         return self.circuit_breakers[host]
     
+    def _get_host_semaphore(self, url: str) -> asyncio.Semaphore:
+        """Get or create the concurrency limiter for the URL's host."""
+        
+        host = self.host_key(url)
+        
+        if host not in self._host_semaphores:
+            self._host_semaphores[host] = asyncio.Semaphore(self.per_host_concurrency)
+        
+        return self._host_semaphores[host]
+    
+    def retry_delay(self, attempt_number: int) -> float:
+        """Exponential backoff delay after the given (1-based) attempt."""
+        return min(
+            self.initial_delay * (self.backoff_multiplier ** (attempt_number - 1)),
+            self.max_delay
+        )
+    
+    @staticmethod
+    def is_retryable(attempt: DeliveryAttempt) -> bool:
+        """Client errors (4xx) are final; network errors and 5xx are retried."""
+        if attempt.success:
+            return False
+        return attempt.status_code is None or not (400 <= attempt.status_code < 500)
+    
+    def _build_headers(self, webhook_config: Dict[str, Any], payload_json: str) -> Dict[str, str]:
+        """Build request headers, including the HMAC signature if configured."""
+        
+        headers = {
+            'Content-Type': 'application/json',
+            'User-Agent': self.user_agent,
+            **webhook_config.get('headers', {})
+        }
+        
+        # Add signature if secret is configured
+        if webhook_config.get('secret_token'):
+            headers['X-JCTC-Signature'] = WebhookSignatureGenerator.generate_signature(
+                payload_json,
+                webhook_config['secret_token']
+            )
+        
+        return headers
+    
+    async def attempt_delivery(
+        self,
+        webhook_config: Dict[str, Any],
+        payload_json: str,
+        attempt_number: int = 1
+    ) -> DeliveryAttempt:
+        """
+        Make a single delivery attempt under the per-host concurrency limit.
+        
+        Circuit breaker bookkeeping and retry scheduling are left to the caller.
+        
+        Args:
+            webhook_config: Webhook configuration dictionary
+            payload_json: Serialized webhook payload
+            attempt_number: 1-based attempt counter for this delivery
+            
+        Returns:
+            DeliveryAttempt describing the outcome
+        """
+        
+        attempt = DeliveryAttempt(
+            attempt_number=attempt_number,
+            timestamp=datetime.utcnow()
+        )
+        
+        try:
+            if not self.client:
+                raise RuntimeError("Client not initialized. Call start() or use async context manager.")
+            
+            headers = self._build_headers(webhook_config, payload_json)
+            
+            async with self._get_host_semaphore(webhook_config['url']):
+                start_time = time.perf_counter()
+                response = await self.client.post(
+                    webhook_config['url'],
+                    headers=headers,
+                    content=payload_json
+                )
+                attempt.response_time_ms = (time.perf_counter() - start_time) * 1000
+            
+            attempt.status_code = response.status_code
+            
+            if 200 <= response.status_code < 300:
+                attempt.success = True
+            else:
+                attempt.error_message = f"HTTP {response.status_code}: {response.reason_phrase}"
+        
+        except Exception as e:
+            attempt.error_message = str(e)
+            logger.error(f"Webhook delivery attempt {attempt_number} failed: {e}")
+        
+        return attempt
+    
     async def deliver_webhook(
         self,
         webhook_config: Dict[str, Any],
@@ -286,7 +538,11 @@ class WebhookDeliveryClient:
         delivery_id: Optional[str] = None
     ) -> WebhookDeliveryResult:
         """
-        Deliver webhook with retries and circuit breaking.
+        Deliver webhook inline with retries and circuit breaking.
+        
+        This waits between attempts in the calling task; event fan-out goes
+        through ``WebhookDeliveryWorker`` instead, which schedules retries on
+        the outbound queue.
         
         Args:
             webhook_config: Webhook configuration dictionary
@@ -317,82 +573,35 @@ class WebhookDeliveryClient:
             )
             return result
         
-        # Prepare request
-        headers = {
-            'Content-Type': 'application/json',
-            'User-Agent': self.user_agent,
-            **webhook_config.get('headers', {})
-        }
-        
         payload_json = payload.model_dump_json()
         
-        # Add signature if secret is configured
-        if webhook_config.get('secret_token'):
-            signature = WebhookSignatureGenerator.generate_signature(
-                payload_json, 
-                webhook_config['secret_token']
-            )
-            headers['X-JCTC-Signature'] = signature
-        
         # Attempt delivery with retries
         for attempt_num in range(1, self.max_retries + 1):
-            attempt = DeliveryAttempt(
-                attempt_number=attempt_num,
-                timestamp=datetime.utcnow()
-            )
+            attempt = await self.attempt_delivery(webhook_config, payload_json, attempt_num)
+            result.attempts.append(attempt)
             
-            try:
-                start_time = time.time()
-                
-                if not self.client:
-                    raise RuntimeError("Client not initialized. Use async context manager.")
+            if attempt.success:
+                result.status = DeliveryStatus.DELIVERED
+                result.final_attempt = True
+                circuit_breaker.record_success()
                 
-                response = await self.client.post(
-                    webhook_config['url'],
-                    headers=headers,
-                    content=payload_json
+                logger.info(
+                    f"Webhook delivered successfully to {webhook_config['url']} "
+                    f"(attempt {attempt_num}, {attempt.response_time_ms:.1f}ms)"
                 )
-                
-                end_time = time.time()
-                attempt.response_time_ms = (end_time - start_time) * 1000
-                attempt.status_code = response.status_code
-                
-                # Check if delivery was successful
-                if 200 <= response.status_code < 300:
-                    attempt.success = True
-                    result.status = DeliveryStatus.DELIVERED
-                    result.final_attempt = True
-                    circuit_breaker.record_success()
-                    
-                    logger.info(
-                        f"Webhook delivered successfully to {webhook_config['url']} "
-                        f"(attempt {attempt_num}, {attempt.response_time_ms:.1f}ms)"
-                    )
-                    
-                    result.attempts.append(attempt)
-                    return result
-                else:
-                    attempt.error_message = f"HTTP {response.status_code}: {response.reason_phrase}"
-                    
-                    # Don't retry client errors (4xx)
-                    if 400 <= response.status_code < 500:
-                        result.status = DeliveryStatus.FAILED
-                        result.final_attempt = True
-                        circuit_breaker.record_failure()
-                        
-                        logger.warning(
-                            f"Webhook delivery failed with client error {response.status_code} "
-                            f"to {webhook_config['url']}, not retrying"
-                        )
-                        
-                        result.attempts.append(attempt)
-                        return result
-            
-            except Exception as e:
-                attempt.error_message = str(e)
-                logger.error(f"Webhook delivery attempt {attempt_num} failed: {e}")
+                return result
             
-            result.attempts.append(attempt)
+            # Don't retry client errors (4xx)
+            if not self.is_retryable(attempt):
+                result.status = DeliveryStatus.FAILED
+                result.final_attempt = True
+                circuit_breaker.record_failure()
+                
+                logger.warning(
+                    f"Webhook delivery failed with client error {attempt.status_code} "
+                    f"to {webhook_config['url']}, not retrying"
+                )
+                return result
             
             # If this was the last attempt, mark as failed
             if attempt_num >= self.max_retries:
@@ -401,12 +610,7 @@ class WebhookDeliveryClient:
                 circuit_breaker.record_failure()
                 return result
             
-            # Calculate delay for next attempt
-            delay = min(
-                self.initial_delay * (self.backoff_multiplier ** (attempt_num - 1)),
-                self.max_delay
-            )
-            
+            delay = self.retry_delay(attempt_num)
             result.status = DeliveryStatus.RETRYING
             result.next_retry_at = datetime.utcnow() + timedelta(seconds=delay)
             
@@ -416,13 +620,489 @@ class WebhookDeliveryClient:
         return result
 
 
+class WebhookDeliveryJob(BaseModel):
+    """A queued webhook delivery.
+    
+    ``webhook_config`` never holds the signing secret: jobs sit in Redis as
+    plain JSON, so the worker looks the secret up by webhook id when it
+    delivers.
+    """
+    
+    delivery_id: str
+    webhook_config: Dict[str, Any]
+    event_type: str
+    event_id: str
+    payload_json: str
+    attempt_number: int = 0
+    max_attempts: int = 3
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    last_error: Optional[str] = None
+
+
+# Atomically move due jobs from the schedule to the in-flight set
+_CLAIM_DUE_SCRIPT = """
+local ids = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, ARGV[2])
+local jobs = {}
+for _, id in ipairs(ids) do
+    redis.call('ZREM', KEYS[1], id)
+    local job = redis.call('HGET', KEYS[3], id)
+    if job then
+        redis.call('ZADD', KEYS[2], ARGV[3], id)
+        table.insert(jobs, job)
+    end
+end
+return jobs
+"""
+
+
+class WebhookDeliveryQueue:
+    """
+    Durable outbound webhook queue.
+    
+    Jobs live in a Redis hash and are scheduled in a sorted set scored by the
+    time they become due, so a retry is a re-scheduled entry rather than a
+    sleeping task. Claimed jobs are leased into an in-flight set; leases that
+    expire (e.g. the worker process died) are returned to the schedule by
+    ``recover_expired``.
+    
+    ``connect`` pings Redis and switches the queue to an in-process heap if
+    it cannot be reached. Jobs that fail to reach Redis later are spilled to
+    that heap too, so a Redis outage never fails the request dispatching the
+    event; the worker drains the local heap alongside Redis.
+    """
+    
+    def __init__(
+        self,
+        redis_url: Optional[str] = None,
+        key_prefix: str = "webhooks:outbound",
+        lease_seconds: int = 120,
+        use_redis: bool = True
+    ):
+        self.key_prefix = key_prefix
+        self.lease_seconds = lease_seconds
+        self.jobs_key = f"{key_prefix}:jobs"
+        self.schedule_key = f"{key_prefix}:schedule"
+        self.inflight_key = f"{key_prefix}:inflight"
+        
+        self.redis_client = None
+        self._claim_script = None
+        if use_redis:
+            try:
+                import redis.asyncio as aioredis
+                # Lazy: nothing is sent until connect() or the first command
+                self.redis_client = aioredis.from_url(redis_url or settings.redis_url)
+                self._claim_script = self.redis_client.register_script(_CLAIM_DUE_SCRIPT)
+            except Exception as e:
+                logger.warning(f"Redis not available for webhook queue, using in-process queue: {e}")
+                self.redis_client = None
+        
+        # In-process fallback
+        self._jobs: Dict[str, str] = {}
+        self._schedule: List[tuple] = []
+        self._inflight: Dict[str, float] = {}
+        
+        self._wakeup = asyncio.Event()
+    
+    async def connect(self) -> bool:
+        """Check that Redis answers; otherwise use the in-process queue. Returns whether Redis is used."""
+        
+        if self.redis_client is None:
+            return False
+        try:
+            await self.redis_client.ping()
+            logger.info("Webhook outbound queue using Redis backend")
+            return True
+        except Exception as e:
+            logger.warning(f"Redis not reachable for webhook queue, using in-process queue: {e}")
+            self.redis_client = None
+            self._claim_script = None
+            return False
+    
+    def _push_local(self, job: WebhookDeliveryJob, due_at: float):
+        self._jobs[job.delivery_id] = job.model_dump_json()
+        heapq.heappush(self._schedule, (due_at, job.delivery_id))
+    
+    async def enqueue_many(self, jobs: List[WebhookDeliveryJob], delay_seconds: float = 0.0):
+        """Add jobs to the queue, due after ``delay_seconds``."""
+        
+        if not jobs:
+            return
+        
+        due_at = time.time() + delay_seconds
+        
+        spill = self.redis_client is None
+        if self.redis_client:
+            try:
+                pipe = self.redis_client.pipeline()
+                pipe.hset(self.jobs_key, mapping={job.delivery_id: job.model_dump_json() for job in jobs})
+                pipe.zadd(self.schedule_key, {job.delivery_id: due_at for job in jobs})
+                await pipe.execute()
+            except Exception as e:
+                logger.warning(f"Webhook queue could not reach Redis, keeping {len(jobs)} jobs in process: {e}")
+                spill = True
+        if spill:
+            for job in jobs:
+                self._push_local(job, due_at)
+        
+        if delay_seconds <= 0:
+            self._wakeup.set()
+    
+    async def enqueue(self, job: WebhookDeliveryJob, delay_seconds: float = 0.0):
+        """Add a single job to the queue."""
+        await self.enqueue_many([job], delay_seconds)
+    
+    async def claim_due(self, limit: int) -> List[WebhookDeliveryJob]:
+        """Lease up to ``limit`` jobs that are due for delivery."""
+        
+        if limit <= 0:
+            return []
+        
+        now = time.time()
+        lease_until = now + self.lease_seconds
+        
+        # Jobs held in process (no Redis, or spilled during an outage) first
+        raw_jobs = []
+        while self._schedule and self._schedule[0][0] <= now and len(raw_jobs) < limit:
+            _, delivery_id = heapq.heappop(self._schedule)
+            raw = self._jobs.get(delivery_id)
+            if raw is not None:
+                self._inflight[delivery_id] = lease_until
+                raw_jobs.append(raw)
+        
+        if self.redis_client and len(raw_jobs) < limit:
+            try:
+                raw_jobs.extend(await self._claim_script(
+                    keys=[self.schedule_key, self.inflight_key, self.jobs_key],
+                    args=[now, limit - len(raw_jobs), lease_until]
+                ))
+            except Exception:
+                if not raw_jobs:
+                    raise
+                logger.warning("Webhook queue could not reach Redis, delivering in-process jobs only")
+        
+        return [WebhookDeliveryJob.model_validate_json(raw) for raw in raw_jobs]
+    
+    async def ack(self, job: WebhookDeliveryJob):
+        """Remove a finished (delivered or abandoned) job."""
+        
+        if job.delivery_id in self._jobs or not self.redis_client:
+            self._jobs.pop(job.delivery_id, None)
+            self._inflight.pop(job.delivery_id, None)
+        else:
+            pipe = self.redis_client.pipeline()
+            pipe.hdel(self.jobs_key, job.delivery_id)
+            pipe.zrem(self.inflight_key, job.delivery_id)
+            await pipe.execute()
+    
+    async def reschedule(self, job: WebhookDeliveryJob, delay_seconds: float):
+        """Return a leased job to the schedule, due after ``delay_seconds``."""
+        
+        due_at = time.time() + delay_seconds
+        
+        if job.delivery_id in self._jobs or not self.redis_client:
+            self._inflight.pop(job.delivery_id, None)
+            self._push_local(job, due_at)
+        else:
+            pipe = self.redis_client.pipeline()
+            pipe.hset(self.jobs_key, job.delivery_id, job.model_dump_json())
+            pipe.zrem(self.inflight_key, job.delivery_id)
+            pipe.zadd(self.schedule_key, {job.delivery_id: due_at})
+            await pipe.execute()
+    
+    async def recover_expired(self) -> int:
+        """Re-queue in-flight jobs whose lease has expired."""
+        
+        now = time.time()
+        
+        expired = [d for d, lease in self._inflight.items() if lease <= now]
+        for delivery_id in expired:
+            del self._inflight[delivery_id]
+            heapq.heappush(self._schedule, (now, delivery_id))
+        
+        if self.redis_client:
+            expired_remote = await self.redis_client.zrangebyscore(self.inflight_key, '-inf', now)
+            if expired_remote:
+                pipe = self.redis_client.pipeline()
+                pipe.zrem(self.inflight_key, *expired_remote)
+                pipe.zadd(self.schedule_key, {delivery_id: now for delivery_id in expired_remote})
+                await pipe.execute()
+                expired.extend(expired_remote)
+        
+        if expired:
+            logger.warning(f"Re-queued {len(expired)} webhook deliveries with expired leases")
+        return len(expired)
+    
+    async def depth(self) -> int:
+        """Number of jobs waiting or in flight."""
+        if self.redis_client:
+            return len(self._jobs) + await self.redis_client.hlen(self.jobs_key)
+        return len(self._jobs)
+    
+    async def wait_for_jobs(self, timeout: float):
+        """Wait until a job is enqueued in this process or ``timeout`` elapses."""
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        self._wakeup.clear()
+
+
+WebhookSecretLoader = Callable[[str], Awaitable[Optional[str]]]
+
+
+async def load_webhook_secret(webhook_id: str) -> Optional[str]:
+    """
+    Load a webhook's signing secret from the database.
+    
+    Raises:
+        LookupError: If the webhook no longer exists
+    """
+    
+    from sqlalchemy import select
+    from app.database.base import AsyncSessionLocal
+    from app.models.integrations import Webhook
+    
+    async with AsyncSessionLocal() as db:
+        row = (await db.execute(
+            select(Webhook.secret_token).where(Webhook.id == webhook_id)
+        )).one_or_none()
+    
+    if row is None:
+        raise LookupError(f"Webhook {webhook_id} not found")
+    return row.secret_token
+
+
+class WebhookDeliveryWorker:
+    """
+    Pool of delivery tasks draining the outbound webhook queue.
+    
+    A single fetcher leases due jobs in batches and hands them to
+    ``concurrency`` consumer tasks sharing one pooled ``WebhookDeliveryClient``.
+    Failed attempts are rescheduled on the queue with exponential backoff and
+    jobs for hosts whose circuit breaker is OPEN are deferred until the breaker
+    allows a test request.
+    """
+    
+    def __init__(
+        self,
+        queue: WebhookDeliveryQueue,
+        client: WebhookDeliveryClient,
+        concurrency: int = 8,
+        batch_size: int = 50,
+        poll_interval: float = 1.0,
+        breaker_store: Optional[CircuitBreakerStore] = None,
+        secret_loader: Optional[WebhookSecretLoader] = None
+    ):
+        self.queue = queue
+        self.client = client
+        self.secret_loader = secret_loader or load_webhook_secret
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.breaker_store = breaker_store or CircuitBreakerStore(queue.redis_client)
+        
+        self.stats: Dict[str, int] = {
+            'delivered': 0,
+            'retried': 0,
+            'abandoned': 0,
+            'deferred': 0
+        }
+        
+        self._pending: asyncio.Queue = asyncio.Queue(maxsize=concurrency * 2)
+        self._tasks: List[asyncio.Task] = []
+        self._running = False
+    
+    @property
+    def is_running(self) -> bool:
+        return self._running
+    
+    async def start(self):
+        """Start the fetcher and consumer tasks."""
+        
+        if self._running:
+            return
+        
+        if not await self.queue.connect():
+            self.breaker_store = CircuitBreakerStore()
+        await self.client.start()
+        self._running = True
+        self._tasks = [asyncio.create_task(self._fetch_loop())]
+        self._tasks.extend(
+            asyncio.create_task(self._consume_loop()) for _ in range(self.concurrency)
+        )
+        logger.info(f"Webhook delivery worker started with {self.concurrency} consumers")
+    
+    async def stop(self):
+        """Stop all tasks and close the pooled client.
+        
+        Jobs leased but not yet delivered are recovered by another worker once
+        their lease expires.
+        """
+        
+        self._running = False
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        await self.client.close()
+        logger.info("Webhook delivery worker stopped")
+    
+    async def _fetch_loop(self):
+        """Lease due jobs and feed them to the consumers."""
+        
+        last_recovery = 0.0
+        
+        while self._running:
+            try:
+                if time.monotonic() - last_recovery >= self.queue.lease_seconds / 2:
+                    await self.queue.recover_expired()
+                    last_recovery = time.monotonic()
+                
+                # Claim at least one job so a full hand-off queue blocks on put()
+                # instead of idling until the next poll
+                free_slots = self._pending.maxsize - self._pending.qsize()
+                jobs = await self.queue.claim_due(max(1, min(self.batch_size, free_slots)))
+                
+                if not jobs:
+                    await self.queue.wait_for_jobs(self.poll_interval)
+                    continue
+                
+                for job in jobs:
+                    await self._pending.put(job)
+            
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Webhook queue fetch failed: {e}")
+                await asyncio.sleep(self.poll_interval)
+    
+    async def _consume_loop(self):
+        """Deliver jobs handed over by the fetcher."""
+        
+        while True:
+            job = await self._pending.get()
+            try:
+                await self.process_job(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Webhook delivery job {job.delivery_id} crashed: {e}")
+            finally:
+                self._pending.task_done()
+    
+    async def process_job(self, job: WebhookDeliveryJob) -> Optional[DeliveryAttempt]:
+        """
+        Make one delivery attempt for a leased job and settle it on the queue.
+        
+        Returns:
+            The attempt made, or None if the job was deferred by the circuit breaker
+        """
+        
+        url = job.webhook_config['url']
+        host = self.client.host_key(url)
+        breaker = self.client.get_circuit_breaker(url)
+        await self.breaker_store.load(host, breaker)
+        
+        if not breaker.can_execute():
+            self.stats['deferred'] += 1
+            await self.queue.reschedule(job, max(breaker.retry_after_seconds(), self.poll_interval))
+            return None
+        
+        # Jobs queued before secrets were kept out of Redis still carry one;
+        # drop it so a reschedule does not write it back
+        job.webhook_config.pop('secret_token', None)
+        try:
+            secret_token = await self.secret_loader(job.webhook_config['id'])
+        except LookupError:
+            self.stats['abandoned'] += 1
+            await self.queue.ack(job)
+            logger.warning(f"Webhook delivery {job.delivery_id} dropped: webhook no longer exists")
+            return None
+        except Exception as e:
+            self.stats['deferred'] += 1
+            await self.queue.reschedule(job, self.client.retry_delay(max(job.attempt_number, 1)))
+            logger.error(f"Could not load secret for webhook delivery {job.delivery_id}: {e}")
+            return None
+        
+        job.attempt_number += 1
+        attempt = await self.client.attempt_delivery(
+            {**job.webhook_config, 'secret_token': secret_token},
+            job.payload_json,
+            job.attempt_number
+        )
+        
+        if attempt.success:
+            await self.breaker_store.record_success(host, breaker)
+            self.stats['delivered'] += 1
+            await self.queue.ack(job)
+        else:
+            await self.breaker_store.record_failure(host, breaker)
+            job.last_error = attempt.error_message
+            
+            if self.client.is_retryable(attempt) and job.attempt_number < job.max_attempts:
+                delay = self.client.retry_delay(job.attempt_number)
+                self.stats['retried'] += 1
+                await self.queue.reschedule(job, delay)
+                logger.info(
+                    f"Webhook delivery {job.delivery_id} to {url} failed "
+                    f"(attempt {job.attempt_number}), retry scheduled in {delay:.1f}s"
+                )
+            else:
+                self.stats['abandoned'] += 1
+                await self.queue.ack(job)
+                logger.warning(
+                    f"Webhook delivery {job.delivery_id} to {url} abandoned after "
+                    f"{job.attempt_number} attempts: {attempt.error_message}"
+                )
+        
+        return attempt
+
+
 class WebhookEventDispatcher:
     """Central dispatcher for webhook events."""
     
-    def __init__(self):
-        self.delivery_client = WebhookDeliveryClient()
+    def __init__(
+        self,
+        delivery_client: Optional[WebhookDeliveryClient] = None,
+        queue: Optional[WebhookDeliveryQueue] = None
+    ):
+        self.delivery_client = delivery_client or WebhookDeliveryClient(
+            per_host_concurrency=settings.webhook_per_host_concurrency,
+            http2=settings.webhook_http2
+        )
+        self.queue = queue or WebhookDeliveryQueue()
+        self.worker: Optional[WebhookDeliveryWorker] = None
         self.event_subscribers: Dict[WebhookEventType, List[Dict[str, Any]]] = {}
     
+    async def start_worker(self, concurrency: Optional[int] = None) -> WebhookDeliveryWorker:
+        """Start the background delivery worker for this process."""
+        
+        if self.worker is None:
+            self.worker = WebhookDeliveryWorker(
+                queue=self.queue,
+                client=self.delivery_client,
+                concurrency=concurrency or settings.webhook_worker_concurrency,
+                secret_loader=self._load_secret
+            )
+        await self.worker.start()
+        return self.worker
+    
+    async def stop_worker(self):
+        """Stop the background delivery worker."""
+        
+        if self.worker:
+            await self.worker.stop()
+    
+    async def _load_secret(self, webhook_id: str) -> Optional[str]:
+        """Signing secret for a webhook, from its subscription or the database."""
+        
+        for subscribers in self.event_subscribers.values():
+            for webhook_config in subscribers:
+                if webhook_config['id'] == webhook_id:
+                    return webhook_config.get('secret_token')
+        
+        return await load_webhook_secret(webhook_id)
+    
     def subscribe_webhook(self, webhook_config: Dict[str, Any]):
         """Subscribe a webhook to specific event types."""
         
@@ -449,7 +1129,11 @@ class WebhookEventDispatcher:
         metadata: Optional[Dict[str, Any]] = None
     ) -> List[WebhookDeliveryResult]:
         """
-        Dispatch event to all subscribed webhooks.
+        Queue event delivery to all subscribed webhooks.
+        
+        Deliveries are written to the outbound queue and made by the
+        background ``WebhookDeliveryWorker``, so the caller only pays for the
+        enqueue.
         
         Args:
             event_type: Type of event being dispatched
@@ -458,7 +1142,7 @@ class WebhookEventDispatcher:
             metadata: Optional event metadata
             
         Returns:
-            List of delivery results for each webhook
+            List of pending delivery results for each webhook
         """
         
         if not event_id:
@@ -487,42 +1171,44 @@ class WebhookEventDispatcher:
             logger.debug(f"No webhooks subscribed to {event_type.value}")
             return []
         
-        logger.info(f"Dispatching {event_type.value} event to {len(subscribers)} webhooks")
-        
-        # Deliver to all subscribers concurrently
-        delivery_tasks = []
+        payload_json = payload.model_dump_json()
+        jobs = []
         
-        async with self.delivery_client:
-            for webhook_config in subscribers:
-                # Check if webhook is active
-                if not webhook_config.get('is_active', False):
-                    continue
-                
-                # Apply event filters if configured
-                if not self._matches_filters(event_data, webhook_config.get('filters', {})):
-                    continue
-                
-                task = self.delivery_client.deliver_webhook(
-                    webhook_config=webhook_config,
-                    payload=payload
-                )
-                delivery_tasks.append(task)
+        for webhook_config in subscribers:
+            # Check if webhook is active
+            if not webhook_config.get('is_active', False):
+                continue
             
-            # Wait for all deliveries to complete
-            if delivery_tasks:
-                results = await asyncio.gather(*delivery_tasks, return_exceptions=True)
-                
-                # Filter out exceptions and log them
-                delivery_results = []
-                for result in results:
-                    if isinstance(result, Exception):
-                        logger.error(f"Webhook delivery task failed: {result}")
-                    else:
-                        delivery_results.append(result)
-                
-                return delivery_results
+            # Apply event filters if configured
+            if not self._matches_filters(event_data, webhook_config.get('filters', {})):
+                continue
             
+            jobs.append(WebhookDeliveryJob(
+                delivery_id=f"del_{uuid.uuid4().hex}",
+                webhook_config={
+                    key: value for key, value in webhook_config.items()
+                    if key != 'secret_token'
+                },
+                event_type=event_type.value,
+                event_id=event_id,
+                payload_json=payload_json,
+                max_attempts=webhook_config.get('retry_attempts') or self.delivery_client.max_retries
+            ))
+        
+        if not jobs:
             return []
+        
+        await self.queue.enqueue_many(jobs)
+        logger.info(f"Queued {event_type.value} event for {len(jobs)} webhooks")
+        
+        return [
+            WebhookDeliveryResult(
+                webhook_id=job.webhook_config['id'],
+                delivery_id=job.delivery_id,
+                status=DeliveryStatus.PENDING
+            )
+            for job in jobs
+        ]
     
     def _matches_filters(self, event_data: Dict[str, Any], filters: Dict[str, Any]) -> bool:
         """Check if event data matches webhook filters."""
@@ -648,7 +1334,7 @@ async def send_webhook_event(
         metadata: Optional event metadata
         
     Returns:
-        List of delivery results
+        List of pending delivery results
     """
     
     return await webhook_dispatcher.dispatch_event(
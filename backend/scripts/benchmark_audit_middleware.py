@@ -0,0 +1,123 @@
+"""
+Script to measure the per-request overhead of the audit middleware
+
+Compares a bare ASGI app, the pure ASGI AuditMiddleware, and the same
+capture done through BaseHTTPMiddleware with the audit row written inline
+(the previous design). Database writes are simulated with a fixed delay.
+
+Usage: python scripts/benchmark_audit_middleware.py [requests] [write_delay_ms]
+"""
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+
+from app.utils.audit import AuditMiddleware, AuditSink, AuditRequestRecord
+
+
+class SimulatedSink(AuditSink):
+    """Audit sink whose batch write costs a fixed delay instead of a database round trip"""
+
+    def __init__(self, write_delay: float, **kwargs):
+        super().__init__(**kwargs)
+        self.write_delay = write_delay
+
+    async def write_batch(self, batch):
+        for record in batch:
+            record.to_audit_log()
+        await asyncio.sleep(self.write_delay)
+
+
+class InlineAuditMiddleware(BaseHTTPMiddleware):
+    """Previous design: BaseHTTPMiddleware writing the audit row before returning"""
+
+    def __init__(self, app, write_delay: float):
+        super().__init__(app)
+        self.write_delay = write_delay
+
+    async def dispatch(self, request: Request, call_next):
+        start = time.perf_counter()
+        response = await call_next(request)
+        record = AuditRequestRecord(request.method, request.url.path, "benchmark")
+        record.status_code = response.status_code
+        record.duration_ms = (time.perf_counter() - start) * 1000
+        record.to_audit_log()
+        await asyncio.sleep(self.write_delay)
+        return response
+
+
+async def endpoint(scope, receive, send):
+    """Minimal JSON endpoint"""
+    await send({"type": "http.response.start", "status": 200,
+                "headers": [(b"content-type", b"application/json"), (b"content-length", b"2")]})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+def make_scope():
+    return {
+        "type": "http", "method": "POST", "path": "/api/v1/cases/123/", "query_string": b"",
+        "headers": [(b"user-agent", b"benchmark"), (b"content-type", b"application/json")],
+        "client": ("127.0.0.1", 50000), "server": ("testserver", 80), "scheme": "http",
+        "root_path": "", "http_version": "1.1",
+    }
+
+
+async def run(app, requests: int):
+    """Issue sequential requests and return per-request latencies in microseconds"""
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    latencies = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        await app(make_scope(), receive, send)
+        latencies.append((time.perf_counter() - start) * 1_000_000)
+    return latencies
+
+
+def report(name: str, latencies, baseline=None):
+    median = statistics.median(latencies)
+    p99 = sorted(latencies)[int(len(latencies) * 0.99) - 1]
+    overhead = f"  (+{median - baseline:.1f} us median)" if baseline is not None else ""
+    print(f"{name:<28} median {median:8.1f} us   p99 {p99:8.1f} us{overhead}")
+    return median
+
+
+async def main():
+    """Run each variant and report per-request latency and overhead"""
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    write_delay = (float(sys.argv[2]) if len(sys.argv) > 2 else 2.0) / 1000
+
+    print(f"{requests} requests, simulated audit write {write_delay * 1000:.1f} ms\n")
+
+    baseline = report("bare app", await run(endpoint, requests))
+
+    sink = SimulatedSink(write_delay, batch_size=200)
+    await sink.start()
+    report("pure ASGI + background sink", await run(AuditMiddleware(endpoint, sink=sink), requests), baseline)
+    await sink.stop()
+    print(f"{'':<28} written {sink.stats['written']}, spilled {sink.stats['spilled']}")
+
+    inline_requests = max(1, min(requests, 1000))
+    report("BaseHTTPMiddleware + inline", await run(InlineAuditMiddleware(endpoint, write_delay), inline_requests), baseline)
+
+    # Backpressure: a sink far slower than the request rate with a small queue
+    slow_sink = SimulatedSink(0.05, max_queue_size=100, batch_size=10, overflow_policy="drop_newest")
+    await slow_sink.start()
+    report("saturated sink (drop_newest)", await run(AuditMiddleware(endpoint, sink=slow_sink), requests), baseline)
+    await slow_sink.stop()
+    print(f"{'':<28} written {slow_sink.stats['written']}, spilled {slow_sink.stats['spilled']}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,93 @@
+"""
+Script to measure IPRangeIndex lookups on audit-log-shaped addresses
+
+Builds an index of random IPv4 and IPv6 networks and classifies a batch of
+addresses (mostly IPv4, some IPv6 and IPv4-mapped) three ways: the old
+linear scan over ``ipaddress`` networks, ``contains`` per address (bisect
+behind the LRU), and ``contains_many``. Checks that all three agree.
+
+Usage: python scripts/benchmark_ip_ranges.py [addresses] [ranges] [linear scan sample]
+"""
+import ipaddress
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.utils.ip_ranges import IPRangeIndex, numpy
+
+
+def build_networks(count: int, rng: random.Random):
+    networks = []
+    for i in range(count):
+        if i % 10:
+            prefix = rng.randint(12, 24)
+            networks.append(ipaddress.IPv4Network((rng.getrandbits(32), prefix), strict=False))
+        else:
+            prefix = rng.randint(24, 48)
+            networks.append(ipaddress.IPv6Network(((0x2C0F << 112) | rng.getrandbits(112), prefix), strict=False))
+    return networks
+
+
+def build_addresses(count: int, networks, rng: random.Random):
+    v4 = [network for network in networks if network.version == 4]
+    addresses = []
+    for i in range(count):
+        if i % 50 == 0:
+            addresses.append(str(ipaddress.IPv6Address((0x2C0F << 112) | rng.getrandbits(112))))
+        elif i % 3 == 0:
+            network = rng.choice(v4)
+            addresses.append(str(network.network_address + rng.randrange(network.num_addresses)))
+        else:
+            addresses.append(str(ipaddress.IPv4Address(rng.getrandbits(32))))
+    return addresses
+
+
+def linear_scan(networks, ip_address: str) -> bool:
+    address = ipaddress.ip_address(ip_address)
+    return any(address in network for network in networks)
+
+
+def main():
+    """Report addresses per second for each path"""
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+    range_count = int(sys.argv[2]) if len(sys.argv) > 2 else 5_000
+    sample = int(sys.argv[3]) if len(sys.argv) > 3 else 2_000
+    rng = random.Random(7)
+    networks = build_networks(range_count, rng)
+    addresses = build_addresses(total, networks, rng)
+    v4_only = [address for address in addresses if ":" not in address]
+
+    start = time.perf_counter()
+    index = IPRangeIndex(networks)
+    print(f"{range_count} ranges ({len(index)} after merging) indexed in {time.perf_counter() - start:.2f}s")
+    print(f"numpy: {'yes' if numpy is not None else 'no (batch falls back to contains)'}\n")
+    print(f"{'path':<36} {'addresses':>10} {'seconds':>8} {'addresses/s':>12}")
+
+    start = time.perf_counter()
+    expected = [linear_scan(networks, address) for address in addresses[:sample]]
+    elapsed = time.perf_counter() - start
+    print(f"{'linear scan per address':<36} {sample:10d} {elapsed:8.2f} {sample / elapsed:12.0f}")
+
+    start = time.perf_counter()
+    single = [index.contains(address) for address in addresses]
+    elapsed = time.perf_counter() - start
+    print(f"{'contains per address (LRU cold)':<36} {total:10d} {elapsed:8.2f} {total / elapsed:12.0f}")
+
+    for label, batch in (("contains_many (mixed)", addresses), ("contains_many (IPv4 only)", v4_only)):
+        start = time.perf_counter()
+        found = index.contains_many(batch)
+        elapsed = time.perf_counter() - start
+        print(f"{label:<36} {len(batch):10d} {elapsed:8.2f} {len(batch) / elapsed:12.0f}")
+
+    batch = index.contains_many(addresses)
+    assert single == batch, "contains and contains_many disagree"
+    assert expected == single[:sample], "index disagrees with the linear scan"
+    print(f"\n{sum(batch)} of {total} addresses in range; all paths agree")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Script to measure latency of an unrelated endpoint during a login storm
+
+Runs an in-process FastAPI app with a cheap /ping endpoint and two login
+variants: one calling bcrypt on the event loop (previous behaviour) and one
+using the bounded password hashing pool. While a burst of logins is in
+flight, /ping is polled continuously and its latency percentiles reported.
+
+Usage: python scripts/benchmark_login_storm.py [logins] [concurrency] [bcrypt_rounds]
+"""
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import bcrypt
+import httpx
+from fastapi import FastAPI
+
+from app.utils.auth import PasswordHasher, verify_password
+
+
+def build_app(hashed_password: str, hasher: PasswordHasher) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    @app.post("/login-inline")
+    async def login_inline():
+        return {"ok": verify_password("correct horse", hashed_password)}
+
+    @app.post("/login-pooled")
+    async def login_pooled():
+        return {"ok": await hasher.verify("correct horse", hashed_password)}
+
+    return app
+
+
+def percentile(values, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+async def storm(client: httpx.AsyncClient, path: str, logins: int, concurrency: int):
+    """Fire logins at the given concurrency while polling /ping; return ping latencies in ms"""
+    semaphore = asyncio.Semaphore(concurrency)
+    done = asyncio.Event()
+    ping_latencies = []
+
+    async def login():
+        async with semaphore:
+            await client.post(path)
+
+    async def poll():
+        # Latency is measured from each ping's scheduled send time, so pings
+        # that could not even be sent while the loop was blocked count too
+        interval = 0.005
+        first = time.perf_counter()
+        sent = 0
+        while not done.is_set():
+            scheduled = first + sent * interval
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            await client.get("/ping")
+            ping_latencies.append((time.perf_counter() - scheduled) * 1000)
+            sent += 1
+
+    poller = asyncio.create_task(poll())
+    start = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(logins)))
+    elapsed = time.perf_counter() - start
+    done.set()
+    await poller
+    return ping_latencies, elapsed
+
+
+async def main():
+    """Compare /ping latency during inline and pooled login storms"""
+    logins = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    rounds = int(sys.argv[3]) if len(sys.argv) > 3 else 12
+
+    hashed_password = bcrypt.hashpw(b"correct horse", bcrypt.gensalt(rounds)).decode()
+    hasher = PasswordHasher(max_workers=4, max_pending=logins)
+    app = build_app(hashed_password, hasher)
+
+    print(f"{logins} logins, concurrency {concurrency}, bcrypt cost {rounds}\n")
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for path in ("/login-inline", "/login-pooled"):
+            latencies, elapsed = await storm(client, path, logins, concurrency)
+            print(
+                f"{path:<14} logins {elapsed:6.2f}s   /ping n={len(latencies):4d} "
+                f"p50 {statistics.median(latencies):8.1f} ms   p99 {percentile(latencies, 0.99):8.1f} ms   "
+                f"max {max(latencies):8.1f} ms"
+            )
+
+    hasher.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,117 @@
+"""
+Script to measure bytes on the wire and CPU per request for mobile responses
+
+Serves a representative /mobile/cases page (50 case summaries) through
+CompressionMiddleware with each available coding, alongside the previous
+base64-wrapped gzip CompressedResponse envelope and an uncompressed
+response, and a 304 revalidation with If-None-Match.
+
+Usage: python scripts/benchmark_mobile_compression.py [requests] [items]
+"""
+import asyncio
+import json
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+
+from app.utils.compression import CompressionMiddleware, available_encodings
+from app.utils.http_caching import make_etag, not_modified
+from app.utils.mobile import MobileCompressionUtils
+
+
+def build_payload(items: int):
+    now = datetime(2026, 1, 1)
+    statuses = ["OPEN", "UNDER_INVESTIGATION", "PENDING_PROSECUTION", "CLOSED"]
+    return [
+        {
+            "id": str(uuid.UUID(int=i)),
+            "case_number": f"JCTC-2026-{i:05d}",
+            "title": f"Suspected business email compromise targeting vendor account {i}",
+            "priority": ["LOW", "MEDIUM", "HIGH"][i % 3],
+            "status": statuses[i % 4],
+            "created_at": (now - timedelta(days=i)).isoformat(),
+            "updated_at": (now - timedelta(hours=i)).isoformat(),
+            "assigned_officers_count": i % 5,
+            "description": "Complainant reported fraudulent invoice redirection via a spoofed domain.",
+        }
+        for i in range(items)
+    ]
+
+
+def build_app(payload, mode: str):
+    etag = make_etag("cases", 42)
+
+    async def app(scope, receive, send):
+        request = Request(scope, receive)
+        cached = not_modified(request, etag)
+        if cached is not None:
+            response = cached
+        elif mode == "envelope":
+            response = JSONResponse(MobileCompressionUtils.compress_data({"items": payload}).model_dump())
+        else:
+            response = JSONResponse(payload, headers={"ETag": etag})
+        await response(scope, receive, send)
+
+    if mode == "envelope":
+        return app, etag
+    return CompressionMiddleware(app, minimum_size=1024), etag
+
+
+async def run(app, requests: int, headers):
+    """Issue sequential requests; return (wire bytes per response, CPU us per request)"""
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    wire = 0
+
+    async def send(message):
+        nonlocal wire
+        if message["type"] == "http.response.body":
+            wire += len(message.get("body", b""))
+
+    scope = {
+        "type": "http", "method": "GET", "path": "/mobile/cases", "query_string": b"",
+        "headers": headers, "client": ("127.0.0.1", 50000), "server": ("bench", 80),
+        "scheme": "http", "root_path": "", "http_version": "1.1",
+    }
+    cpu_start = time.process_time()
+    for _ in range(requests):
+        await app(dict(scope), receive, send)
+    cpu = time.process_time() - cpu_start
+    return wire // requests, cpu / requests * 1_000_000
+
+
+async def main():
+    """Report response size and CPU per request for each variant"""
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    items = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    payload = build_payload(items)
+
+    print(f"{items} case summaries, {requests} requests per variant\n")
+    print(f"{'variant':<28} {'bytes':>8} {'cpu us/req':>11}")
+
+    app, etag = build_app(payload, "plain")
+    variants = [("identity", app, [])]
+    envelope_app, _ = build_app(payload, "envelope")
+    variants.append(("gzip base64 envelope (old)", envelope_app, []))
+    for encoding in available_encodings():
+        variants.append((f"Content-Encoding: {encoding}", app, [(b"accept-encoding", encoding.encode())]))
+    variants.append(("If-None-Match -> 304", app, [
+        (b"accept-encoding", b"gzip"), (b"if-none-match", etag[:-1].encode() + b'-gz"'),
+    ]))
+
+    for name, variant_app, headers in variants:
+        size, cpu = await run(variant_app, requests, headers)
+        print(f"{name:<28} {size:8d} {cpu:11.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
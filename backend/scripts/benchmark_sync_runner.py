@@ -0,0 +1,191 @@
+"""
+Script to measure SyncJobRunner throughput against a local stand-in API
+
+Serves JSON lists, page-numbered or keyset (``updated_since``/``after_id``),
+with a fixed per-request latency. Runs one page-numbered sync job
+sequentially (one page in flight), one with concurrent paging, and one keyset
+job while remote records keep being modified, then reports records per second
+and checks the keyset job synced every record. Upserts go to the database in DATABASE_URL;
+the sync tables are created there if they do not exist yet.
+
+Usage: python scripts/benchmark_sync_runner.py [records] [page size] [latency ms] [concurrency]
+"""
+import asyncio
+import json
+import random
+import sys
+import time
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import delete, func, select
+
+from app.database.base import AsyncSessionLocal, engine
+from app.models.ingest import ExternalRecord
+from app.models.integrations import Integration, SyncJob
+from app.models.user import User
+from app.utils.api_clients import APIClient, APIClientConfig, AuthenticationConfig, RateLimitConfig
+from app.utils.sync_runner import SyncJobRunner, parse_remote_timestamp
+
+
+def make_records(total: int) -> list:
+    """Remote records, one per second of updated_at so (updated_at, id) orders them by i"""
+    start = datetime(2025, 6, 1, tzinfo=timezone.utc)
+    return [
+        {
+            "id": f"case-{i:06d}",
+            "reference": f"JCTC/2025/{i:06d}",
+            "title": f"Suspected BEC fraud report {i}",
+            "status": ("open", "under_investigation", "closed")[i % 3],
+            "updated_at": (start + timedelta(seconds=i)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        }
+        for i in range(total)
+    ]
+
+
+def select_page(records: list, query: dict) -> tuple:
+    """
+    One page of ``records`` (sorted by updated_at, id) and whether more follow.
+
+    With ``page`` the page is numbered; otherwise it is the keyset page after
+    ``updated_since``/``after_id`` (``updated_since`` alone is inclusive).
+    """
+    size = int(query.get("page_size", ["100"])[0])
+    since = query.get("updated_since", [None])[0]
+    after = query.get("after_id", [None])[0]
+    if "page" in query:
+        first = (int(query["page"][0]) - 1) * size
+    elif since and after:
+        key = (parse_remote_timestamp(since), after)
+        first = bisect_right(records, key, key=lambda record: (parse_remote_timestamp(record["updated_at"]), record["id"]))
+    elif since:
+        first = bisect_left(records, parse_remote_timestamp(since), key=lambda record: parse_remote_timestamp(record["updated_at"]))
+    else:
+        first = 0
+    return records[first:first + size], first + size < len(records)
+
+
+def make_handler(records: list, latency: float):
+    async def handle_request(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Minimal keep-alive HTTP/1.1 server returning one page of records per GET"""
+        try:
+            while True:
+                headers = await reader.readuntil(b"\r\n\r\n")
+                target = headers.split(b" ", 2)[1].decode()
+                items, has_more = select_page(records, parse_qs(urlsplit(target).query))
+                body = json.dumps({"items": items, "has_more": has_more}).encode()
+                await asyncio.sleep(latency)
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                    + f"Content-Length: {len(body)}\r\n\r\n".encode() + body
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionResetError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+    return handle_request
+
+
+async def touch_records(records: list, interval: float):
+    """Keep modifying remote records while a job runs: each moves to the end with a new updated_at"""
+    rng = random.Random(11)
+    while True:
+        await asyncio.sleep(interval)
+        record = dict(records.pop(rng.randrange(len(records))))
+        newest = parse_remote_timestamp(records[-1]["updated_at"])
+        record["updated_at"] = (newest + timedelta(seconds=1)).strftime("%Y-%m-%dT%H:%M:%SZ")
+        records.append(record)
+
+
+async def run_job(base_url: str, user_id: str, paging: str, page_size: int, concurrency: int) -> dict:
+    async with AsyncSessionLocal() as db:
+        job = SyncJob(
+            connector_type="benchmark",
+            sync_direction="import",
+            entity_types=["cases"],
+            created_by=user_id
+        )
+        db.add(job)
+        await db.commit()
+        job_id = job.id
+
+    config = APIClientConfig(
+        base_url=base_url,
+        name="benchmark",
+        authentication=AuthenticationConfig(type="none"),
+        rate_limit_config=RateLimitConfig(requests_per_second=1000.0)
+    )
+    async with APIClient(config) as client:
+        runner = SyncJobRunner(
+            client, {"cases": "/cases"}, paging=paging, page_size=page_size, concurrency=concurrency
+        )
+        return await runner.run(job_id)
+
+
+async def main():
+    """Run the same sync page-numbered (sequential and concurrent) and keyset"""
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    page_size = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    latency = (float(sys.argv[3]) if len(sys.argv) > 3 else 50.0) / 1000
+    concurrency = int(sys.argv[4]) if len(sys.argv) > 4 else 4
+
+    async with engine.begin() as conn:
+        await conn.run_sync(lambda sync_conn: Integration.metadata.create_all(
+            sync_conn,
+            tables=[Integration.__table__, SyncJob.__table__, ExternalRecord.__table__]
+        ))
+
+    async with AsyncSessionLocal() as db:
+        user_id = (await db.execute(select(User.id).limit(1))).scalar()
+    if user_id is None:
+        print("No users found; run scripts/create_super_admin.py first")
+        return
+
+    records = make_records(total)
+    server = await asyncio.start_server(make_handler(records, latency), "127.0.0.1", 0)
+    base_url = f"http://127.0.0.1:{server.sockets[0].getsockname()[1]}"
+
+    print("=" * 60)
+    print(f"Sync runner benchmark: {total} records, {page_size}/page, {latency * 1000:.0f}ms per page")
+    print("=" * 60)
+    print(f"{'paging':<18} {'seconds':>8} {'records/s':>11} {'created':>9} {'updated':>9}")
+
+    # Keyset run last, with records modified while it pages
+    for paging, in_flight in (("page", 1), ("page", concurrency), ("keyset", 1)):
+        async with AsyncSessionLocal() as db:
+            await db.execute(delete(ExternalRecord).where(ExternalRecord.integration_id == ""))
+            await db.commit()
+        toucher = asyncio.create_task(touch_records(records, latency / 2)) if paging == "keyset" else None
+        start = time.perf_counter()
+        summary = await run_job(base_url, str(user_id), paging, page_size, in_flight)
+        elapsed = time.perf_counter() - start
+        label = f"{paging} x{in_flight}" if paging == "page" else f"{paging} (live edits)"
+        print(
+            f"{label:<18} {elapsed:8.2f} {summary['records_processed'] / elapsed:11.0f} "
+            f"{summary['records_created']:9d} {summary['records_updated']:9d}"
+        )
+        if toucher is not None:
+            toucher.cancel()
+            await asyncio.gather(toucher, return_exceptions=True)
+
+    async with AsyncSessionLocal() as db:
+        synced = (await db.execute(
+            select(func.count(func.distinct(ExternalRecord.external_id)))
+            .where(ExternalRecord.integration_id == "")
+        )).scalar()
+    print(f"\nKeyset run synced {synced} of {total} records")
+
+    server.close()
+    await server.wait_closed()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,125 @@
+"""
+Script to measure DataTransformer throughput on Cellebrite-shaped records
+
+Maps UFED-style message/call records (nested device, party and attachment
+fields) to the JCTC evidence schema with type conversions, string clean-up,
+custom functions, conditions and validation rules. Compares per-record
+transform_data calls against a compiled plan driven through transform_many.
+
+Usage: python scripts/benchmark_transformers.py [records] [transform_data sample]
+"""
+import itertools
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.utils.transformers import (
+    DataTransformer,
+    FieldMapping,
+    MappingConfiguration,
+    TransformationRule,
+    TransformationType,
+    ValidationRule,
+)
+
+
+def build_mapping() -> MappingConfiguration:
+    def rule(kind, order=0, condition=None, **parameters):
+        return TransformationRule(type=kind, parameters=parameters, order=order, condition=condition)
+
+    return MappingConfiguration(
+        name="cellebrite_ufed_to_jctc",
+        source_system="cellebrite",
+        target_system="jctc",
+        validation_mode="lenient",
+        error_handling="collect_errors",
+        field_mappings=[
+            FieldMapping(source_field="Id", target_field="external_id", required=True,
+                         transformations=[rule(TransformationType.TO_STRING)]),
+            FieldMapping(source_field="Source", target_field="application",
+                         transformations=[rule(TransformationType.LOWERCASE, order=2),
+                                          rule(TransformationType.TRIM, order=1)]),
+            FieldMapping(source_field="TimeStamp", target_field="occurred_on",
+                         transformations=[rule(TransformationType.FORMAT_DATE, format="%Y-%m-%d %H:%M")]),
+            FieldMapping(source_field="Direction", target_field="direction", default_value="Unknown",
+                         transformations=[rule(TransformationType.UPPERCASE)],
+                         validation_rules=[ValidationRule(type="in", parameters={
+                             "values": ["INCOMING", "OUTGOING", "UNKNOWN"]})]),
+            FieldMapping(source_field="Body", target_field="content.text",
+                         transformations=[rule(TransformationType.TRIM),
+                                          rule(TransformationType.NULL_IF_EMPTY, order=1)],
+                         validation_rules=[ValidationRule(type="length", parameters={"max": 4096},
+                                                          severity="warning")]),
+            FieldMapping(source_field="Party.Identifier", target_field="counterparty.phone",
+                         transformations=[rule(TransformationType.CUSTOM, function="format_nigerian_phone")],
+                         validation_rules=[ValidationRule(type="pattern", parameters={"regex": r"^\+234\d{10}$"})]),
+            FieldMapping(source_field="Party.Name", target_field="counterparty.initials",
+                         transformations=[rule(TransformationType.CUSTOM, function="extract_initials")]),
+            FieldMapping(source_field="Device.IMEI", target_field="device.imei", required=True,
+                         validation_rules=[ValidationRule(type="pattern", parameters={"regex": r"^\d{15}$"})]),
+            FieldMapping(source_field="Device.Model", target_field="device.model",
+                         transformations=[rule(TransformationType.REPLACE, **{"from": "_", "to": " "}),
+                                          rule(TransformationType.CAPITALIZE, order=1)]),
+            FieldMapping(source_field="Attachments.Count", target_field="attachment_count",
+                         transformations=[rule(TransformationType.TO_INTEGER)],
+                         validation_rules=[ValidationRule(type="range", parameters={"min": 0, "max": 100})]),
+            FieldMapping(source_field="Attachments.Size", target_field="attachment_size_kb",
+                         transformations=[rule(TransformationType.FORMAT_NUMBER, decimals=1)]),
+            FieldMapping(source_field="Deleted", target_field="recovered",
+                         transformations=[rule(TransformationType.TO_BOOLEAN)]),
+            FieldMapping(source_field="Body", target_field="content.sha256",
+                         transformations=[rule(TransformationType.CUSTOM, condition="${Deleted} == 'true'",
+                                               function="hash_sensitive_data")]),
+        ],
+    )
+
+
+def build_records(count: int):
+    sources = [" WhatsApp", "SMS ", "Telegram", "Facebook Messenger"]
+    directions = ["Incoming", "Outgoing", None]
+    return [
+        {
+            "Id": 100000 + i,
+            "Source": sources[i % 4],
+            "TimeStamp": f"2025-{i % 12 + 1:02d}-{i % 28 + 1:02d}T{i % 24:02d}:{i % 60:02d}:00Z",
+            "Direction": directions[i % 3],
+            "Body": f"  Send the balance to account 01{i:08d} before noon  " if i % 7 else "   ",
+            "Party": {"Identifier": f"0803{i:07d}", "Name": "Chinedu Okafor Eze", "Role": "From"},
+            "Device": {"IMEI": f"35{i:013d}", "Model": "samsung_galaxy_a54", "OS": "Android 14"},
+            "Attachments": {"Count": str(i % 4), "Size": i * 3.7},
+            "Deleted": "true" if i % 11 == 0 else "false",
+            "Folder": "Inbox",
+        }
+        for i in range(count)
+    ]
+
+
+def main():
+    """Report records per second for each path"""
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    sample = int(sys.argv[2]) if len(sys.argv) > 2 else 20_000
+    mapping = build_mapping()
+    pool = build_records(1000)
+    transformer = DataTransformer()
+
+    print(f"{len(mapping.field_mappings)} field mappings\n")
+    print(f"{'path':<36} {'records':>9} {'seconds':>8} {'records/s':>11}")
+
+    start = time.perf_counter()
+    for record in itertools.islice(itertools.cycle(pool), sample):
+        transformer.transform_data(record, mapping)
+    elapsed = time.perf_counter() - start
+    print(f"{'transform_data per record':<36} {sample:9d} {elapsed:8.2f} {sample / elapsed:11.0f}")
+
+    start = time.perf_counter()
+    for result in transformer.transform_many(itertools.islice(itertools.cycle(pool), total), mapping):
+        pass
+    elapsed = time.perf_counter() - start
+    print(f"{'transform_many (compiled plan)':<36} {total:9d} {elapsed:8.2f} {total / elapsed:11.0f}")
+
+
+if __name__ == "__main__":
+    main()
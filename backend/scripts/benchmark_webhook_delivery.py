@@ -0,0 +1,92 @@
+"""
+Script to measure webhook delivery throughput against a local stand-in receiver
+
+Usage: python scripts/benchmark_webhook_delivery.py [events] [webhooks] [concurrency]
+"""
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.utils.webhooks import (
+    WebhookDeliveryClient,
+    WebhookDeliveryQueue,
+    WebhookEventDispatcher,
+    WebhookEventType,
+)
+
+
+async def handle_request(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    """Minimal keep-alive HTTP/1.1 receiver that accepts every POST"""
+    try:
+        while True:
+            headers = await reader.readuntil(b"\r\n\r\n")
+            content_length = 0
+            for line in headers.split(b"\r\n"):
+                if line.lower().startswith(b"content-length:"):
+                    content_length = int(line.split(b":", 1)[1])
+            if content_length:
+                await reader.readexactly(content_length)
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok")
+            await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionResetError, asyncio.CancelledError):
+        pass
+    finally:
+        writer.close()
+
+
+async def main():
+    """Dispatch events through the queue and report delivery throughput"""
+    events = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    webhooks = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    concurrency = int(sys.argv[3]) if len(sys.argv) > 3 else 16
+
+    server = await asyncio.start_server(handle_request, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+
+    dispatcher = WebhookEventDispatcher(
+        delivery_client=WebhookDeliveryClient(per_host_concurrency=concurrency, http2=False),
+        queue=WebhookDeliveryQueue(use_redis=False)
+    )
+    for i in range(webhooks):
+        dispatcher.subscribe_webhook({
+            "id": f"bench-{i}",
+            "url": f"http://127.0.0.1:{port}/hook/{i}",
+            "event_types": [WebhookEventType.CASE_UPDATED],
+            "is_active": True,
+            "secret_token": "benchmark-secret",
+        })
+
+    worker = await dispatcher.start_worker(concurrency=concurrency)
+    total = events * webhooks
+
+    print("=" * 60)
+    print(f"Webhook delivery benchmark: {events} events x {webhooks} webhooks")
+    print("=" * 60)
+
+    start = time.perf_counter()
+    dispatch_time = 0.0
+    for i in range(events):
+        t0 = time.perf_counter()
+        await dispatcher.dispatch_event(WebhookEventType.CASE_UPDATED, {"case_id": str(i)})
+        dispatch_time += time.perf_counter() - t0
+
+    while worker.stats["delivered"] + worker.stats["abandoned"] < total:
+        await asyncio.sleep(0.05)
+    elapsed = time.perf_counter() - start
+
+    await dispatcher.stop_worker()
+    server.close()
+    await server.wait_closed()
+
+    print(f"Delivered:               {worker.stats['delivered']} / {total}")
+    print(f"Mean dispatch latency:   {dispatch_time / events * 1000:.3f} ms")
+    print(f"Total time:              {elapsed:.2f} s")
+    print(f"Throughput:              {total / elapsed:.0f} deliveries/s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())